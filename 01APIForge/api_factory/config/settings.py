@@ -22,6 +22,8 @@ class ZMQConfig(BaseSettings):
     reply_port: int = Field(default=5558, json_schema_extra={"env": "ZMQ_REPLY_PORT"})
     bind_address: str = Field(default="tcp://*", json_schema_extra={"env": "ZMQ_BIND_ADDRESS"})
     connect_address: str = Field(default="tcp://127.0.0.1", json_schema_extra={"env": "ZMQ_CONNECT_ADDRESS"})
+    request_pool_size: int = Field(default=1, json_schema_extra={"env": "ZMQ_REQUEST_POOL_SIZE"})
+    request_max_in_flight: int = Field(default=1000, json_schema_extra={"env": "ZMQ_REQUEST_MAX_IN_FLIGHT"})
 
 
 class RedisConfig(BaseSettings):
@@ -41,6 +43,8 @@ class SQLiteConfig(BaseSettings):
 
     database_path: str = Field(default="./data/api_factory.db", json_schema_extra={"env": "SQLITE_DB_PATH"})
     backup_path: str = Field(default="./data/backups", json_schema_extra={"env": "SQLITE_BACKUP_PATH"})
+    reader_pool_size: int = Field(default=4, json_schema_extra={"env": "SQLITE_READER_POOL_SIZE"})
+    statement_cache_size: int = Field(default=256, json_schema_extra={"env": "SQLITE_STATEMENT_CACHE_SIZE"})
 
 
 class SupabaseConfig(BaseSettings):
@@ -66,6 +70,16 @@ class AuthConfig(BaseSettings):
     # 加密配置
     encryption_key: str = Field(default="", json_schema_extra={"env": "ENCRYPTION_KEY"})
     encryption_algorithm: str = Field(default="AES-256-GCM", json_schema_extra={"env": "ENCRYPTION_ALGORITHM"})
+    # 凭证验证缓存
+    credential_cache_ttl_seconds: float = Field(
+        default=60.0, json_schema_extra={"env": "AUTH_CREDENTIAL_CACHE_TTL"}
+    )
+    credential_cache_max_entries: int = Field(
+        default=50000, json_schema_extra={"env": "AUTH_CREDENTIAL_CACHE_MAX_ENTRIES"}
+    )
+    last_used_flush_seconds: float = Field(
+        default=5.0, json_schema_extra={"env": "AUTH_LAST_USED_FLUSH_SECONDS"}
+    )
 
 
 class APIConfig(BaseSettings):
@@ -76,6 +90,56 @@ class APIConfig(BaseSettings):
         default=5, json_schema_extra={"env": "API_CIRCUIT_BREAKER_THRESHOLD"}
     )
     circuit_breaker_timeout: int = Field(default=60, json_schema_extra={"env": "API_CIRCUIT_BREAKER_TIMEOUT"})
+    circuit_breaker_failure_rate: float = Field(
+        default=0.5, json_schema_extra={"env": "API_CIRCUIT_BREAKER_FAILURE_RATE"}
+    )
+    circuit_breaker_slow_call_ms: float = Field(
+        default=5000.0, json_schema_extra={"env": "API_CIRCUIT_BREAKER_SLOW_CALL_MS"}
+    )
+    circuit_breaker_slow_call_rate: float = Field(
+        default=0.8, json_schema_extra={"env": "API_CIRCUIT_BREAKER_SLOW_CALL_RATE"}
+    )
+    circuit_breaker_window_seconds: int = Field(
+        default=10, json_schema_extra={"env": "API_CIRCUIT_BREAKER_WINDOW_SECONDS"}
+    )
+    circuit_breaker_half_open_max_calls: int = Field(
+        default=3, json_schema_extra={"env": "API_CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS"}
+    )
+
+    # 限流引擎配置
+    rate_limit_algorithm: str = Field(
+        default="sliding_window_counter", json_schema_extra={"env": "API_RATE_LIMIT_ALGORITHM"}
+    )
+    rate_limit_burst: int = Field(default=0, json_schema_extra={"env": "API_RATE_LIMIT_BURST"})
+    rate_limit_lease_max: int = Field(default=20, json_schema_extra={"env": "API_RATE_LIMIT_LEASE_MAX"})
+    rate_limit_lease_fraction: float = Field(
+        default=0.1, json_schema_extra={"env": "API_RATE_LIMIT_LEASE_FRACTION"}
+    )
+    rate_limit_lease_seconds: float = Field(
+        default=0.5, json_schema_extra={"env": "API_RATE_LIMIT_LEASE_SECONDS"}
+    )
+    rate_limit_max_leases: int = Field(default=100000, json_schema_extra={"env": "API_RATE_LIMIT_MAX_LEASES"})
+
+    # 响应缓存配置（幂等GET）
+    response_cache_ttl_seconds: float = Field(
+        default=1.0, json_schema_extra={"env": "API_RESPONSE_CACHE_TTL_SECONDS"}
+    )
+    response_cache_stale_seconds: float = Field(
+        default=5.0, json_schema_extra={"env": "API_RESPONSE_CACHE_STALE_SECONDS"}
+    )
+    response_cache_max_entries: int = Field(
+        default=10000, json_schema_extra={"env": "API_RESPONSE_CACHE_MAX_ENTRIES"}
+    )
+    # 调用记账（api_logs 批量写入）
+    usage_log_flush_seconds: float = Field(
+        default=1.0, json_schema_extra={"env": "API_USAGE_LOG_FLUSH_SECONDS"}
+    )
+    usage_log_batch_size: int = Field(
+        default=500, json_schema_extra={"env": "API_USAGE_LOG_BATCH_SIZE"}
+    )
+    usage_log_max_buffer: int = Field(
+        default=100000, json_schema_extra={"env": "API_USAGE_LOG_MAX_BUFFER"}
+    )
 
 
 class Settings(BaseSettings):
@@ -226,6 +290,7 @@ ENCRYPTION_ALGORITHM=AES-256-GCM
 # API配置
 API_RATE_LIMIT_PER_MINUTE=60
 API_CIRCUIT_BREAKER_THRESHOLD=5
+API_RATE_LIMIT_ALGORITHM=sliding_window_counter
 
 # 数据隔离
 DATA_ISOLATION_ENABLED=true
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+API配置注册表 - 持久化配置 + 内存路由表
+核心设计理念：配置存SQLite、热路径只查内存字典、变更整表原子替换并广播到其他副本
+
+- 路由表为不可变映射，键为 (tenant_id, api_name)，读路径零数据库I/O
+- create/update/delete 先写库，再基于当前表复制出新表整体替换（读方不会看到半更新状态）
+- 变更通过Redis发布订阅广播，事件只携带路由键，其他副本从数据库回读（凭证不经Redis明文传播）
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from dataclasses import dataclass, field, fields, replace
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .pubsub_sync import PubSubListener
+from .sqlite_manager import Tables
+
+logger = logging.getLogger(__name__)
+
+API_CONFIG_EVENTS_CHANNEL = "api_config:events"
+
+# 租户未单独配置时回退到的共享租户
+SHARED_TENANT = "default"
+
+# 敏感配置项（对外返回时脱敏）
+SECRET_MARKERS = ("key", "secret", "token", "password", "passphrase")
+
+
+@dataclass(frozen=True)
+class APIRoute:
+    """路由表条目 - 调用上游所需的全部信息"""
+
+    tenant_id: str
+    api_name: str
+    api_type: str
+    endpoint: str
+    timeout: float = 30
+    config_data: Mapping[str, Any] = field(default_factory=dict)
+    status: str = "active"
+    id: Optional[int] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "APIRoute":
+        """由 api_configs 表记录构建"""
+        config_data = record.get("config_data") or {}
+        if isinstance(config_data, str):
+            config_data = json.loads(config_data) if config_data else {}
+        return cls(
+            tenant_id=record["tenant_id"],
+            api_name=record["api_name"],
+            api_type=record["api_type"],
+            endpoint=record["endpoint"].rstrip("/"),
+            timeout=config_data.get("timeout", 30),
+            config_data=MappingProxyType(dict(config_data)),
+            status=record.get("status") or "active",
+            id=record.get("id"),
+            created_at=record.get("created_at"),
+            updated_at=record.get("updated_at"),
+        )
+
+    def to_record(self) -> Dict[str, Any]:
+        """转为 api_configs 表记录（不含自增ID）"""
+        return {
+            "tenant_id": self.tenant_id,
+            "api_name": self.api_name,
+            "api_type": self.api_type,
+            "endpoint": self.endpoint,
+            "config_data": json.dumps(dict(self.config_data)),
+            "status": self.status,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+    def to_dict(self, mask_secrets: bool = True) -> Dict[str, Any]:
+        """对外展示格式（默认对凭证类配置脱敏）"""
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        config_data = dict(self.config_data)
+        if mask_secrets:
+            for name in config_data:
+                if any(marker in name.lower() for marker in SECRET_MARKERS):
+                    config_data[name] = "***"
+        data["config_data"] = config_data
+        return data
+
+
+# 内置路由：数据库中没有对应配置时使用，保证开箱可用
+BUILTIN_ROUTES = (
+    APIRoute(SHARED_TENANT, "binance_spot", "exchange", "https://api.binance.com", 30),
+    APIRoute(SHARED_TENANT, "openai_gpt4", "llm", "https://api.openai.com", 60),
+    APIRoute(SHARED_TENANT, "yahoo_finance", "datasource", "https://query1.finance.yahoo.com", 30),
+)
+
+RouteKey = Tuple[str, str]
+
+
+class APIConfigRegistry:
+    """API配置注册表"""
+
+    def __init__(self, sqlite_manager: Optional[Any] = None, redis_manager: Optional[Any] = None):
+        self.sqlite_manager = sqlite_manager
+        self.redis_manager = redis_manager
+        self.node_id = uuid.uuid4().hex
+        self._table: Mapping[RouteKey, APIRoute] = self._build_table([])
+        self._lock = asyncio.Lock()
+
+        # 统计信息
+        self.stats = {
+            "lookups": 0,
+            "misses": 0,
+            "reloads": 0,
+            "swaps": 0,
+            "events_published": 0,
+            "events_received": 0,
+            "errors": 0,
+        }
+        self._listener = PubSubListener(
+            API_CONFIG_EVENTS_CHANNEL, self.apply_remote_event, "API配置", self.stats
+        )
+
+    @staticmethod
+    def _build_table(routes: List[APIRoute]) -> Mapping[RouteKey, APIRoute]:
+        table: Dict[RouteKey, APIRoute] = {
+            (route.tenant_id, route.api_name): route for route in BUILTIN_ROUTES
+        }
+        for route in routes:
+            table[(route.tenant_id, route.api_name)] = route
+        return MappingProxyType(table)
+
+    def _swap(self, table: Mapping[RouteKey, APIRoute]):
+        # 单次引用赋值，读方要么看到旧表要么看到新表
+        self._table = table
+        self.stats["swaps"] += 1
+
+    # 热路径
+
+    def lookup(self, tenant_id: str, api_name: str) -> Optional[APIRoute]:
+        """查找可用路由：租户自有配置优先，其次共享配置；非active状态视为不存在"""
+        self.stats["lookups"] += 1
+        table = self._table
+        route = table.get((tenant_id, api_name)) or table.get((SHARED_TENANT, api_name))
+        if route is None or route.status != "active":
+            self.stats["misses"] += 1
+            return None
+        return route
+
+    def get(self, tenant_id: str, api_name: str) -> Optional[APIRoute]:
+        """获取租户可见的配置（不区分状态）"""
+        table = self._table
+        return table.get((tenant_id, api_name)) or table.get((SHARED_TENANT, api_name))
+
+    def list_routes(
+        self,
+        tenant_id: str,
+        api_type: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> List[APIRoute]:
+        """列出租户可见的配置（租户配置覆盖同名共享配置）"""
+        visible: Dict[str, APIRoute] = {}
+        for (owner, api_name), route in self._table.items():
+            if owner == tenant_id or (owner == SHARED_TENANT and api_name not in visible):
+                visible[api_name] = route
+        routes = sorted(visible.values(), key=lambda r: r.api_name)
+        if api_type:
+            routes = [r for r in routes if r.api_type == api_type]
+        if status:
+            routes = [r for r in routes if r.status == status]
+        return routes
+
+    # 加载与变更
+
+    async def load(self) -> int:
+        """从数据库全量加载并替换路由表"""
+        if self.sqlite_manager is None:
+            return 0
+        records = await self.sqlite_manager.get_records(Tables.API_CONFIGS)
+        routes = []
+        for record in records:
+            try:
+                routes.append(APIRoute.from_record(record))
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"API配置记录无效，已跳过 - Name: {record.get('api_name')}: {e}")
+        async with self._lock:
+            self._swap(self._build_table(routes))
+        self.stats["reloads"] += 1
+        logger.info(f"API路由表已加载 - Routes: {len(routes)}")
+        return len(routes)
+
+    async def upsert(self, route: APIRoute) -> APIRoute:
+        """写入或更新配置，并原子替换路由表"""
+        async with self._lock:
+            now = datetime.now().isoformat()
+            existing = self._table.get((route.tenant_id, route.api_name))
+            route = replace(
+                route,
+                config_data=MappingProxyType(dict(route.config_data)),
+                id=existing.id if existing else None,
+                created_at=existing.created_at if existing and existing.created_at else now,
+                updated_at=now,
+            )
+
+            if self.sqlite_manager is not None:
+                record = route.to_record()
+                if existing is None or existing.id is None:
+                    # api_configs.tenant_id 引用 tenants 表，首次写入前补齐租户记录
+                    await self.sqlite_manager.ensure_tenant(route.tenant_id)
+                if existing is not None and existing.id is not None:
+                    await self.sqlite_manager.update_record(
+                        Tables.API_CONFIGS,
+                        {k: v for k, v in record.items() if k != "created_at"},
+                        "tenant_id = ? AND api_name = ?",
+                        (route.tenant_id, route.api_name),
+                    )
+                else:
+                    route_id = await self.sqlite_manager.insert_record(Tables.API_CONFIGS, record)
+                    route = replace(route, id=route_id)
+
+            self._apply_upsert(route)
+
+        await self._publish({"action": "upsert", "tenant_id": route.tenant_id, "api_name": route.api_name})
+        return route
+
+    async def remove(self, tenant_id: str, api_name: str) -> bool:
+        """删除租户自有配置，并原子替换路由表（内置路由不可删除，返回False）"""
+        async with self._lock:
+            route = self._table.get((tenant_id, api_name))
+            if route is None or route in BUILTIN_ROUTES:
+                return False
+            if self.sqlite_manager is not None:
+                await self.sqlite_manager.delete_record(
+                    Tables.API_CONFIGS, "tenant_id = ? AND api_name = ?", (tenant_id, api_name)
+                )
+            self._apply_remove(tenant_id, api_name)
+
+        await self._publish({"action": "delete", "tenant_id": tenant_id, "api_name": api_name})
+        return True
+
+    def _apply_upsert(self, route: APIRoute):
+        table = dict(self._table)
+        table[(route.tenant_id, route.api_name)] = route
+        self._swap(MappingProxyType(table))
+
+    def _apply_remove(self, tenant_id: str, api_name: str):
+        table = dict(self._table)
+        table.pop((tenant_id, api_name), None)
+        # 删除的是内置路由的覆盖配置时恢复内置路由
+        for builtin in BUILTIN_ROUTES:
+            if (builtin.tenant_id, builtin.api_name) == (tenant_id, api_name):
+                table[(tenant_id, api_name)] = builtin
+        self._swap(MappingProxyType(table))
+
+    # 跨副本同步
+
+    async def _publish(self, event: Dict[str, Any]):
+        if getattr(self.redis_manager, "client", None) is None:
+            return
+        try:
+            await self.redis_manager.publish_message(
+                API_CONFIG_EVENTS_CHANNEL, {"node_id": self.node_id, **event}
+            )
+            self.stats["events_published"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"发布API配置变更事件失败: {e}")
+
+    async def apply_remote_event(self, event: Dict[str, Any]):
+        """应用其他副本广播的配置变更：按事件中的路由键从数据库回读"""
+        if event.get("node_id") == self.node_id:
+            return
+        api_name = event.get("api_name")
+        if event.get("action") not in ("upsert", "delete") or not api_name:
+            return
+        self.stats["events_received"] += 1
+        await self.refresh_route(event.get("tenant_id", SHARED_TENANT), api_name)
+
+    async def refresh_route(self, tenant_id: str, api_name: str):
+        """从数据库回读单条配置并替换路由表（记录已删除时移除）"""
+        if self.sqlite_manager is None:
+            logger.warning(f"未配置数据库，无法同步API配置变更 - Name: {api_name}")
+            return
+        records = await self.sqlite_manager.get_records(
+            Tables.API_CONFIGS, "tenant_id = ? AND api_name = ?", (tenant_id, api_name)
+        )
+        async with self._lock:
+            if records:
+                self._apply_upsert(APIRoute.from_record(records[0]))
+            else:
+                self._apply_remove(tenant_id, api_name)
+
+    async def start_sync(self):
+        """启动Redis订阅任务"""
+        if self._listener.running:
+            return
+        if not await self._listener.start(self.redis_manager):
+            logger.info("Redis不可用，API配置变更仅在本节点生效")
+            return
+        logger.info(f"API配置同步已启动 - Node: {self.node_id}")
+
+    async def stop_sync(self):
+        """停止Redis订阅任务"""
+        await self._listener.stop()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "routes": len(self._table)}
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+熔断器 - 上游服务故障隔离
+核心设计理念：进程内状态机快速失败、滚动窗口统计、跨副本状态同步
+
+状态转换：
+- CLOSED -> OPEN: 滚动窗口内错误率或慢调用率超过阈值（且调用数达到最小样本）
+- OPEN -> HALF_OPEN: 熔断时间到期后，下一次请求触发
+- HALF_OPEN -> CLOSED: 探测调用全部成功
+- HALF_OPEN -> OPEN: 任一探测调用失败
+
+状态变更通过Redis发布订阅广播，所有网关副本同步打开/关闭。
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config.settings import APIConfig
+from .pubsub_sync import PubSubListener
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_EVENTS_CHANNEL = "circuit:events"
+
+
+class CircuitOpenError(Exception):
+    """熔断器打开，请求被快速拒绝"""
+
+    def __init__(self, service: str, retry_after: float):
+        super().__init__(f"Circuit breaker is open: {service}")
+        self.service = service
+        self.retry_after = retry_after
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """熔断器配置"""
+
+    failure_threshold: int = 5  # 最小样本数（窗口内调用数不足时不判定）
+    failure_rate_threshold: float = 0.5
+    slow_call_duration_ms: float = 5000.0
+    slow_call_rate_threshold: float = 0.8
+    window_seconds: int = 10
+    timeout_seconds: float = 60.0  # OPEN 持续时间
+    half_open_max_calls: int = 3
+
+    @classmethod
+    def from_api_config(cls, config: APIConfig) -> "CircuitBreakerConfig":
+        return cls(
+            failure_threshold=config.circuit_breaker_threshold,
+            failure_rate_threshold=config.circuit_breaker_failure_rate,
+            slow_call_duration_ms=config.circuit_breaker_slow_call_ms,
+            slow_call_rate_threshold=config.circuit_breaker_slow_call_rate,
+            window_seconds=config.circuit_breaker_window_seconds,
+            timeout_seconds=config.circuit_breaker_timeout,
+            half_open_max_calls=config.circuit_breaker_half_open_max_calls,
+        )
+
+
+class CircuitBreaker:
+    """单个上游服务的熔断器状态机"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        service: str,
+        config: CircuitBreakerConfig,
+        on_transition: Optional[Callable[["CircuitBreaker", str, str], None]] = None,
+    ):
+        self.service = service
+        self.config = config
+        self.on_transition = on_transition
+
+        self.state = self.CLOSED
+        self.open_until = 0.0
+        self.half_open_in_flight = 0
+        self.half_open_successes = 0
+
+        # 滚动窗口：每秒一个桶 [秒, 总数, 失败数, 慢调用数]
+        self._buckets: List[List[int]] = [
+            [0, 0, 0, 0] for _ in range(max(config.window_seconds, 1))
+        ]
+
+        # 累计统计
+        self.success_count = 0
+        self.failure_count = 0
+        self.rejected_count = 0
+        self.last_failure_time: Optional[datetime] = None
+
+    # 调用许可
+
+    def allow_request(self) -> bool:
+        """请求许可 - 纯内存判断，不涉及任何I/O"""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+
+        if state == self.OPEN:
+            if time.monotonic() < self.open_until:
+                self.rejected_count += 1
+                return False
+            self._transition(self.HALF_OPEN)
+
+        # HALF_OPEN：限制并发探测数
+        if self.half_open_in_flight < self.config.half_open_max_calls:
+            self.half_open_in_flight += 1
+            return True
+        self.rejected_count += 1
+        return False
+
+    def acquire(self):
+        """请求许可，被拒绝时抛出 CircuitOpenError"""
+        if not self.allow_request():
+            raise CircuitOpenError(self.service, self.retry_after())
+
+    def release(self):
+        """归还许可但不记录结果 - 调用被取消（客户端断开等）时使用，避免半开探测名额泄漏"""
+        if self.state == self.HALF_OPEN:
+            self.half_open_in_flight = max(self.half_open_in_flight - 1, 0)
+
+    def retry_after(self) -> float:
+        """距离允许探测的剩余秒数"""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(self.open_until - time.monotonic(), 0.0)
+
+    # 结果记录
+
+    def record_success(self, duration_ms: float = 0.0):
+        """记录成功调用"""
+        self.success_count += 1
+        slow = duration_ms >= self.config.slow_call_duration_ms
+        self._record(failed=False, slow=slow)
+
+        if self.state == self.HALF_OPEN:
+            self.half_open_in_flight = max(self.half_open_in_flight - 1, 0)
+            if slow:
+                self._trip()
+                return
+            self.half_open_successes += 1
+            if self.half_open_successes >= self.config.half_open_max_calls:
+                self._transition(self.CLOSED)
+        elif self.state == self.CLOSED:
+            self._evaluate()
+
+    def record_failure(self, duration_ms: float = 0.0):
+        """记录失败调用"""
+        self.failure_count += 1
+        self.last_failure_time = datetime.now()
+        self._record(
+            failed=True, slow=duration_ms >= self.config.slow_call_duration_ms
+        )
+
+        if self.state == self.HALF_OPEN:
+            self.half_open_in_flight = max(self.half_open_in_flight - 1, 0)
+            self._trip()
+        elif self.state == self.CLOSED:
+            self._evaluate()
+
+    def _record(self, failed: bool, slow: bool):
+        second = int(time.monotonic())
+        bucket = self._buckets[second % len(self._buckets)]
+        if bucket[0] != second:
+            bucket[0], bucket[1], bucket[2], bucket[3] = second, 0, 0, 0
+        bucket[1] += 1
+        if failed:
+            bucket[2] += 1
+        if slow:
+            bucket[3] += 1
+
+    def window_counts(self) -> Dict[str, int]:
+        """滚动窗口内的调用统计"""
+        oldest = int(time.monotonic()) - len(self._buckets)
+        total = failures = slow = 0
+        for second, count, failed, slow_count in self._buckets:
+            if second > oldest:
+                total += count
+                failures += failed
+                slow += slow_count
+        return {"total": total, "failures": failures, "slow": slow}
+
+    def _evaluate(self):
+        counts = self.window_counts()
+        total = counts["total"]
+        if total < self.config.failure_threshold:
+            return
+        if (
+            counts["failures"] / total >= self.config.failure_rate_threshold
+            or counts["slow"] / total >= self.config.slow_call_rate_threshold
+        ):
+            self._trip()
+
+    # 状态转换
+
+    def _trip(self, open_seconds: Optional[float] = None):
+        seconds = self.config.timeout_seconds if open_seconds is None else open_seconds
+        self.open_until = time.monotonic() + seconds
+        self._transition(self.OPEN)
+
+    def _transition(self, new_state: str, notify: bool = True):
+        old_state = self.state
+        if old_state == new_state and new_state != self.OPEN:
+            return
+        self.state = new_state
+        self.half_open_in_flight = 0
+        self.half_open_successes = 0
+        if new_state == self.CLOSED:
+            for bucket in self._buckets:
+                bucket[0] = bucket[1] = bucket[2] = bucket[3] = 0
+
+        logger.info(f"熔断器状态变更 - Service: {self.service}, {old_state} -> {new_state}")
+        if notify and self.on_transition:
+            try:
+                self.on_transition(self, old_state, new_state)
+            except Exception as e:
+                logger.error(f"熔断器状态变更回调失败: {e}")
+
+    def force_open(self, open_seconds: Optional[float] = None, notify: bool = True):
+        """强制打开（远端同步或人工操作）"""
+        seconds = self.config.timeout_seconds if open_seconds is None else open_seconds
+        self.open_until = time.monotonic() + seconds
+        self._transition(self.OPEN, notify=notify)
+
+    def reset(self, notify: bool = True):
+        """重置为关闭状态"""
+        self.open_until = 0.0
+        self._transition(self.CLOSED, notify=notify)
+
+    def get_status(self) -> Dict[str, Any]:
+        """获取状态快照"""
+        next_attempt = None
+        if self.state == self.OPEN:
+            next_attempt = (
+                datetime.now() + timedelta(seconds=self.retry_after())
+            ).isoformat()
+        return {
+            "service_name": self.service,
+            "state": self.state,
+            "failure_count": self.failure_count,
+            "success_count": self.success_count,
+            "rejected_count": self.rejected_count,
+            "last_failure_time": self.last_failure_time.isoformat()
+            if self.last_failure_time
+            else None,
+            "next_attempt_time": next_attempt,
+            "window": self.window_counts(),
+            "config": asdict(self.config),
+        }
+
+
+class CircuitBreakerRegistry:
+    """熔断器注册表 - 每个上游一个熔断器，并通过Redis同步跨副本状态"""
+
+    def __init__(self, redis_manager: Optional[Any], config: APIConfig):
+        self.redis_manager = redis_manager
+        self.default_config = CircuitBreakerConfig.from_api_config(config)
+        self.node_id = uuid.uuid4().hex
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+        # 统计信息
+        self.stats = {
+            "events_published": 0,
+            "events_received": 0,
+            "errors": 0,
+        }
+        self._listener = PubSubListener(
+            CIRCUIT_EVENTS_CHANNEL, self.apply_remote_event, "熔断器", self.stats
+        )
+
+    def get(self, service: str) -> CircuitBreaker:
+        """获取（必要时创建）指定服务的熔断器"""
+        breaker = self.breakers.get(service)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                service, self.default_config, on_transition=self._on_transition
+            )
+            self.breakers[service] = breaker
+        return breaker
+
+    def configure(self, service: str, config: CircuitBreakerConfig) -> CircuitBreaker:
+        """为指定服务设置熔断器配置（保留当前状态）"""
+        old = self.breakers.get(service)
+        breaker = CircuitBreaker(service, config, on_transition=self._on_transition)
+        if old is not None:
+            breaker.state = old.state
+            breaker.open_until = old.open_until
+            breaker.success_count = old.success_count
+            breaker.failure_count = old.failure_count
+            breaker.rejected_count = old.rejected_count
+            breaker.last_failure_time = old.last_failure_time
+        self.breakers[service] = breaker
+        return breaker
+
+    def list_status(self) -> List[Dict[str, Any]]:
+        return [b.get_status() for b in self.breakers.values()]
+
+    def get_stats(self) -> Dict[str, Any]:
+        states = [b.state for b in self.breakers.values()]
+        return {
+            **self.stats,
+            "total_services": len(states),
+            "open_circuits": states.count(CircuitBreaker.OPEN),
+            "half_open_circuits": states.count(CircuitBreaker.HALF_OPEN),
+            "healthy_services": states.count(CircuitBreaker.CLOSED),
+            "rejected_requests": sum(b.rejected_count for b in self.breakers.values()),
+        }
+
+    # 跨副本同步
+
+    def _on_transition(self, breaker: CircuitBreaker, old_state: str, new_state: str):
+        # 半开为本地探测状态，只广播打开/关闭
+        if new_state == CircuitBreaker.HALF_OPEN:
+            return
+        if getattr(self.redis_manager, "client", None) is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        event = {
+            "node_id": self.node_id,
+            "service": breaker.service,
+            "state": new_state,
+            "open_seconds": breaker.retry_after(),
+        }
+        loop.create_task(self._publish(event))
+
+    async def _publish(self, event: Dict[str, Any]):
+        try:
+            await self.redis_manager.publish_message(CIRCUIT_EVENTS_CHANNEL, event)
+            self.stats["events_published"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"发布熔断器事件失败: {e}")
+
+    def apply_remote_event(self, event: Dict[str, Any]):
+        """应用其他副本广播的状态变更"""
+        if event.get("node_id") == self.node_id:
+            return
+        service = event.get("service")
+        if not service:
+            return
+        self.stats["events_received"] += 1
+        breaker = self.get(service)
+        if event.get("state") == CircuitBreaker.OPEN:
+            breaker.force_open(float(event.get("open_seconds") or 0), notify=False)
+        elif event.get("state") == CircuitBreaker.CLOSED:
+            breaker.reset(notify=False)
+
+    async def start_sync(self):
+        """启动Redis订阅任务"""
+        if self._listener.running:
+            return
+        if not await self._listener.start(self.redis_manager):
+            logger.info("Redis不可用，熔断器以单节点模式运行")
+            return
+        logger.info(f"熔断器状态同步已启动 - Node: {self.node_id}")
+
+    async def stop_sync(self):
+        """停止Redis订阅任务"""
+        await self._listener.stop()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Redis发布订阅同步 - 跨副本事件监听的公共实现
+核心设计理念：订阅、读取循环、错误退避与关闭逻辑只写一份，各组件只提供事件处理函数
+
+- PubSubListener: 订阅单个频道，后台任务逐条解码JSON消息并交给处理函数（同步或异步均可）
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PubSubListener:
+    """Redis频道监听器"""
+
+    def __init__(
+        self,
+        channel: str,
+        handler: Callable[[Dict[str, Any]], Any],
+        name: str,
+        stats: Optional[Dict[str, int]] = None,
+    ):
+        self.channel = channel
+        self.handler = handler
+        self.name = name
+        # 处理失败计入所属组件的 errors 统计
+        self.stats = stats
+        self._task: Optional[asyncio.Task] = None
+        self._pubsub = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def start(self, redis_manager: Optional[Any]) -> bool:
+        """订阅频道并启动监听任务；Redis不可用时返回False"""
+        if self._task is not None:
+            return True
+        self._pubsub = await redis_manager.subscribe(self.channel) if redis_manager else None
+        if self._pubsub is None:
+            return False
+        self._task = asyncio.create_task(self._listen())
+        return True
+
+    async def _listen(self):
+        while True:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+                if message and message.get("type") == "message":
+                    result = self.handler(json.loads(message["data"]))
+                    if inspect.isawaitable(result):
+                        await result
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                if self.stats is not None:
+                    self.stats["errors"] = self.stats.get("errors", 0) + 1
+                logger.error(f"{self.name}同步消息处理失败: {e}")
+                await asyncio.sleep(1)
+
+    async def stop(self):
+        """停止监听任务并关闭订阅"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pubsub is not None:
+            try:
+                closer = getattr(self._pubsub, "aclose", None) or self._pubsub.close
+                await closer()
+            except Exception:
+                pass
+            self._pubsub = None
@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+限流引擎 - 分布式速率限制
+核心设计理念：服务端原子脚本、多算法支持、本地预检减少Redis往返
+
+支持算法：
+- sliding_window_log: 滑动窗口日志（精确，按请求记录时间戳）
+- sliding_window_counter: 滑动窗口计数（两个固定窗口加权，O(1)内存）
+- token_bucket: 令牌桶（允许突发，平滑补充）
+
+本地预检：当Redis返回的剩余额度明显充足时，一次性预扣一小批额度作为本地租约，
+后续请求在租约有效期内直接本地放行，不再访问Redis。预扣在服务端完成，
+因此不会超发，只可能在租约过期时少量浪费额度。
+"""
+
+import logging
+import math
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, Optional, Tuple
+
+from ..config.settings import APIConfig
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitAlgorithm(str, Enum):
+    """限流算法"""
+
+    SLIDING_WINDOW_LOG = "sliding_window_log"
+    SLIDING_WINDOW_COUNTER = "sliding_window_counter"
+    TOKEN_BUCKET = "token_bucket"
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """限流规则"""
+
+    limit: int
+    window_seconds: int = 60
+    algorithm: RateLimitAlgorithm = RateLimitAlgorithm.SLIDING_WINDOW_COUNTER
+    burst: Optional[int] = None  # 令牌桶容量，默认等于limit
+
+    @property
+    def capacity(self) -> int:
+        return self.burst or self.limit
+
+
+@dataclass
+class RateLimitResult:
+    """限流检查结果"""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0
+    algorithm: str = RateLimitAlgorithm.SLIDING_WINDOW_COUNTER.value
+    source: str = "redis"  # redis / local / lease
+
+    @property
+    def current_usage(self) -> int:
+        return max(self.limit - self.remaining, 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "allowed": self.allowed,
+            "limit_value": self.limit,
+            "current_usage": self.current_usage,
+            "remaining": self.remaining,
+            "retry_after": math.ceil(self.retry_after) if not self.allowed else None,
+            "algorithm": self.algorithm,
+            "source": self.source,
+        }
+
+
+# Redis Lua脚本 - 所有读改写在服务端原子完成
+# 返回值统一为 {allowed, remaining, retry_after_ms}
+
+SLIDING_WINDOW_LOG_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local member = ARGV[5]
+
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+local count = redis.call('ZCARD', key)
+if count + cost <= limit then
+    for i = 1, cost do
+        redis.call('ZADD', key, now, member .. ':' .. i)
+    end
+    redis.call('PEXPIRE', key, window)
+    return {1, limit - count - cost, 0}
+end
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+local retry = window
+if oldest[2] then
+    retry = tonumber(oldest[2]) + window - now
+end
+return {0, limit - count, retry}
+"""
+
+SLIDING_WINDOW_COUNTER_SCRIPT = """
+local current_key = KEYS[1]
+local previous_key = KEYS[2]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+
+local elapsed = now % window
+local previous = tonumber(redis.call('GET', previous_key) or '0')
+local current = tonumber(redis.call('GET', current_key) or '0')
+local weighted = previous * (window - elapsed) / window + current
+
+if weighted + cost > limit then
+    local retry = window - elapsed
+    if current + cost <= limit and previous > 0 then
+        retry = (window - elapsed) - (limit - current - cost) * window / previous
+    end
+    return {0, math.max(math.floor(limit - weighted), 0), math.ceil(retry)}
+end
+redis.call('INCRBY', current_key, cost)
+redis.call('PEXPIRE', current_key, window * 2)
+return {1, math.floor(limit - weighted - cost), 0}
+"""
+
+TOKEN_BUCKET_SCRIPT = """
+local key = KEYS[1]
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+
+local state = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(now - ts, 0) * rate)
+
+local allowed = 0
+local retry = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry = math.ceil((cost - tokens) / rate)
+end
+redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', key, math.ceil(capacity / rate) + 1000)
+return {allowed, math.floor(tokens), retry}
+"""
+
+_SCRIPTS = {
+    RateLimitAlgorithm.SLIDING_WINDOW_LOG: SLIDING_WINDOW_LOG_SCRIPT,
+    RateLimitAlgorithm.SLIDING_WINDOW_COUNTER: SLIDING_WINDOW_COUNTER_SCRIPT,
+    RateLimitAlgorithm.TOKEN_BUCKET: TOKEN_BUCKET_SCRIPT,
+}
+
+
+@dataclass
+class _Lease:
+    """本地预检租约：已在服务端预扣的额度"""
+
+    tokens: int = 0
+    expires_at: float = 0.0
+    remaining_hint: int = 0
+    rule: Optional[RateLimitRule] = None
+
+
+@dataclass
+class _LocalBucket:
+    """Redis不可用时的进程内状态"""
+
+    log: deque = field(default_factory=deque)
+    current_window: int = 0
+    current_count: int = 0
+    previous_count: int = 0
+    tokens: float = -1.0
+    ts: float = 0.0
+
+
+class RateLimiter:
+    """限流器 - 按租户/用户/API维度限流"""
+
+    def __init__(self, redis_manager: Optional[Any], config: APIConfig):
+        self.redis_manager = redis_manager
+        self.config = config
+        self.default_rule = RateLimitRule(
+            limit=config.rate_limit_per_minute,
+            window_seconds=60,
+            algorithm=RateLimitAlgorithm(config.rate_limit_algorithm),
+            burst=config.rate_limit_burst or None,
+        )
+
+        # (tenant_id, api_name) -> 规则；tenant_id为None表示全局规则
+        self.rules: Dict[Tuple[Optional[str], str], RateLimitRule] = {}
+
+        self._scripts: Dict[RateLimitAlgorithm, Any] = {}
+        self._leases: Dict[str, _Lease] = {}
+        self._local_buckets: Dict[str, _LocalBucket] = {}
+
+        # 统计信息
+        self.stats = {
+            "checks": 0,
+            "allowed": 0,
+            "rejected": 0,
+            "lease_hits": 0,
+            "redis_calls": 0,
+            "local_fallbacks": 0,
+            "errors": 0,
+        }
+
+    # 规则管理
+
+    def set_rule(
+        self, api_name: str, rule: RateLimitRule, tenant_id: Optional[str] = None
+    ):
+        """设置API限流规则"""
+        self.rules[(tenant_id, api_name)] = rule
+        # 规则变更后丢弃相关租约，避免按旧额度放行
+        suffix = f":{api_name}"
+        for key in [k for k in self._leases if k.endswith(suffix)]:
+            self._leases.pop(key, None)
+        logger.info(
+            f"限流规则已更新 - API: {api_name}, Tenant: {tenant_id}, "
+            f"Limit: {rule.limit}/{rule.window_seconds}s, Algorithm: {rule.algorithm.value}"
+        )
+
+    def remove_rule(self, api_name: str, tenant_id: Optional[str] = None) -> bool:
+        """删除API限流规则"""
+        return self.rules.pop((tenant_id, api_name), None) is not None
+
+    def get_rule(self, api_name: str, tenant_id: Optional[str] = None) -> RateLimitRule:
+        """获取生效规则：租户规则 > 全局规则 > 默认规则"""
+        rule = self.rules.get((tenant_id, api_name))
+        if rule is None:
+            rule = self.rules.get((None, api_name), self.default_rule)
+        return rule
+
+    @staticmethod
+    def build_key(tenant_id: str, user_id: Any, api_name: str) -> str:
+        """构建限流键 - 租户/用户/API"""
+        return f"ratelimit:{tenant_id}:{user_id or 'anonymous'}:{api_name}"
+
+    # 限流检查
+
+    async def check(
+        self,
+        tenant_id: str,
+        user_id: Any,
+        api_name: str,
+        rule: Optional[RateLimitRule] = None,
+    ) -> RateLimitResult:
+        """检查并消耗一次调用额度"""
+        rule = rule or self.get_rule(api_name, tenant_id)
+        key = self.build_key(tenant_id, user_id, api_name)
+        self.stats["checks"] += 1
+
+        # 1) 本地租约命中：零网络开销
+        now = time.monotonic()
+        lease = self._leases.get(key)
+        if lease is not None and lease.rule is rule:
+            if lease.tokens > 0 and lease.expires_at > now:
+                lease.tokens -= 1
+                self.stats["lease_hits"] += 1
+                self.stats["allowed"] += 1
+                return RateLimitResult(
+                    allowed=True,
+                    limit=rule.limit,
+                    remaining=lease.remaining_hint + lease.tokens,
+                    algorithm=rule.algorithm.value,
+                    source="lease",
+                )
+        else:
+            lease = None
+
+        # 2) 剩余额度充足时，顺带预扣一批租约额度
+        lease_size = 0
+        if lease is not None and lease.remaining_hint * 2 >= rule.capacity:
+            lease_size = min(
+                self.config.rate_limit_lease_max,
+                int(lease.remaining_hint * self.config.rate_limit_lease_fraction),
+            )
+
+        result = await self._consume(key, rule, 1 + lease_size)
+        if not result.allowed and lease_size:
+            result = await self._consume(key, rule, 1)
+            lease_size = 0
+
+        if result.allowed:
+            self.stats["allowed"] += 1
+        else:
+            self.stats["rejected"] += 1
+
+        if len(self._leases) >= self.config.rate_limit_max_leases:
+            self._prune_leases(now)
+        self._leases[key] = _Lease(
+            tokens=lease_size,
+            expires_at=now + self.config.rate_limit_lease_seconds,
+            remaining_hint=result.remaining,
+            rule=rule,
+        )
+        if lease_size:
+            result.remaining += lease_size
+        return result
+
+    def _prune_leases(self, now: float):
+        """清理过期租约，限制本地缓存规模"""
+        expired = [k for k, v in self._leases.items() if v.expires_at <= now]
+        for k in expired:
+            self._leases.pop(k, None)
+        if len(self._leases) >= self.config.rate_limit_max_leases:
+            self._leases.clear()
+
+    async def peek(
+        self, tenant_id: str, user_id: Any, api_name: str
+    ) -> Dict[str, Any]:
+        """查看当前剩余额度（不消耗）"""
+        rule = self.get_rule(api_name, tenant_id)
+        key = self.build_key(tenant_id, user_id, api_name)
+        lease = self._leases.get(key)
+        remaining = rule.limit
+        if lease is not None and lease.rule is rule:
+            remaining = lease.remaining_hint + lease.tokens
+        return {
+            "api_name": api_name,
+            "limit_value": rule.limit,
+            "window_seconds": rule.window_seconds,
+            "algorithm": rule.algorithm.value,
+            "remaining": remaining,
+            "current_usage": max(rule.limit - remaining, 0),
+        }
+
+    async def _consume(
+        self, key: str, rule: RateLimitRule, cost: int
+    ) -> RateLimitResult:
+        """消耗额度 - Redis原子脚本，不可用时降级为进程内实现"""
+        client = getattr(self.redis_manager, "client", None)
+        if client is None:
+            self.stats["local_fallbacks"] += 1
+            return self._consume_local(key, rule, cost)
+
+        try:
+            allowed, remaining, retry_ms = await self._run_script(key, rule, cost)
+            self.stats["redis_calls"] += 1
+            return RateLimitResult(
+                allowed=bool(allowed),
+                limit=rule.limit,
+                remaining=max(int(remaining), 0),
+                retry_after=max(int(retry_ms), 0) / 1000.0,
+                algorithm=rule.algorithm.value,
+                source="redis",
+            )
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"Redis限流脚本执行失败，降级为本地限流: {e}")
+            return self._consume_local(key, rule, cost)
+
+    async def _run_script(self, key: str, rule: RateLimitRule, cost: int):
+        script = self._scripts.get(rule.algorithm)
+        if script is None:
+            script = self.redis_manager.register_script(_SCRIPTS[rule.algorithm])
+            self._scripts[rule.algorithm] = script
+
+        redis_key = self.redis_manager._build_key("quota", key)
+        now_ms = int(time.time() * 1000)
+        window_ms = rule.window_seconds * 1000
+
+        if rule.algorithm == RateLimitAlgorithm.SLIDING_WINDOW_LOG:
+            keys = [redis_key]
+            args = [now_ms, window_ms, rule.limit, cost, uuid.uuid4().hex]
+        elif rule.algorithm == RateLimitAlgorithm.SLIDING_WINDOW_COUNTER:
+            index = now_ms // window_ms
+            keys = [f"{redis_key}:{index}", f"{redis_key}:{index - 1}"]
+            args = [now_ms, window_ms, rule.limit, cost]
+        else:
+            rate = rule.limit / window_ms  # 每毫秒补充的令牌数
+            keys = [redis_key]
+            args = [rule.capacity, rate, now_ms, cost]
+
+        return await self.redis_manager.run_script(script, keys, args)
+
+    def _consume_local(
+        self, key: str, rule: RateLimitRule, cost: int
+    ) -> RateLimitResult:
+        """进程内限流实现 - 与Lua脚本语义一致"""
+        bucket = self._local_buckets.setdefault(key, _LocalBucket())
+        now = time.time()
+        window = float(rule.window_seconds)
+        allowed = False
+        retry = 0.0
+
+        if rule.algorithm == RateLimitAlgorithm.SLIDING_WINDOW_LOG:
+            log = bucket.log
+            while log and log[0] <= now - window:
+                log.popleft()
+            if len(log) + cost <= rule.limit:
+                log.extend([now] * cost)
+                allowed = True
+            else:
+                retry = log[0] + window - now if log else window
+            remaining = rule.limit - len(log)
+
+        elif rule.algorithm == RateLimitAlgorithm.SLIDING_WINDOW_COUNTER:
+            index = int(now // window)
+            if index != bucket.current_window:
+                bucket.previous_count = (
+                    bucket.current_count if index == bucket.current_window + 1 else 0
+                )
+                bucket.current_count = 0
+                bucket.current_window = index
+            elapsed = now % window
+            weighted = (
+                bucket.previous_count * (window - elapsed) / window
+                + bucket.current_count
+            )
+            if weighted + cost <= rule.limit:
+                bucket.current_count += cost
+                weighted += cost
+                allowed = True
+            else:
+                retry = window - elapsed
+            remaining = int(rule.limit - weighted)
+
+        else:
+            rate = rule.limit / window
+            if bucket.tokens < 0:
+                bucket.tokens = float(rule.capacity)
+                bucket.ts = now
+            bucket.tokens = min(
+                rule.capacity, bucket.tokens + max(now - bucket.ts, 0.0) * rate
+            )
+            bucket.ts = now
+            if bucket.tokens >= cost:
+                bucket.tokens -= cost
+                allowed = True
+            else:
+                retry = (cost - bucket.tokens) / rate
+            remaining = int(bucket.tokens)
+
+        return RateLimitResult(
+            allowed=allowed,
+            limit=rule.limit,
+            remaining=max(remaining, 0),
+            retry_after=retry,
+            algorithm=rule.algorithm.value,
+            source="local",
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        checks = self.stats["checks"]
+        return {
+            **self.stats,
+            "lease_hit_rate": self.stats["lease_hits"] / checks if checks else 0.0,
+            "active_leases": len(self._leases),
+            "rules": len(self.rules),
+        }
@@ -276,6 +276,24 @@ class RedisManager:
             logger.error(f"获取配额计数失败: {e}")
             return 0
 
+    def register_script(self, script: str):
+        """注册Lua脚本 - 返回可重复调用的脚本对象（EVALSHA，缺失时自动回退EVAL）"""
+        if not self.client:
+            raise RuntimeError("Redis客户端未初始化")
+        return self.client.register_script(script)
+
+    async def run_script(self, script, keys: List[str], args: List[Any]) -> Any:
+        """执行已注册的Lua脚本"""
+        try:
+            result = await script(keys=keys, args=args)
+            self.stats["operations"] += 1
+            return result
+
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"执行Lua脚本失败: {e}")
+            raise
+
     async def set_circuit_breaker(
         self, service: str, state: str, ttl: int = 60, tenant_id: Optional[str] = None
     ) -> bool:
@@ -350,6 +368,26 @@ class RedisManager:
             logger.error(f"发布消息失败: {e}")
             return 0
 
+    async def subscribe(self, *channels: str):
+        """订阅频道 - 返回PubSub对象，Redis不可用时返回None"""
+        try:
+            if not self.client:
+                logger.debug(f"Redis不可用，跳过频道订阅 - Channels: {channels}")
+                return None
+
+            pubsub = self.client.pubsub()
+            await pubsub.subscribe(*channels)
+
+            self.stats["operations"] += 1
+            logger.info(f"已订阅Redis频道: {', '.join(channels)}")
+
+            return pubsub
+
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"订阅频道失败: {e}")
+            return None
+
     async def get_keys_by_pattern(
         self, pattern: str, tenant_id: Optional[str] = None
     ) -> List[str]:
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+响应缓存 - 幂等GET请求的两级缓存
+核心设计理念：进程内LRU + Redis共享缓存、并发未命中合并、过期数据后台刷新
+
+- L1: 进程内LRU，命中零网络开销
+- L2: Redis（RedisManager.set_cache/get_cache），跨副本共享
+- 合并：同一键同时只有一个上游请求在途，其余请求等待同一结果
+- stale-while-revalidate：新鲜期过后、陈旧期内直接返回旧值，并在后台刷新
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+from ..config.settings import APIConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CacheRule:
+    """缓存规则"""
+
+    ttl_seconds: float
+    stale_seconds: float = 0.0
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fresh_until: float
+    stale_until: float
+
+
+class ResponseCache:
+    """API响应缓存 - 按API配置TTL规则"""
+
+    def __init__(self, redis_manager: Optional[Any], config: APIConfig):
+        self.redis_manager = redis_manager
+        self.max_entries = config.response_cache_max_entries
+        self.default_rule = CacheRule(
+            ttl_seconds=config.response_cache_ttl_seconds,
+            stale_seconds=config.response_cache_stale_seconds,
+        )
+        self.rules: Dict[str, CacheRule] = {}
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # 统计信息
+        self.stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "l2_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "upstream_fetches": 0,
+            "revalidations": 0,
+            "errors": 0,
+        }
+
+    # 规则管理
+
+    def set_rule(self, api_name: str, rule: CacheRule):
+        """设置API缓存规则（ttl_seconds<=0 表示不缓存）"""
+        self.rules[api_name] = rule
+
+    def get_rule(self, api_name: str) -> CacheRule:
+        return self.rules.get(api_name, self.default_rule)
+
+    def rule_for_route(self, api_name: str, config_data: Mapping[str, Any]) -> CacheRule:
+        """路由配置中的缓存规则（cache_ttl_seconds / cache_stale_seconds），未配置的项回退到 get_rule"""
+        base = self.get_rule(api_name)
+        ttl = config_data.get("cache_ttl_seconds")
+        stale = config_data.get("cache_stale_seconds")
+        if ttl is None and stale is None:
+            return base
+        try:
+            return CacheRule(
+                ttl_seconds=base.ttl_seconds if ttl is None else float(ttl),
+                stale_seconds=base.stale_seconds if stale is None else float(stale),
+            )
+        except (TypeError, ValueError):
+            logger.warning(f"API缓存规则配置无效，使用默认规则 - Name: {api_name}")
+            return base
+
+    @staticmethod
+    def build_key(
+        tenant_id: str, api_name: str, path: str, params: Optional[Dict[str, Any]]
+    ) -> str:
+        """构建缓存键 - 参数排序后哈希，保证同义请求命中同一键"""
+        raw = json.dumps(params or {}, sort_keys=True, default=str, separators=(",", ":"))
+        digest = hashlib.sha1(f"{path}?{raw}".encode("utf-8")).hexdigest()
+        return f"resp:{tenant_id}:{api_name}:{digest}"
+
+    # 读取
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        api_name: str,
+        fetcher: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = lambda value: True,
+        rule: Optional[CacheRule] = None,
+    ) -> Any:
+        """读取缓存，未命中时调用fetcher；并发未命中共享同一次上游调用"""
+        if rule is None:
+            rule = self.get_rule(api_name)
+        if rule.ttl_seconds <= 0:
+            return await fetcher()
+
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.fresh_until > now:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry.value
+            if entry.stale_until > now:
+                self.stats["stale_hits"] += 1
+                if key not in self._inflight:
+                    self.stats["revalidations"] += 1
+                    self._start_load(key, rule, fetcher, cacheable, check_l2=False)
+                return entry.value
+            self._entries.pop(key, None)
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(future)
+
+        self.stats["misses"] += 1
+        future = self._start_load(key, rule, fetcher, cacheable, check_l2=True)
+        return await asyncio.shield(future)
+
+    def _start_load(self, key, rule, fetcher, cacheable, check_l2: bool) -> asyncio.Future:
+        task = asyncio.ensure_future(self._load(key, rule, fetcher, cacheable, check_l2))
+        self._inflight[key] = task
+        task.add_done_callback(self._on_load_done)
+        return task
+
+    def _on_load_done(self, task: asyncio.Future):
+        # 取出异常，避免后台刷新失败时出现未检索异常告警
+        if not task.cancelled() and task.exception() is not None:
+            self.stats["errors"] += 1
+            logger.warning(f"响应缓存加载失败: {task.exception()}")
+
+    async def _load(self, key, rule, fetcher, cacheable, check_l2: bool) -> Any:
+        try:
+            if check_l2:
+                cached = await self._get_l2(key)
+                if cached is not None:
+                    self.stats["l2_hits"] += 1
+                    self._put_l1(key, cached)
+                    return cached.value
+
+            value = await fetcher()
+            self.stats["upstream_fetches"] += 1
+
+            if cacheable(value):
+                now = time.time()
+                entry = _Entry(
+                    value=value,
+                    fresh_until=now + rule.ttl_seconds,
+                    stale_until=now + rule.ttl_seconds + rule.stale_seconds,
+                )
+                self._put_l1(key, entry)
+                await self._set_l2(key, entry)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    # 两级存储
+
+    def _put_l1(self, key: str, entry: _Entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _get_l2(self, key: str) -> Optional[_Entry]:
+        if getattr(self.redis_manager, "client", None) is None:
+            return None
+        data = await self.redis_manager.get_cache(key)
+        if not isinstance(data, dict) or data.get("f", 0) <= time.time():
+            return None
+        return _Entry(value=data.get("v"), fresh_until=data["f"], stale_until=data.get("s", data["f"]))
+
+    async def _set_l2(self, key: str, entry: _Entry):
+        if getattr(self.redis_manager, "client", None) is None:
+            return
+        ttl = max(math.ceil(entry.stale_until - time.time()), 1)
+        await self.redis_manager.set_cache(
+            key, {"v": entry.value, "f": entry.fresh_until, "s": entry.stale_until}, ttl=ttl
+        )
+
+    def invalidate(self, api_name: Optional[str] = None):
+        """清除L1缓存（可按API过滤）"""
+        if api_name is None:
+            self._entries.clear()
+            return
+        marker = f":{api_name}:"
+        for key in [k for k in self._entries if marker in k]:
+            self._entries.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        lookups = self.stats["hits"] + self.stats["stale_hits"] + self.stats["misses"] + self.stats["coalesced"]
+        served = lookups - self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "in_flight": len(self._inflight),
+            "hit_rate": served / lookups if lookups else 0.0,
+        }
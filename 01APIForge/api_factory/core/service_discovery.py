@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+服务发现引擎 - 节点状态跟踪与负载均衡选择
+核心设计理念：心跳与调用结果更新节点状态，选择只读取不可变快照
+
+- 每个节点维护 EWMA 延迟、在途请求数、健康状态
+- 每个服务类型维护一个不可变快照（可用节点元组、平滑加权序列、一致性哈希环），
+  成员/健康变化或刷新周期到期时整体重建并替换引用，选择路径不加锁
+- 加权策略按 EWMA 延迟折算有效权重，慢节点在一个刷新周期内被降权
+- 最少连接策略使用惰性删除的最小堆：状态变化时压入新键，选择时丢弃过期堆顶
+"""
+
+import bisect
+import hashlib
+import heapq
+import itertools
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class NodeStatus(str, Enum):
+    ACTIVE = "active"  # 活跃状态
+    INACTIVE = "inactive"  # 非活跃状态
+    MAINTENANCE = "maintenance"  # 维护状态
+    FAILED = "failed"  # 失败状态
+
+
+class LoadBalanceStrategy(str, Enum):
+    ROUND_ROBIN = "round_robin"  # 轮询
+    WEIGHTED_ROUND_ROBIN = "weighted_round_robin"  # 加权轮询（按延迟折算有效权重）
+    LEAST_CONNECTIONS = "least_connections"  # 最少连接
+    RANDOM = "random"  # 随机
+    IP_HASH = "ip_hash"  # IP哈希（一致性哈希环）
+    POWER_OF_TWO = "power_of_two_choices"  # 随机两选一（在途数 × 延迟）
+    CONSISTENT_HASH = "consistent_hash"  # 一致性哈希（任意键）
+
+
+@dataclass
+class NodeState:
+    """节点运行时状态"""
+
+    node_id: int
+    node_name: str
+    host: str
+    port: int
+    service_type: str
+    weight: int = 1
+    status: NodeStatus = NodeStatus.ACTIVE
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    ewma_latency_ms: float = 0.0
+    in_flight: int = 0
+    # 节点心跳自报的连接数，仅用于展示；in_flight 只由 acquire/release 维护
+    reported_connections: Optional[int] = None
+    total_requests: int = 0
+    failed_requests: int = 0
+    consecutive_failures: int = 0
+    last_heartbeat: float = field(default_factory=time.time)
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def success_rate(self) -> float:
+        if not self.total_requests:
+            return 1.0
+        return (self.total_requests - self.failed_requests) / self.total_requests
+
+    def load_score(self) -> float:
+        """负载评分（越小越好）：(在途+1) × 延迟 / 权重"""
+        return (self.in_flight + 1) * max(self.ewma_latency_ms, 1.0) / self.weight
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    """服务快照 - 只读，选择路径直接使用"""
+
+    nodes: Tuple[NodeState, ...]
+    node_ids: FrozenSet[int]
+    weighted_sequence: Tuple[NodeState, ...]
+    ring_hashes: Tuple[int, ...]
+    ring_nodes: Tuple[NodeState, ...]
+    built_at: float
+
+
+# 最少连接堆条目：(在途/权重, EWMA延迟, 节点ID, 序号, 节点)；序号保证同一节点的重复键可比较
+_LoadEntry = Tuple[float, float, int, int, NodeState]
+_load_sequence = itertools.count()
+
+
+def _load_entry(node: NodeState) -> _LoadEntry:
+    return (node.in_flight / node.weight, node.ewma_latency_ms, node.node_id, next(_load_sequence), node)
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+class ServiceDiscovery:
+    """服务发现与负载均衡引擎"""
+
+    # 加权序列中单个节点的最大份额（限制快照重建开销）
+    MAX_WEIGHT = 20
+
+    def __init__(
+        self,
+        ewma_alpha: float = 0.3,
+        heartbeat_timeout_seconds: float = 90.0,
+        snapshot_refresh_seconds: float = 1.0,
+        failure_threshold: int = 3,
+        virtual_nodes: int = 100,
+    ):
+        self.ewma_alpha = ewma_alpha
+        self.heartbeat_timeout_seconds = heartbeat_timeout_seconds
+        self.snapshot_refresh_seconds = snapshot_refresh_seconds
+        self.virtual_nodes = virtual_nodes
+
+        self.nodes: Dict[int, NodeState] = {}
+        self.strategies: Dict[str, LoadBalanceStrategy] = {}
+        self.failure_thresholds: Dict[str, int] = {}
+        self.default_failure_threshold = failure_threshold
+        self._snapshots: Dict[str, _Snapshot] = {}
+        self._load_heaps: Dict[str, List[_LoadEntry]] = {}
+        self._counters: Dict[str, itertools.count] = {}
+        self._node_ids = itertools.count(1001)
+
+        # 统计信息
+        self.stats = {"selections": 0, "no_available_node": 0, "snapshot_rebuilds": 0}
+
+    # 成员管理
+
+    def register(
+        self,
+        node_name: str,
+        host: str,
+        port: int,
+        service_type: str,
+        weight: int = 1,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> NodeState:
+        node = NodeState(
+            node_id=next(self._node_ids),
+            node_name=node_name,
+            host=host,
+            port=port,
+            service_type=str(service_type),
+            weight=weight,
+            metadata=dict(metadata or {}),
+        )
+        self.nodes[node.node_id] = node
+        self._invalidate(node.service_type)
+        return node
+
+    def unregister(self, node_id: int) -> bool:
+        node = self.nodes.pop(node_id, None)
+        if node is None:
+            return False
+        self._invalidate(node.service_type)
+        return True
+
+    def update(
+        self,
+        node_id: int,
+        status: Optional[NodeStatus] = None,
+        weight: Optional[int] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Optional[NodeState]:
+        node = self.nodes.get(node_id)
+        if node is None:
+            return None
+        if status is not None:
+            node.status = NodeStatus(status)
+            node.consecutive_failures = 0
+        if weight is not None:
+            node.weight = weight
+        if metadata is not None:
+            node.metadata = dict(metadata)
+        node.updated_at = time.time()
+        self._invalidate(node.service_type)
+        return node
+
+    def configure(
+        self,
+        service_type: str,
+        strategy: LoadBalanceStrategy,
+        failure_threshold: Optional[int] = None,
+    ):
+        """设置服务类型的负载均衡策略"""
+        self.strategies[str(service_type)] = LoadBalanceStrategy(strategy)
+        if failure_threshold is not None:
+            self.failure_thresholds[str(service_type)] = failure_threshold
+
+    def get_strategy(self, service_type: str) -> LoadBalanceStrategy:
+        return self.strategies.get(str(service_type), LoadBalanceStrategy.POWER_OF_TWO)
+
+    # 状态输入
+
+    def _observe_latency(self, node: NodeState, latency_ms: float):
+        if node.ewma_latency_ms <= 0:
+            node.ewma_latency_ms = latency_ms
+        else:
+            node.ewma_latency_ms += self.ewma_alpha * (latency_ms - node.ewma_latency_ms)
+
+    def heartbeat(self, node_id: int, metrics: Optional[Dict[str, Any]] = None) -> Optional[NodeState]:
+        """心跳上报：刷新存活时间，并合并节点自报的延迟/连接数/健康状态"""
+        node = self.nodes.get(node_id)
+        if node is None:
+            return None
+        metrics = metrics or {}
+        node.last_heartbeat = time.time()
+
+        latency = metrics.get("latency_ms", metrics.get("avg_response_time"))
+        if latency is not None:
+            self._observe_latency(node, float(latency))
+        connections = metrics.get("in_flight", metrics.get("current_connections"))
+        if connections is not None:
+            node.reported_connections = int(connections)
+        self._push_load(node)
+
+        healthy = metrics.get("healthy")
+        if healthy is False and node.status == NodeStatus.ACTIVE:
+            node.status = NodeStatus.FAILED
+            self._invalidate(node.service_type)
+        elif healthy is not False and node.status == NodeStatus.FAILED:
+            # 失败节点恢复心跳且未自报不健康，重新加入
+            node.status = NodeStatus.ACTIVE
+            node.consecutive_failures = 0
+            self._invalidate(node.service_type)
+        return node
+
+    def acquire(self, node: NodeState):
+        """请求开始：在途数+1"""
+        node.in_flight += 1
+        self._push_load(node)
+
+    def release(self, node: NodeState, latency_ms: float, success: bool = True):
+        """请求结束：在途数-1，更新延迟与失败计数"""
+        node.in_flight = max(node.in_flight - 1, 0)
+        node.total_requests += 1
+        self._observe_latency(node, latency_ms)
+        self._push_load(node)
+        if success:
+            node.consecutive_failures = 0
+            return
+        node.failed_requests += 1
+        node.consecutive_failures += 1
+        threshold = self.failure_thresholds.get(node.service_type, self.default_failure_threshold)
+        if node.consecutive_failures >= threshold and node.status == NodeStatus.ACTIVE:
+            node.status = NodeStatus.FAILED
+            self._invalidate(node.service_type)
+            logger.warning(f"节点连续失败，已摘除 - NodeID: {node.node_id}, Failures: {node.consecutive_failures}")
+
+    # 快照
+
+    def _invalidate(self, service_type: str):
+        self._snapshots.pop(service_type, None)
+        self._load_heaps.pop(service_type, None)
+
+    def _push_load(self, node: NodeState):
+        """节点负载变化时压入新键（旧键留在堆中，选择时惰性丢弃）"""
+        heap = self._load_heaps.get(node.service_type)
+        snapshot = self._snapshots.get(node.service_type)
+        if heap is not None and snapshot is not None and node.node_id in snapshot.node_ids:
+            heapq.heappush(heap, _load_entry(node))
+
+    def _least_loaded(self, service_type: str, snapshot: _Snapshot) -> NodeState:
+        heap = self._load_heaps.get(service_type)
+        # 过期条目累积过多时按快照重建，堆大小保持在节点数的常数倍
+        if heap is not None and len(heap) <= 4 * len(snapshot.nodes) + 16:
+            while heap:
+                entry = heap[0]
+                node = entry[-1]
+                if entry[:2] == (node.in_flight / node.weight, node.ewma_latency_ms):
+                    return node
+                heapq.heappop(heap)
+        heap = [_load_entry(node) for node in snapshot.nodes]
+        heapq.heapify(heap)
+        self._load_heaps[service_type] = heap
+        return heap[0][-1]
+
+    def _effective_weights(self, nodes: List[NodeState]) -> List[int]:
+        """有效权重：配置权重 × (最快节点延迟 / 本节点延迟)，按最大值归一到 1..MAX_WEIGHT"""
+        latencies = [n.ewma_latency_ms for n in nodes if n.ewma_latency_ms > 0]
+        fastest = min(latencies) if latencies else 0.0
+        raw = []
+        for node in nodes:
+            factor = fastest / node.ewma_latency_ms if fastest and node.ewma_latency_ms > 0 else 1.0
+            raw.append(node.weight * factor)
+        top = max(raw, default=0.0)
+        return [max(int(round(self.MAX_WEIGHT * w / top)), 1) for w in raw] if top else []
+
+    @staticmethod
+    def _smooth_weighted_sequence(nodes: List[NodeState], weights: List[int]) -> Tuple[NodeState, ...]:
+        """平滑加权轮询序列（避免同一节点连续被选中）"""
+        if not nodes:
+            return ()
+        current = [0] * len(nodes)
+        total = sum(weights)
+        sequence = []
+        for _ in range(total):
+            for index, weight in enumerate(weights):
+                current[index] += weight
+            best = max(range(len(nodes)), key=current.__getitem__)
+            current[best] -= total
+            sequence.append(nodes[best])
+        return tuple(sequence)
+
+    def refresh(self, service_type: str) -> _Snapshot:
+        """立即按最新延迟与健康状态重建快照（不等待刷新周期）"""
+        return self._build_snapshot(str(service_type))
+
+    def _build_snapshot(self, service_type: str) -> _Snapshot:
+        now = time.time()
+        nodes = [
+            node
+            for node in self.nodes.values()
+            if node.service_type == service_type
+            and node.status == NodeStatus.ACTIVE
+            and now - node.last_heartbeat <= self.heartbeat_timeout_seconds
+        ]
+        nodes.sort(key=lambda n: n.node_id)
+
+        ring = sorted(
+            (_hash(f"{node.node_id}#{replica}"), node)
+            for node in nodes
+            for replica in range(self.virtual_nodes)
+        )
+        snapshot = _Snapshot(
+            nodes=tuple(nodes),
+            node_ids=frozenset(node.node_id for node in nodes),
+            weighted_sequence=self._smooth_weighted_sequence(nodes, self._effective_weights(nodes)),
+            ring_hashes=tuple(h for h, _ in ring),
+            ring_nodes=tuple(n for _, n in ring),
+            built_at=now,
+        )
+        self._snapshots[service_type] = snapshot
+        self._load_heaps.pop(service_type, None)
+        self.stats["snapshot_rebuilds"] += 1
+        return snapshot
+
+    def snapshot(self, service_type: str) -> _Snapshot:
+        service_type = str(service_type)
+        snapshot = self._snapshots.get(service_type)
+        if snapshot is None or time.time() - snapshot.built_at > self.snapshot_refresh_seconds:
+            snapshot = self._build_snapshot(service_type)
+        return snapshot
+
+    # 选择
+
+    def select(
+        self,
+        service_type: str,
+        key: Optional[str] = None,
+        strategy: Optional[LoadBalanceStrategy] = None,
+    ) -> Optional[NodeState]:
+        """按策略选择一个可用节点；无可用节点时返回None"""
+        service_type = str(service_type)
+        snapshot = self.snapshot(service_type)
+        nodes = snapshot.nodes
+        if not nodes:
+            self.stats["no_available_node"] += 1
+            return None
+        self.stats["selections"] += 1
+
+        strategy = LoadBalanceStrategy(strategy or self.get_strategy(service_type))
+        counter = self._counters.get(service_type)
+        if counter is None:
+            counter = self._counters[service_type] = itertools.count()
+
+        if strategy == LoadBalanceStrategy.ROUND_ROBIN:
+            return nodes[next(counter) % len(nodes)]
+        if strategy == LoadBalanceStrategy.WEIGHTED_ROUND_ROBIN:
+            sequence = snapshot.weighted_sequence
+            return sequence[next(counter) % len(sequence)]
+        if strategy == LoadBalanceStrategy.LEAST_CONNECTIONS:
+            return self._least_loaded(service_type, snapshot)
+        if strategy == LoadBalanceStrategy.RANDOM:
+            return random.choice(nodes)
+        if strategy in (LoadBalanceStrategy.IP_HASH, LoadBalanceStrategy.CONSISTENT_HASH) and key:
+            index = bisect.bisect(snapshot.ring_hashes, _hash(key)) % len(snapshot.ring_hashes)
+            return snapshot.ring_nodes[index]
+
+        # 随机两选一（也是哈希策略缺少键时的回退）
+        if len(nodes) == 1:
+            return nodes[0]
+        first, second = random.sample(nodes, 2)
+        return first if first.load_score() <= second.load_score() else second
+
+    def list_nodes(
+        self, service_type: Optional[str] = None, status: Optional[NodeStatus] = None
+    ) -> List[NodeState]:
+        nodes = sorted(self.nodes.values(), key=lambda n: n.node_id)
+        if service_type:
+            nodes = [n for n in nodes if n.service_type == str(service_type)]
+        if status:
+            nodes = [n for n in nodes if n.status == status]
+        return nodes
+
+    def get_stats(self) -> Dict[str, Any]:
+        nodes = list(self.nodes.values())
+        total_requests = sum(n.total_requests for n in nodes)
+        return {
+            **self.stats,
+            "total_nodes": len(nodes),
+            "status_counts": {
+                status.value: sum(1 for n in nodes if n.status == status) for status in NodeStatus
+            },
+            "service_distribution": {
+                service: sum(1 for n in nodes if n.service_type == service)
+                for service in sorted({n.service_type for n in nodes})
+            },
+            "total_requests": total_requests,
+            "load_distribution": {
+                f"node_{n.node_id}": n.total_requests / total_requests if total_requests else 0.0
+                for n in nodes
+            },
+        }
@@ -3,12 +3,20 @@
 """
 SQLite管理器 - 本地数据存储
 核心设计理念：数据隔离、轻量级存储、事务管理
+
+- 一个写连接（写操作串行化）+ N个WAL只读连接，长查询不阻塞认证/配置读取
+- 连接级预编译语句缓存；行转字典在连接线程内完成，不占用事件循环
+- iter_records/stream_query 分批流式读取，大结果集不一次性物化
 """
 
+import asyncio
 import aiosqlite
 import logging
 import os
-from typing import Dict, Any, Optional, List, Tuple
+import sqlite3
+from contextlib import aclosing, asynccontextmanager
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
 from datetime import datetime
 from pathlib import Path
 from ..config.settings import SQLiteConfig
@@ -16,6 +24,24 @@ from ..config.settings import SQLiteConfig
 logger = logging.getLogger(__name__)
 
 
+def _dict_row_factory(cursor: sqlite3.Cursor, row: Tuple) -> Dict[str, Any]:
+    """行工厂 - 在aiosqlite连接线程中把行转为字典"""
+    return {description[0]: value for description, value in zip(cursor.description, row)}
+
+
+@lru_cache(maxsize=512)
+def _select_sql(table: str, where_clause: str, order_by: str, limit: int) -> str:
+    """构建SELECT语句（相同参数复用同一字符串，命中连接的语句缓存）"""
+    query = f"SELECT * FROM {table}"
+    if where_clause:
+        query += f" WHERE {where_clause}"
+    if order_by:
+        query += f" ORDER BY {order_by}"
+    if limit > 0:
+        query += f" LIMIT {limit}"
+    return query
+
+
 class SQLiteManager:
     """SQLite管理器 - 本地数据存储"""
 
@@ -24,9 +50,18 @@ class SQLiteManager:
         self.db_path = config.database_path
         self.backup_path = config.backup_path
         self.connection: Optional[aiosqlite.Connection] = None
+        self.reader_pool_size = config.reader_pool_size
+        self.statement_cache_size = config.statement_cache_size
+
+        # 只读连接池与写串行化
+        self.readers: List[aiosqlite.Connection] = []
+        self._idle_readers: Optional[asyncio.Queue] = None
+        self._write_lock = asyncio.Lock()
 
         # 统计信息
         self.stats = {
+            "reads_on_pool": 0,
+            "reads_on_writer": 0,
             "queries_executed": 0,
             "transactions_committed": 0,
             "errors": 0,
@@ -44,8 +79,11 @@ class SQLiteManager:
             if self.backup_path:
                 Path(self.backup_path).mkdir(parents=True, exist_ok=True)
 
-            # 连接数据库
-            self.connection = await aiosqlite.connect(self.db_path)
+            # 连接数据库（写连接）
+            self.connection = await aiosqlite.connect(
+                self.db_path, cached_statements=self.statement_cache_size
+            )
+            self.connection.row_factory = _dict_row_factory
 
             # 启用外键约束
             await self.connection.execute("PRAGMA foreign_keys = ON")
@@ -56,6 +94,9 @@ class SQLiteManager:
             # 创建基础表结构
             await self._create_tables()
 
+            # 表结构就绪后打开只读连接池
+            await self._open_readers()
+
             self.stats["start_time"] = datetime.now()
             logger.info(f"SQLite管理器初始化完成 - 数据库: {self.db_path}")
 
@@ -63,6 +104,36 @@ class SQLiteManager:
             logger.error(f"SQLite初始化失败: {e}")
             raise
 
+    async def _open_readers(self):
+        """打开WAL只读连接池（内存数据库无法跨连接共享，只使用写连接）"""
+        if self.reader_pool_size <= 0 or self.db_path == ":memory:":
+            return
+        self._idle_readers = asyncio.Queue()
+        for _ in range(self.reader_pool_size):
+            reader = await aiosqlite.connect(
+                self.db_path, cached_statements=self.statement_cache_size
+            )
+            reader.row_factory = _dict_row_factory
+            await reader.execute("PRAGMA query_only = ON")
+            self.readers.append(reader)
+            self._idle_readers.put_nowait(reader)
+
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """借出一个只读连接；未启用连接池时使用写连接"""
+        if self._idle_readers is None:
+            if not self.connection:
+                raise RuntimeError("数据库连接未初始化")
+            self.stats["reads_on_writer"] += 1
+            yield self.connection
+            return
+        reader = await self._idle_readers.get()
+        self.stats["reads_on_pool"] += 1
+        try:
+            yield reader
+        finally:
+            self._idle_readers.put_nowait(reader)
+
     async def _create_tables(self):
         """创建基础表结构"""
         try:
@@ -230,18 +301,14 @@ class SQLiteManager:
     async def execute_query(
         self, query: str, params: Tuple = ()
     ) -> List[Dict[str, Any]]:
-        """执行查询语句"""
+        """执行查询语句（走只读连接池）"""
         try:
             if not self.connection:
                 raise RuntimeError("数据库连接未初始化")
 
-            async with self.connection.execute(query, params) as cursor:
-                columns = [description[0] for description in cursor.description]
-                rows = await cursor.fetchall()
-
-                result = []
-                for row in rows:
-                    result.append(dict(zip(columns, row)))
+            async with self._reader() as reader:
+                async with reader.execute(query, params) as cursor:
+                    result = await cursor.fetchall()
 
                 self.stats["queries_executed"] += 1
                 logger.debug(f"查询执行完成 - 返回 {len(result)} 行")
@@ -253,15 +320,28 @@ class SQLiteManager:
             logger.error(f"执行查询失败: {e}")
             raise
 
+    async def _write(self, query: str, params: Any, many: bool = False) -> aiosqlite.Cursor:
+        """在写连接上串行执行并提交，失败时回滚"""
+        async with self._write_lock:
+            try:
+                if many:
+                    cursor = await self.connection.executemany(query, params)
+                else:
+                    cursor = await self.connection.execute(query, params)
+                await self.connection.commit()
+                return cursor
+            except Exception:
+                await self.connection.rollback()
+                raise
+
     async def execute_update(self, query: str, params: Tuple = ()) -> int:
         """执行更新语句"""
         try:
             if not self.connection:
                 raise RuntimeError("数据库连接未初始化")
 
-            cursor = await self.connection.execute(query, params)
+            cursor = await self._write(query, params)
             affected_rows = cursor.rowcount
-            await self.connection.commit()
 
             self.stats["queries_executed"] += 1
             self.stats["transactions_committed"] += 1
@@ -271,10 +351,36 @@ class SQLiteManager:
 
         except Exception as e:
             self.stats["errors"] += 1
-            await self.connection.rollback()
             logger.error(f"执行更新失败: {e}")
             raise
 
+    async def execute_many(self, query: str, params_seq: List[Tuple]) -> int:
+        """批量执行同一语句（单次提交）"""
+        try:
+            if not self.connection:
+                raise RuntimeError("数据库连接未初始化")
+
+            cursor = await self._write(query, params_seq, many=True)
+            affected_rows = cursor.rowcount
+
+            self.stats["queries_executed"] += 1
+            self.stats["transactions_committed"] += 1
+            logger.debug(f"批量执行完成 - {len(params_seq)} 组参数")
+
+            return affected_rows
+
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"批量执行失败: {e}")
+            raise
+
+    async def ensure_tenant(self, tenant_id: str, name: Optional[str] = None):
+        """确保租户记录存在（写入引用 tenants 外键的记录前调用；已存在时不修改）"""
+        await self.execute_update(
+            f"INSERT OR IGNORE INTO {Tables.TENANTS} (tenant_id, name) VALUES (?, ?)",
+            (tenant_id, name or tenant_id),
+        )
+
     async def insert_record(self, table: str, data: Dict[str, Any]) -> int:
         """插入记录"""
         try:
@@ -284,8 +390,7 @@ class SQLiteManager:
 
             query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
 
-            cursor = await self.connection.execute(query, values)
-            await self.connection.commit()
+            cursor = await self._write(query, values)
 
             self.stats["queries_executed"] += 1
             self.stats["transactions_committed"] += 1
@@ -294,7 +399,6 @@ class SQLiteManager:
 
         except Exception as e:
             self.stats["errors"] += 1
-            await self.connection.rollback()
             logger.error(f"插入记录失败: {e}")
             raise
 
@@ -340,23 +444,43 @@ class SQLiteManager:
     ) -> List[Dict[str, Any]]:
         """获取记录"""
         try:
-            query = f"SELECT * FROM {table}"
-
-            if where_clause:
-                query += f" WHERE {where_clause}"
-
-            if order_by:
-                query += f" ORDER BY {order_by}"
-
-            if limit > 0:
-                query += f" LIMIT {limit}"
-
+            query = _select_sql(table, where_clause, order_by, limit)
             return await self.execute_query(query, where_params)
 
         except Exception as e:
             logger.error(f"获取记录失败: {e}")
             raise
 
+    async def stream_query(
+        self, query: str, params: Tuple = (), batch_size: int = 500
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """流式执行查询 - 按批 fetchmany，逐行产出，整个迭代期间占用一个只读连接"""
+        async with self._reader() as reader:
+            async with reader.execute(query, params) as cursor:
+                self.stats["queries_executed"] += 1
+                while True:
+                    rows = await cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield row
+
+    async def iter_records(
+        self,
+        table: str,
+        where_clause: str = "",
+        where_params: Tuple = (),
+        order_by: str = "",
+        limit: int = 0,
+        batch_size: int = 500,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """流式获取记录（get_records 的异步迭代器版本）"""
+        query = _select_sql(table, where_clause, order_by, limit)
+        # aclosing 保证调用方提前结束迭代时只读连接立即归还
+        async with aclosing(self.stream_query(query, where_params, batch_size)) as rows:
+            async for row in rows:
+                yield row
+
     async def begin_transaction(self):
         """开始事务"""
         if self.connection:
@@ -443,6 +567,8 @@ class SQLiteManager:
 
             return {
                 **self.stats,
+                "reader_pool_size": len(self.readers),
+                "idle_readers": self._idle_readers.qsize() if self._idle_readers else 0,
                 "uptime_seconds": uptime,
                 "database_size_bytes": db_size,
                 "table_counts": table_stats,
@@ -455,6 +581,11 @@ class SQLiteManager:
     async def cleanup(self):
         """清理资源"""
         try:
+            for reader in self.readers:
+                await reader.close()
+            self.readers.clear()
+            self._idle_readers = None
+
             if self.connection:
                 await self.connection.close()
 
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+调用记账 - API调用日志与用量汇总
+核心设计理念：请求路径只做内存追加和计数累加，落库由后台任务批量完成
+
+- 调用记录先进入内存缓冲，后台按批次 executemany 写入 api_logs；违反外键时逐条重试
+- 按 (tenant_id, api_name) 与租户维度维护滚动汇总：次数、字节数、延迟直方图（只汇总注册表中存在的API）
+- 统计接口直接读取汇总，不扫描日志表
+"""
+
+import asyncio
+import bisect
+import logging
+import sqlite3
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..config.settings import APIConfig
+
+logger = logging.getLogger(__name__)
+
+# 延迟直方图桶上界（毫秒），最后一个桶收纳超出上界的调用
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# 汇总键中代表"该租户全部API"的占位名
+ALL_APIS = "*"
+
+
+@dataclass
+class UsageRollup:
+    """用量汇总"""
+
+    count: int = 0
+    errors: int = 0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    total_latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
+    histogram: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    last_call_at: Optional[str] = None
+
+    def add(self, status_code: int, latency_ms: float, request_bytes: int, response_bytes: int, at: str):
+        self.count += 1
+        if status_code == 0 or status_code >= 400:
+            self.errors += 1
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+        self.total_latency_ms += latency_ms
+        if latency_ms > self.max_latency_ms:
+            self.max_latency_ms = latency_ms
+        self.histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.last_call_at = at
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """由直方图估算分位延迟（返回所在桶上界）"""
+        if self.count == 0:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.histogram):
+            seen += bucket_count
+            if seen >= target:
+                if index < len(LATENCY_BUCKETS_MS):
+                    return float(LATENCY_BUCKETS_MS[index])
+                return self.max_latency_ms
+        return self.max_latency_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_calls": self.count,
+            "error_calls": self.errors,
+            "success_rate": (self.count - self.errors) / self.count if self.count else 0.0,
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "avg_latency_ms": self.total_latency_ms / self.count if self.count else 0.0,
+            "max_latency_ms": self.max_latency_ms,
+            "p50_latency_ms": self.percentile(0.5),
+            "p95_latency_ms": self.percentile(0.95),
+            "p99_latency_ms": self.percentile(0.99),
+            "latency_histogram": {
+                **{f"le_{bound}": n for bound, n in zip(LATENCY_BUCKETS_MS, self.histogram)},
+                "inf": self.histogram[-1],
+            },
+            "last_call_at": self.last_call_at,
+        }
+
+
+class UsageAccountant:
+    """调用记账器 - 缓冲写入 api_logs 并维护内存汇总"""
+
+    INSERT_SQL = (
+        "INSERT INTO api_logs (tenant_id, user_id, api_name, method, endpoint, status_code, "
+        "response_time, request_size, response_size, error_message, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+
+    def __init__(
+        self,
+        sqlite_manager: Optional[Any],
+        config: APIConfig,
+        api_registry: Optional[Any] = None,
+    ):
+        self.sqlite_manager = sqlite_manager
+        self.api_registry = api_registry
+        self.flush_interval = config.usage_log_flush_seconds
+        self.batch_size = config.usage_log_batch_size
+        self.max_buffer = config.usage_log_max_buffer
+
+        self._buffer: "deque[Tuple]" = deque()
+        self._rollups: Dict[Tuple[str, str], UsageRollup] = {}
+        self._known_tenants: Set[str] = set()
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # 统计信息
+        self.stats = {
+            "recorded": 0,
+            "written": 0,
+            "flushes": 0,
+            "dropped": 0,
+            "unrouted": 0,
+            "row_retries": 0,
+            "errors": 0,
+        }
+
+    # 请求路径
+
+    def record(
+        self,
+        tenant_id: str,
+        user_id: Any,
+        api_name: str,
+        method: str,
+        endpoint: str,
+        status_code: int,
+        response_time_ms: float,
+        request_size: int = 0,
+        response_size: int = 0,
+        error_message: Optional[str] = None,
+    ):
+        """记录一次调用（仅内存操作）"""
+        created_at = datetime.now().isoformat()
+
+        # 只为注册表中可解析的API建立单独汇总，任意调用方传入的名称不会让汇总无限增长
+        keys = [(tenant_id, ALL_APIS)]
+        if self.api_registry is None or self.api_registry.get(tenant_id, api_name) is not None:
+            keys.append((tenant_id, api_name))
+        else:
+            self.stats["unrouted"] += 1
+
+        for key in keys:
+            rollup = self._rollups.get(key)
+            if rollup is None:
+                rollup = self._rollups[key] = UsageRollup()
+            rollup.add(status_code, response_time_ms, request_size, response_size, created_at)
+
+        self.stats["recorded"] += 1
+        if self.sqlite_manager is None:
+            return
+
+        # 缓冲已满时丢弃最旧记录，汇总不受影响
+        if len(self._buffer) >= self.max_buffer:
+            self._buffer.popleft()
+            self.stats["dropped"] += 1
+
+        self._buffer.append(
+            (
+                tenant_id,
+                self._log_user_id(user_id),
+                api_name,
+                method,
+                endpoint,
+                status_code,
+                response_time_ms,
+                request_size,
+                response_size,
+                error_message,
+                created_at,
+            )
+        )
+        if len(self._buffer) >= self.batch_size and self._flush_requested is not None:
+            self._flush_requested.set()
+
+    @staticmethod
+    def _log_user_id(user_id: Any) -> Optional[int]:
+        """api_logs.user_id 引用 users.id，非整数标识（如令牌中的外部用户名）记为NULL"""
+        if isinstance(user_id, int) and not isinstance(user_id, bool):
+            return user_id
+        if isinstance(user_id, str) and user_id.isdigit():
+            return int(user_id)
+        return None
+
+    def get_stats(self, tenant_id: str, api_name: Optional[str] = None) -> Dict[str, Any]:
+        """读取租户（或租户下指定API）的用量汇总"""
+        rollup = self._rollups.get((tenant_id, api_name or ALL_APIS))
+        return (rollup or UsageRollup()).to_dict()
+
+    def list_api_stats(self, tenant_id: str) -> Dict[str, Dict[str, Any]]:
+        """租户下各API的用量汇总"""
+        return {
+            api_name: rollup.to_dict()
+            for (owner, api_name), rollup in self._rollups.items()
+            if owner == tenant_id and api_name != ALL_APIS
+        }
+
+    # 后台落库
+
+    async def flush(self) -> int:
+        """将缓冲中的记录一次性批量写入"""
+        if not self._buffer or self.sqlite_manager is None:
+            return 0
+        batch = list(self._buffer)
+        self._buffer.clear()
+        try:
+            await self._ensure_tenants(batch)
+            await self.sqlite_manager.execute_many(self.INSERT_SQL, batch)
+            self.stats["flushes"] += 1
+            self.stats["written"] += len(batch)
+            return len(batch)
+        except sqlite3.IntegrityError as e:
+            # 批次已整体回滚；逐条重写，只丢弃仍违反约束的记录
+            self.stats["errors"] += 1
+            logger.warning(f"API调用日志批量写入违反约束，改为逐条写入 - Rows: {len(batch)}: {e}")
+            return await self._write_rows(batch)
+        except Exception as e:
+            # 日志表写入失败不影响调用，丢弃本批并计数
+            self.stats["errors"] += 1
+            self.stats["dropped"] += len(batch)
+            logger.error(f"批量写入API调用日志失败 - Rows: {len(batch)}: {e}")
+            return 0
+
+    async def _ensure_tenants(self, batch: List[Tuple]):
+        """补齐 api_logs.tenant_id 外键引用的租户记录（每个租户只检查一次）"""
+        for tenant_id in {row[0] for row in batch} - self._known_tenants:
+            await self.sqlite_manager.ensure_tenant(tenant_id)
+            self._known_tenants.add(tenant_id)
+
+    async def _write_rows(self, batch: List[Tuple]) -> int:
+        written = 0
+        for row in batch:
+            self.stats["row_retries"] += 1
+            try:
+                try:
+                    await self.sqlite_manager.execute_update(self.INSERT_SQL, row)
+                except sqlite3.IntegrityError:
+                    if row[1] is None:
+                        raise
+                    # 用户外键失效（如用户已删除）时保留日志、清空用户引用
+                    await self.sqlite_manager.execute_update(self.INSERT_SQL, (row[0], None) + row[2:])
+                written += 1
+            except Exception as e:
+                self.stats["dropped"] += 1
+                logger.error(f"API调用日志写入失败，已丢弃 - Tenant: {row[0]}, API: {row[2]}: {e}")
+        self.stats["flushes"] += 1
+        self.stats["written"] += written
+        return written
+
+    def start(self):
+        if self._task is None:
+            self._flush_requested = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self._flush_requested.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._flush_requested.clear()
+                await self.flush()
+            except asyncio.CancelledError:
+                break
+
+    async def stop(self):
+        """停止后台任务并写入剩余记录"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def get_pipeline_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "buffered": len(self._buffer), "rollups": len(self._rollups)}
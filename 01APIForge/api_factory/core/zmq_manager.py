@@ -14,6 +14,7 @@ import os
 import zmq
 import zmq.asyncio
 from ..config.settings import ZMQConfig
+from .zmq_requester import ZMQRequestClient
 
 logger = logging.getLogger(__name__)
 
@@ -26,9 +27,12 @@ class ZMQManager:
         self.context: Optional[zmq.asyncio.Context] = None
         self.publisher: Optional[zmq.asyncio.Socket] = None
         self.subscriber: Optional[zmq.asyncio.Socket] = None
-        self.request_socket: Optional[zmq.asyncio.Socket] = None
         self.reply_socket: Optional[zmq.asyncio.Socket] = None
 
+        # 多路复用请求客户端（按端点）
+        self.request_clients: Dict[str, ZMQRequestClient] = {}
+        self.default_request_endpoint: Optional[str] = None
+
         # 消息处理器注册表
         self.message_handlers: Dict[str, Callable] = {}
         self.subscription_topics: List[str] = []
@@ -87,12 +91,11 @@ class ZMQManager:
             )
             self.subscriber.connect(subscriber_address)
 
-            # 创建请求套接字
-            self.request_socket = self.context.socket(zmq.REQ)
-            request_address = (
+            # 创建默认端点的多路复用请求客户端（DEALER）
+            self.default_request_endpoint = (
                 f"{self.config.connect_address}:{self.config.reply_port}"
             )
-            self.request_socket.connect(request_address)
+            self.get_request_client(self.default_request_endpoint)
 
             # 创建响应套接字
             self.reply_socket = self.context.socket(zmq.REP)
@@ -130,9 +133,10 @@ class ZMQManager:
             if hasattr(self, "subscriber") and self.subscriber:
                 self.subscriber.close()
                 self.subscriber = None
-            if hasattr(self, "request_socket") and self.request_socket:
-                self.request_socket.close()
-                self.request_socket = None
+            for client in self.request_clients.values():
+                await client.close()
+            self.request_clients.clear()
+            self.default_request_endpoint = None
             if hasattr(self, "reply_socket") and self.reply_socket:
                 self.reply_socket.close()
                 self.reply_socket = None
@@ -190,11 +194,30 @@ class ZMQManager:
             logger.error(f"订阅主题失败: {e}")
             raise
 
+    def get_request_client(self, endpoint: str) -> ZMQRequestClient:
+        """获取（必要时创建）指定端点的多路复用请求客户端"""
+        client = self.request_clients.get(endpoint)
+        if client is None:
+            client = ZMQRequestClient(
+                self.context,
+                endpoint,
+                pool_size=self.config.request_pool_size,
+                max_in_flight=self.config.request_max_in_flight,
+                json_default=self._json_default,
+            )
+            client.start()
+            self.request_clients[endpoint] = client
+        return client
+
     async def send_request(
-        self, request_data: Dict[str, Any], timeout: int = 5000
+        self,
+        request_data: Dict[str, Any],
+        timeout: int = 5000,
+        endpoint: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """发送请求并等待响应"""
-        if not self.request_socket:
+        """发送请求并等待响应 - 多个协程可并发调用，各自独立超时"""
+        endpoint = endpoint or self.default_request_endpoint
+        if not self.context or not endpoint:
             logger.debug("ZeroMQ不可用，返回模拟响应")
             # 返回模拟响应
             return {
@@ -205,23 +228,20 @@ class ZMQManager:
             }
 
         try:
-            # 设置超时
-            self.request_socket.setsockopt(zmq.RCVTIMEO, timeout)
-
-            # 发送请求
-            await self.request_socket.send_json(request_data, default=self._json_default)
-
-            # 等待响应
-            response = await self.request_socket.recv_json()
+            response = await self.get_request_client(endpoint).request(
+                request_data, timeout=timeout
+            )
 
             self.stats["messages_sent"] += 1
             self.stats["messages_received"] += 1
 
             return response
 
-        except zmq.Again:
-            logger.error(f"请求超时: {timeout}ms")
-            raise TimeoutError("Request timeout")
+        except TimeoutError:
+            logger.error(f"请求超时: {timeout}ms - Endpoint: {endpoint}")
+            raise
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             self.stats["errors"] += 1
             logger.error(f"发送请求失败: {e}")
@@ -272,6 +292,10 @@ class ZMQManager:
                         "timestamp": datetime.now().isoformat(),
                     }
 
+                # 回带request_id，供多路复用客户端关联响应
+                if isinstance(response, dict) and isinstance(request, dict) and "request_id" in request:
+                    response = {**response, "request_id": request["request_id"]}
+
                 # 发送响应
                 await self.reply_socket.send_json(response, default=self._json_default)
 
@@ -366,8 +390,9 @@ class ZMQManager:
                 sockets_ok = False
             if self.subscriber and self.subscriber.closed:
                 sockets_ok = False
-            if self.request_socket and self.request_socket.closed:
-                sockets_ok = False
+            for client in self.request_clients.values():
+                if any(socket.closed for socket in client.sockets):
+                    sockets_ok = False
             if self.reply_socket and self.reply_socket.closed:
                 sockets_ok = False
                 
@@ -388,6 +413,7 @@ class ZMQManager:
             "uptime_seconds": uptime,
             "subscription_topics": self.subscription_topics,
             "active_handlers": len(self.message_handlers),
+            "request_clients": [c.get_stats() for c in self.request_clients.values()],
         }
 
     async def cleanup(self):
@@ -397,8 +423,9 @@ class ZMQManager:
                 self.publisher.close()
             if self.subscriber:
                 self.subscriber.close()
-            if self.request_socket:
-                self.request_socket.close()
+            for client in self.request_clients.values():
+                await client.close()
+            self.request_clients.clear()
             if self.reply_socket:
                 self.reply_socket.close()
             if self.context:
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ZeroMQ多路复用请求客户端 - DEALER套接字上的并发请求/响应
+核心设计理念：关联ID + Future映射，单套接字承载大量在途请求
+
+- 每个请求在消息体中携带 request_id，响应按 request_id 找回对应的 Future
+- 帧格式 [b"", payload] 与 REP 及 ROUTER（TACore负载均衡器）服务端兼容
+- 每个请求独立超时与取消；超时或取消不影响同一套接字上的其他请求
+- 可选套接字池：同一端点多个DEALER轮询发送
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+import zmq
+import zmq.asyncio
+
+logger = logging.getLogger(__name__)
+
+
+class ZMQRequestClient:
+    """单端点多路复用请求客户端"""
+
+    def __init__(
+        self,
+        context: "zmq.asyncio.Context",
+        endpoint: str,
+        pool_size: int = 1,
+        max_in_flight: int = 1000,
+        json_default: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.context = context
+        self.endpoint = endpoint
+        self.pool_size = max(pool_size, 1)
+        self.json_default = json_default
+
+        self.sockets: List["zmq.asyncio.Socket"] = []
+        self._next_socket = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._recv_tasks: List[asyncio.Task] = []
+        self._slots = asyncio.Semaphore(max_in_flight)
+
+        # 统计信息
+        self.stats = {
+            "requests": 0,
+            "responses": 0,
+            "timeouts": 0,
+            "cancelled": 0,
+            "late_responses": 0,
+            "errors": 0,
+        }
+
+    @property
+    def started(self) -> bool:
+        return bool(self.sockets)
+
+    def start(self):
+        """创建并连接DEALER套接字池，启动接收任务"""
+        if self.started:
+            return
+        for _ in range(self.pool_size):
+            socket = self.context.socket(zmq.DEALER)
+            socket.setsockopt(zmq.LINGER, 0)
+            socket.connect(self.endpoint)
+            self.sockets.append(socket)
+            self._recv_tasks.append(asyncio.create_task(self._recv_loop(socket)))
+        self._next_socket = itertools.cycle(self.sockets)
+        logger.info(f"ZMQ请求客户端已连接 - Endpoint: {self.endpoint}, Sockets: {self.pool_size}")
+
+    async def request(self, request_data: Dict[str, Any], timeout: int = 5000) -> Dict[str, Any]:
+        """发送请求并等待对应响应（timeout单位为毫秒）"""
+        if not self.started:
+            raise RuntimeError(f"ZMQ请求客户端未启动: {self.endpoint}")
+
+        request_id = request_data.get("request_id") or uuid.uuid4().hex
+        if request_id in self._pending:
+            raise ValueError(f"重复的request_id: {request_id}")
+        payload = json.dumps(
+            {**request_data, "request_id": request_id}, default=self.json_default
+        ).encode("utf-8")
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            async with self._slots:
+                self._pending[request_id] = future
+                await next(self._next_socket).send_multipart([b"", payload])
+                self.stats["requests"] += 1
+                return await asyncio.wait_for(future, timeout / 1000)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise TimeoutError(f"Request timeout: {request_id}")
+        except asyncio.CancelledError:
+            self.stats["cancelled"] += 1
+            raise
+        finally:
+            # 超时/取消后迟到的响应在接收循环中被丢弃
+            self._pending.pop(request_id, None)
+
+    async def _recv_loop(self, socket: "zmq.asyncio.Socket"):
+        while True:
+            try:
+                frames = await socket.recv_multipart()
+                response = json.loads(frames[-1].decode("utf-8"))
+                future = self._pending.get(response.get("request_id"))
+                if future is None or future.done():
+                    self.stats["late_responses"] += 1
+                    continue
+                future.set_result(response)
+                self.stats["responses"] += 1
+            except asyncio.CancelledError:
+                break
+            except zmq.ZMQError as e:
+                if socket.closed:
+                    break
+                self.stats["errors"] += 1
+                logger.error(f"ZMQ响应接收失败 - Endpoint: {self.endpoint}: {e}")
+                await asyncio.sleep(0.1)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"ZMQ响应解析失败 - Endpoint: {self.endpoint}: {e}")
+
+    async def close(self):
+        """关闭套接字池，未完成的请求以ConnectionError结束"""
+        for task in self._recv_tasks:
+            task.cancel()
+        for task in self._recv_tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._recv_tasks.clear()
+
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError(f"ZMQ请求客户端已关闭: {self.endpoint}"))
+        self._pending.clear()
+
+        for socket in self.sockets:
+            socket.close()
+        self.sockets.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "endpoint": self.endpoint,
+            "sockets": len(self.sockets),
+            "in_flight": len(self._pending),
+        }
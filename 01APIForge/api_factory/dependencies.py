@@ -14,6 +14,12 @@ from .config.settings import get_settings
 from .security.encryption import EncryptionManager, create_encryption_manager
 from .database.supabase_client import SupabaseClient, create_supabase_client
 from .core.redis_manager import RedisManager
+from .core.rate_limiter import RateLimiter
+from .core.circuit_breaker import CircuitBreakerRegistry
+from .core.response_cache import ResponseCache
+from .core.api_registry import APIConfigRegistry
+from .core.usage_accounting import UsageAccountant
+from .core.service_discovery import ServiceDiscovery
 from fastapi import Header, HTTPException, status
 
 logger = logging.getLogger(__name__)
@@ -22,6 +28,8 @@ logger = logging.getLogger(__name__)
 _encryption_manager: Optional[EncryptionManager] = None
 _supabase_client: Optional[SupabaseClient] = None
 _redis_manager: Optional[RedisManager] = None
+# 应用未启动时按需创建的进程内组件（名称 -> 实例）
+_fallback_components: Dict[str, Any] = {}
 
 
 @lru_cache()
@@ -81,6 +89,118 @@ async def get_redis_manager() -> RedisManager:
     return _redis_manager
 
 
+def get_app_component(name: str) -> Optional[Any]:
+    """
+    获取应用生命周期中创建的组件（api_factory.main 的模块级实例）
+    
+    运行期导入以避免循环依赖；未启动应用（如测试环境）时返回None
+    
+    Args:
+        name: 组件名称，如 rate_limiter、api_registry
+        
+    Returns:
+        组件实例或None
+    """
+    from importlib import import_module
+    try:
+        return getattr(import_module("api_factory.main"), name, None)
+    except Exception:
+        return None
+
+
+def _component_or_fallback(name: str, factory, description: str):
+    """优先返回生命周期组件，否则返回按需创建的进程内实例"""
+    component = get_app_component(name)
+    if component is not None:
+        return component
+
+    if name not in _fallback_components:
+        _fallback_components[name] = factory()
+        logger.info(description)
+
+    return _fallback_components[name]
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    获取限流器实例：未初始化时（如测试环境）回退为进程内限流器
+    
+    Returns:
+        RateLimiter实例
+    """
+    return _component_or_fallback(
+        "rate_limiter",
+        lambda: RateLimiter(None, get_settings().api_config),
+        "限流器以进程内模式初始化",
+    )
+
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """
+    获取熔断器注册表：未初始化时回退为单节点注册表
+    
+    Returns:
+        CircuitBreakerRegistry实例
+    """
+    return _component_or_fallback(
+        "circuit_breakers",
+        lambda: CircuitBreakerRegistry(None, get_settings().api_config),
+        "熔断器注册表以单节点模式初始化",
+    )
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    获取响应缓存：未初始化时回退为仅进程内缓存
+    
+    Returns:
+        ResponseCache实例
+    """
+    return _component_or_fallback(
+        "response_cache",
+        lambda: ResponseCache(None, get_settings().api_config),
+        "响应缓存以进程内模式初始化",
+    )
+
+
+def get_api_registry() -> APIConfigRegistry:
+    """
+    获取API配置注册表：未初始化时回退为仅含内置路由的进程内注册表
+    
+    Returns:
+        APIConfigRegistry实例
+    """
+    return _component_or_fallback(
+        "api_registry", APIConfigRegistry, "API配置注册表以进程内模式初始化"
+    )
+
+
+def get_usage_accountant() -> UsageAccountant:
+    """
+    获取调用记账器：未初始化时回退为仅内存汇总（不落库）
+    
+    Returns:
+        UsageAccountant实例
+    """
+    return _component_or_fallback(
+        "usage_accountant",
+        lambda: UsageAccountant(None, get_settings().api_config),
+        "调用记账器以仅内存模式初始化",
+    )
+
+
+def get_service_discovery() -> ServiceDiscovery:
+    """
+    获取服务发现引擎：未初始化时回退为进程内实例
+    
+    Returns:
+        ServiceDiscovery实例
+    """
+    return _component_or_fallback(
+        "service_discovery", ServiceDiscovery, "服务发现引擎以进程内模式初始化"
+    )
+
+
 async def get_supabase_client() -> SupabaseClient:
     """
     获取Supabase客户端实例
@@ -263,12 +383,7 @@ async def get_current_active_user(
         )
 
     # 2) 运行期获取 auth_manager，避免循环依赖
-    from importlib import import_module
-    try:
-        main_module = import_module("api_factory.main")
-        auth_manager = getattr(main_module, "auth_manager", None)
-    except Exception:
-        auth_manager = None
+    auth_manager = get_app_component("auth_manager")
 
     if auth_manager is None:
         raise HTTPException(
@@ -22,6 +22,12 @@ from .routers import api_gateway, auth_center, quota_circuit, cluster_management
 from .core.zmq_manager import ZMQManager, MessageTopics
 from .core.redis_manager import RedisManager
 from .core.sqlite_manager import SQLiteManager
+from .core.rate_limiter import RateLimiter
+from .core.circuit_breaker import CircuitBreakerRegistry
+from .core.response_cache import ResponseCache
+from .core.api_registry import APIConfigRegistry
+from .core.usage_accounting import UsageAccountant
+from .core.service_discovery import ServiceDiscovery
 from .security.auth import AuthManager
 
 # 閰嶇疆鏃ュ織
@@ -35,12 +41,18 @@ zmq_manager: ZMQManager = None
 redis_manager: RedisManager = None
 sqlite_manager: SQLiteManager = None
 auth_manager: AuthManager = None
+rate_limiter: RateLimiter = None
+circuit_breakers: CircuitBreakerRegistry = None
+response_cache: ResponseCache = None
+api_registry: APIConfigRegistry = None
+usage_accountant: UsageAccountant = None
+service_discovery: ServiceDiscovery = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """搴旂敤鐢熷懡鍛ㄦ湡绠＄悊 - 涓ユ牸鎸夌収鍏ㄥ眬瑙勮寖"""
-    global zmq_manager, redis_manager, sqlite_manager, auth_manager
+    global zmq_manager, redis_manager, sqlite_manager, auth_manager, rate_limiter, circuit_breakers, response_cache, api_registry, usage_accountant, service_discovery
 
     settings = get_settings()
     logger.info(f"鍚姩API Factory Module - 鐜: {settings.environment}")
@@ -53,10 +65,33 @@ async def lifespan(app: FastAPI):
         redis_manager = RedisManager(settings.redis_config)
         await redis_manager.initialize()
 
+        # 限流引擎（Redis不可用时自动降级为进程内限流）
+        rate_limiter = RateLimiter(redis_manager, settings.api_config)
+
+        # 熔断器（通过Redis发布订阅在副本间同步状态）
+        circuit_breakers = CircuitBreakerRegistry(redis_manager, settings.api_config)
+        await circuit_breakers.start_sync()
+
+        # 幂等GET响应缓存（进程内LRU + Redis）
+        response_cache = ResponseCache(redis_manager, settings.api_config)
+
         sqlite_manager = SQLiteManager(settings.sqlite_config)
         await sqlite_manager.initialize()
 
+        # API配置注册表：启动时全量加载，之后call_api只查内存路由表
+        api_registry = APIConfigRegistry(sqlite_manager, redis_manager)
+        await api_registry.load()
+        await api_registry.start_sync()
+
+        # 调用记账：内存汇总 + 后台批量写入 api_logs
+        usage_accountant = UsageAccountant(sqlite_manager, settings.api_config, api_registry)
+        usage_accountant.start()
+
+        # 服务发现：集群节点状态与负载均衡选择
+        service_discovery = ServiceDiscovery()
+
         auth_manager = AuthManager(settings.auth_config)
+        auth_manager.set_managers(sqlite_manager, redis_manager)
         await auth_manager.initialize()
 
         logger.info("鎵€鏈夋牳蹇冪粍浠跺垵濮嬪寲瀹屾垚")
@@ -108,14 +143,21 @@ async def lifespan(app: FastAPI):
             pass
 
         # 娓呯悊璧勬簮
+        if circuit_breakers:
+            await circuit_breakers.stop_sync()
+        if api_registry:
+            await api_registry.stop_sync()
+        # 认证管理器（last_used批量写入、撤销订阅）与调用记账依赖Redis/SQLite，先于连接关闭停止并刷写
+        if auth_manager:
+            await auth_manager.cleanup()
+        if usage_accountant:
+            await usage_accountant.stop()
         if zmq_manager:
             await zmq_manager.cleanup()
         if redis_manager:
             await redis_manager.cleanup()
         if sqlite_manager:
             await sqlite_manager.cleanup()
-        if auth_manager:
-            await auth_manager.cleanup()
 
         logger.info("API Factory Module shutdown complete")
 
@@ -7,6 +7,9 @@ API网关路由 - 统一API管理
 
 import json
 import logging
+import math
+import sqlite3
+import time
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone
 from fastapi import APIRouter, HTTPException, Depends, Header, Request, Response
@@ -18,9 +21,19 @@ import uuid
 
 from ..core.zmq_manager import ZMQManager, MessageTopics
 from ..core.sqlite_manager import SQLiteManager, Tables
-from ..config.settings import get_settings
+from ..core.circuit_breaker import CircuitOpenError
+from ..core.api_registry import APIRoute, BUILTIN_ROUTES
+from ..core.service_discovery import NodeState
 import inspect
 from ..dependencies import get_current_active_user as _get_current_active_user
+from ..dependencies import (
+    get_rate_limiter,
+    get_circuit_breakers,
+    get_response_cache,
+    get_api_registry,
+    get_usage_accountant,
+    get_service_discovery,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -71,6 +84,44 @@ async def get_tenant_id(x_tenant_id: Optional[str] = Header(None)):
     return x_tenant_id or "default"
 
 
+async def enforce_rate_limit(
+    tenant_id: str, current_user: Dict[str, Any], api_name: str
+):
+    """调用前限流检查 - 超出配额时抛出429"""
+    limiter = get_rate_limiter()
+    result = await limiter.check(tenant_id, current_user.get("user_id"), api_name)
+    if not result.allowed:
+        retry_after = max(math.ceil(result.retry_after), 1)
+        logger.info(
+            f"API调用被限流 - Name: {api_name}, User: {current_user.get('user_id')}, Tenant: {tenant_id}, RetryAfter: {retry_after}s"
+        )
+        raise HTTPException(
+            status_code=429,
+            detail={
+                "success": False,
+                "message": "Rate limit exceeded",
+                "api_name": api_name,
+                "limit": result.limit,
+                "remaining": result.remaining,
+                "retry_after": retry_after,
+            },
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+def _route_from_request(config_request: APIConfigRequest, tenant_id: str) -> APIRoute:
+    """将请求模型转换为路由表条目"""
+    return APIRoute(
+        tenant_id=tenant_id,
+        api_name=config_request.api_name,
+        api_type=config_request.api_type,
+        endpoint=config_request.endpoint.rstrip("/"),
+        timeout=config_request.config_data.get("timeout", 30),
+        config_data=config_request.config_data,
+        status=config_request.status,
+    )
+
+
 @router.post("/config", response_model=Dict[str, Any])
 async def create_api_config(
     config_request: APIConfigRequest,
@@ -79,13 +130,29 @@ async def create_api_config(
 ):
     """创建API配置"""
     try:
-        settings = get_settings()
-
         # 验证API类型
         valid_types = ["exchange", "llm", "datasource"]
         if config_request.api_type not in valid_types:
             raise HTTPException(status_code=400, detail="Unsupported API type")
-        # ... existing code ...
+
+        registry = get_api_registry()
+        existing = registry.get(tenant_id, config_request.api_name)
+        if existing is not None and existing.tenant_id == tenant_id and existing not in BUILTIN_ROUTES:
+            raise HTTPException(
+                status_code=409, detail=f"API配置已存在: {config_request.api_name}"
+            )
+
+        route = await registry.upsert(_route_from_request(config_request, tenant_id))
+
+        logger.info(f"API配置创建成功 - Name: {route.api_name}, Tenant: {tenant_id}")
+
+        return {"success": True, "message": "API配置创建成功", **route.to_dict()}
+
+    except HTTPException:
+        raise
+    except sqlite3.IntegrityError as e:
+        logger.warning(f"创建API配置违反约束: {e}")
+        raise HTTPException(status_code=409, detail=f"API配置创建冲突: {e}")
     except Exception as e:
         logger.error(f"创建API配置失败: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -100,40 +167,19 @@ async def list_api_configs(
 ):
     """获取API配置列表"""
     try:
-        # 模拟从数据库获取配置
+        routes = get_api_registry().list_routes(tenant_id, api_type=api_type, status=status)
         configs = [
             {
-                "id": 1,
-                "api_name": "binance_spot",
-                "api_type": "exchange",
-                "endpoint": "https://api.binance.com",
-                "status": "active",
-                "created_at": "2024-01-01T00:00:00",
-            },
-            {
-                "id": 2,
-                "api_name": "openai_gpt4",
-                "api_type": "llm",
-                "endpoint": "https://api.openai.com",
-                "status": "active",
-                "created_at": "2024-01-01T00:00:00",
-            },
-            {
-                "id": 3,
-                "api_name": "yahoo_finance",
-                "api_type": "datasource",
-                "endpoint": "https://query1.finance.yahoo.com",
-                "status": "active",
-                "created_at": "2024-01-01T00:00:00",
-            },
+                "id": route.id,
+                "api_name": route.api_name,
+                "api_type": route.api_type,
+                "endpoint": route.endpoint,
+                "status": route.status,
+                "created_at": route.created_at,
+            }
+            for route in routes
         ]
 
-        # 过滤条件
-        if api_type:
-            configs = [c for c in configs if c["api_type"] == api_type]
-        if status:
-            configs = [c for c in configs if c["status"] == status]
-
         logger.info(f"获取API配置列表 - Count: {len(configs)}, Tenant: {tenant_id}")
 
         return configs
@@ -151,27 +197,16 @@ async def get_api_config(
 ):
     """获取指定API配置"""
     try:
-        # 模拟从数据库获取配置
-        config = {
-            "id": 1,
-            "api_name": api_name,
-            "api_type": "exchange",
-            "endpoint": "https://api.binance.com",
-            "config_data": {
-                "api_key": "***",
-                "secret_key": "***",
-                "timeout": 30,
-                "rate_limit": 1200,
-            },
-            "status": "active",
-            "created_at": "2024-01-01T00:00:00",
-            "updated_at": "2024-01-01T00:00:00",
-        }
+        route = get_api_registry().get(tenant_id, api_name)
+        if route is None:
+            raise HTTPException(status_code=404, detail=f"API配置不存在: {api_name}")
 
         logger.info(f"获取API配置 - Name: {api_name}, Tenant: {tenant_id}")
 
-        return config
+        return route.to_dict()
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"获取API配置失败: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -184,13 +219,24 @@ async def update_api_config(
     current_user: Dict = Depends(get_current_user),
     tenant_id: str = Depends(get_tenant_id),
 ):
-    """更新API配置"""
+    """更新API配置（更新共享配置时为租户创建覆盖配置）"""
     try:
-        # 模拟更新数据库
+        registry = get_api_registry()
+        if registry.get(tenant_id, api_name) is None:
+            raise HTTPException(status_code=404, detail=f"API配置不存在: {api_name}")
+
+        config_request.api_name = api_name
+        await registry.upsert(_route_from_request(config_request, tenant_id))
+
         logger.info(f"API配置更新成功 - Name: {api_name}, Tenant: {tenant_id}")
 
         return {"success": True, "message": "API配置更新成功", "api_name": api_name}
 
+    except HTTPException:
+        raise
+    except sqlite3.IntegrityError as e:
+        logger.warning(f"更新API配置违反约束: {e}")
+        raise HTTPException(status_code=409, detail=f"API配置更新冲突: {e}")
     except Exception as e:
         logger.error(f"更新API配置失败: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -204,16 +250,83 @@ async def delete_api_config(
 ):
     """删除API配置"""
     try:
-        # 模拟从数据库删除
+        if not await get_api_registry().remove(tenant_id, api_name):
+            raise HTTPException(status_code=404, detail=f"API配置不存在: {api_name}")
+
         logger.info(f"API配置删除成功 - Name: {api_name}, Tenant: {tenant_id}")
 
         return {"success": True, "message": "API配置删除成功", "api_name": api_name}
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"删除API配置失败: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def fetch_upstream(
+    api_name: str, request_kwargs: Dict[str, Any], node: Optional[NodeState] = None
+) -> Dict[str, Any]:
+    """调用上游API - 经过熔断器保护，返回状态码与解析后的数据
+
+    node 为服务发现选出的集群节点时，调用期间计入该节点在途数，结束后回报延迟与成败。
+    """
+    # 熔断器检查：打开时立即失败，不在事件循环上等待上游超时
+    breaker = get_circuit_breakers().get(api_name)
+    if not breaker.allow_request():
+        raise CircuitOpenError(api_name, breaker.retry_after())
+
+    discovery = get_service_discovery() if node is not None else None
+    if discovery is not None:
+        discovery.acquire(node)
+
+    upstream_start = time.perf_counter()
+    outcome_recorded = False
+    failed = False
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.request(**request_kwargs)
+        upstream_ms = (time.perf_counter() - upstream_start) * 1000
+        failed = response.status_code >= 500
+        if failed:
+            breaker.record_failure(upstream_ms)
+        else:
+            breaker.record_success(upstream_ms)
+        outcome_recorded = True
+    except Exception:
+        failed = True
+        breaker.record_failure((time.perf_counter() - upstream_start) * 1000)
+        outcome_recorded = True
+        raise
+    finally:
+        # 取消（CancelledError不是Exception子类）不计入结果，但必须归还半开探测名额
+        if not outcome_recorded:
+            breaker.release()
+        if discovery is not None:
+            discovery.release(
+                node, (time.perf_counter() - upstream_start) * 1000, success=not failed
+            )
+
+    response_data = (
+        response.json()
+        if response.headers.get("content-type", "").startswith("application/json")
+        else response.text
+    )
+    return {
+        "status_code": response.status_code,
+        "data": response_data,
+        "bytes": len(response.content),
+    }
+
+
+def _request_size(request: Request) -> int:
+    """请求体字节数（取自Content-Length，不重新序列化）"""
+    try:
+        return int(request.headers.get("content-length") or 0)
+    except ValueError:
+        return 0
+
+
 @router.post("/call", response_model=APIResponse)
 async def call_api(
     call_request: APICallRequest,
@@ -227,43 +340,33 @@ async def call_api(
     )
     start_time = datetime.now()
 
-    try:
-        # 获取API配置
-        # api_config = await get_api_config_from_db(call_request.api_name, tenant_id)
-
-        # 模拟API配置
-        api_configs = {
-            "binance_spot": {
-                "endpoint": "https://api.binance.com",
-                "api_type": "exchange",
-                "timeout": 30,
-            },
-            "openai_gpt4": {
-                "endpoint": "https://api.openai.com",
-                "api_type": "llm",
-                "timeout": 60,
-            },
-            "yahoo_finance": {
-                "endpoint": "https://query1.finance.yahoo.com",
-                "api_type": "datasource",
-                "timeout": 30,
-            },
-        }
+    # 路由表查找（内存字典，不访问数据库）；未知API直接404，不消耗配额
+    api_config = get_api_registry().lookup(tenant_id, call_request.api_name)
+    if not api_config:
+        raise HTTPException(
+            status_code=404, detail=f"API配置不存在: {call_request.api_name}"
+        )
 
-        api_config = api_configs.get(call_request.api_name)
-        if not api_config:
-            raise HTTPException(
-                status_code=404, detail=f"API配置不存在: {call_request.api_name}"
-            )
+    # 限流检查（在try之外，确保429直接返回给调用方）
+    await enforce_rate_limit(tenant_id, current_user, call_request.api_name)
 
-        # 构建请求URL
-        url = f"{api_config['endpoint']}{call_request.path}"
+    # 集群路由：配置了 service_type 的API由服务发现按负载均衡策略选择节点
+    node = None
+    service_type = api_config.config_data.get("service_type")
+    if service_type:
+        node = get_service_discovery().select(service_type, key=tenant_id)
+        if node is None:
+            raise HTTPException(status_code=503, detail=f"无可用节点: {service_type}")
 
+    # 构建请求URL（成功与失败记账使用同一上游地址）
+    url = f"{node.endpoint if node else api_config.endpoint}{call_request.path}"
+
+    try:
         # 准备请求参数
         request_kwargs = {
             "method": call_request.method,
             "url": url,
-            "timeout": api_config.get("timeout", 30),
+            "timeout": api_config.timeout,
         }
 
         if call_request.params:
@@ -275,36 +378,44 @@ async def call_api(
         if call_request.body and call_request.method in ["POST", "PUT", "PATCH"]:
             request_kwargs["json"] = call_request.body
 
-        # 执行API调用
-        async with httpx.AsyncClient() as client:
-            response = await client.request(**request_kwargs)
-            response_data = (
-                response.json()
-                if response.headers.get("content-type", "").startswith(
-                    "application/json"
-                )
-                else response.text
+        # 幂等GET走响应缓存：并发相同请求只发起一次上游调用
+        # 携带自定义请求头（可能含调用方凭证）的请求不共享缓存
+        if call_request.method.upper() == "GET" and not call_request.headers:
+            cache = get_response_cache()
+            cache_key = cache.build_key(
+                tenant_id, call_request.api_name, call_request.path, call_request.params
+            )
+            upstream = await cache.get_or_fetch(
+                cache_key,
+                call_request.api_name,
+                lambda: fetch_upstream(call_request.api_name, request_kwargs, node),
+                cacheable=lambda result: result["status_code"] < 400,
+                rule=cache.rule_for_route(call_request.api_name, api_config.config_data),
             )
+        else:
+            upstream = await fetch_upstream(call_request.api_name, request_kwargs, node)
+
+        status_code = upstream["status_code"]
+        response_data = upstream["data"]
 
         # 计算响应时间
         response_time = (datetime.now() - start_time).total_seconds() * 1000
 
-        # 记录API调用日志
-        log_data = {
-            "tenant_id": tenant_id,
-            "user_id": current_user["user_id"],
-            "api_name": call_request.api_name,
-            "method": call_request.method,
-            "endpoint": url,
-            "status_code": response.status_code,
-            "response_time": response_time,
-            "request_size": len(str(call_request.model_dump())),
-            "response_size": len(str(response_data)),
-            "created_at": datetime.now().isoformat(),
-        }
+        # 调用记账：字节数取自原始报文长度，落库由后台批量完成
+        get_usage_accountant().record(
+            tenant_id,
+            current_user["user_id"],
+            api_config.api_name,
+            call_request.method,
+            url,
+            status_code,
+            response_time,
+            request_size=_request_size(request),
+            response_size=upstream.get("bytes", 0),
+        )
 
         logger.info(
-            f"API调用完成 - Name: {call_request.api_name}, Status: {response.status_code}, Time: {response_time:.2f}ms"
+            f"API调用完成 - Name: {call_request.api_name}, Status: {status_code}, Time: {response_time:.2f}ms"
         )
 
         # 发布ZeroMQ消息
@@ -321,10 +432,36 @@ async def call_api(
             request_id=request_id,
         )
 
+    except CircuitOpenError as e:
+        retry_after = max(math.ceil(e.retry_after), 1)
+        logger.warning(f"熔断器打开，快速失败 - Name: {call_request.api_name}, RetryAfter: {retry_after}s")
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "success": False,
+                "message": "Circuit breaker is open",
+                "api_name": call_request.api_name,
+                "retry_after": retry_after,
+            },
+            headers={"Retry-After": str(retry_after)},
+        )
+
     except httpx.TimeoutException:
         error_msg = f"API调用超时: {call_request.api_name}"
         logger.error(error_msg)
 
+        get_usage_accountant().record(
+            tenant_id,
+            current_user["user_id"],
+            api_config.api_name,
+            call_request.method,
+            url,
+            504,
+            (datetime.now() - start_time).total_seconds() * 1000,
+            request_size=_request_size(request),
+            error_message=error_msg,
+        )
+
         return APIResponse(
             success=False,
             error=error_msg,
@@ -336,6 +473,18 @@ async def call_api(
         error_msg = f"API调用失败: {str(e)}"
         logger.error(error_msg)
 
+        get_usage_accountant().record(
+            tenant_id,
+            current_user["user_id"],
+            api_config.api_name,
+            call_request.method,
+            url,
+            getattr(e, "status_code", 0),
+            (datetime.now() - start_time).total_seconds() * 1000,
+            request_size=_request_size(request),
+            error_message=error_msg,
+        )
+
         # 发布错误消息
         # await zmq_manager.publish_message(
         #     MessageTopics.API_RESPONSE,
@@ -357,14 +506,11 @@ async def get_api_stats(
     current_user: Dict = Depends(get_current_user),
     tenant_id: str = Depends(get_tenant_id),
 ):
-    """获取API统计信息（示例返回静态数据）。"""
+    """获取API统计信息（读取内存汇总，不扫描日志表）"""
     try:
-        stats = {
-            "total_calls": 12345,
-            "success_rate": 0.98,
-            "avg_latency_ms": 123,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        }
+        stats = get_usage_accountant().get_stats(tenant_id, api_name)
+        stats["api_name"] = api_name
+        stats["timestamp"] = datetime.now(timezone.utc).isoformat()
         return stats
     except Exception as e:
         logger.error(f"获取API统计失败: {e}")
@@ -441,13 +587,7 @@ async def list_configs_compat(
     logger.info(
         f"[compat] Listing configs (/configs) for tenant={tenant_id} user={current_user.get('username')}"
     )
-    # 从 list_api_configs 的静态模拟中返回名称列表
-    configs = [
-        "binance_spot",
-        "openai_gpt4",
-        "yahoo_finance",
-    ]
-    return configs
+    return [route.api_name for route in get_api_registry().list_routes(tenant_id)]
 
 
 # 兼容历史测试路径：GET /api/call?api_id=xxx&...
@@ -16,6 +16,7 @@ from ..core.zmq_manager import ZMQManager, MessageTopics
 from ..core.sqlite_manager import SQLiteManager, Tables
 from ..security.auth import AuthManager, Permissions
 from ..config.settings import get_settings
+from ..dependencies import get_app_component
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
@@ -453,15 +454,23 @@ async def delete_api_key(
     current_user: Dict = Depends(get_current_user),
     tenant_id: str = Depends(get_tenant_id),
 ):
-    """删除API密钥"""
+    """删除API密钥 - 撤销后本节点与其他副本的凭证缓存同步失效"""
     try:
-        # 模拟删除API密钥
+        auth_manager = get_app_component("auth_manager")
+        if auth_manager is None:
+            raise HTTPException(status_code=503, detail="认证服务不可用")
+
+        if not await auth_manager.revoke_api_key(key_id, tenant_id):
+            raise HTTPException(status_code=404, detail=f"API密钥不存在: {key_id}")
+
         logger.info(
             f"API密钥删除成功 - KeyID: {key_id}, User: {current_user['username']}, Tenant: {tenant_id}"
         )
 
         return {"success": True, "message": "API密钥删除成功", "key_id": key_id}
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"删除API密钥失败: {e}")
         raise HTTPException(status_code=500, detail=str(e))
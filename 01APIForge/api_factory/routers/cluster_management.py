@@ -5,12 +5,10 @@
 核心功能：集群节点管理、负载均衡策略、服务注册与发现、健康监控
 """
 
-import logging
 import logging
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone, timedelta
 from enum import Enum
-import random
 from fastapi import APIRouter, HTTPException, Depends, Header, Request, BackgroundTasks
 from fastapi import status
 from pydantic import BaseModel, Field
@@ -20,10 +18,12 @@ import uuid
 
 from ..core.zmq_manager import ZMQManager, MessageTopics
 from ..core.sqlite_manager import SQLiteManager, Tables
+from ..core.service_discovery import LoadBalanceStrategy, NodeState, NodeStatus
 from ..config.settings import get_settings
 import inspect
 
 from ..dependencies import get_current_active_user as _get_current_active_user
+from ..dependencies import get_service_discovery
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -31,21 +31,6 @@ router = APIRouter()
 # 枚举定义
 
 
-class NodeStatus(str, Enum):
-    ACTIVE = "active"  # 活跃状态
-    INACTIVE = "inactive"  # 非活跃状态
-    MAINTENANCE = "maintenance"  # 维护状态
-    FAILED = "failed"  # 失败状态
-
-
-class LoadBalanceStrategy(str, Enum):
-    ROUND_ROBIN = "round_robin"  # 轮询
-    WEIGHTED_ROUND_ROBIN = "weighted_round_robin"  # 加权轮询
-    LEAST_CONNECTIONS = "least_connections"  # 最少连接
-    RANDOM = "random"  # 随机
-    IP_HASH = "ip_hash"  # IP哈希
-
-
 class ServiceType(str, Enum):
     API_GATEWAY = "api_gateway"
     AUTH_SERVICE = "auth_service"
@@ -82,6 +67,7 @@ class LoadBalanceConfigRequest(BaseModel):
 class ServiceDiscoveryRequest(BaseModel):
     service_type: ServiceType = Field(..., description="服务类型")
     client_ip: Optional[str] = Field(default=None, description="客户端IP（用于IP哈希）")
+    hash_key: Optional[str] = Field(default=None, description="一致性哈希键（如租户ID、会话ID）")
 
 
 # 响应模型
@@ -96,6 +82,7 @@ class NodeInfo(BaseModel):
     status: NodeStatus
     weight: int
     current_connections: int
+    reported_connections: Optional[int] = None
     total_requests: int
     success_rate: float
     avg_response_time: float
@@ -144,6 +131,43 @@ async def get_tenant_id(x_tenant_id: Optional[str] = Header(None)):
     return x_tenant_id or "default"
 
 
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+
+def _node_info(node: NodeState) -> NodeInfo:
+    return NodeInfo(
+        node_id=node.node_id,
+        node_name=node.node_name,
+        node_ip=node.host,
+        node_port=node.port,
+        service_type=node.service_type,
+        status=node.status,
+        weight=node.weight,
+        current_connections=node.in_flight,
+        reported_connections=node.reported_connections,
+        total_requests=node.total_requests,
+        success_rate=node.success_rate,
+        avg_response_time=node.ewma_latency_ms,
+        last_heartbeat=_iso(node.last_heartbeat),
+        metadata=node.metadata,
+        created_at=_iso(node.created_at),
+        updated_at=_iso(node.updated_at),
+    )
+
+
+def _service_endpoint(node: NodeState) -> ServiceEndpoint:
+    return ServiceEndpoint(
+        node_id=node.node_id,
+        node_name=node.node_name,
+        endpoint=node.endpoint,
+        weight=node.weight,
+        status=node.status,
+        response_time=node.ewma_latency_ms,
+        load_score=node.load_score(),
+    )
+
+
 # 节点管理端点
 @router.post("/nodes", response_model=Dict[str, Any])
 async def register_node(
@@ -153,41 +177,20 @@ async def register_node(
 ):
     """注册集群节点"""
     try:
-        # 生成节点ID
-        node_id = random.randint(1000, 9999)
-
-        # 构建节点信息
-        node_data = {
-            "node_id": node_id,
-            "tenant_id": tenant_id,
-            "node_name": node_request.node_name,
-            "node_ip": node_request.node_ip,
-            "node_port": node_request.node_port,
-            "service_type": node_request.service_type,
-            "status": NodeStatus.ACTIVE,
-            "weight": node_request.weight,
-            "current_connections": 0,
-            "total_requests": 0,
-            "success_rate": 1.0,
-            "avg_response_time": 0.0,
-            "last_heartbeat": datetime.now().isoformat(),
-            "metadata": node_request.metadata or {},
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-        }
+        node = get_service_discovery().register(
+            node_name=node_request.node_name,
+            host=node_request.node_ip,
+            port=node_request.node_port,
+            service_type=node_request.service_type.value,
+            weight=node_request.weight,
+            metadata=node_request.metadata,
+        )
+        node_data = {**_node_info(node).model_dump(mode="json"), "tenant_id": tenant_id}
 
-        # 模拟保存到数据库
         logger.info(
             f"节点注册成功 - Name: {node_request.node_name}, IP: {node_request.node_ip}:{node_request.node_port}, Type: {node_request.service_type}, Tenant: {tenant_id}"
         )
 
-        # 发布节点注册事件
-        # await zmq_manager.publish_message(
-        #     MessageTopics.CLUSTER_EVENT,
-        #     {"action": "node_registered", "node_id": node_id, "service_type": node_request.service_type},
-        #     tenant_id
-        # )
-
         return {"success": True, "message": "节点注册成功", "node_data": node_data}
 
     except Exception as e:
@@ -204,72 +207,15 @@ async def list_nodes(
 ):
     """获取集群节点列表"""
     try:
-        # 模拟节点数据
-        nodes = [
-            NodeInfo(
-                node_id=1001,
-                node_name="api-gateway-01",
-                node_ip="192.168.1.10",
-                node_port=8080,
-                service_type=ServiceType.API_GATEWAY,
-                status=NodeStatus.ACTIVE,
-                weight=10,
-                current_connections=25,
-                total_requests=1500,
-                success_rate=0.98,
-                avg_response_time=120.5,
-                last_heartbeat=datetime.now().isoformat(),
-                metadata={"version": "1.0.0", "region": "us-east-1"},
-                created_at="2024-01-01T10:00:00",
-                updated_at=datetime.now().isoformat(),
-            ),
-            NodeInfo(
-                node_id=1002,
-                node_name="auth-service-01",
-                node_ip="192.168.1.11",
-                node_port=8081,
-                service_type=ServiceType.AUTH_SERVICE,
-                status=NodeStatus.ACTIVE,
-                weight=8,
-                current_connections=15,
-                total_requests=800,
-                success_rate=0.99,
-                avg_response_time=85.2,
-                last_heartbeat=datetime.now().isoformat(),
-                metadata={"version": "1.0.0", "region": "us-east-1"},
-                created_at="2024-01-01T10:05:00",
-                updated_at=datetime.now().isoformat(),
-            ),
-            NodeInfo(
-                node_id=1003,
-                node_name="quota-service-01",
-                node_ip="192.168.1.12",
-                node_port=8082,
-                service_type=ServiceType.QUOTA_SERVICE,
-                status=NodeStatus.MAINTENANCE,
-                weight=5,
-                current_connections=0,
-                total_requests=500,
-                success_rate=0.95,
-                avg_response_time=200.1,
-                last_heartbeat=(datetime.now() - timedelta(minutes=5)).isoformat(),
-                metadata={"version": "0.9.5", "region": "us-east-1"},
-                created_at="2024-01-01T10:10:00",
-                updated_at=datetime.now().isoformat(),
-            ),
-        ]
-
-        # 过滤条件
-        if service_type:
-            nodes = [n for n in nodes if n.service_type == service_type]
-        if status:
-            nodes = [n for n in nodes if n.status == status]
+        nodes = get_service_discovery().list_nodes(
+            service_type.value if service_type else None, status
+        )
 
         logger.info(
             f"获取节点列表 - Count: {len(nodes)}, ServiceType: {service_type}, Status: {status}, Tenant: {tenant_id}"
         )
 
-        return nodes
+        return [_node_info(node) for node in nodes]
 
     except Exception as e:
         logger.error(f"获取节点列表失败: {e}")
@@ -284,29 +230,16 @@ async def get_node(
 ):
     """获取指定节点信息"""
     try:
-        # 模拟获取节点信息
-        node = NodeInfo(
-            node_id=node_id,
-            node_name="api-gateway-01",
-            node_ip="192.168.1.10",
-            node_port=8080,
-            service_type=ServiceType.API_GATEWAY,
-            status=NodeStatus.ACTIVE,
-            weight=10,
-            current_connections=25,
-            total_requests=1500,
-            success_rate=0.98,
-            avg_response_time=120.5,
-            last_heartbeat=datetime.now().isoformat(),
-            metadata={"version": "1.0.0", "region": "us-east-1"},
-            created_at="2024-01-01T10:00:00",
-            updated_at=datetime.now().isoformat(),
-        )
+        node = get_service_discovery().nodes.get(node_id)
+        if node is None:
+            raise HTTPException(status_code=404, detail=f"节点不存在: {node_id}")
 
         logger.info(f"获取节点信息 - NodeID: {node_id}, Tenant: {tenant_id}")
 
-        return node
+        return _node_info(node)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"获取节点信息失败: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -321,35 +254,34 @@ async def update_node(
 ):
     """更新节点信息"""
     try:
-        # 模拟更新节点
-        update_fields = {}
-        if node_update.status is not None:
-            update_fields["status"] = node_update.status
-        if node_update.weight is not None:
-            update_fields["weight"] = node_update.weight
-        if node_update.metadata is not None:
-            update_fields["metadata"] = node_update.metadata
+        node = get_service_discovery().update(
+            node_id,
+            status=node_update.status,
+            weight=node_update.weight,
+            metadata=node_update.metadata,
+        )
+        if node is None:
+            raise HTTPException(status_code=404, detail=f"节点不存在: {node_id}")
 
-        update_fields["updated_at"] = datetime.now().isoformat()
+        update_fields = [
+            name
+            for name in ("status", "weight", "metadata")
+            if getattr(node_update, name) is not None
+        ] + ["updated_at"]
 
         logger.info(
-            f"节点更新成功 - NodeID: {node_id}, Fields: {list(update_fields.keys())}, Tenant: {tenant_id}"
+            f"节点更新成功 - NodeID: {node_id}, Fields: {update_fields}, Tenant: {tenant_id}"
         )
 
-        # 发布节点更新事件
-        # await zmq_manager.publish_message(
-        #     MessageTopics.CLUSTER_EVENT,
-        #     {"action": "node_updated", "node_id": node_id, "updates": list(update_fields.keys())},
-        #     tenant_id
-        # )
-
         return {
             "success": True,
             "message": "节点更新成功",
             "node_id": node_id,
-            "updated_fields": list(update_fields.keys()),
+            "updated_fields": update_fields,
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"更新节点失败: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -363,18 +295,15 @@ async def unregister_node(
 ):
     """注销节点"""
     try:
-        # 模拟注销节点
-        logger.info(f"节点注销成功 - NodeID: {node_id}, Tenant: {tenant_id}")
+        if not get_service_discovery().unregister(node_id):
+            raise HTTPException(status_code=404, detail=f"节点不存在: {node_id}")
 
-        # 发布节点注销事件
-        # await zmq_manager.publish_message(
-        #     MessageTopics.CLUSTER_EVENT,
-        #     {"action": "node_unregistered", "node_id": node_id},
-        #     tenant_id
-        # )
+        logger.info(f"节点注销成功 - NodeID: {node_id}, Tenant: {tenant_id}")
 
         return {"success": True, "message": "节点注销成功", "node_id": node_id}
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"注销节点失败: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -387,24 +316,23 @@ async def node_heartbeat(
     current_user: Dict = Depends(get_current_user),
     tenant_id: str = Depends(get_tenant_id),
 ):
-    """节点心跳上报"""
+    """节点心跳上报 - 指标（latency_ms、in_flight、healthy）进入服务发现引擎"""
     try:
-        # 更新心跳时间和指标
-        heartbeat_data = {
-            "node_id": node_id,
-            "last_heartbeat": datetime.now().isoformat(),
-            "metrics": metrics or {},
-            "status": "healthy",
-        }
+        node = get_service_discovery().heartbeat(node_id, metrics)
+        if node is None:
+            raise HTTPException(status_code=404, detail=f"节点不存在: {node_id}")
 
         logger.debug(f"节点心跳 - NodeID: {node_id}, Tenant: {tenant_id}")
 
         return {
             "success": True,
             "message": "心跳接收成功",
+            "status": node.status,
             "next_heartbeat": (datetime.now() + timedelta(seconds=30)).isoformat(),
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"节点心跳失败: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -419,14 +347,20 @@ async def create_load_balance_config(
 ):
     """创建负载均衡配置"""
     try:
-        # 模拟创建负载均衡配置
+        discovery = get_service_discovery()
+        service_type = config_request.service_type.value
+        discovery.configure(
+            service_type, config_request.strategy, config_request.failure_threshold
+        )
+        nodes = discovery.list_nodes(service_type)
+
         config_data = {
             "service_type": config_request.service_type,
             "strategy": config_request.strategy,
             "health_check_interval": config_request.health_check_interval,
             "failure_threshold": config_request.failure_threshold,
-            "active_nodes": 0,
-            "total_nodes": 0,
+            "active_nodes": len(discovery.snapshot(service_type).nodes),
+            "total_nodes": len(nodes),
             "created_at": datetime.now().isoformat(),
             "updated_at": datetime.now().isoformat(),
         }
@@ -450,28 +384,22 @@ async def list_load_balance_configs(
 ):
     """获取负载均衡配置列表"""
     try:
-        # 模拟负载均衡配置
+        discovery = get_service_discovery()
+        now = datetime.now().isoformat()
         configs = [
             LoadBalanceConfig(
-                service_type=ServiceType.API_GATEWAY,
-                strategy=LoadBalanceStrategy.WEIGHTED_ROUND_ROBIN,
+                service_type=name,
+                strategy=strategy,
                 health_check_interval=30,
-                failure_threshold=3,
-                active_nodes=2,
-                total_nodes=3,
-                created_at="2024-01-01T10:00:00",
-                updated_at=datetime.now().isoformat(),
-            ),
-            LoadBalanceConfig(
-                service_type=ServiceType.AUTH_SERVICE,
-                strategy=LoadBalanceStrategy.LEAST_CONNECTIONS,
-                health_check_interval=60,
-                failure_threshold=5,
-                active_nodes=1,
-                total_nodes=2,
-                created_at="2024-01-01T10:05:00",
-                updated_at=datetime.now().isoformat(),
-            ),
+                failure_threshold=discovery.failure_thresholds.get(
+                    name, discovery.default_failure_threshold
+                ),
+                active_nodes=len(discovery.snapshot(name).nodes),
+                total_nodes=len(discovery.list_nodes(name)),
+                created_at=now,
+                updated_at=now,
+            )
+            for name, strategy in discovery.strategies.items()
         ]
 
         # 过滤条件
@@ -498,48 +426,24 @@ async def discover_service(
 ):
     """服务发现 - 根据负载均衡策略返回最佳节点"""
     try:
-        # 模拟可用节点
-        available_nodes = [
-            {
-                "node_id": 1001,
-                "node_name": "api-gateway-01",
-                "node_ip": "192.168.1.10",
-                "node_port": 8080,
-                "weight": 10,
-                "current_connections": 25,
-                "avg_response_time": 120.5,
-            },
-            {
-                "node_id": 1002,
-                "node_name": "api-gateway-02",
-                "node_ip": "192.168.1.11",
-                "node_port": 8080,
-                "weight": 8,
-                "current_connections": 15,
-                "avg_response_time": 95.2,
-            },
-        ]
-
-        # 简单的负载均衡选择（这里使用随机选择作为示例）
-        selected_node = random.choice(available_nodes)
-
-        # 构建服务端点
-        endpoint = ServiceEndpoint(
-            node_id=selected_node["node_id"],
-            node_name=selected_node["node_name"],
-            endpoint=f"http://{selected_node['node_ip']}:{selected_node['node_port']}",
-            weight=selected_node["weight"],
-            status=NodeStatus.ACTIVE,
-            response_time=selected_node["avg_response_time"],
-            load_score=selected_node["current_connections"] / selected_node["weight"],
+        selected_node = get_service_discovery().select(
+            discovery_request.service_type.value,
+            key=discovery_request.hash_key or discovery_request.client_ip,
         )
+        if selected_node is None:
+            raise HTTPException(
+                status_code=503,
+                detail=f"无可用节点: {discovery_request.service_type.value}",
+            )
 
         logger.info(
-            f"服务发现 - ServiceType: {discovery_request.service_type}, Selected: {selected_node['node_name']}, Tenant: {tenant_id}"
+            f"服务发现 - ServiceType: {discovery_request.service_type}, Selected: {selected_node.node_name}, Tenant: {tenant_id}"
         )
 
-        return endpoint
+        return _service_endpoint(selected_node)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"服务发现失败: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -554,40 +458,12 @@ async def get_service_endpoints(
 ):
     """获取指定服务类型的所有端点"""
     try:
-        # 模拟服务端点
-        endpoints = [
-            ServiceEndpoint(
-                node_id=1001,
-                node_name="api-gateway-01",
-                endpoint="http://192.168.1.10:8080",
-                weight=10,
-                status=NodeStatus.ACTIVE,
-                response_time=120.5,
-                load_score=2.5,
-            ),
-            ServiceEndpoint(
-                node_id=1002,
-                node_name="api-gateway-02",
-                endpoint="http://192.168.1.11:8080",
-                weight=8,
-                status=NodeStatus.ACTIVE,
-                response_time=95.2,
-                load_score=1.9,
-            ),
-            ServiceEndpoint(
-                node_id=1003,
-                node_name="api-gateway-03",
-                endpoint="http://192.168.1.12:8080",
-                weight=5,
-                status=NodeStatus.MAINTENANCE,
-                response_time=200.1,
-                load_score=0.0,
-            ),
-        ]
-
-        # 过滤非活跃节点
-        if not include_inactive:
-            endpoints = [e for e in endpoints if e.status == NodeStatus.ACTIVE]
+        discovery = get_service_discovery()
+        if include_inactive:
+            nodes = discovery.list_nodes(service_type.value)
+        else:
+            nodes = list(discovery.snapshot(service_type.value).nodes)
+        endpoints = [_service_endpoint(node) for node in nodes]
 
         logger.info(
             f"获取服务端点 - ServiceType: {service_type}, Count: {len(endpoints)}, IncludeInactive: {include_inactive}, Tenant: {tenant_id}"
@@ -607,39 +483,33 @@ async def get_cluster_stats(
 ):
     """获取集群统计信息"""
     try:
-        # 模拟集群统计数据
+        discovery_stats = get_service_discovery().get_stats()
+        nodes = list(get_service_discovery().nodes.values())
+        status_counts = discovery_stats["status_counts"]
+        total_requests = discovery_stats["total_requests"]
+
         stats = {
             "cluster_overview": {
-                "total_nodes": 8,
-                "active_nodes": 6,
-                "inactive_nodes": 1,
-                "maintenance_nodes": 1,
-                "failed_nodes": 0,
-            },
-            "service_distribution": {
-                "api_gateway": 3,
-                "auth_service": 2,
-                "quota_service": 2,
-                "data_service": 1,
+                "total_nodes": discovery_stats["total_nodes"],
+                "active_nodes": status_counts[NodeStatus.ACTIVE.value],
+                "inactive_nodes": status_counts[NodeStatus.INACTIVE.value],
+                "maintenance_nodes": status_counts[NodeStatus.MAINTENANCE.value],
+                "failed_nodes": status_counts[NodeStatus.FAILED.value],
             },
+            "service_distribution": discovery_stats["service_distribution"],
             "load_balance_stats": {
-                "total_requests": 15000,
-                "avg_response_time": 125.8,
-                "success_rate": 0.97,
-                "load_distribution": {
-                    "node_1001": 0.35,
-                    "node_1002": 0.28,
-                    "node_1003": 0.22,
-                    "node_1004": 0.15,
-                },
-            },
-            "health_metrics": {
-                "healthy_services": 6,
-                "degraded_services": 1,
-                "failed_services": 0,
-                "avg_cpu_usage": 0.65,
-                "avg_memory_usage": 0.72,
-                "network_throughput": "125.5 MB/s",
+                "total_requests": total_requests,
+                "avg_response_time": (
+                    sum(n.ewma_latency_ms for n in nodes) / len(nodes) if nodes else 0.0
+                ),
+                "success_rate": (
+                    sum(n.total_requests - n.failed_requests for n in nodes) / total_requests
+                    if total_requests
+                    else 1.0
+                ),
+                "load_distribution": discovery_stats["load_distribution"],
+                "selections": discovery_stats["selections"],
+                "no_available_node": discovery_stats["no_available_node"],
             },
             "last_updated": datetime.now().isoformat(),
         }
@@ -659,28 +529,28 @@ async def trigger_cluster_rebalance(
     current_user: Dict = Depends(get_current_user),
     tenant_id: str = Depends(get_tenant_id),
 ):
-    """触发集群重新平衡"""
+    """触发集群重新平衡 - 立即按最新延迟与健康状态重建选择快照"""
     try:
-        # 模拟集群重新平衡
+        discovery = get_service_discovery()
+        service_types = (
+            [service_type.value]
+            if service_type
+            else sorted({n.service_type for n in discovery.nodes.values()})
+        )
+        affected_nodes = sum(len(discovery.refresh(name).nodes) for name in service_types)
+
         rebalance_result = {
             "triggered_at": datetime.now().isoformat(),
             "service_type": service_type or "all",
-            "affected_nodes": 6,
-            "estimated_completion": (datetime.now() + timedelta(minutes=5)).isoformat(),
-            "status": "in_progress",
+            "affected_nodes": affected_nodes,
+            "estimated_completion": datetime.now().isoformat(),
+            "status": "completed",
         }
 
         logger.info(
             f"集群重新平衡触发 - ServiceType: {service_type or 'all'}, Tenant: {tenant_id}"
         )
 
-        # 发布重新平衡事件
-        # await zmq_manager.publish_message(
-        #     MessageTopics.CLUSTER_EVENT,
-        #     {"action": "rebalance_triggered", "service_type": service_type},
-        #     tenant_id
-        # )
-
         return {
             "success": True,
             "message": "集群重新平衡已触发",
@@ -719,150 +589,3 @@ async def health_check(request: Request):
     except Exception as e:
         logger.error(f"集群管理健康检查失败: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.get("/services/{service_type}/endpoints", response_model=List[ServiceEndpoint])
-async def get_service_endpoints(
-    service_type: ServiceType,
-    include_inactive: bool = False,
-    current_user: Dict = Depends(get_current_user),
-    tenant_id: str = Depends(get_tenant_id),
-):
-    """获取指定服务类型的所有端点"""
-    try:
-        # 模拟服务端点
-        endpoints = [
-            ServiceEndpoint(
-                node_id=1001,
-                node_name="api-gateway-01",
-                endpoint="http://192.168.1.10:8080",
-                weight=10,
-                status=NodeStatus.ACTIVE,
-                response_time=120.5,
-                load_score=2.5,
-            ),
-            ServiceEndpoint(
-                node_id=1002,
-                node_name="api-gateway-02",
-                endpoint="http://192.168.1.11:8080",
-                weight=8,
-                status=NodeStatus.ACTIVE,
-                response_time=95.2,
-                load_score=1.9,
-            ),
-            ServiceEndpoint(
-                node_id=1003,
-                node_name="api-gateway-03",
-                endpoint="http://192.168.1.12:8080",
-                weight=5,
-                status=NodeStatus.MAINTENANCE,
-                response_time=200.1,
-                load_score=0.0,
-            ),
-        ]
-
-        # 过滤非活跃节点
-        if not include_inactive:
-            endpoints = [e for e in endpoints if e.status == NodeStatus.ACTIVE]
-
-        logger.info(
-            f"获取服务端点 - ServiceType: {service_type}, Count: {len(endpoints)}, IncludeInactive: {include_inactive}, Tenant: {tenant_id}"
-        )
-
-        return endpoints
-
-    except Exception as e:
-        logger.error(f"获取服务端点失败: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.get("/cluster/stats", response_model=Dict[str, Any])
-async def get_cluster_stats(
-    current_user: Dict = Depends(get_current_user),
-    tenant_id: str = Depends(get_tenant_id),
-):
-    """获取集群统计信息"""
-    try:
-        # 模拟集群统计数据
-        stats = {
-            "cluster_overview": {
-                "total_nodes": 8,
-                "active_nodes": 6,
-                "inactive_nodes": 1,
-                "maintenance_nodes": 1,
-                "failed_nodes": 0,
-            },
-            "service_distribution": {
-                "api_gateway": 3,
-                "auth_service": 2,
-                "quota_service": 2,
-                "data_service": 1,
-            },
-            "load_balance_stats": {
-                "total_requests": 15000,
-                "avg_response_time": 125.8,
-                "success_rate": 0.97,
-                "load_distribution": {
-                    "node_1001": 0.35,
-                    "node_1002": 0.28,
-                    "node_1003": 0.22,
-                    "node_1004": 0.15,
-                },
-            },
-            "health_metrics": {
-                "healthy_services": 6,
-                "degraded_services": 1,
-                "failed_services": 0,
-                "avg_cpu_usage": 0.65,
-                "avg_memory_usage": 0.72,
-                "network_throughput": "125.5 MB/s",
-            },
-            "last_updated": datetime.now().isoformat(),
-        }
-
-        logger.info(f"获取集群统计信息 - Tenant: {tenant_id}")
-
-        return stats
-
-    except Exception as e:
-        logger.error(f"获取集群统计信息失败: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.post("/cluster/rebalance", response_model=Dict[str, Any])
-async def trigger_cluster_rebalance(
-    service_type: Optional[ServiceType] = None,
-    current_user: Dict = Depends(get_current_user),
-    tenant_id: str = Depends(get_tenant_id),
-):
-    """触发集群重新平衡"""
-    try:
-        # 模拟集群重新平衡
-        rebalance_result = {
-            "triggered_at": datetime.now().isoformat(),
-            "service_type": service_type or "all",
-            "affected_nodes": 6,
-            "estimated_completion": (datetime.now() + timedelta(minutes=5)).isoformat(),
-            "status": "in_progress",
-        }
-
-        logger.info(
-            f"集群重新平衡触发 - ServiceType: {service_type or 'all'}, Tenant: {tenant_id}"
-        )
-
-        # 发布重新平衡事件
-        # await zmq_manager.publish_message(
-        #     MessageTopics.CLUSTER_EVENT,
-        #     {"action": "rebalance_triggered", "service_type": service_type},
-        #     tenant_id
-        # )
-
-        return {
-            "success": True,
-            "message": "集群重新平衡已触发",
-            "rebalance_info": rebalance_result,
-        }
-
-    except Exception as e:
-        logger.error(f"触发集群重新平衡失败: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
@@ -11,15 +11,18 @@ from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, HTTPException, Depends, Header, BackgroundTasks, Request
 from pydantic import BaseModel, Field
 from enum import Enum
+from dataclasses import replace as dataclass_replace
 
 from ..core.zmq_manager import ZMQManager, MessageTopics
 from ..core.sqlite_manager import SQLiteManager, Tables
+from ..core.rate_limiter import RateLimitAlgorithm, RateLimitRule
 from ..config.settings import get_settings
 from .. import main as main_app
 import inspect
 from fastapi import status
 import uuid
 from ..dependencies import get_current_active_user as _get_current_active_user
+from ..dependencies import get_rate_limiter, get_circuit_breakers
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -48,6 +51,8 @@ class QuotaCreateRequest(BaseModel):
     quota_type: QuotaType = Field(..., description="配额类型")
     limit_value: int = Field(..., gt=0, description="限制值")
     user_id: Optional[int] = Field(default=None, description="用户ID（为空则为全局配额）")
+    algorithm: Optional[RateLimitAlgorithm] = Field(default=None, description="限流算法（为空则使用默认算法）")
+    burst: Optional[int] = Field(default=None, gt=0, description="令牌桶容量（仅token_bucket）")
 
 
 class QuotaUpdateRequest(BaseModel):
@@ -139,6 +144,16 @@ async def create_quota(
             )
             window_seconds = 2592000  # 30天
 
+        # 注册限流规则，立即对 call_api 生效
+        limiter = get_rate_limiter()
+        rule = RateLimitRule(
+            limit=quota_request.limit_value,
+            window_seconds=window_seconds,
+            algorithm=quota_request.algorithm or limiter.default_rule.algorithm,
+            burst=quota_request.burst,
+        )
+        limiter.set_rule(quota_request.api_name, rule, tenant_id=tenant_id)
+
         # 模拟保存配额配置
         quota_data = {
             "quota_id": 1,  # 模拟生成的ID
@@ -148,6 +163,7 @@ async def create_quota(
             "quota_type": quota_request.quota_type,
             "limit_value": quota_request.limit_value,
             "window_seconds": window_seconds,
+            "algorithm": rule.algorithm.value,
             "current_usage": 0,
             "reset_at": reset_at.isoformat(),
             "created_at": now.isoformat(),
@@ -369,32 +385,27 @@ async def check_rate_limit(
     current_user: Dict = Depends(get_current_user),
     tenant_id: str = Depends(get_tenant_id),
 ):
-    """检查API调用是否超过限流"""
+    """检查API调用是否超过限流（消耗一次额度）"""
     try:
-        # 模拟限流检查
         api_name = check_request.api_name
-        user_id = check_request.user_id or current_user["user_id"]
-
-        # 模拟当前使用量
-        current_usage = 25
-        limit_value = 60
-        remaining = limit_value - current_usage
+        user_id = check_request.user_id or current_user.get("user_id")
 
-        is_allowed = remaining > 0
+        limiter = get_rate_limiter()
+        rule = limiter.get_rule(api_name, tenant_id)
+        check = await limiter.check(tenant_id, user_id, api_name, rule=rule)
 
         result = {
-            "allowed": is_allowed,
             "api_name": api_name,
-            "current_usage": current_usage,
-            "limit_value": limit_value,
-            "remaining": remaining,
-            "reset_at": (datetime.now() + timedelta(minutes=1)).isoformat(),
-            "retry_after": None if is_allowed else 60,
+            **check.to_dict(),
+            "window_seconds": rule.window_seconds,
+            "reset_at": (
+                datetime.now() + timedelta(seconds=check.retry_after or rule.window_seconds)
+            ).isoformat(),
         }
 
-        if not is_allowed:
+        if not check.allowed:
             logger.warning(
-                f"API限流触发 - API: {api_name}, User: {user_id}, Usage: {current_usage}/{limit_value}, Tenant: {tenant_id}"
+                f"API限流触发 - API: {api_name}, User: {user_id}, Usage: {check.current_usage}/{check.limit}, Tenant: {tenant_id}"
             )
 
             # 发布限流告警
@@ -420,15 +431,20 @@ async def create_circuit_breaker(
 ):
     """创建熔断器配置"""
     try:
-        # 模拟创建熔断器配置
+        registry = get_circuit_breakers()
+        breaker_config = dataclass_replace(
+            registry.default_config,
+            failure_threshold=config_request.failure_threshold,
+            timeout_seconds=config_request.timeout_seconds,
+            half_open_max_calls=config_request.half_open_max_calls,
+        )
+        breaker = registry.configure(config_request.service_name, breaker_config)
         circuit_config = {
+            **breaker.get_status()["config"],
             "service_name": config_request.service_name,
-            "failure_threshold": config_request.failure_threshold,
-            "timeout_seconds": config_request.timeout_seconds,
-            "half_open_max_calls": config_request.half_open_max_calls,
-            "state": CircuitState.CLOSED,
-            "failure_count": 0,
-            "success_count": 0,
+            "state": breaker.state,
+            "failure_count": breaker.failure_count,
+            "success_count": breaker.success_count,
             "created_at": datetime.now().isoformat(),
         }
 
@@ -443,6 +459,17 @@ async def create_circuit_breaker(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _to_status(status_data: Dict[str, Any]) -> CircuitBreakerStatus:
+    return CircuitBreakerStatus(
+        service_name=status_data["service_name"],
+        state=CircuitState(status_data["state"]),
+        failure_count=status_data["failure_count"],
+        last_failure_time=status_data["last_failure_time"],
+        next_attempt_time=status_data["next_attempt_time"],
+        success_count=status_data["success_count"],
+    )
+
+
 @router.get("/circuit-breaker", response_model=List[CircuitBreakerStatus])
 async def list_circuit_breakers(
     service_name: Optional[str] = None,
@@ -451,32 +478,9 @@ async def list_circuit_breakers(
 ):
     """获取熔断器状态列表"""
     try:
-        # 模拟熔断器状态
         circuit_breakers = [
-            CircuitBreakerStatus(
-                service_name="binance_api",
-                state=CircuitState.CLOSED,
-                failure_count=1,
-                last_failure_time="2024-01-01T10:00:00",
-                next_attempt_time=None,
-                success_count=150,
-            ),
-            CircuitBreakerStatus(
-                service_name="openai_api",
-                state=CircuitState.HALF_OPEN,
-                failure_count=3,
-                last_failure_time="2024-01-01T11:30:00",
-                next_attempt_time="2024-01-01T12:30:00",
-                success_count=2,
-            ),
-            CircuitBreakerStatus(
-                service_name="yahoo_api",
-                state=CircuitState.OPEN,
-                failure_count=5,
-                last_failure_time="2024-01-01T11:45:00",
-                next_attempt_time="2024-01-01T12:45:00",
-                success_count=0,
-            ),
+            _to_status(status_data)
+            for status_data in get_circuit_breakers().list_status()
         ]
 
         # 过滤条件
@@ -502,14 +506,8 @@ async def get_circuit_breaker(
 ):
     """获取指定服务的熔断器状态"""
     try:
-        # 模拟获取熔断器状态
-        circuit_breaker = CircuitBreakerStatus(
-            service_name=service_name,
-            state=CircuitState.CLOSED,
-            failure_count=1,
-            last_failure_time="2024-01-01T10:00:00",
-            next_attempt_time=None,
-            success_count=150,
+        circuit_breaker = _to_status(
+            get_circuit_breakers().get(service_name).get_status()
         )
 
         logger.info(
@@ -529,23 +527,18 @@ async def reset_circuit_breaker(
     current_user: Dict = Depends(get_current_user),
     tenant_id: str = Depends(get_tenant_id),
 ):
-    """重置熔断器状态"""
+    """重置熔断器状态（广播到所有副本）"""
     try:
-        # 模拟重置熔断器
-        logger.info(f"熔断器重置成功 - Service: {service_name}, Tenant: {tenant_id}")
+        breaker = get_circuit_breakers().get(service_name)
+        breaker.reset()
 
-        # 发布熔断器事件
-        # await zmq_manager.publish_message(
-        #     MessageTopics.CIRCUIT_BREAKER,
-        #     {"action": "circuit_reset", "service_name": service_name},
-        #     tenant_id
-        # )
+        logger.info(f"熔断器重置成功 - Service: {service_name}, Tenant: {tenant_id}")
 
         return {
             "success": True,
             "message": "熔断器重置成功",
             "service_name": service_name,
-            "new_state": CircuitState.CLOSED,
+            "new_state": CircuitState(breaker.state),
         }
 
     except Exception as e:
@@ -560,26 +553,30 @@ async def test_circuit_breaker(
     current_user: Dict = Depends(get_current_user),
     tenant_id: str = Depends(get_tenant_id),
 ):
-    """测试熔断器（模拟成功/失败调用）"""
+    """测试熔断器（记录一次模拟成功/失败调用）"""
     try:
-        # 模拟测试熔断器
-        if success:
-            result = {
-                "success": True,
-                "message": "模拟成功调用",
-                "service_name": service_name,
-                "action": "success_recorded",
-            }
-        else:
-            result = {
-                "success": False,
-                "message": "模拟失败调用",
-                "service_name": service_name,
-                "action": "failure_recorded",
-            }
+        breaker = get_circuit_breakers().get(service_name)
+        allowed = breaker.allow_request()
+        if allowed:
+            if success:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+
+        result = {
+            "success": success,
+            "message": "模拟成功调用" if success else "模拟失败调用",
+            "service_name": service_name,
+            "action": (
+                "rejected"
+                if not allowed
+                else ("success_recorded" if success else "failure_recorded")
+            ),
+            "state": breaker.state,
+        }
 
         logger.info(
-            f"熔断器测试 - Service: {service_name}, Success: {success}, Tenant: {tenant_id}"
+            f"熔断器测试 - Service: {service_name}, Success: {success}, State: {breaker.state}, Tenant: {tenant_id}"
         )
 
         return result
@@ -607,20 +604,14 @@ async def get_quota_circuit_stats(
                     {"api_name": "openai_gpt4", "violations": 2},
                 ],
             },
-            "circuit_breaker_stats": {
-                "total_services": 8,
-                "healthy_services": 6,
-                "open_circuits": 1,
-                "half_open_circuits": 1,
-                "total_failures_today": 12,
-                "recovery_attempts": 3,
-            },
+            "circuit_breaker_stats": get_circuit_breakers().get_stats(),
             "performance_metrics": {
                 "avg_response_time": 245.5,
                 "success_rate": 0.96,
                 "total_requests_today": 2500,
                 "blocked_requests": 45,
             },
+            "rate_limiter": get_rate_limiter().get_stats(),
             "last_updated": datetime.now().isoformat(),
         }
 
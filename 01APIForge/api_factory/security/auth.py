@@ -16,6 +16,12 @@ from fastapi import HTTPException, status
 from ..config.settings import AuthConfig
 from ..core.sqlite_manager import SQLiteManager, Tables
 from ..core.redis_manager import RedisManager
+from .credential_cache import (
+    CredentialCache,
+    LastUsedBatcher,
+    REVOCATION_CHANNEL,
+    credential_hash,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +35,13 @@ class AuthManager:
         self.sqlite_manager: Optional[SQLiteManager] = None
         self.redis_manager: Optional[RedisManager] = None
 
+        # 已验证凭证缓存与 last_used 批量写入
+        self.credential_cache = CredentialCache(
+            ttl_seconds=config.credential_cache_ttl_seconds,
+            max_entries=config.credential_cache_max_entries,
+        )
+        self.last_used_batcher = LastUsedBatcher(None, config.last_used_flush_seconds)
+
         # 统计信息
         self.stats = {
             "authentications": 0,
@@ -41,6 +54,10 @@ class AuthManager:
     async def initialize(self):
         """初始化认证管理器"""
         try:
+            # 撤销事件订阅与 last_used 定期刷写
+            await self.credential_cache.start_listener(self.redis_manager)
+            self.last_used_batcher.start()
+
             self.stats["start_time"] = datetime.now()
             logger.info("认证管理器初始化完成")
 
@@ -52,6 +69,7 @@ class AuthManager:
         """设置依赖的管理器"""
         self.sqlite_manager = sqlite_manager
         self.redis_manager = redis_manager
+        self.last_used_batcher.sqlite_manager = sqlite_manager
 
     def hash_password(self, password: str) -> str:
         """密码哈希"""
@@ -257,7 +275,12 @@ class AuthManager:
             raise
 
     async def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
-        """验证令牌"""
+        """验证令牌（命中本地缓存时不做解码和Redis查询）"""
+        cache_key = f"jwt:{credential_hash(token)}"
+        cached = self.credential_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             payload = jwt.decode(
                 token, self.config.secret_key, algorithms=[self.config.algorithm]
@@ -277,13 +300,16 @@ class AuthManager:
                 if is_revoked:
                     return None
 
-            return {
+            token_data = {
                 "user_id": int(user_id),
                 "username": payload.get("username"),
                 "role": payload.get("role"),
                 "tenant_id": tenant_id,
                 "token_type": token_type,
             }
+            self.credential_cache.put(cache_key, token_data, payload.get("exp"))
+
+            return token_data
 
         except JWTError as e:
             logger.warning(f"令牌验证失败: {e}")
@@ -307,6 +333,9 @@ class AuthManager:
                 tenant_id=tenant_id,
             )
 
+            # 本地失效并广播到其他副本
+            await self._broadcast_revocation("jwt", credential_hash(token))
+
             self.stats["tokens_revoked"] += 1
 
             return True
@@ -315,6 +344,38 @@ class AuthManager:
             logger.error(f"撤销令牌失败: {e}")
             return False
 
+    async def _broadcast_revocation(self, kind: str, digest: str):
+        """使本地缓存失效，并通过Redis通知其他副本"""
+        self.credential_cache.invalidate(f"{kind}:{digest}")
+        if self.redis_manager:
+            await self.redis_manager.publish_message(
+                REVOCATION_CHANNEL, {"kind": kind, "hash": digest}
+            )
+
+    async def revoke_api_key(self, key_id: int, tenant_id: str) -> bool:
+        """撤销API密钥"""
+        try:
+            if not self.sqlite_manager:
+                raise RuntimeError("SQLite管理器未设置")
+
+            keys = await self.sqlite_manager.get_records(
+                Tables.API_KEYS, "id = ? AND tenant_id = ?", (key_id, tenant_id)
+            )
+            if not keys:
+                return False
+
+            await self.sqlite_manager.update_record(
+                Tables.API_KEYS, {"status": "revoked"}, "id = ?", (key_id,)
+            )
+            await self._broadcast_revocation("key", keys[0]["key_hash"])
+
+            logger.info(f"API密钥已撤销 - ID: {key_id}, Tenant: {tenant_id}")
+            return True
+
+        except Exception as e:
+            logger.error(f"撤销API密钥失败: {e}")
+            return False
+
     async def create_api_key(
         self,
         tenant_id: str,
@@ -372,6 +433,12 @@ class AuthManager:
                 raise RuntimeError("SQLite管理器未设置")
 
             key_hash = self.hash_api_key(api_key)
+            cache_key = f"key:{key_hash}"
+
+            cached = self.credential_cache.get(cache_key)
+            if cached is not None:
+                self.last_used_batcher.mark(cached["key_id"])
+                return cached
 
             # 查找API密钥
             keys = await self.sqlite_manager.get_records(
@@ -384,20 +451,17 @@ class AuthManager:
             key_info = keys[0]
 
             # 检查过期时间
+            key_expires_at = None
             if key_info["expires_at"]:
                 expires_at = datetime.fromisoformat(key_info["expires_at"])
                 if datetime.now() > expires_at:
                     return None
+                key_expires_at = expires_at.timestamp()
 
-            # 更新最后使用时间
-            await self.sqlite_manager.update_record(
-                Tables.API_KEYS,
-                {"last_used": datetime.now().isoformat()},
-                "id = ?",
-                (key_info["id"],),
-            )
+            # 最后使用时间合并后批量写入，不在请求路径上写库
+            self.last_used_batcher.mark(key_info["id"])
 
-            return {
+            key_data = {
                 "key_id": key_info["id"],
                 "user_id": key_info["user_id"],
                 "tenant_id": key_info["tenant_id"],
@@ -406,6 +470,9 @@ class AuthManager:
                 if key_info["permissions"]
                 else [],
             }
+            self.credential_cache.put(cache_key, key_data, key_expires_at)
+
+            return key_data
 
         except Exception as e:
             logger.error(f"验证API密钥失败: {e}")
@@ -475,11 +542,18 @@ class AuthManager:
         if self.stats["start_time"]:
             uptime = (datetime.now() - self.stats["start_time"]).total_seconds()
 
-        return {**self.stats, "uptime_seconds": uptime}
+        return {
+            **self.stats,
+            "uptime_seconds": uptime,
+            "credential_cache": self.credential_cache.get_stats(),
+            "last_used_batcher": dict(self.last_used_batcher.stats),
+        }
 
     async def cleanup(self):
         """清理资源"""
         try:
+            await self.credential_cache.stop_listener()
+            await self.last_used_batcher.stop()
             logger.info("认证管理器已清理")
         except Exception as e:
             logger.error(f"认证管理器清理失败: {e}")
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+凭证验证缓存 - 认证热路径去I/O
+核心设计理念：按凭证哈希缓存验证结果、有效期受凭证自身过期时间约束、撤销事件实时失效
+
+- CredentialCache: 进程内已验证凭证缓存（JWT与API密钥），通过Redis发布订阅接收撤销事件
+- LastUsedBatcher: 合并API密钥 last_used 更新，定期批量写入SQLite
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from ..core.pubsub_sync import PubSubListener
+from ..core.sqlite_manager import Tables
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_CHANNEL = "auth:revocations"
+
+
+def credential_hash(credential: str) -> str:
+    """凭证哈希 - 缓存键与撤销事件中只出现哈希，不出现明文"""
+    return hashlib.sha256(credential.encode("utf-8")).hexdigest()
+
+
+class CredentialCache:
+    """已验证凭证缓存"""
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 50000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+
+        # 统计信息
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "revocation_events": 0,
+        }
+        self._listener = PubSubListener(REVOCATION_CHANNEL, self.apply_revocation, "凭证撤销")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """读取缓存的验证结果（返回副本，避免调用方修改缓存）"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        data, expires_at = entry
+        if expires_at <= time.time():
+            self._entries.pop(key, None)
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return dict(data)
+
+    def put(self, key: str, data: Dict[str, Any], credential_expires_at: Optional[float] = None):
+        """写入验证结果 - 有效期取缓存TTL与凭证过期时间的较小值"""
+        expires_at = time.time() + self.ttl_seconds
+        if credential_expires_at is not None:
+            expires_at = min(expires_at, credential_expires_at)
+        if expires_at <= time.time():
+            return
+        self._entries[key] = (dict(data), expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> bool:
+        """使单个凭证失效"""
+        removed = self._entries.pop(key, None) is not None
+        if removed:
+            self.stats["invalidations"] += 1
+        return removed
+
+    def clear(self):
+        self._entries.clear()
+
+    def apply_revocation(self, event: Dict[str, Any]):
+        """应用撤销事件：{"kind": "jwt"|"key", "hash": <sha256>}"""
+        kind = event.get("kind")
+        digest = event.get("hash")
+        if not kind or not digest:
+            return
+        self.stats["revocation_events"] += 1
+        self.invalidate(f"{kind}:{digest}")
+
+    async def start_listener(self, redis_manager: Any):
+        """订阅撤销频道"""
+        await self._listener.start(redis_manager)
+
+    async def stop_listener(self):
+        await self._listener.stop()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+        }
+
+
+class LastUsedBatcher:
+    """API密钥 last_used 批量更新器"""
+
+    UPDATE_SQL = f"UPDATE {Tables.API_KEYS} SET last_used = ? WHERE id = ?"
+
+    def __init__(self, sqlite_manager: Any, interval_seconds: float = 5.0):
+        self.sqlite_manager = sqlite_manager
+        self.interval_seconds = interval_seconds
+        self._pending: Dict[Any, str] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        # 统计信息
+        self.stats = {"marked": 0, "flushes": 0, "rows_written": 0, "errors": 0}
+
+    def mark(self, key_id: Any, when: Optional[datetime] = None):
+        """记录一次使用（同一密钥在一个周期内只保留最后一次）"""
+        self._pending[key_id] = (when or datetime.now()).isoformat()
+        self.stats["marked"] += 1
+
+    async def flush(self) -> int:
+        """将待写入的 last_used 一次性批量写入"""
+        if not self._pending or self.sqlite_manager is None:
+            return 0
+        pending, self._pending = self._pending, {}
+        rows = [(used_at, key_id) for key_id, used_at in pending.items()]
+        try:
+            await self.sqlite_manager.execute_many(self.UPDATE_SQL, rows)
+            self.stats["flushes"] += 1
+            self.stats["rows_written"] += len(rows)
+            return len(rows)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"批量更新API密钥last_used失败: {e}")
+            # 写入失败时放回，较新的记录优先
+            for key_id, used_at in pending.items():
+                self._pending.setdefault(key_id, used_at)
+            return 0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.sleep(self.interval_seconds)
+                await self.flush()
+            except asyncio.CancelledError:
+                break
+
+    async def stop(self):
+        """停止后台任务并写入剩余记录"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
@@ -159,6 +159,18 @@ def _stop_global_patches():
         pass
 
 
+@pytest.fixture()
+def real_sqlite_manager_cls():
+    """未被全局patch替换的 SQLiteManager 类（用于基于临时数据库的测试）"""
+    return _patch_sqlite.temp_original
+
+
+@pytest.fixture()
+def real_auth_manager_cls():
+    """未被全局patch替换的 AuthManager 类（用于验证真实认证逻辑的测试）"""
+    return _patch_auth.temp_original
+
+
 @pytest.fixture()
 def mock_zmq_manager() -> DummyZMQManager:
     """Provide a fresh DummyZMQManager instance per test when needed."""
@@ -0,0 +1,191 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from api_factory.config.settings import SQLiteConfig
+from api_factory.core.sqlite_manager import Tables
+from api_factory.core.api_registry import APIConfigRegistry, APIRoute
+
+
+class TestAPIConfigRegistry:
+    """API配置注册表测试类"""
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_load_and_upsert_persist_routes(self, event_loop):
+        """启动时从数据库加载；新增配置先写库再进入路由表"""
+        sqlite = AsyncMock()
+        sqlite.get_records.return_value = [
+            {
+                "id": 7,
+                "tenant_id": "acme",
+                "api_name": "okx",
+                "api_type": "exchange",
+                "endpoint": "https://www.okx.com/",
+                "config_data": '{"timeout": 10}',
+                "status": "active",
+            }
+        ]
+        sqlite.insert_record.return_value = 8
+        registry = APIConfigRegistry(sqlite)
+
+        assert event_loop.run_until_complete(registry.load()) == 1
+        route = registry.lookup("acme", "okx")
+        assert route.endpoint == "https://www.okx.com"
+        assert route.timeout == 10
+        assert registry.lookup("other", "okx") is None, "租户配置对其他租户不可见"
+
+        created = event_loop.run_until_complete(
+            registry.upsert(APIRoute("acme", "bybit", "exchange", "https://api.bybit.com"))
+        )
+        assert created.id == 8
+        table, record = sqlite.insert_record.await_args.args
+        assert table == Tables.API_CONFIGS
+        assert record["api_name"] == "bybit"
+
+        event_loop.run_until_complete(
+            registry.upsert(APIRoute("acme", "okx", "exchange", "https://aws.okx.com"))
+        )
+        sqlite.update_record.assert_awaited_once()
+        assert registry.lookup("acme", "okx").endpoint == "https://aws.okx.com"
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_lookup_does_no_database_io(self, event_loop):
+        """热路径查找只读内存路由表"""
+        sqlite = AsyncMock()
+        registry = APIConfigRegistry(sqlite)
+
+        for _ in range(100):
+            assert registry.lookup("acme", "binance_spot") is not None
+
+        assert sqlite.mock_calls == []
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_swap_is_copy_on_write(self, event_loop):
+        """变更替换整张表，已取得的旧表不受影响"""
+        registry = APIConfigRegistry()
+        before = registry._table
+
+        event_loop.run_until_complete(
+            registry.upsert(APIRoute("acme", "binance_spot", "exchange", "https://testnet.binance.vision"))
+        )
+
+        assert before[("default", "binance_spot")].endpoint == "https://api.binance.com"
+        assert ("acme", "binance_spot") not in before
+        assert registry.lookup("acme", "binance_spot").endpoint == "https://testnet.binance.vision"
+        assert registry.lookup("default", "binance_spot").endpoint == "https://api.binance.com"
+
+        event_loop.run_until_complete(registry.remove("acme", "binance_spot"))
+        assert registry.lookup("acme", "binance_spot").endpoint == "https://api.binance.com"
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_remote_events_update_replica(self, event_loop):
+        """其他副本广播的变更按路由键从数据库回读，自身事件被忽略"""
+        sqlite = AsyncMock()
+        sqlite.get_records.return_value = [
+            {
+                "tenant_id": "acme",
+                "api_name": "okx",
+                "api_type": "exchange",
+                "endpoint": "https://www.okx.com",
+                "config_data": '{"api_key": "secret"}',
+            }
+        ]
+        registry = APIConfigRegistry(sqlite)
+        event = {"action": "upsert", "tenant_id": "acme", "api_name": "okx"}
+
+        event_loop.run_until_complete(registry.apply_remote_event({"node_id": registry.node_id, **event}))
+        assert registry.lookup("acme", "okx") is None
+        sqlite.get_records.assert_not_awaited()
+
+        event_loop.run_until_complete(registry.apply_remote_event({"node_id": "other", **event}))
+        assert registry.lookup("acme", "okx").config_data["api_key"] == "secret"
+
+        sqlite.get_records.return_value = []
+        event_loop.run_until_complete(
+            registry.apply_remote_event(
+                {"node_id": "other", "action": "delete", "tenant_id": "acme", "api_name": "okx"}
+            )
+        )
+        assert registry.lookup("acme", "okx") is None
+        assert registry.stats["events_received"] == 2
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_published_events_carry_no_credentials(self, event_loop):
+        """广播事件只含路由键，不含配置内容"""
+        redis_manager = AsyncMock()
+        registry = APIConfigRegistry(None, redis_manager)
+
+        event_loop.run_until_complete(
+            registry.upsert(APIRoute("acme", "okx", "exchange", "https://www.okx.com", config_data={"api_key": "secret"}))
+        )
+
+        channel, event = redis_manager.publish_message.await_args.args
+        assert event == {"node_id": registry.node_id, "action": "upsert", "tenant_id": "acme", "api_name": "okx"}
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_upsert_creates_missing_tenant_and_builtins_are_not_removable(
+        self, real_sqlite_manager_cls, event_loop, tmp_path
+    ):
+        """租户记录不存在时自动补齐（满足外键）；内置路由删除返回False"""
+        manager = real_sqlite_manager_cls(
+            SQLiteConfig(database_path=str(tmp_path / "registry.db"), backup_path="", reader_pool_size=0)
+        )
+        event_loop.run_until_complete(manager.initialize())
+        try:
+            registry = APIConfigRegistry(manager)
+            for tenant_id in ("default", "acme"):
+                route = event_loop.run_until_complete(
+                    registry.upsert(APIRoute(tenant_id, "okx", "exchange", "https://www.okx.com"))
+                )
+                assert route.id is not None
+
+            tenants = event_loop.run_until_complete(manager.get_records(Tables.TENANTS))
+            assert sorted(t["tenant_id"] for t in tenants) == ["acme", "default"]
+
+            assert event_loop.run_until_complete(registry.remove("default", "binance_spot")) is False
+            assert registry.lookup("default", "binance_spot") is not None
+        finally:
+            event_loop.run_until_complete(manager.cleanup())
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_call_api_uses_registered_route(self, client, mock_auth_manager, valid_user_data):
+        """新建的租户配置立即用于 call_api 路由"""
+        mock_auth_manager.verify_token.return_value = valid_user_data
+        registry = APIConfigRegistry()
+        headers = {"Authorization": "Bearer valid_token", "X-Tenant-ID": "acme"}
+
+        with patch("api_factory.main.auth_manager", mock_auth_manager):
+            with patch("api_factory.main.api_registry", registry):
+                created = client.post(
+                    "/api/config",
+                    headers=headers,
+                    json={
+                        "api_name": "okx",
+                        "api_type": "exchange",
+                        "endpoint": "https://www.okx.com/",
+                        "config_data": {"timeout": 5, "api_key": "secret"},
+                    },
+                )
+                assert created.status_code == 200
+                assert created.json()["config_data"]["api_key"] == "***"
+
+                with patch("httpx.AsyncClient.request", new_callable=AsyncMock) as upstream:
+                    upstream.return_value.status_code = 200
+                    upstream.return_value.headers = {"content-type": "text/plain"}
+                    upstream.return_value.text = "ok"
+                    response = client.post(
+                        "/api/call",
+                        headers=headers,
+                        json={"api_name": "okx", "method": "POST", "path": "/api/v5/public/time"},
+                    )
+
+                assert response.json()["success"] is True
+                kwargs = upstream.await_args.kwargs
+                assert kwargs["url"] == "https://www.okx.com/api/v5/public/time"
+                assert kwargs["timeout"] == 5
@@ -0,0 +1,181 @@
+import asyncio
+import json
+
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from api_factory.config.settings import APIConfig
+from api_factory.core.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+)
+from api_factory.routers.api_gateway import fetch_upstream
+
+
+class TestCircuitBreaker:
+    """熔断器状态机测试类"""
+
+    @pytest.mark.unit
+    @pytest.mark.quota
+    def test_trips_on_error_rate_after_minimum_calls(self):
+        """窗口内调用数达到最小样本且错误率超阈值时打开"""
+        breaker = CircuitBreaker(
+            "binance_spot", CircuitBreakerConfig(failure_threshold=4, failure_rate_threshold=0.5)
+        )
+
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED, "样本不足时不应打开"
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow_request() is False
+        with pytest.raises(CircuitOpenError):
+            breaker.acquire()
+        assert breaker.rejected_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.quota
+    def test_trips_on_slow_call_rate(self):
+        """慢调用率超阈值时打开"""
+        breaker = CircuitBreaker(
+            "binance_spot",
+            CircuitBreakerConfig(
+                failure_threshold=3, slow_call_duration_ms=100, slow_call_rate_threshold=0.6
+            ),
+        )
+        breaker.record_success(10)
+        breaker.record_success(500)
+        breaker.record_success(800)
+        assert breaker.state == CircuitBreaker.OPEN
+
+    @pytest.mark.unit
+    @pytest.mark.quota
+    def test_half_open_limits_probes_and_recovers(self):
+        """半开状态限制探测并发，探测全部成功后关闭"""
+        breaker = CircuitBreaker(
+            "binance_spot", CircuitBreakerConfig(timeout_seconds=0, half_open_max_calls=2)
+        )
+        breaker.force_open(0)
+
+        assert breaker.allow_request() is True
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False, "超过探测并发上限应被拒绝"
+
+        breaker.record_success()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    @pytest.mark.unit
+    @pytest.mark.quota
+    def test_half_open_probe_failure_reopens(self):
+        """半开探测失败重新打开"""
+        breaker = CircuitBreaker("binance_spot", CircuitBreakerConfig(timeout_seconds=30))
+        breaker.force_open(0)
+        assert breaker.allow_request() is True
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.retry_after() > 29
+
+    @pytest.mark.unit
+    @pytest.mark.quota
+    def test_cancelled_probe_releases_half_open_slot(self, event_loop):
+        """半开探测调用被取消时归还探测名额，不记录结果"""
+        registry = CircuitBreakerRegistry(None, APIConfig())
+        breaker = registry.configure(
+            "binance_spot", CircuitBreakerConfig(timeout_seconds=30, half_open_max_calls=1)
+        )
+        breaker.force_open(0)
+
+        with patch("api_factory.main.circuit_breakers", registry):
+            with patch(
+                "httpx.AsyncClient.request",
+                new_callable=AsyncMock,
+                side_effect=asyncio.CancelledError(),
+            ):
+                with pytest.raises(asyncio.CancelledError):
+                    event_loop.run_until_complete(
+                        fetch_upstream("binance_spot", {"method": "GET", "url": "http://upstream"})
+                    )
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.half_open_in_flight == 0
+        assert breaker.failure_count == 0
+        assert breaker.allow_request() is True, "名额归还后应允许下一次探测"
+
+    @pytest.mark.unit
+    @pytest.mark.quota
+    def test_remote_events_sync_state_across_replicas(self):
+        """其他副本广播的打开/关闭事件同步到本地，自身事件被忽略"""
+        registry = CircuitBreakerRegistry(None, APIConfig())
+
+        registry.apply_remote_event(
+            {"node_id": "other", "service": "binance_spot", "state": "open", "open_seconds": 30}
+        )
+        assert registry.get("binance_spot").state == CircuitBreaker.OPEN
+
+        registry.apply_remote_event(
+            {"node_id": registry.node_id, "service": "binance_spot", "state": "closed"}
+        )
+        assert registry.get("binance_spot").state == CircuitBreaker.OPEN
+
+        registry.apply_remote_event({"node_id": "other", "service": "binance_spot", "state": "closed"})
+        assert registry.get("binance_spot").state == CircuitBreaker.CLOSED
+        assert registry.stats["events_received"] == 2
+
+    @pytest.mark.unit
+    @pytest.mark.quota
+    def test_sync_listener_applies_published_events(self, event_loop):
+        """订阅任务把频道消息交给 apply_remote_event，停止时关闭订阅"""
+        messages = [
+            {"type": "message", "data": json.dumps(
+                {"node_id": "other", "service": "binance_spot", "state": "open", "open_seconds": 30}
+            )},
+        ]
+        pubsub = AsyncMock()
+
+        async def get_message(**kwargs):
+            if messages:
+                return messages.pop(0)
+            await asyncio.sleep(0.01)
+            return None
+
+        pubsub.get_message.side_effect = get_message
+        redis_manager = AsyncMock()
+        redis_manager.subscribe.return_value = pubsub
+        registry = CircuitBreakerRegistry(redis_manager, APIConfig())
+
+        async def scenario():
+            await registry.start_sync()
+            await asyncio.sleep(0.05)
+            await registry.stop_sync()
+
+        event_loop.run_until_complete(scenario())
+        assert registry.get("binance_spot").state == CircuitBreaker.OPEN
+        assert registry.stats["events_received"] == 1
+        pubsub.aclose.assert_awaited_once()
+
+    @pytest.mark.unit
+    @pytest.mark.quota
+    def test_call_api_fast_fails_when_open(self, client, mock_auth_manager, valid_user_data):
+        """熔断器打开时 call_api 立即返回503，不调用上游"""
+        mock_auth_manager.verify_token.return_value = valid_user_data
+        registry = CircuitBreakerRegistry(None, APIConfig())
+        registry.get("binance_spot").force_open(30)
+
+        with patch("api_factory.main.auth_manager", mock_auth_manager):
+            with patch("api_factory.main.circuit_breakers", registry):
+                with patch("httpx.AsyncClient.request", new_callable=AsyncMock) as upstream:
+                    response = client.post(
+                        "/api/call",
+                        headers={"Authorization": "Bearer valid_token"},
+                        json={"api_name": "binance_spot", "path": "/api/v3/time"},
+                    )
+
+                    assert response.status_code == 503
+                    assert "Retry-After" in response.headers
+                    upstream.assert_not_awaited()
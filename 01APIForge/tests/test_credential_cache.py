@@ -0,0 +1,104 @@
+import time
+import pytest
+from unittest.mock import patch, Mock, AsyncMock
+
+from api_factory.config.settings import AuthConfig
+
+from api_factory.security.credential_cache import (
+    CredentialCache,
+    LastUsedBatcher,
+    credential_hash,
+)
+
+
+class TestCredentialCache:
+    """凭证验证缓存测试类"""
+
+    @pytest.mark.unit
+    @pytest.mark.auth
+    def test_entry_never_outlives_credential(self):
+        """缓存有效期不超过凭证自身过期时间"""
+        cache = CredentialCache(ttl_seconds=60)
+
+        cache.put("jwt:a", {"user_id": 1}, credential_expires_at=time.time() - 1)
+        assert cache.get("jwt:a") is None, "已过期凭证不应写入缓存"
+
+        cache.put("jwt:b", {"user_id": 2}, credential_expires_at=time.time() + 0.01)
+        assert cache.get("jwt:b") == {"user_id": 2}
+        time.sleep(0.02)
+        assert cache.get("jwt:b") is None
+
+    @pytest.mark.unit
+    @pytest.mark.auth
+    def test_revocation_event_invalidates_entry(self):
+        """撤销事件按凭证哈希使缓存失效"""
+        cache = CredentialCache()
+        digest = credential_hash("afk_secret")
+        cache.put(f"key:{digest}", {"key_id": 7})
+
+        cache.apply_revocation({"kind": "key", "hash": digest})
+
+        assert cache.get(f"key:{digest}") is None
+        assert cache.stats["revocation_events"] == 1
+        assert cache.stats["invalidations"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.auth
+    def test_returned_data_is_a_copy(self):
+        """调用方修改返回值不影响缓存"""
+        cache = CredentialCache()
+        cache.put("jwt:x", {"role": "user"})
+        cache.get("jwt:x")["role"] = "admin"
+        assert cache.get("jwt:x")["role"] == "user"
+
+    @pytest.mark.unit
+    @pytest.mark.auth
+    def test_last_used_updates_are_coalesced(self, event_loop):
+        """同一密钥多次使用合并为一行，一个周期只执行一次批量写入"""
+        sqlite = Mock()
+        sqlite.execute_many = AsyncMock(return_value=2)
+        batcher = LastUsedBatcher(sqlite, interval_seconds=60)
+
+        for _ in range(100):
+            batcher.mark(1)
+        batcher.mark(2)
+
+        written = event_loop.run_until_complete(batcher.flush())
+
+        assert written == 2
+        sqlite.execute_many.assert_awaited_once()
+        rows = sqlite.execute_many.await_args.args[1]
+        assert sorted(key_id for _, key_id in rows) == [1, 2]
+        assert event_loop.run_until_complete(batcher.flush()) == 0
+
+    @pytest.mark.unit
+    @pytest.mark.auth
+    def test_delete_api_key_route_revokes_and_invalidates(self, event_loop, client, real_auth_manager_cls):
+        """删除API密钥接口撤销密钥并使已缓存的验证结果失效"""
+        auth_manager = real_auth_manager_cls(AuthConfig())
+        sqlite = AsyncMock()
+        key_hash = auth_manager.hash_api_key("afk_secret")
+        sqlite.get_records.return_value = [{
+            "id": 7, "user_id": 1, "tenant_id": "default", "key_name": "ci",
+            "key_hash": key_hash, "permissions": "api.read", "expires_at": None,
+        }]
+        auth_manager.set_managers(sqlite, None)
+
+        assert event_loop.run_until_complete(auth_manager.verify_api_key("afk_secret"))["key_id"] == 7
+        assert auth_manager.credential_cache.get(f"key:{key_hash}") is not None
+
+        with patch("api_factory.main.auth_manager", auth_manager):
+            response = client.delete(
+                "/api/v1/auth/api-keys/7", headers={"Authorization": "Bearer valid_token"}
+            )
+            assert response.status_code == 200
+
+            sqlite.get_records.return_value = []
+            missing = client.delete(
+                "/api/v1/auth/api-keys/8", headers={"Authorization": "Bearer valid_token"}
+            )
+            assert missing.status_code == 404
+
+        sqlite.update_record.assert_awaited_once()
+        assert sqlite.update_record.await_args.args[1] == {"status": "revoked"}
+        assert auth_manager.credential_cache.get(f"key:{key_hash}") is None
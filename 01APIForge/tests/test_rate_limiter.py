@@ -0,0 +1,133 @@
+import pytest
+from unittest.mock import patch, Mock, AsyncMock
+
+from api_factory.config.settings import APIConfig
+from api_factory.core.rate_limiter import (
+    RateLimiter,
+    RateLimitRule,
+    RateLimitAlgorithm,
+)
+
+
+class TestRateLimiter:
+    """限流引擎测试类"""
+
+    @pytest.mark.unit
+    @pytest.mark.quota
+    @pytest.mark.parametrize("algorithm", list(RateLimitAlgorithm))
+    def test_local_algorithms_enforce_limit(self, event_loop, algorithm):
+        """Redis不可用时，进程内实现对每种算法都严格执行限额"""
+        limiter = RateLimiter(None, APIConfig())
+        rule = RateLimitRule(limit=10, window_seconds=60, algorithm=algorithm)
+
+        async def run():
+            return [await limiter.check("t1", "u1", "binance_spot", rule=rule) for _ in range(15)]
+
+        results = event_loop.run_until_complete(run())
+
+        assert sum(r.allowed for r in results) == 10
+        assert all(r.allowed for r in results[:10])
+        assert not results[-1].allowed
+        assert results[-1].retry_after > 0
+        assert limiter.stats["rejected"] == 5
+
+    @pytest.mark.unit
+    @pytest.mark.quota
+    def test_keys_are_isolated_per_tenant_and_user(self, event_loop):
+        """不同租户/用户的额度互不影响"""
+        limiter = RateLimiter(None, APIConfig())
+        rule = RateLimitRule(limit=1, window_seconds=60)
+
+        async def run():
+            return [
+                await limiter.check("t1", "u1", "api", rule=rule),
+                await limiter.check("t1", "u1", "api", rule=rule),
+                await limiter.check("t1", "u2", "api", rule=rule),
+                await limiter.check("t2", "u1", "api", rule=rule),
+            ]
+
+        allowed = [r.allowed for r in event_loop.run_until_complete(run())]
+        assert allowed == [True, False, True, True]
+
+    @pytest.mark.unit
+    @pytest.mark.quota
+    def test_lease_skips_redis_for_clearly_under_limit_callers(self, event_loop):
+        """剩余额度充足时预扣租约，后续调用不访问Redis"""
+        redis_manager = Mock()
+        redis_manager.client = object()
+        redis_manager._build_key = Mock(side_effect=lambda t, k, tenant=None: k)
+        redis_manager.register_script = Mock(return_value=object())
+        redis_manager.run_script = AsyncMock(side_effect=lambda s, keys, args: [1, 1000 - args[-1], 0])
+
+        config = APIConfig(rate_limit_lease_max=5, rate_limit_lease_fraction=0.5)
+        limiter = RateLimiter(redis_manager, config)
+        rule = RateLimitRule(limit=1000, window_seconds=60, algorithm=RateLimitAlgorithm.TOKEN_BUCKET)
+
+        async def run():
+            return [await limiter.check("t1", "u1", "api", rule=rule) for _ in range(8)]
+
+        results = event_loop.run_until_complete(run())
+
+        assert all(r.allowed for r in results)
+        # 第1次学习剩余额度，第2次预扣 1+5，随后5次命中本地租约
+        assert redis_manager.run_script.await_count == 3
+        assert redis_manager.run_script.await_args_list[1].args[2][-1] == 6
+        assert [r.source for r in results[2:7]] == ["lease"] * 5
+        assert limiter.stats["lease_hits"] == 5
+
+    @pytest.mark.unit
+    @pytest.mark.quota
+    def test_rule_resolution_prefers_tenant_rule(self):
+        """规则优先级：租户规则 > 全局规则 > 默认规则"""
+        limiter = RateLimiter(None, APIConfig(rate_limit_per_minute=60))
+        global_rule = RateLimitRule(limit=100)
+        tenant_rule = RateLimitRule(limit=5)
+
+        assert limiter.get_rule("api", "t1").limit == 60
+        limiter.set_rule("api", global_rule)
+        assert limiter.get_rule("api", "t1") is global_rule
+        limiter.set_rule("api", tenant_rule, tenant_id="t1")
+        assert limiter.get_rule("api", "t1") is tenant_rule
+        assert limiter.get_rule("api", "t2") is global_rule
+
+    @pytest.mark.unit
+    @pytest.mark.quota
+    def test_call_api_rejects_with_429_inline(self, client, mock_auth_manager, valid_user_data):
+        """call_api 在调用上游前执行限流，超限返回429"""
+        mock_auth_manager.verify_token.return_value = valid_user_data
+        limiter = RateLimiter(None, APIConfig())
+        limiter.set_rule("binance_spot", RateLimitRule(limit=1), tenant_id="default")
+
+        with patch("api_factory.main.auth_manager", mock_auth_manager):
+            with patch("api_factory.main.rate_limiter", limiter):
+                with patch("httpx.AsyncClient.request", new_callable=AsyncMock) as upstream:
+                    upstream.return_value = Mock(
+                        status_code=200, headers={"content-type": "text/plain"}, text="ok"
+                    )
+                    headers = {"Authorization": "Bearer valid_token"}
+                    payload = {"api_name": "binance_spot", "path": "/api/v3/time"}
+
+                    first = client.post("/api/call", headers=headers, json=payload)
+                    second = client.post("/api/call", headers=headers, json=payload)
+
+                    assert first.status_code == 200
+                    assert second.status_code == 429
+                    assert "Retry-After" in second.headers
+                    assert upstream.await_count == 1
+
+    @pytest.mark.unit
+    @pytest.mark.quota
+    def test_unknown_api_returns_404_without_consuming_quota(self, client, mock_auth_manager, valid_user_data):
+        """未知API在限流之前返回404，不消耗配额"""
+        mock_auth_manager.verify_token.return_value = valid_user_data
+        limiter = RateLimiter(None, APIConfig())
+
+        with patch("api_factory.main.auth_manager", mock_auth_manager):
+            with patch("api_factory.main.rate_limiter", limiter):
+                headers = {"Authorization": "Bearer valid_token"}
+                response = client.post(
+                    "/api/call", headers=headers, json={"api_name": "no_such_api"}
+                )
+
+                assert response.status_code == 404
+                assert limiter.stats["checks"] == 0
@@ -0,0 +1,150 @@
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from api_factory.config.settings import APIConfig
+from api_factory.core.api_registry import APIConfigRegistry, APIRoute
+from api_factory.core.response_cache import ResponseCache, CacheRule
+
+
+class TestResponseCache:
+    """响应缓存测试类"""
+
+    @staticmethod
+    def _counting_fetcher(delay: float = 0.0):
+        calls = {"count": 0}
+
+        async def fetch():
+            calls["count"] += 1
+            await asyncio.sleep(delay)
+            return {"status_code": 200, "data": calls["count"]}
+
+        return fetch, calls
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_concurrent_misses_are_coalesced(self, event_loop):
+        """并发未命中只发起一次上游请求"""
+        cache = ResponseCache(None, APIConfig())
+        fetch, calls = self._counting_fetcher(delay=0.01)
+        key = cache.build_key("default", "binance_spot", "/klines", {"symbol": "BTCUSDT"})
+
+        async def run():
+            return await asyncio.gather(
+                *[cache.get_or_fetch(key, "binance_spot", fetch) for _ in range(20)]
+            )
+
+        results = event_loop.run_until_complete(run())
+
+        assert calls["count"] == 1
+        assert all(r["data"] == 1 for r in results)
+        assert cache.stats["coalesced"] == 19
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_key_ignores_param_order(self):
+        """参数顺序不同的同义请求使用同一缓存键"""
+        a = ResponseCache.build_key("default", "binance_spot", "/klines", {"symbol": "BTCUSDT", "interval": "1m"})
+        b = ResponseCache.build_key("default", "binance_spot", "/klines", {"interval": "1m", "symbol": "BTCUSDT"})
+        c = ResponseCache.build_key("default", "binance_spot", "/klines", {"symbol": "ETHUSDT", "interval": "1m"})
+        assert a == b
+        assert a != c
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_stale_while_revalidate(self, event_loop):
+        """陈旧期内返回旧值并在后台刷新"""
+        cache = ResponseCache(None, APIConfig())
+        cache.set_rule("binance_spot", CacheRule(ttl_seconds=0.01, stale_seconds=60))
+        fetch, calls = self._counting_fetcher()
+
+        async def run():
+            first = await cache.get_or_fetch("k", "binance_spot", fetch)
+            await asyncio.sleep(0.02)
+            stale = await cache.get_or_fetch("k", "binance_spot", fetch)
+            await asyncio.sleep(0)  # 让后台刷新完成
+            await asyncio.sleep(0)
+            fresh = await cache.get_or_fetch("k", "binance_spot", fetch)
+            return first, stale, fresh
+
+        first, stale, fresh = event_loop.run_until_complete(run())
+
+        assert first["data"] == 1
+        assert stale["data"] == 1, "陈旧期内应立即返回旧值"
+        assert fresh["data"] == 2, "后台刷新后应返回新值"
+        assert cache.stats["stale_hits"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_error_responses_and_disabled_rules_are_not_cached(self, event_loop):
+        """错误响应不缓存；ttl<=0 的API直接透传"""
+        cache = ResponseCache(None, APIConfig())
+        calls = {"count": 0}
+
+        async def failing():
+            calls["count"] += 1
+            return {"status_code": 500, "data": None}
+
+        async def run():
+            for _ in range(3):
+                await cache.get_or_fetch(
+                    "k", "binance_spot", failing, cacheable=lambda r: r["status_code"] < 400
+                )
+
+        event_loop.run_until_complete(run())
+        assert calls["count"] == 3
+
+        cache.set_rule("openai_gpt4", CacheRule(ttl_seconds=0))
+        fetch, gpt_calls = self._counting_fetcher()
+
+        async def run_disabled():
+            await cache.get_or_fetch("g", "openai_gpt4", fetch)
+            await cache.get_or_fetch("g", "openai_gpt4", fetch)
+
+        event_loop.run_until_complete(run_disabled())
+        assert gpt_calls["count"] == 2
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_rule_for_route_reads_api_config(self):
+        """路由配置中的缓存项覆盖默认规则，未配置或无效时回退"""
+        cache = ResponseCache(None, APIConfig())
+        cache.set_rule("binance_spot", CacheRule(ttl_seconds=5, stale_seconds=10))
+
+        assert cache.rule_for_route("binance_spot", {}) == CacheRule(5, 10)
+        assert cache.rule_for_route("binance_spot", {"cache_ttl_seconds": 0}) == CacheRule(0, 10)
+        assert cache.rule_for_route("okx", {"cache_ttl_seconds": "2", "cache_stale_seconds": 3}) == CacheRule(2, 3)
+        assert cache.rule_for_route("okx", {"cache_ttl_seconds": "n/a"}) == cache.default_rule
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_call_api_applies_route_cache_rule(self, event_loop, client, mock_auth_manager, valid_user_data):
+        """call_api 按路由配置决定是否缓存：cache_ttl_seconds=0 的API每次都调用上游"""
+        mock_auth_manager.verify_token.return_value = valid_user_data
+        registry = APIConfigRegistry()
+        event_loop.run_until_complete(registry.upsert(APIRoute(
+            "default", "okx", "exchange", "https://www.okx.com", config_data={"cache_ttl_seconds": 0}
+        )))
+        headers = {"Authorization": "Bearer valid_token"}
+
+        with patch("api_factory.main.auth_manager", mock_auth_manager):
+            with patch("api_factory.main.api_registry", registry):
+                with patch("api_factory.main.response_cache", ResponseCache(None, APIConfig())):
+                    with patch("httpx.AsyncClient.request", new_callable=AsyncMock) as upstream:
+                        upstream.return_value.status_code = 200
+                        upstream.return_value.headers = {"content-type": "text/plain"}
+                        upstream.return_value.text = "ok"
+                        for api_name in ("okx", "okx", "binance_spot", "binance_spot"):
+                            response = client.post(
+                                "/api/call",
+                                headers=headers,
+                                json={"api_name": api_name, "path": "/time"},
+                            )
+                            assert response.status_code == 200
+
+                        urls = [call.kwargs["url"] for call in upstream.await_args_list]
+                        assert urls == [
+                            "https://www.okx.com/time",
+                            "https://www.okx.com/time",
+                            "https://api.binance.com/time",
+                        ]
@@ -0,0 +1,203 @@
+import pytest
+from collections import Counter
+from unittest.mock import patch, AsyncMock
+
+from api_factory.core.api_registry import APIConfigRegistry, APIRoute
+
+from api_factory.core.service_discovery import (
+    LoadBalanceStrategy,
+    NodeStatus,
+    ServiceDiscovery,
+)
+
+
+class TestServiceDiscovery:
+    """服务发现与负载均衡测试类"""
+
+    @staticmethod
+    def _cluster(count=3, **kwargs):
+        discovery = ServiceDiscovery(snapshot_refresh_seconds=0, **kwargs)
+        nodes = [
+            discovery.register(f"gw-{i}", f"10.0.0.{i}", 8000, "api_gateway")
+            for i in range(count)
+        ]
+        return discovery, nodes
+
+    @staticmethod
+    def _drive(discovery, latencies, rounds=600, strategy=None):
+        """模拟调用：选择 -> 记录在途 -> 按节点延迟完成"""
+        picks = Counter()
+        for _ in range(rounds):
+            node = discovery.select("api_gateway", strategy=strategy)
+            discovery.acquire(node)
+            discovery.release(node, latencies[node.node_id])
+            picks[node.node_id] += 1
+        return picks
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    @pytest.mark.parametrize(
+        "strategy",
+        [LoadBalanceStrategy.POWER_OF_TWO, LoadBalanceStrategy.WEIGHTED_ROUND_ROBIN],
+    )
+    def test_traffic_shifts_away_from_slow_node(self, strategy):
+        """慢节点的流量份额随EWMA延迟下降"""
+        discovery, nodes = self._cluster()
+        slow = nodes[0].node_id
+        latencies = {n.node_id: 10.0 for n in nodes}
+        latencies[slow] = 200.0
+        for node in nodes:
+            discovery.heartbeat(node.node_id, {"latency_ms": latencies[node.node_id]})
+
+        picks = self._drive(discovery, latencies, strategy=strategy)
+
+        assert picks[slow] < 600 * 0.15
+        assert nodes[0].ewma_latency_ms == pytest.approx(200.0)
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_round_robin_and_consistent_hash(self):
+        """轮询按序循环；一致性哈希对同一键稳定，摘除节点只迁移其键"""
+        discovery, nodes = self._cluster()
+        order = [
+            discovery.select("api_gateway", strategy=LoadBalanceStrategy.ROUND_ROBIN).node_id
+            for _ in range(6)
+        ]
+        assert order == [n.node_id for n in nodes] * 2
+
+        discovery.configure("api_gateway", LoadBalanceStrategy.CONSISTENT_HASH)
+        keys = [f"tenant-{i}" for i in range(200)]
+        before = {key: discovery.select("api_gateway", key=key).node_id for key in keys}
+        assert before == {key: discovery.select("api_gateway", key=key).node_id for key in keys}
+        assert len(set(before.values())) == 3
+
+        removed = nodes[1].node_id
+        discovery.unregister(removed)
+        after = {key: discovery.select("api_gateway", key=key).node_id for key in keys}
+        assert all(after[k] == before[k] for k in keys if before[k] != removed)
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_least_connections_tracks_in_flight(self):
+        """最少连接按在途数选择，请求结束后节点重新可选；堆大小有界"""
+        discovery, nodes = self._cluster()
+        discovery.snapshot_refresh_seconds = 60
+        discovery.configure("api_gateway", LoadBalanceStrategy.LEAST_CONNECTIONS)
+
+        held = []
+        for _ in range(3):
+            node = discovery.select("api_gateway")
+            discovery.acquire(node)
+            held.append(node)
+        assert sorted(n.node_id for n in held) == sorted(n.node_id for n in nodes)
+
+        discovery.release(held[1], 10.0)
+        assert discovery.select("api_gateway") is held[1]
+
+        # 心跳自报的连接数不覆盖网关自己维护的在途数
+        discovery.heartbeat(held[0].node_id, {"current_connections": 0})
+        assert held[0].in_flight == 1
+        assert held[0].reported_connections == 0
+        assert discovery.select("api_gateway") is held[1]
+        discovery.release(held[0], 10.0)
+        discovery.release(held[2], 10.0)
+
+        for _ in range(1000):
+            node = discovery.select("api_gateway")
+            discovery.acquire(node)
+            discovery.release(node, 10.0)
+        assert len(discovery._load_heaps["api_gateway"]) <= 4 * len(nodes) + 16
+        assert discovery.get_stats()["snapshot_rebuilds"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_call_api_routes_through_cluster_nodes(self, event_loop, client, mock_auth_manager, valid_user_data):
+        """配置了 service_type 的API经服务发现选节点，调用期间计入在途数"""
+        mock_auth_manager.verify_token.return_value = valid_user_data
+        discovery, nodes = self._cluster(count=1)
+        node = nodes[0]
+        registry = APIConfigRegistry()
+        event_loop.run_until_complete(registry.upsert(APIRoute(
+            "default", "internal_quotes", "datasource", "http://unused",
+            config_data={"service_type": "api_gateway"},
+        )))
+        in_flight_during_call = []
+
+        async def upstream_request(**kwargs):
+            in_flight_during_call.append(node.in_flight)
+            response = AsyncMock()
+            response.status_code = 200
+            response.headers = {"content-type": "text/plain"}
+            response.text = "ok"
+            response.content = b"ok"
+            return response
+
+        with patch("api_factory.main.auth_manager", mock_auth_manager):
+            with patch("api_factory.main.api_registry", registry):
+                with patch("api_factory.main.service_discovery", discovery):
+                    with patch("httpx.AsyncClient.request", side_effect=upstream_request) as upstream:
+                        response = client.post(
+                            "/api/call",
+                            headers={"Authorization": "Bearer valid_token"},
+                            json={"api_name": "internal_quotes", "method": "POST", "path": "/quotes"},
+                        )
+
+        assert response.status_code == 200
+        assert upstream.call_args.kwargs["url"] == "http://10.0.0.0:8000/quotes"
+        assert in_flight_during_call == [1]
+        assert node.in_flight == 0
+        assert node.total_requests == 1
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_failed_and_expired_nodes_leave_rotation(self):
+        """连续失败或心跳超时的节点不再被选中；恢复心跳后重新加入"""
+        discovery, nodes = self._cluster(count=2, failure_threshold=2)
+        failing, healthy = nodes
+        for _ in range(2):
+            discovery.release(failing, 50.0, success=False)
+        assert failing.status == NodeStatus.FAILED
+        assert {discovery.select("api_gateway").node_id for _ in range(20)} == {healthy.node_id}
+
+        discovery.heartbeat(failing.node_id, {"latency_ms": 5.0})
+        assert failing.status == NodeStatus.ACTIVE
+
+        healthy.last_heartbeat -= discovery.heartbeat_timeout_seconds + 1
+        assert {discovery.select("api_gateway").node_id for _ in range(20)} == {failing.node_id}
+
+        failing.last_heartbeat -= discovery.heartbeat_timeout_seconds + 1
+        assert discovery.select("api_gateway") is None
+        assert discovery.get_stats()["no_available_node"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_discover_endpoint_uses_engine(self, client, mock_auth_manager, valid_user_data):
+        """/cluster/discover 返回引擎选择的节点，无可用节点时返回503"""
+        mock_auth_manager.verify_token.return_value = valid_user_data
+        headers = {"Authorization": "Bearer valid_token"}
+        discovery = ServiceDiscovery()
+
+        with patch("api_factory.main.auth_manager", mock_auth_manager):
+            with patch("api_factory.main.service_discovery", discovery):
+                empty = client.post(
+                    "/cluster/discover", json={"service_type": "api_gateway"}, headers=headers
+                )
+                assert empty.status_code == 503
+
+                registered = client.post(
+                    "/cluster/nodes",
+                    json={"node_name": "gw-1", "node_ip": "10.0.0.1", "node_port": 8000, "service_type": "api_gateway"},
+                    headers=headers,
+                )
+                assert registered.status_code == 200
+                node_id = registered.json()["node_data"]["node_id"]
+
+                response = client.post(
+                    "/cluster/discover", json={"service_type": "api_gateway"}, headers=headers
+                )
+                assert response.status_code == 200
+                assert response.json()["node_id"] == node_id
+                assert response.json()["endpoint"] == "http://10.0.0.1:8000"
+
+                missing = client.post("/cluster/nodes/999999/heartbeat", json={}, headers=headers)
+                assert missing.status_code == 404
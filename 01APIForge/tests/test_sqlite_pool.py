@@ -0,0 +1,111 @@
+import asyncio
+import pytest
+
+from api_factory.config.settings import SQLiteConfig
+from api_factory.core.sqlite_manager import Tables
+
+
+class TestSQLitePool:
+    """SQLite读写分离连接池测试类"""
+
+    @staticmethod
+    def _manager(cls, event_loop, tmp_path, readers=2):
+        manager = cls(
+            SQLiteConfig(
+                database_path=str(tmp_path / "pool.db"), backup_path="", reader_pool_size=readers
+            )
+        )
+        event_loop.run_until_complete(manager.initialize())
+        event_loop.run_until_complete(
+            manager.insert_record(Tables.TENANTS, {"tenant_id": "acme", "name": "Acme"})
+        )
+        rows = [("acme", "binance_spot", "GET", "/t", 200, float(i)) for i in range(1200)]
+        event_loop.run_until_complete(
+            manager.execute_many(
+                "INSERT INTO api_logs (tenant_id, api_name, method, endpoint, status_code, response_time) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        )
+        return manager
+
+    @pytest.mark.unit
+    def test_reads_use_reader_pool_and_return_dicts(self, real_sqlite_manager_cls, event_loop, tmp_path):
+        """读取走只读连接池，结果为字典；只读连接拒绝写入"""
+        manager = self._manager(real_sqlite_manager_cls, event_loop, tmp_path)
+        try:
+            tenants = event_loop.run_until_complete(
+                manager.get_records(Tables.TENANTS, "tenant_id = ?", ("acme",))
+            )
+            assert tenants[0]["name"] == "Acme"
+            assert manager.stats["reads_on_pool"] >= 1
+            assert len(manager.readers) == 2
+
+            with pytest.raises(Exception):
+                event_loop.run_until_complete(
+                    manager.readers[0].execute("DELETE FROM tenants")
+                )
+        finally:
+            event_loop.run_until_complete(manager.cleanup())
+
+    @pytest.mark.unit
+    def test_iter_records_streams_in_batches(self, real_sqlite_manager_cls, event_loop, tmp_path):
+        """流式读取逐行产出全部记录"""
+        manager = self._manager(real_sqlite_manager_cls, event_loop, tmp_path)
+
+        async def consume():
+            total = 0
+            last = -1.0
+            async for row in manager.iter_records(
+                Tables.API_LOGS, order_by="response_time", batch_size=100
+            ):
+                assert row["response_time"] > last
+                last = row["response_time"]
+                total += 1
+            return total
+
+        try:
+            assert event_loop.run_until_complete(consume()) == 1200
+        finally:
+            event_loop.run_until_complete(manager.cleanup())
+
+    @pytest.mark.unit
+    def test_open_stream_does_not_block_point_reads(self, real_sqlite_manager_cls, event_loop, tmp_path):
+        """一个连接被长查询占用时，其他读取仍可立即完成"""
+        manager = self._manager(real_sqlite_manager_cls, event_loop, tmp_path)
+
+        async def scenario():
+            stream = manager.iter_records(Tables.API_LOGS, batch_size=10)
+            first = await stream.__anext__()
+            tenants = await asyncio.wait_for(
+                manager.get_records(Tables.TENANTS, "tenant_id = ?", ("acme",)), timeout=1
+            )
+            await stream.aclose()
+            return first, tenants
+
+        try:
+            first, tenants = event_loop.run_until_complete(scenario())
+            assert first["tenant_id"] == "acme"
+            assert len(tenants) == 1
+            assert manager._idle_readers.qsize() == 2, "迭代结束后连接应归还"
+        finally:
+            event_loop.run_until_complete(manager.cleanup())
+
+    @pytest.mark.unit
+    def test_concurrent_writes_are_serialized(self, real_sqlite_manager_cls, event_loop, tmp_path):
+        """并发写入在写连接上串行执行，互不干扰"""
+        manager = self._manager(real_sqlite_manager_cls, event_loop, tmp_path)
+
+        async def writes():
+            await asyncio.gather(
+                *[
+                    manager.insert_record(Tables.TENANTS, {"tenant_id": f"t{i}", "name": f"T{i}"})
+                    for i in range(50)
+                ]
+            )
+            return await manager.execute_query("SELECT COUNT(*) AS n FROM tenants")
+
+        try:
+            assert event_loop.run_until_complete(writes())[0]["n"] == 51
+        finally:
+            event_loop.run_until_complete(manager.cleanup())
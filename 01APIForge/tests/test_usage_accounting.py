@@ -0,0 +1,135 @@
+import httpx
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+
+from api_factory.config.settings import APIConfig, SQLiteConfig
+from api_factory.core.api_registry import APIConfigRegistry
+from api_factory.core.sqlite_manager import Tables
+from api_factory.core.usage_accounting import UsageAccountant
+
+
+class TestUsageAccounting:
+    """调用记账测试类"""
+
+    @staticmethod
+    def _record(accountant, api_name="binance_spot", status_code=200, latency=20.0, size=100):
+        accountant.record(
+            "acme", 1, api_name, "GET", "https://api.binance.com/api/v3/time",
+            status_code, latency, request_size=10, response_size=size,
+        )
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_rollups_by_tenant_and_api(self):
+        """按租户与API维护次数、字节与延迟汇总"""
+        accountant = UsageAccountant(None, APIConfig())
+        self._record(accountant, latency=3.0, size=100)
+        self._record(accountant, latency=40.0, size=300)
+        self._record(accountant, status_code=502, latency=900.0, size=0)
+        self._record(accountant, api_name="openai_gpt4", latency=2000.0, size=50)
+
+        binance = accountant.get_stats("acme", "binance_spot")
+        assert binance["total_calls"] == 3
+        assert binance["error_calls"] == 1
+        assert binance["response_bytes"] == 400
+        assert binance["request_bytes"] == 30
+        assert binance["max_latency_ms"] == 900.0
+        assert binance["p50_latency_ms"] == 50.0
+        assert binance["latency_histogram"]["le_5"] == 1
+
+        tenant = accountant.get_stats("acme")
+        assert tenant["total_calls"] == 4
+        assert set(accountant.list_api_stats("acme")) == {"binance_spot", "openai_gpt4"}
+        assert accountant.get_stats("other")["total_calls"] == 0
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_flush_writes_buffer_in_one_batch(self, event_loop):
+        """缓冲记录一次 executemany 写入"""
+        sqlite = Mock()
+        sqlite.execute_many = AsyncMock(return_value=3)
+        sqlite.ensure_tenant = AsyncMock()
+        accountant = UsageAccountant(sqlite, APIConfig())
+        for _ in range(3):
+            self._record(accountant)
+
+        assert event_loop.run_until_complete(accountant.flush()) == 3
+        sqlite.execute_many.assert_awaited_once()
+        query, rows = sqlite.execute_many.await_args.args
+        assert query.startswith("INSERT INTO api_logs")
+        assert len(rows) == 3
+        sqlite.ensure_tenant.assert_awaited_once_with("acme")
+        assert event_loop.run_until_complete(accountant.flush()) == 0
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_buffer_is_bounded(self):
+        """缓冲满时丢弃最旧记录，汇总仍然完整"""
+        accountant = UsageAccountant(Mock(), APIConfig(usage_log_max_buffer=2))
+        for _ in range(5):
+            self._record(accountant)
+
+        stats = accountant.get_pipeline_stats()
+        assert stats["buffered"] == 2
+        assert stats["dropped"] == 3
+        assert accountant.get_stats("acme", "binance_spot")["total_calls"] == 5
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_rollups_only_for_registered_apis(self):
+        """未注册的API名称只计入租户汇总，不建立单独汇总"""
+        accountant = UsageAccountant(None, APIConfig(), APIConfigRegistry())
+        self._record(accountant)
+        for i in range(50):
+            self._record(accountant, api_name=f"unknown_{i}")
+
+        assert set(accountant.list_api_stats("acme")) == {"binance_spot"}
+        assert accountant.get_stats("acme")["total_calls"] == 51
+        assert accountant.get_pipeline_stats()["unrouted"] == 50
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_flush_satisfies_foreign_keys(self, real_sqlite_manager_cls, event_loop, tmp_path):
+        """默认租户与非数值用户标识可直接落库；个别外键失效时逐条重试，不丢整批"""
+        manager = real_sqlite_manager_cls(
+            SQLiteConfig(database_path=str(tmp_path / "usage.db"), backup_path="", reader_pool_size=0)
+        )
+        event_loop.run_until_complete(manager.initialize())
+        try:
+            accountant = UsageAccountant(manager, APIConfig())
+            accountant.record("default", "test_user", "binance_spot", "GET", "https://api.binance.com/t", 200, 5.0)
+            accountant.record("default", 1, "binance_spot", "GET", "https://api.binance.com/t", 200, 5.0)
+            accountant.record("acme", "2", "binance_spot", "GET", "https://api.binance.com/t", 200, 5.0)
+
+            assert event_loop.run_until_complete(accountant.flush()) == 3
+            assert accountant.stats["row_retries"] == 3, "用户1/2不存在，批量写入后应逐条重试"
+            assert accountant.stats["dropped"] == 0
+
+            rows = event_loop.run_until_complete(manager.get_records(Tables.API_LOGS))
+            assert sorted(r["tenant_id"] for r in rows) == ["acme", "default", "default"]
+            assert all(r["user_id"] is None for r in rows)
+        finally:
+            event_loop.run_until_complete(manager.cleanup())
+
+    @pytest.mark.unit
+    @pytest.mark.routing
+    def test_call_api_records_upstream_timeout(self, client, mock_auth_manager, valid_user_data):
+        """上游超时的调用同样记账，状态码记为504"""
+        mock_auth_manager.verify_token.return_value = valid_user_data
+        accountant = UsageAccountant(None, APIConfig())
+
+        with patch("api_factory.main.auth_manager", mock_auth_manager):
+            with patch("api_factory.main.usage_accountant", accountant):
+                with patch("httpx.AsyncClient.request", new_callable=AsyncMock) as upstream:
+                    upstream.side_effect = httpx.ReadTimeout("timed out")
+                    response = client.post(
+                        "/api/call",
+                        headers={"Authorization": "Bearer valid_token"},
+                        json={"api_name": "binance_spot", "path": "/time", "method": "POST"},
+                    )
+
+        assert response.status_code == 200
+        assert response.json()["success"] is False
+        stats = accountant.get_stats("default", "binance_spot")
+        assert stats["total_calls"] == 1
+        assert stats["error_calls"] == 1
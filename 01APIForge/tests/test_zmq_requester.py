@@ -0,0 +1,141 @@
+import asyncio
+import json
+import random
+import pytest
+import zmq
+
+from api_factory.core.zmq_requester import ZMQRequestClient
+
+
+class _FakeDealer:
+    """进程内DEALER替身：发送进入服务端队列，响应进入自身队列"""
+
+    def __init__(self, server_queue):
+        self.server_queue = server_queue
+        self.inbox = asyncio.Queue()
+        self.closed = False
+
+    def setsockopt(self, *args):
+        pass
+
+    def connect(self, endpoint):
+        pass
+
+    async def send_multipart(self, frames):
+        await self.server_queue.put((self, frames))
+
+    async def recv_multipart(self):
+        return await self.inbox.get()
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeContext:
+    def __init__(self):
+        self.server_queue = asyncio.Queue()
+        self.created = []
+
+    def socket(self, socket_type):
+        dealer = _FakeDealer(self.server_queue)
+        self.created.append(dealer)
+        return dealer
+
+
+class TestZMQRequestClient:
+    """ZMQ多路复用请求客户端测试类"""
+
+    @pytest.fixture(autouse=True)
+    def _zmq_constants(self, monkeypatch):
+        # 测试环境中 zmq 可能是桩模块
+        monkeypatch.setattr(zmq, "DEALER", 5, raising=False)
+        monkeypatch.setattr(zmq, "LINGER", 17, raising=False)
+        monkeypatch.setattr(zmq, "ZMQError", OSError, raising=False)
+
+    @staticmethod
+    async def _server(context, drop=()):
+        """乱序回复的服务端；drop 中的请求不回复"""
+
+        async def reply(dealer, request):
+            await asyncio.sleep(random.uniform(0, 0.02))
+            response = {"request_id": request["request_id"], "echo": request["n"]}
+            await dealer.inbox.put([b"", json.dumps(response).encode()])
+
+        while True:
+            dealer, (_empty, payload) = await context.server_queue.get()
+            request = json.loads(payload)
+            if request["n"] not in drop:
+                asyncio.ensure_future(reply(dealer, request))
+
+    def _run(self, event_loop, scenario, drop=(), pool_size=1):
+        async def run():
+            context = _FakeContext()
+            server_task = asyncio.ensure_future(self._server(context, drop))
+            client = ZMQRequestClient(context, "tcp://127.0.0.1:5558", pool_size=pool_size)
+            client.start()
+            try:
+                return await scenario(client, context)
+            finally:
+                await client.close()
+                server_task.cancel()
+
+        return event_loop.run_until_complete(run())
+
+    @pytest.mark.unit
+    @pytest.mark.zmq
+    def test_concurrent_requests_share_one_socket(self, event_loop):
+        """数百个并发请求共用一个套接字，乱序响应正确配对"""
+
+        async def scenario(client, context):
+            results = await asyncio.gather(
+                *[client.request({"n": i}, timeout=5000) for i in range(300)]
+            )
+            return results, client.get_stats()
+
+        results, stats = self._run(event_loop, scenario)
+
+        assert [r["echo"] for r in results] == list(range(300))
+        assert stats["sockets"] == 1
+        assert stats["responses"] == 300
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.unit
+    @pytest.mark.zmq
+    def test_timeout_does_not_break_other_requests(self, event_loop):
+        """单个请求超时后，同一套接字上的其他请求正常完成"""
+
+        async def scenario(client, context):
+            lost = asyncio.ensure_future(client.request({"n": 0}, timeout=50))
+            ok = await asyncio.gather(*[client.request({"n": i}, timeout=5000) for i in range(1, 20)])
+            with pytest.raises(TimeoutError):
+                await lost
+            again = await client.request({"n": 99}, timeout=5000)
+            return ok, again, client.get_stats()
+
+        ok, again, stats = self._run(event_loop, scenario, drop=(0,))
+
+        assert [r["echo"] for r in ok] == list(range(1, 20))
+        assert again["echo"] == 99
+        assert stats["timeouts"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.zmq
+    def test_cancellation_and_socket_pool(self, event_loop):
+        """取消的请求从映射中移除；套接字池轮询发送"""
+
+        async def scenario(client, context):
+            task = asyncio.ensure_future(client.request({"n": 0}, timeout=5000))
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            results = await asyncio.gather(*[client.request({"n": i}, timeout=5000) for i in range(1, 9)])
+            return results, client.get_stats(), context.created
+
+        results, stats, sockets = self._run(event_loop, scenario, drop=(0,), pool_size=4)
+
+        assert len(results) == 8
+        assert stats["sockets"] == 4
+        assert stats["cancelled"] == 1
+        assert stats["in_flight"] == 0
+        assert all(s.closed for s in sockets)
@@ -8,5 +8,16 @@ from .scrapy_crawler import ScrapyCrawler
 from .telegram_crawler import TelegramCrawler
 from .base_crawler import BaseCrawler
 from .web_crawler import WebCrawler
+from .frontier import CrawlFrontier
+from .url_index import VisitedURLIndex
+from .fetch_cache import FetchCache
 
-__all__ = ["ScrapyCrawler", "TelegramCrawler", "BaseCrawler", "WebCrawler"]
+__all__ = [
+    "ScrapyCrawler",
+    "TelegramCrawler",
+    "BaseCrawler",
+    "WebCrawler",
+    "CrawlFrontier",
+    "VisitedURLIndex",
+    "FetchCache",
+]
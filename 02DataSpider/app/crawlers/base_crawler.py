@@ -24,6 +24,7 @@ core_lib_path = os.path.join(YILAI_DIR, "core_lib")
 if os.path.isdir(core_lib_path) and core_lib_path not in sys.path:
     sys.path.insert(0, core_lib_path)
 
+import aiohttp
 import requests
 from fake_useragent import UserAgent
 from bs4 import BeautifulSoup
@@ -31,6 +32,7 @@ from bs4 import BeautifulSoup
 from ..config import ConfigManager
 from ..utils import Logger
 from ..zmq_client import ZMQPublisher, NewsMessage
+from .fetch_cache import FetchCache
 
 
 class CrawlerStatus(Enum):
@@ -282,6 +284,8 @@ class BaseCrawler(ABC):
             "requests_successful": 0,
             "requests_failed": 0,
             "items_scraped": 0,
+            "pages_unchanged": 0,
+            "fetch_rollbacks": 0,
             "total_processing_time": 0.0,
             "last_activity_time": None,
         }
@@ -299,6 +303,24 @@ class BaseCrawler(ABC):
         self.concurrent_requests = self.crawler_config.get("concurrent_requests", 1)
         self.download_timeout = self.crawler_config.get("download_timeout", 30)
 
+        # 条件抓取缓存（ETag/Last-Modified/正文指纹）；diff_mode 下只输出新出现的条目与链接
+        # 默认关闭：启用后未变化的页面返回空结果，只适合轮询索引/列表页的爬虫
+        fetch_cache_config = self.crawler_config.get("fetch_cache", {})
+        if not isinstance(fetch_cache_config, dict):
+            fetch_cache_config = {}
+        self.fetch_cache = (
+            FetchCache(
+                persist_path=fetch_cache_config.get("persist_path"),
+                max_links_per_page=fetch_cache_config.get("max_links_per_page", 5000),
+                max_entries=fetch_cache_config.get("max_entries", 10000),
+            )
+            if fetch_cache_config.get("enabled", False)
+            else None
+        )
+        self.diff_mode = self.fetch_cache is not None and bool(
+            fetch_cache_config.get("diff_mode", False)
+        )
+
         self.logger.info(f"{self.__class__.__name__} 初始化完成")
 
     @abstractmethod
@@ -322,6 +344,20 @@ class BaseCrawler(ABC):
         """
         pass
 
+    async def parse_response_async(self, response: CrawlResponse) -> List[Dict[str, Any]]:
+        """异步抓取路径上的解析入口
+
+        默认在事件循环线程内直接调用 parse_response；解析开销大的子类可覆盖，
+        将HTML解析放到线程池执行，避免阻塞其它抓取协程。
+
+        Args:
+            response: 爬虫响应对象
+
+        Returns:
+            解析出的数据列表
+        """
+        return self.parse_response(response)
+
     @abstractmethod
     def extract_links(self, response: CrawlResponse) -> List[str]:
         """提取页面链接
@@ -334,6 +370,117 @@ class BaseCrawler(ABC):
         """
         pass
 
+    def _conditional_headers(self, request: CrawlRequest) -> Dict[str, str]:
+        """为GET请求生成条件请求头（调用方已显式指定校验器时不覆盖）"""
+        if self.fetch_cache is None or request.method != RequestMethod.GET:
+            return {}
+        for key in request.headers:
+            if key.lower() in ("if-none-match", "if-modified-since"):
+                return {}
+        return self.fetch_cache.conditional_headers(request.url)
+
+    def _mark_freshness(self, request: CrawlRequest, response: CrawlResponse) -> None:
+        """对照抓取缓存判断响应是否未变化，结果写入 response.metadata"""
+        if self.fetch_cache is None or request.method != RequestMethod.GET:
+            return
+
+        if response.status_code == 304:
+            self.fetch_cache.record_not_modified(request.url, response.headers)
+            response.metadata["not_modified"] = True
+        elif response.status_code == 200:
+            previous = self.fetch_cache.validators(request.url)
+            if self.fetch_cache.record_response(
+                request.url, response.headers, response.content
+            ):
+                # 正文有变化：解析或发布失败时据此回滚（见 rollback_freshness）
+                response.metadata["fetch_rollback"] = {
+                    "url": request.url,
+                    "validators": previous,
+                    "items": [],
+                }
+            else:
+                response.metadata["unchanged"] = True
+
+    def rollback_freshness(self, response: Optional[CrawlResponse]) -> None:
+        """撤销本次响应写入抓取缓存的校验器、正文指纹与增量条目
+
+        解析或发布失败时调用，否则下次轮询会命中304或正文指纹而跳过页面，内容永久丢失。
+        """
+        if response is None or self.fetch_cache is None:
+            return
+        pending = response.metadata.pop("fetch_rollback", None)
+        if pending is None:
+            return
+        self.fetch_cache.restore(pending["url"], pending["validators"], pending["items"])
+        self.stats["fetch_rollbacks"] += 1
+        self.logger.warning(f"页面处理失败，已回滚抓取缓存: {pending['url']}")
+
+    @staticmethod
+    def is_unchanged(response: CrawlResponse) -> bool:
+        """响应是否为未变化页面（304或正文指纹相同）"""
+        return bool(
+            response.metadata.get("not_modified") or response.metadata.get("unchanged")
+        )
+
+    def _unchanged_result(
+        self, url: str, response: CrawlResponse, start_time: float
+    ) -> CrawlResult:
+        """未变化页面的爬取结果（跳过解析、链接提取与发布）"""
+        self.stats["pages_unchanged"] += 1
+        processing_time = time.time() - start_time
+        self.logger.debug(f"页面未变化，跳过解析: {url} | 状态码: {response.status_code}")
+
+        return CrawlResult(
+            success=True,
+            url=url,
+            data=[],
+            response=response,
+            processing_time=processing_time,
+            metadata={
+                "items_count": 0,
+                "response_size": len(response.content),
+                "unchanged": True,
+            },
+        )
+
+    def _new_items(
+        self,
+        url: str,
+        data: List[Dict[str, Any]],
+        response: Optional[CrawlResponse] = None,
+    ) -> List[Dict[str, Any]]:
+        """增量模式：只保留此前未从该页面输出过的条目（按条目链接判断，无链接的条目保留）
+
+        传入 response 时新记入的条目键随回滚信息保存，发布失败时一并撤销。
+        """
+        keys = [self._item_key(item) for item in data]
+        fresh_keys = self.fetch_cache.new_items(url, [key for key in keys if key])
+        pending = response.metadata.get("fetch_rollback") if response is not None else None
+        if pending is not None:
+            pending["items"].extend(fresh_keys)
+        fresh = set(fresh_keys)
+        return [item for item, key in zip(data, keys) if not key or key in fresh]
+
+    @staticmethod
+    def _item_key(item: Dict[str, Any]) -> Optional[str]:
+        """条目键：url字段，其次第一个 *_link 字段"""
+        key = item.get("url")
+        if not key:
+            key = next(
+                (value for field, value in item.items() if field.endswith("_link") and value),
+                None,
+            )
+        return key if isinstance(key, str) else None
+
+    def save_fetch_cache(self) -> None:
+        """持久化抓取缓存（未配置路径时忽略）"""
+        if self.fetch_cache is None:
+            return
+        try:
+            self.fetch_cache.save()
+        except Exception as e:
+            self.logger.error(f"保存抓取缓存失败: {e}")
+
     def make_request(self, request: CrawlRequest) -> CrawlResponse:
         """发起HTTP请求
 
@@ -349,8 +496,9 @@ class BaseCrawler(ABC):
             # 应用反爬虫策略
             self.anti_spider.apply_delay(request.url)
 
-            # 准备请求头
+            # 准备请求头（附加缓存校验器）
             headers = self.anti_spider.prepare_headers(request.headers)
+            headers.update(self._conditional_headers(request))
 
             # 获取代理（仅当 use_proxy 为 True 时注入）
             proxies = None
@@ -395,6 +543,7 @@ class BaseCrawler(ABC):
                     "proxy_used": bool(proxies),
                 },
             )
+            self._mark_freshness(request, crawl_response)
 
             self.logger.debug(
                 f"请求成功: {request.url} | "
@@ -417,6 +566,169 @@ class BaseCrawler(ABC):
 
             raise
 
+    def create_http_session(self) -> aiohttp.ClientSession:
+        """创建异步HTTP会话（连接池在所有域名间复用）
+
+        Returns:
+            aiohttp会话，调用方负责关闭
+        """
+        # 连接池：总连接数与单主机连接数上限
+        connector = aiohttp.TCPConnector(
+            limit=self.crawler_config.get(
+                "connection_pool_size", max(self.concurrent_requests, 1) * 2
+            ),
+            limit_per_host=self.crawler_config.get("connections_per_host", 2),
+            ttl_dns_cache=300,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.download_timeout),
+            # 与同步会话一致，不信任环境变量代理
+            trust_env=False,
+        )
+
+    async def make_request_async(
+        self, request: CrawlRequest, session: aiohttp.ClientSession
+    ) -> CrawlResponse:
+        """异步发起HTTP请求
+
+        礼貌间隔由调用方（爬取前沿的调度器）负责，这里不做阻塞延迟
+
+        Args:
+            request: 爬虫请求对象
+            session: 异步HTTP会话
+
+        Returns:
+            爬虫响应对象
+        """
+        start_time = time.time()
+
+        try:
+            headers = self.anti_spider.prepare_headers(request.headers)
+            headers.update(self._conditional_headers(request))
+
+            proxy = None
+            if getattr(self.anti_spider, "use_proxy", False):
+                proxies = self.anti_spider.get_random_proxy()
+                proxy = proxies.get("http") if proxies else None
+
+            async with session.request(
+                request.method.value,
+                request.url,
+                headers=headers,
+                params=request.params or None,
+                data=request.data or None,
+                cookies=request.cookies or None,
+                proxy=proxy,
+                timeout=aiohttp.ClientTimeout(total=request.timeout),
+                allow_redirects=True,
+            ) as response:
+                content = await response.text(errors="replace")
+
+                self.anti_spider.record_request(request.url)
+
+                self.stats["requests_made"] += 1
+                self.stats["requests_successful"] += 1
+                self.stats["last_activity_time"] = datetime.utcnow().isoformat()
+
+                response_time = time.time() - start_time
+
+                crawl_response = CrawlResponse(
+                    url=str(response.url),
+                    status_code=response.status,
+                    content=content,
+                    headers=dict(response.headers),
+                    cookies={k: v.value for k, v in response.cookies.items()},
+                    encoding=response.charset or "utf-8",
+                    response_time=response_time,
+                    timestamp=datetime.utcnow().isoformat(),
+                    metadata={
+                        "request_method": request.method.value,
+                        "proxy_used": bool(proxy),
+                    },
+                )
+            self._mark_freshness(request, crawl_response)
+
+            self.logger.debug(
+                f"请求成功: {request.url} | "
+                f"状态码: {crawl_response.status_code} | "
+                f"耗时: {response_time:.3f}s"
+            )
+
+            return crawl_response
+
+        except Exception as e:
+            response_time = time.time() - start_time
+
+            self.stats["requests_made"] += 1
+            self.stats["requests_failed"] += 1
+
+            self.logger.error(
+                f"请求失败: {request.url} | " f"错误: {e} | " f"耗时: {response_time:.3f}s"
+            )
+
+            raise
+
+    async def crawl_url_async(
+        self, url: str, session: aiohttp.ClientSession, **kwargs
+    ) -> CrawlResult:
+        """异步爬取单个URL
+
+        Args:
+            url: 要爬取的URL
+            session: 异步HTTP会话
+            **kwargs: 额外的请求参数
+
+        Returns:
+            爬取结果
+        """
+        start_time = time.time()
+        response = None
+
+        try:
+            request = CrawlRequest(url=url, **kwargs)
+            response = await self.make_request_async(request, session)
+            if self.is_unchanged(response):
+                return self._unchanged_result(url, response, start_time)
+
+            data = await self.parse_response_async(response)
+            if self.diff_mode:
+                data = self._new_items(url, data, response)
+
+            self.stats["items_scraped"] += len(data)
+            processing_time = time.time() - start_time
+            self.stats["total_processing_time"] += processing_time
+
+            self.logger.info(
+                f"爬取完成: {url} | " f"数据条数: {len(data)} | " f"耗时: {processing_time:.3f}s"
+            )
+
+            return CrawlResult(
+                success=True,
+                url=url,
+                data=data,
+                response=response,
+                processing_time=processing_time,
+                metadata={
+                    "items_count": len(data),
+                    "response_size": len(response.content),
+                },
+            )
+
+        except Exception as e:
+            processing_time = time.time() - start_time
+            self.rollback_freshness(response)
+
+            self.logger.error(f"爬取失败: {url} | 错误: {e}")
+
+            return CrawlResult(
+                success=False,
+                url=url,
+                data=[],
+                error=str(e),
+                processing_time=processing_time,
+            )
+
     def crawl_url(self, url: str, **kwargs) -> CrawlResult:
         """爬取单个URL
 
@@ -428,6 +740,7 @@ class BaseCrawler(ABC):
             爬取结果
         """
         start_time = time.time()
+        response = None
 
         try:
             # 创建请求对象
@@ -436,8 +749,14 @@ class BaseCrawler(ABC):
             # 发起请求
             response = self.make_request(request)
 
-            # 解析响应
+            # 未变化页面跳过解析与发布
+            if self.is_unchanged(response):
+                return self._unchanged_result(url, response, start_time)
+
+            # 解析响应（增量模式只保留新出现的条目）
             data = self.parse_response(response)
+            if self.diff_mode:
+                data = self._new_items(url, data, response)
 
             # 更新统计
             self.stats["items_scraped"] += len(data)
@@ -462,6 +781,7 @@ class BaseCrawler(ABC):
 
         except Exception as e:
             processing_time = time.time() - start_time
+            self.rollback_freshness(response)
 
             self.logger.error(f"爬取失败: {url} | 错误: {e}")
 
@@ -500,8 +820,9 @@ class BaseCrawler(ABC):
                 result = self.crawl_url(url)
 
                 if result.success and result.data:
-                    # 发布数据到ZMQ
-                    self._publish_data(result.data, url)
+                    # 发布数据到ZMQ（未全部受理时回滚抓取缓存，下次轮询重新处理）
+                    if not self._publish_data(result.data, url):
+                        self.rollback_freshness(result.response)
 
         except Exception as e:
             self.status = CrawlerStatus.ERROR
@@ -511,6 +832,7 @@ class BaseCrawler(ABC):
                 self.status = CrawlerStatus.IDLE
 
             self.stop_time = datetime.utcnow()
+            self.save_fetch_cache()
             self.logger.info(f"{self.__class__.__name__} 爬取结束")
 
     def stop_crawling(self) -> None:
@@ -531,16 +853,20 @@ class BaseCrawler(ABC):
             self.status = CrawlerStatus.RUNNING
             self.logger.info(f"{self.__class__.__name__} 恢复爬取")
 
-    def _publish_data(self, data: List[Dict[str, Any]], source_url: str) -> None:
+    def _publish_data(self, data: List[Dict[str, Any]], source_url: str) -> bool:
         """发布数据到ZMQ
 
         Args:
             data: 要发布的数据列表
             source_url: 数据来源URL
+
+        Returns:
+            是否全部被发布者受理（未配置发布者时为True）
         """
         if not self.publisher:
-            return
+            return True
 
+        accepted = True
         try:
             for item in data:
                 # 创建新闻消息
@@ -562,10 +888,14 @@ class BaseCrawler(ABC):
                 )
 
                 # 发布消息
-                self.publisher.publish_message(message)
+                if not self.publisher.publish_message(message):
+                    accepted = False
 
         except Exception as e:
             self.logger.error(f"发布数据失败: {e}")
+            return False
+
+        return accepted
 
     def _generate_message_id(self, item: Dict[str, Any], source_url: str) -> str:
         """生成消息ID
@@ -596,6 +926,8 @@ class BaseCrawler(ABC):
                 "crawler_name": self.__class__.__name__,
             }
         )
+        if self.fetch_cache is not None:
+            stats["fetch_cache"] = self.fetch_cache.get_stats()
 
         # 计算成功率
         if stats["requests_made"] > 0:
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""
+NeuroTrade Nexus - 条件抓取缓存
+按URL记录 ETag / Last-Modified 与正文指纹，轮询索引页时发送条件请求
+
+- 服务器支持校验器时，未变化的页面返回 304，不传输正文
+- 不支持校验器的服务器返回完整正文，按正文指纹判断是否变化
+- 未变化的页面跳过解析、链接提取与发布
+- 增量（diff）模式下记录每个页面已出现过的链接与条目，只输出新出现的部分
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .url_index import url_fingerprint
+
+_VERSION = 1
+
+
+def _header(headers: Optional[Mapping[str, Any]], name: str) -> Optional[str]:
+    """读取响应头（大小写不敏感，非字符串值视为缺失）"""
+    if not headers:
+        return None
+    try:
+        value = headers.get(name)
+        if value is None:
+            lowered = name.lower()
+            value = next((v for k, v in headers.items() if k.lower() == lowered), None)
+    except (AttributeError, TypeError):
+        return None
+    return value if isinstance(value, str) and value else None
+
+
+def content_digest(content: Any) -> Optional[str]:
+    """正文指纹（128位blake2b），无法识别的正文类型返回None"""
+    if isinstance(content, str):
+        content = content.encode("utf-8", errors="replace")
+    if not isinstance(content, (bytes, bytearray)):
+        return None
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+@dataclass
+class FetchRecord:
+    """单个URL的抓取校验信息"""
+
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    # 页面上出现过的链接 / 已输出条目的指纹（按出现顺序，超出上限时淘汰最早的）
+    links: Dict[int, None] = field(default_factory=dict)
+    items: Dict[int, None] = field(default_factory=dict)
+
+
+class FetchCache:
+    """条件抓取缓存
+
+    Args:
+        persist_path: 持久化文件路径（为空则仅内存）
+        max_links_per_page: 增量模式下每个页面保留的链接（条目）指纹上限
+        max_entries: 最多记录的URL数，超出时淘汰最久未访问的记录（LRU）
+    """
+
+    def __init__(
+        self,
+        persist_path: Optional[str] = None,
+        max_links_per_page: int = 5000,
+        max_entries: int = 10000,
+    ):
+        self.persist_path = persist_path
+        self.max_links_per_page = max_links_per_page
+        self.max_entries = max(1, max_entries)
+        self._records: "OrderedDict[int, FetchRecord]" = OrderedDict()
+        self.stats = {
+            "evicted": 0,
+            "conditional_requests": 0,
+            "not_modified": 0,
+            "unchanged": 0,
+            "changed": 0,
+            "new_links": 0,
+            "known_links": 0,
+            "new_items": 0,
+            "known_items": 0,
+        }
+
+        if persist_path and os.path.exists(persist_path):
+            self.load(persist_path)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, url: str) -> bool:
+        return url_fingerprint(url) in self._records
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """生成条件请求头（无缓存校验器时为空）"""
+        record = self._touch(url)
+        if record is None:
+            return {}
+
+        headers = {}
+        if record.etag:
+            headers["If-None-Match"] = record.etag
+        if record.last_modified:
+            headers["If-Modified-Since"] = record.last_modified
+        if headers:
+            self.stats["conditional_requests"] += 1
+        return headers
+
+    def record_not_modified(self, url: str, headers: Optional[Mapping[str, Any]] = None) -> None:
+        """记录304响应（服务器可能下发新的校验器）"""
+        self.stats["not_modified"] += 1
+        record = self._records.get(url_fingerprint(url))
+        if record is not None:
+            record.etag = _header(headers, "ETag") or record.etag
+            record.last_modified = _header(headers, "Last-Modified") or record.last_modified
+
+    def record_response(
+        self, url: str, headers: Optional[Mapping[str, Any]], content: Any
+    ) -> bool:
+        """记录完整响应并判断正文是否变化
+
+        Args:
+            url: 请求URL
+            headers: 响应头
+            content: 响应正文（str或bytes）
+
+        Returns:
+            正文是否有变化（首次抓取或无法计算指纹时视为有变化）
+        """
+        digest = content_digest(content)
+        record = self._record(url)
+        changed = digest is None or digest != record.content_hash
+        record.etag = _header(headers, "ETag")
+        record.last_modified = _header(headers, "Last-Modified")
+        record.content_hash = digest
+
+        self.stats["changed" if changed else "unchanged"] += 1
+        return changed
+
+    def validators(self, url: str) -> Optional[Tuple[Optional[str], Optional[str], Optional[str]]]:
+        """当前记录的 (ETag, Last-Modified, 正文指纹)，无记录时为None"""
+        record = self._records.get(url_fingerprint(url))
+        if record is None:
+            return None
+        return record.etag, record.last_modified, record.content_hash
+
+    def restore(
+        self,
+        url: str,
+        validators: Optional[Tuple[Optional[str], Optional[str], Optional[str]]],
+        item_keys: Iterable[str] = (),
+    ) -> None:
+        """回滚到 validators() 取得的状态，并移除本次新记入的条目键
+
+        页面解析或发布失败时使用：下次抓取不会命中304或正文指纹，页面重新获取并处理。
+
+        Args:
+            url: 页面URL
+            validators: 写入前的校验器（None表示写入前无记录）
+            item_keys: 本次由 new_items() 新记入的条目键
+        """
+        record = self._records.get(url_fingerprint(url))
+        if record is None:
+            return
+        record.etag, record.last_modified, record.content_hash = validators or (None, None, None)
+        for key in item_keys:
+            record.items.pop(url_fingerprint(key), None)
+
+    def _touch(self, url: str) -> Optional[FetchRecord]:
+        """查找记录并标记为最近访问"""
+        fingerprint = url_fingerprint(url)
+        record = self._records.get(fingerprint)
+        if record is not None:
+            self._records.move_to_end(fingerprint)
+        return record
+
+    def _record(self, url: str) -> FetchRecord:
+        record = self._touch(url)
+        if record is None:
+            record = self._records[url_fingerprint(url)] = FetchRecord()
+            self._evict()
+        return record
+
+    def _evict(self) -> None:
+        while len(self._records) > self.max_entries:
+            self._records.popitem(last=False)
+            self.stats["evicted"] += 1
+
+    def _diff(self, seen: Dict[int, None], keys: Iterable[str], kind: str) -> List[str]:
+        """返回未出现过的键并记入已出现集合（保持原顺序并去重）"""
+        fresh = []
+        known = 0
+        for key in keys:
+            key_fingerprint = url_fingerprint(key)
+            if key_fingerprint in seen:
+                known += 1
+                continue
+            seen[key_fingerprint] = None
+            fresh.append(key)
+
+        overflow = len(seen) - self.max_links_per_page
+        if overflow > 0:
+            for stale in list(seen)[:overflow]:
+                del seen[stale]
+
+        self.stats[f"new_{kind}"] += len(fresh)
+        self.stats[f"known_{kind}"] += known
+        return fresh
+
+    def new_links(self, url: str, links: Iterable[str]) -> List[str]:
+        """增量模式：返回页面上新出现的链接
+
+        Args:
+            url: 页面URL
+            links: 本次提取到的链接
+
+        Returns:
+            此前未在该页面出现过的链接
+        """
+        return self._diff(self._record(url).links, links, "links")
+
+    def new_items(self, url: str, keys: Iterable[str]) -> List[str]:
+        """增量模式：返回页面上新出现的条目键（通常为条目链接）
+
+        Args:
+            url: 页面URL
+            keys: 本次解析出的条目键
+
+        Returns:
+            此前未从该页面输出过的条目键
+        """
+        return self._diff(self._record(url).items, keys, "items")
+
+    # 持久化
+
+    def save(self, path: Optional[str] = None) -> Optional[str]:
+        """写入文件（先写临时文件再原子替换）"""
+        path = path or self.persist_path
+        if not path:
+            return None
+
+        payload = {
+            "version": _VERSION,
+            "records": {
+                format(fingerprint, "016x"): {
+                    "etag": record.etag,
+                    "last_modified": record.last_modified,
+                    "content_hash": record.content_hash,
+                    "links": list(record.links),
+                    "items": list(record.items),
+                }
+                for fingerprint, record in self._records.items()
+            },
+        }
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+        return path
+
+    def load(self, path: str) -> None:
+        """从文件恢复"""
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        if payload.get("version") != _VERSION:
+            raise ValueError(f"不支持的抓取缓存版本: {path}")
+
+        self._records = OrderedDict(
+            (int(key, 16), FetchRecord(
+                etag=item.get("etag"),
+                last_modified=item.get("last_modified"),
+                content_hash=item.get("content_hash"),
+                links=dict.fromkeys(item.get("links", [])),
+                items=dict.fromkeys(item.get("items", [])),
+            ))
+            for key, item in payload["records"].items()
+        )
+        # 文件按访问顺序写入，超出上限时保留最近访问的记录
+        self._evict()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.copy()
+        fetched = stats["not_modified"] + stats["unchanged"] + stats["changed"]
+        stats["urls"] = len(self._records)
+        stats["max_entries"] = self.max_entries
+        stats["skip_rate"] = (
+            (stats["not_modified"] + stats["unchanged"]) / fetched if fetched else 0.0
+        )
+        stats["persist_path"] = self.persist_path
+        return stats
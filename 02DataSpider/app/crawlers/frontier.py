@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+NeuroTrade Nexus - 爬取前沿
+按域名分队列的URL前沿与礼貌调度器
+
+- 每个域名一个FIFO队列，域名之间互不阻塞
+- 定时堆按"下次允许请求时间"排列域名，到期的域名才会出队，
+  等待通过事件循环计时完成，不阻塞线程
+- 同一域名同一时刻最多一个在途请求；请求结束后按礼貌间隔重新入堆
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from .url_index import url_fingerprint
+
+
+class CrawlFrontier:
+    """URL前沿 - 域名队列 + 礼貌调度定时堆"""
+
+    def __init__(self):
+        # 域名 -> 待抓取URL队列
+        self._queues: Dict[str, Deque[str]] = {}
+        # 定时堆：(允许请求时间, 序号, 域名)
+        self._heap: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        # 已在堆中 / 已出队等待release的域名
+        self._scheduled: Set[str] = set()
+        self._in_flight: Set[str] = set()
+        # 域名下次允许请求的时间（队列清空后仍保留，新URL入队时沿用）
+        self._next_allowed: Dict[str, float] = {}
+        # 队列中URL的规范化指纹（O(1)成员判断）
+        self._pending: Set[int] = set()
+
+        # 唤醒事件绑定到当前事件循环（前沿可跨多次 asyncio.run 复用）
+        self._wakeup: Optional[asyncio.Event] = None
+        self._wakeup_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed = False
+
+        # 统计信息
+        self.stats = {"pushed": 0, "dispatched": 0, "politeness_waits": 0}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, url: str) -> bool:
+        return url_fingerprint(url) in self._pending
+
+    def domain_size(self, domain: str) -> int:
+        """域名队列中的URL数"""
+        queue = self._queues.get(domain)
+        return len(queue) if queue else 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def push(self, url: str, domain: Optional[str] = None) -> bool:
+        """URL入队
+
+        Args:
+            url: 待抓取URL
+            domain: 所属域名（缺省时从URL解析）
+
+        Returns:
+            是否入队（已在队列中的URL不重复入队）
+        """
+        fingerprint = url_fingerprint(url)
+        if fingerprint in self._pending:
+            return False
+        domain = domain or urlparse(url).netloc
+
+        queue = self._queues.get(domain)
+        if queue is None:
+            queue = self._queues[domain] = deque()
+        queue.append(url)
+        self._pending.add(fingerprint)
+        self.stats["pushed"] += 1
+
+        if domain not in self._scheduled and domain not in self._in_flight:
+            self._schedule(domain, self._next_allowed.get(domain, 0.0))
+        return True
+
+    def _schedule(self, domain: str, ready_at: float) -> None:
+        heapq.heappush(self._heap, (ready_at, next(self._sequence), domain))
+        self._scheduled.add(domain)
+        self._notify()
+
+    def _notify(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _wait(self, timeout: Optional[float]) -> None:
+        loop = asyncio.get_running_loop()
+        if self._wakeup is None or self._wakeup_loop is not loop:
+            self._wakeup = asyncio.Event()
+            self._wakeup_loop = loop
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def get(self) -> Optional[Tuple[str, str]]:
+        """等待下一个到期域名并取出其队首URL
+
+        Returns:
+            (域名, URL)；前沿已关闭，或队列为空且没有在途请求时返回None
+        """
+        while not self._closed:
+            if not self._heap:
+                if not self._in_flight:
+                    return None
+                # 在途请求可能发现新链接，等待入队或release
+                await self._wait(None)
+                continue
+
+            ready_at, _, domain = self._heap[0]
+            delay = ready_at - time.monotonic()
+            if delay > 0:
+                self.stats["politeness_waits"] += 1
+                await self._wait(delay)
+                continue
+
+            heapq.heappop(self._heap)
+            self._scheduled.discard(domain)
+            url = self._queues[domain].popleft()
+            self._pending.discard(url_fingerprint(url))
+            self._in_flight.add(domain)
+            self.stats["dispatched"] += 1
+            return domain, url
+        return None
+
+    def release(self, domain: str, delay: Optional[float] = None) -> None:
+        """域名的在途请求结束
+
+        Args:
+            domain: 域名
+            delay: 距下次请求的礼貌间隔（秒）；None表示本次未发出请求，沿用原间隔
+        """
+        self._in_flight.discard(domain)
+        if delay is not None:
+            self._next_allowed[domain] = time.monotonic() + delay
+
+        if self._queues.get(domain):
+            self._schedule(domain, self._next_allowed.get(domain, 0.0))
+        else:
+            self._queues.pop(domain, None)
+            # 唤醒等待者以判断前沿是否已耗尽
+            self._notify()
+
+    def open(self) -> None:
+        """重新开放前沿（保留队列中的URL）"""
+        self._closed = False
+
+    def close(self) -> None:
+        """关闭前沿，所有等待中的get返回None"""
+        self._closed = True
+        self._notify()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "queued_urls": len(self._pending),
+            "queued_domains": len(self._queues),
+            "scheduled_domains": len(self._scheduled),
+            "in_flight_domains": len(self._in_flight),
+        }
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+NeuroTrade Nexus - 关键词匹配器
+把关键词列表与垃圾信息正则编译为单次扫描的匹配器，替代逐个关键词的重复扫描
+
+- 整词模式: 文本分词一次后与关键词集合求交集，含非单词字符的短语关键词单独按边界正则匹配
+- 子串模式: 所有关键词合并为一个交替正则，一次扫描即可判断是否命中
+- 正则集合: 多个垃圾信息正则合并为一个，无法合并时逐个匹配
+"""
+
+import re
+from typing import Iterable, List, Optional, Set, Tuple
+
+_WORD_RE = re.compile(r"\w+")
+_BACKREF_RE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+def tokenize(text_lower: str) -> Set[str]:
+    """分词（按 \\w+，与 \\b 边界语义一致）"""
+    return set(_WORD_RE.findall(text_lower))
+
+
+class KeywordMatcher:
+    """编译后的关键词匹配器（大小写不敏感）
+
+    Args:
+        keywords: 关键词列表
+        whole_word: 是否按整词匹配（否则按子串匹配）
+    """
+
+    def __init__(self, keywords: Iterable[str], whole_word: bool = False):
+        self.keywords = self.normalize(keywords)
+        self.whole_word = whole_word
+        self._words: Set[str] = set()
+        self._phrases: List[Tuple[str, re.Pattern]] = []
+        self._regex: Optional[re.Pattern] = None
+
+        if whole_word:
+            for keyword in self.keywords:
+                if _WORD_RE.fullmatch(keyword):
+                    self._words.add(keyword)
+                else:
+                    self._phrases.append(
+                        (keyword, re.compile(r"\b" + re.escape(keyword) + r"\b"))
+                    )
+        elif self.keywords:
+            # 长词优先，前瞻匹配使相互重叠的关键词都能被找到
+            alternation = "|".join(
+                re.escape(keyword) for keyword in sorted(self.keywords, key=len, reverse=True)
+            )
+            self._regex = re.compile(f"(?=({alternation}))")
+
+    @staticmethod
+    def normalize(keywords: Iterable[str]) -> List[str]:
+        """规范化关键词列表：转小写、去空值并按首次出现顺序去重"""
+        return list(dict.fromkeys(k.lower() for k in keywords if k))
+
+    def __bool__(self) -> bool:
+        return bool(self.keywords)
+
+    def search(self, text_lower: str, tokens: Optional[Set[str]] = None) -> bool:
+        """是否命中任一关键词
+
+        Args:
+            text_lower: 已转小写的文本
+            tokens: 预先计算的分词结果（整词模式下可复用）
+        """
+        if self._regex is not None:
+            return self._regex.search(text_lower) is not None
+        if self._words:
+            if tokens is None:
+                tokens = tokenize(text_lower)
+            if not self._words.isdisjoint(tokens):
+                return True
+        return any(pattern.search(text_lower) for _, pattern in self._phrases)
+
+    def findall(self, text_lower: str, tokens: Optional[Set[str]] = None) -> List[str]:
+        """返回命中的关键词（按关键词列表顺序去重）"""
+        if self._regex is not None:
+            found = {match.group(1) for match in self._regex.finditer(text_lower)}
+            return [keyword for keyword in self.keywords if keyword in found]
+
+        found = set()
+        if self._words:
+            if tokens is None:
+                tokens = tokenize(text_lower)
+            found = self._words.intersection(tokens)
+        for keyword, pattern in self._phrases:
+            if pattern.search(text_lower):
+                found.add(keyword)
+        return [keyword for keyword in self.keywords if keyword in found]
+
+
+class PatternMatcher:
+    """多个正则合并后的匹配器
+
+    Args:
+        patterns: 正则表达式列表
+        flags: 编译标志
+    """
+
+    def __init__(self, patterns: Iterable[str], flags: int = re.IGNORECASE):
+        self.patterns = [pattern for pattern in patterns if pattern]
+        self._combined: Optional[re.Pattern] = None
+        self._regexes: List[re.Pattern] = []
+
+        if not self.patterns:
+            return
+        # 含反向引用的正则合并后组号会错位，内联标志无法出现在中间位置，均逐个匹配
+        if not any(_BACKREF_RE.search(pattern) for pattern in self.patterns):
+            try:
+                self._combined = re.compile(
+                    "|".join(f"(?:{pattern})" for pattern in self.patterns), flags
+                )
+                return
+            except re.error:
+                pass
+        self._regexes = [re.compile(pattern, flags) for pattern in self.patterns]
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def search(self, text: str) -> bool:
+        """是否命中任一正则"""
+        if self._combined is not None:
+            return self._combined.search(text) is not None
+        return any(regex.search(text) for regex in self._regexes)
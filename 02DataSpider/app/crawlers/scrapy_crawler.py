@@ -8,8 +8,8 @@ import sys
 import os
 import re
 import json
-import time
-from typing import Dict, Any, List, Optional, Set
+import asyncio
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 from urllib.parse import urljoin, urlparse
 from dataclasses import dataclass
@@ -28,7 +28,33 @@ from lxml import html
 from ..config import ConfigManager
 from ..utils import Logger
 from ..zmq_client import ZMQPublisher
-from .base_crawler import BaseCrawler, CrawlResponse, CrawlRequest, RequestMethod
+import aiohttp
+
+from .base_crawler import (
+    BaseCrawler,
+    CrawlerStatus,
+    CrawlResponse,
+    CrawlRequest,
+    RequestMethod,
+)
+from .frontier import CrawlFrontier
+from .selector_engine import (
+    MODE_ALL,
+    MODE_UNION,
+    ExtractionPlan,
+    FieldRule,
+    split_selector_list,
+)
+from .url_index import VisitedURLIndex
+
+# 不作为分类的通用导航文本
+_GENERIC_CATEGORIES = frozenset(("home", "news", "首页", "新闻"))
+
+# 标签元素选择器
+_TAG_SELECTORS = (".tag", ".tags", "[class*='tag']", ".label", ".labels")
+
+# 正文区域结束标记（站点配置可用 stop 覆盖），之后的页脚、评论等不参与提取
+_ARTICLE_END_SELECTORS = "body > footer, #footer, .site-footer, #comments, .comments"
 
 
 @dataclass
@@ -96,9 +122,15 @@ class NewsExtractor:
             },
         }
 
+        # 按站点缓存编译后的提取计划
+        self._plans: Dict[str, ExtractionPlan] = {}
+        self.stats = {"extracted": 0, "early_stops": 0, "elements_scanned": 0}
+
     def extract_news_item(self, response: CrawlResponse) -> Optional[NewsItem]:
         """从响应中提取新闻项
 
+        一次流式遍历提取全部字段，所有站点字段确定或遇到正文区域结束标记后即停止解析
+
         Args:
             response: 爬虫响应对象
 
@@ -106,21 +138,23 @@ class NewsExtractor:
             提取的新闻项或None
         """
         try:
-            soup = BeautifulSoup(response.content, "html.parser")
             domain = urlparse(response.url).netloc
-
-            # 获取站点配置
-            config = self._get_site_config(domain)
-
-            # 提取各个字段
-            title = self._extract_title(soup, config)
-            content = self._extract_content(soup, config)
-            author = self._extract_author(soup, config)
-            timestamp = self._extract_timestamp(soup, config, response.timestamp)
-            category = self._extract_category(soup, config)
-            tags = self._extract_tags(soup)
+            extraction = self._get_site_plan(domain).extract(response.content or "")
+            fields = extraction.values
+
+            self.stats["extracted"] += 1
+            self.stats["elements_scanned"] += extraction.elements
+            if extraction.early_stop:
+                self.stats["early_stops"] += 1
+
+            title = fields["title"]
+            content = "\n\n".join(fields["content"]) or None
+            author = fields["author"]
+            timestamp = fields["timestamp"] or response.timestamp
+            category = fields["category"][-1] if fields["category"] else None
+            tags = list(dict.fromkeys((fields["keywords"] or []) + fields["tags"]))
             summary = self._extract_summary(content)
-            image_url = self._extract_image(soup, response.url)
+            image_url = urljoin(response.url, fields["image"]) if fields["image"] else None
 
             # 验证必需字段
             if not title or not content:
@@ -152,178 +186,93 @@ class NewsExtractor:
             self.logger.error(f"提取新闻失败: {response.url} | 错误: {e}")
             return None
 
-    def _get_site_config(self, domain: str) -> Dict[str, str]:
-        """获取站点配置"""
-        for site_domain, config in self.site_configs.items():
+    def _match_site(self, domain: str) -> str:
+        """匹配站点配置名"""
+        for site_domain in self.site_configs:
             if site_domain in domain:
-                return config
-        return self.site_configs["default"]
-
-    def _extract_title(
-        self, soup: BeautifulSoup, config: Dict[str, str]
-    ) -> Optional[str]:
-        """提取标题"""
-        selectors = config.get("title", "").split(", ")
-
-        for selector in selectors:
-            if not selector.strip():
-                continue
-
-            element = soup.select_one(selector.strip())
-            if element:
-                return element.get_text(strip=True)
-
-        # 备用方案：从meta标签提取
-        meta_title = soup.find("meta", property="og:title")
-        if meta_title:
-            return meta_title.get("content", "").strip()
-
-        # 最后备用：页面title
-        title_tag = soup.find("title")
-        if title_tag:
-            return title_tag.get_text(strip=True)
-
-        return None
-
-    def _extract_content(
-        self, soup: BeautifulSoup, config: Dict[str, str]
-    ) -> Optional[str]:
-        """提取正文内容"""
-        selectors = config.get("content", "").split(", ")
-
-        for selector in selectors:
-            if not selector.strip():
-                continue
-
-            elements = soup.select(selector.strip())
-            if elements:
-                # 合并所有匹配元素的文本
-                content_parts = []
-                for element in elements:
-                    text = element.get_text(strip=True)
-                    if text and len(text) > 20:  # 过滤太短的文本
-                        content_parts.append(text)
-
-                if content_parts:
-                    return "\n\n".join(content_parts)
-
-        # 备用方案：提取所有段落
-        paragraphs = soup.find_all("p")
-        if paragraphs:
-            content_parts = []
-            for p in paragraphs:
-                text = p.get_text(strip=True)
-                if text and len(text) > 20:
-                    content_parts.append(text)
-
-            if content_parts:
-                return "\n\n".join(content_parts)
-
-        return None
+                return site_domain
+        return "default"
 
-    def _extract_author(
-        self, soup: BeautifulSoup, config: Dict[str, str]
-    ) -> Optional[str]:
-        """提取作者"""
-        selectors = config.get("author", "").split(", ")
-
-        for selector in selectors:
-            if not selector.strip():
-                continue
-
-            element = soup.select_one(selector.strip())
-            if element:
-                author = element.get_text(strip=True)
-                if author and len(author) < 100:  # 作者名不应该太长
-                    return author
-
-        # 备用方案：从meta标签提取
-        meta_author = soup.find("meta", attrs={"name": "author"})
-        if meta_author:
-            return meta_author.get("content", "").strip()
-
-        return None
+    def _get_site_config(self, domain: str) -> Dict[str, str]:
+        """获取站点配置"""
+        return self.site_configs[self._match_site(domain)]
 
-    def _extract_timestamp(
-        self, soup: BeautifulSoup, config: Dict[str, str], fallback: str
-    ) -> str:
-        """提取时间戳"""
-        selectors = config.get("timestamp", "").split(", ")
+    def _get_site_plan(self, domain: str) -> ExtractionPlan:
+        """获取站点的提取计划（首次使用时编译）"""
+        site = self._match_site(domain)
+        plan = self._plans.get(site)
+        if plan is None:
+            plan = self._plans[site] = self._build_plan(self.site_configs[site])
+        return plan
 
-        for selector in selectors:
-            if not selector.strip():
-                continue
+    def _build_plan(self, config: Dict[str, str]) -> ExtractionPlan:
+        """把站点选择器配置编译为一次遍历的提取计划
 
-            element = soup.select_one(selector.strip())
-            if element:
-                # 尝试从datetime属性获取
-                datetime_attr = element.get("datetime")
-                if datetime_attr:
-                    return self._normalize_timestamp(datetime_attr)
-
-                # 从文本内容获取
-                text = element.get_text(strip=True)
-                if text:
-                    normalized = self._normalize_timestamp(text)
-                    if normalized:
-                        return normalized
-
-        # 备用方案：从meta标签提取
-        meta_time = soup.find("meta", property="article:published_time")
-        if meta_time:
-            return self._normalize_timestamp(meta_time.get("content", ""))
-
-        # 使用fallback时间戳
-        return fallback
-
-    def _extract_category(
-        self, soup: BeautifulSoup, config: Dict[str, str]
-    ) -> Optional[str]:
-        """提取分类"""
-        selectors = config.get("category", "").split(", ")
-
-        for selector in selectors:
-            if not selector.strip():
-                continue
+        每个字段的来源按优先级排列：站点选择器在前，meta标签等备用来源在后
+        """
 
-            elements = soup.select(selector.strip())
-            if elements:
-                categories = []
-                for element in elements:
-                    text = element.get_text(strip=True)
-                    if text and text.lower() not in ["home", "news", "首页", "新闻"]:
-                        categories.append(text)
+        def text_sources(key: str, *fallbacks: str) -> List[Tuple[str, Any]]:
+            selectors = split_selector_list(config.get(key, "")) + list(fallbacks)
+            return [(selector, None) for selector in dict.fromkeys(selectors)]
 
-                if categories:
-                    return categories[-1]  # 返回最后一个（通常是最具体的）
+        # 时间元素优先取datetime属性，其次取元素文本
+        timestamp_sources = [
+            (selector, ("datetime", None))
+            for selector in split_selector_list(config.get("timestamp", ""))
+        ]
 
-        return None
+        rules = [
+            FieldRule(
+                "title",
+                text_sources("title")
+                + [("meta[property='og:title']", "content"), ("title", None)],
+            ),
+            FieldRule(
+                "content",
+                text_sources("content", "p"),
+                accept=lambda text: text if len(text) > 20 else None,  # 过滤太短的文本
+                mode=MODE_ALL,
+            ),
+            FieldRule(
+                "author",
+                text_sources("author") + [("meta[name='author']", "content")],
+                accept=lambda text: text if len(text) < 100 else None,  # 作者名不应该太长
+            ),
+            FieldRule(
+                "timestamp",
+                timestamp_sources + [("meta[property='article:published_time']", "content")],
+                accept=self._normalize_timestamp,
+            ),
+            FieldRule(
+                "category",
+                text_sources("category"),
+                accept=lambda text: None if text.lower() in _GENERIC_CATEGORIES else text,
+                mode=MODE_ALL,
+            ),
+            # 以下字段尽力提取，不阻止提前结束
+            FieldRule(
+                "keywords",
+                [("meta[name='keywords']", "content")],
+                accept=lambda text: [k.strip() for k in text.split(",") if k.strip()] or None,
+                blocking=False,
+            ),
+            FieldRule(
+                "tags",
+                [(selector, None) for selector in _TAG_SELECTORS],
+                accept=lambda text: text if len(text) < 50 else None,
+                mode=MODE_UNION,
+                blocking=False,
+            ),
+            FieldRule(
+                "image",
+                [("meta[property='og:image']", "content"), ("img", "src")],
+                accept=lambda src: None if src.startswith("data:") else src,
+                blocking=False,
+            ),
+        ]
+        return ExtractionPlan(rules, stop=config.get("stop", _ARTICLE_END_SELECTORS))
 
-    def _extract_tags(self, soup: BeautifulSoup) -> List[str]:
-        """提取标签"""
-        tags = set()
-
-        # 从meta keywords提取
-        meta_keywords = soup.find("meta", attrs={"name": "keywords"})
-        if meta_keywords:
-            keywords = meta_keywords.get("content", "")
-            for keyword in keywords.split(","):
-                keyword = keyword.strip()
-                if keyword:
-                    tags.add(keyword)
-
-        # 从标签元素提取
-        tag_selectors = [".tag", ".tags", "[class*='tag']", ".label", ".labels"]
-        for selector in tag_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                text = element.get_text(strip=True)
-                if text and len(text) < 50:
-                    tags.add(text)
-
-        return list(tags)
-
-    def _extract_summary(self, content: str) -> Optional[str]:
+    def _extract_summary(self, content: Optional[str]) -> Optional[str]:
         """提取摘要"""
         if not content:
             return None
@@ -340,24 +289,6 @@ class NewsExtractor:
 
         return summary.strip() if summary else content[:200] + "..."
 
-    def _extract_image(self, soup: BeautifulSoup, base_url: str) -> Optional[str]:
-        """提取主图片"""
-        # 从meta标签提取
-        meta_image = soup.find("meta", property="og:image")
-        if meta_image:
-            image_url = meta_image.get("content", "")
-            if image_url:
-                return urljoin(base_url, image_url)
-
-        # 从文章内容中提取第一张图片
-        img_tags = soup.find_all("img")
-        for img in img_tags:
-            src = img.get("src")
-            if src and not src.startswith("data:"):
-                return urljoin(base_url, src)
-
-        return None
-
     def _clean_text(self, text: str) -> str:
         """清理文本"""
         if not text:
@@ -463,11 +394,17 @@ class ScrapyCrawler(BaseCrawler):
         self.max_pages_per_site = self.scrapy_config.get("max_pages_per_site", 10)
         self.follow_links = self.scrapy_config.get("follow_links", True)
 
-        # 已访问URL集合（避免重复爬取）
-        self.visited_urls: Set[str] = set()
+        # 已访问URL索引（规范化指纹 + 域名计数，可选布隆过滤器与持久化）
+        visited_config = self.scrapy_config.get("visited_index", {})
+        self.visited_urls = VisitedURLIndex(
+            use_bloom=visited_config.get("use_bloom", False),
+            persist_path=visited_config.get("persist_path"),
+            capacity=visited_config.get("capacity", 100000),
+            error_rate=visited_config.get("error_rate", 0.001),
+        )
 
-        # URL队列
-        self.url_queue: List[str] = []
+        # URL前沿（按域名分队列 + 礼貌调度）
+        self.frontier = CrawlFrontier()
 
         self.logger.info(f"Scrapy爬虫初始化完成，目标站点: {len(self.target_sites)}")
 
@@ -510,7 +447,34 @@ class ScrapyCrawler(BaseCrawler):
         Returns:
             解析出的数据列表
         """
+        data, links = self._parse_page(response)
+        self._follow_links(response, links)
+        return data
+
+    async def parse_response_async(self, response: CrawlResponse) -> List[Dict[str, Any]]:
+        """异步解析：HTML解析与链接提取在线程池中执行，前沿与增量缓存只在事件循环线程上修改
+
+        Args:
+            response: 爬虫响应对象
+
+        Returns:
+            解析出的数据列表
+        """
+        data, links = await asyncio.to_thread(self._parse_page, response)
+        self._follow_links(response, links)
+        return data
+
+    def _parse_page(self, response: CrawlResponse) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """解析页面内容并提取候选链接（纯计算，不读写前沿与已访问索引，可在工作线程执行）
+
+        Args:
+            response: 爬虫响应对象
+
+        Returns:
+            (解析出的数据列表, 候选链接列表)
+        """
         data = []
+        links = []
 
         try:
             # 检查是否为新闻详情页
@@ -543,12 +507,30 @@ class ScrapyCrawler(BaseCrawler):
             # 如果启用了链接跟踪，提取更多链接
             if self.follow_links:
                 links = self.extract_links(response)
-                self._add_links_to_queue(links)
 
         except Exception as e:
+            # 向上抛出：爬取结果记为失败并回滚抓取缓存，下次轮询重新解析
             self.logger.error(f"解析响应失败: {response.url} | 错误: {e}")
+            raise
 
-        return data
+        return data, links
+
+    def _follow_links(self, response: CrawlResponse, links: List[str]) -> None:
+        """候选链接去重后加入前沿
+
+        Args:
+            response: 爬虫响应对象
+            links: 候选链接列表
+        """
+        if not links:
+            return
+        try:
+            # 增量模式：只跟踪该页面上新出现的文章链接
+            if self.diff_mode:
+                links = self.fetch_cache.new_links(response.url, links)
+            self._add_links_to_queue(links)
+        except Exception as e:
+            self.logger.error(f"添加链接失败: {response.url} | 错误: {e}")
 
     def extract_links(self, response: CrawlResponse) -> List[str]:
         """提取页面链接
@@ -586,66 +568,103 @@ class ScrapyCrawler(BaseCrawler):
 
         return links
 
-    def start_crawling(self) -> None:
-        """开始爬取（重写以支持链接跟踪）"""
-        if self.status.value == "running":
+    def start_crawling(self) -> Optional["asyncio.Task"]:
+        """开始爬取
+
+        没有运行中的事件循环时阻塞运行异步爬取引擎；在事件循环内调用时
+        （asyncio.run 会报错）改为在当前循环上创建爬取任务并返回，由调用方 await。
+
+        Returns:
+            在事件循环内调用时返回爬取任务，否则返回None
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self.crawl_async())
+            return None
+
+        self.logger.info("检测到运行中的事件循环，爬取以任务方式启动")
+        return loop.create_task(self.crawl_async())
+
+    async def crawl_async(self) -> None:
+        """异步爬取：多个域名并发抓取，每个域名按礼貌间隔串行"""
+        if self.status == CrawlerStatus.RUNNING:
             self.logger.warning("爬虫已在运行中")
             return
 
-        self.status = type(self.status)("running")
+        self.status = CrawlerStatus.RUNNING
         self.start_time = datetime.utcnow()
+        self.frontier.open()
 
         self.logger.info(f"{self.__class__.__name__} 开始爬取")
 
         try:
-            # 获取起始URL并添加到队列
-            start_urls = self.get_start_urls()
-            self.url_queue.extend(start_urls)
+            # 获取起始URL并加入前沿
+            for url in self.get_start_urls():
+                self.frontier.push(url)
+
+            workers = max(self.concurrent_requests, 1)
+            async with self.create_http_session() as session:
+                await asyncio.gather(
+                    *(self._crawl_worker(session) for _ in range(workers))
+                )
+
+        except Exception as e:
+            self.status = CrawlerStatus.ERROR
+            self.logger.error(f"爬取过程异常: {e}")
+        finally:
+            if self.status == CrawlerStatus.RUNNING:
+                self.status = CrawlerStatus.IDLE
+
+            self.stop_time = datetime.utcnow()
+            try:
+                self.visited_urls.save()
+            except Exception as e:
+                self.logger.error(f"保存已访问URL索引失败: {e}")
+            self.save_fetch_cache()
+            self.logger.info(
+                f"{self.__class__.__name__} 爬取结束 | "
+                f"访问页面: {len(self.visited_urls)} | "
+                f"队列剩余: {len(self.frontier)}"
+            )
 
-            # 处理URL队列
-            while self.url_queue and self.status.value == "running":
-                url = self.url_queue.pop(0)
+    async def _crawl_worker(self, session: aiohttp.ClientSession) -> None:
+        """爬取协程：从前沿取到期域名的URL，抓取后按礼貌间隔归还域名"""
+        while self.status == CrawlerStatus.RUNNING:
+            item = await self.frontier.get()
+            if item is None:
+                break
 
+            domain, url = item
+            delay = None
+            try:
                 # 检查是否已访问
                 if url in self.visited_urls:
                     continue
 
                 # 检查每个站点的页面限制
-                domain = urlparse(url).netloc
-                domain_count = sum(
-                    1
-                    for visited_url in self.visited_urls
-                    if urlparse(visited_url).netloc == domain
-                )
-
-                if domain_count >= self.max_pages_per_site:
+                if self.visited_urls.domain_count(domain) >= self.max_pages_per_site:
                     self.logger.debug(f"站点 {domain} 已达到页面限制: {self.max_pages_per_site}")
                     continue
 
                 # 爬取URL
-                result = self.crawl_url(url)
-                self.visited_urls.add(url)
+                result = await self.crawl_url_async(url, session)
+                self.visited_urls.add(url, domain)
+                delay = self.anti_spider.calculate_delay(domain)
 
                 if result.success and result.data:
-                    # 发布数据到ZMQ
-                    self._publish_data(result.data, url)
+                    # 发布数据到ZMQ（消息编码与磁盘暂存在线程池执行，不阻塞其它抓取协程）；
+                    # 未全部受理时回滚抓取缓存，下次轮询重新处理
+                    if not await asyncio.to_thread(self._publish_data, result.data, url):
+                        self.rollback_freshness(result.response)
 
-                # 控制爬取速度
-                time.sleep(0.5)
+            finally:
+                self.frontier.release(domain, delay)
 
-        except Exception as e:
-            self.status = type(self.status)("error")
-            self.logger.error(f"爬取过程异常: {e}")
-        finally:
-            if self.status.value == "running":
-                self.status = type(self.status)("idle")
-
-            self.stop_time = datetime.utcnow()
-            self.logger.info(
-                f"{self.__class__.__name__} 爬取结束 | "
-                f"访问页面: {len(self.visited_urls)} | "
-                f"队列剩余: {len(self.url_queue)}"
-            )
+    def stop_crawling(self) -> None:
+        """停止爬取（唤醒等待中的爬取协程）"""
+        super().stop_crawling()
+        self.frontier.close()
 
     def _is_article_page(self, response: CrawlResponse) -> bool:
         """判断是否为文章详情页
@@ -722,14 +741,7 @@ class ScrapyCrawler(BaseCrawler):
                 if re.search(pattern, url, re.IGNORECASE):
                     return False
 
-            # 检查是否已访问
-            if url in self.visited_urls:
-                return False
-
-            # 检查是否已在队列中
-            if url in self.url_queue:
-                return False
-
+            # 已访问与已排队的去重在 _add_links_to_queue 中于事件循环线程上完成
             return True
 
         except Exception:
@@ -744,12 +756,18 @@ class ScrapyCrawler(BaseCrawler):
         added_count = 0
 
         for link in links:
-            if link not in self.url_queue and link not in self.visited_urls:
-                self.url_queue.append(link)
+            domain = urlparse(link).netloc
+            # 已访问数 + 排队数达到站点上限后不再入队，队列内存随站点数而非链接数增长
+            if (
+                self.visited_urls.domain_count(domain) + self.frontier.domain_size(domain)
+                >= self.max_pages_per_site
+            ):
+                continue
+            if link not in self.visited_urls and self.frontier.push(link, domain):
                 added_count += 1
 
         if added_count > 0:
-            self.logger.debug(f"添加 {added_count} 个链接到队列，队列总数: {len(self.url_queue)}")
+            self.logger.debug(f"添加 {added_count} 个链接到队列，队列总数: {len(self.frontier)}")
 
     def _extract_keywords(self, content: str) -> List[str]:
         """从内容中提取关键词
@@ -822,7 +840,10 @@ class ScrapyCrawler(BaseCrawler):
         stats.update(
             {
                 "visited_urls_count": len(self.visited_urls),
-                "queue_size": len(self.url_queue),
+                "visited_index": self.visited_urls.get_stats(),
+                "queue_size": len(self.frontier),
+                "frontier": self.frontier.get_stats(),
+                "news_extractor": self.news_extractor.stats.copy(),
                 "target_sites_count": len(self.target_sites),
                 "max_pages_per_site": self.max_pages_per_site,
                 "follow_links_enabled": self.follow_links,
@@ -0,0 +1,450 @@
+# -*- coding: utf-8 -*-
+"""
+NeuroTrade Nexus - 流式选择器提取引擎
+把一组字段的CSS选择器编译为一次流式遍历，边解析边匹配，字段全部确定后提前结束
+
+- 基于 lxml 的增量HTML解析器，按块喂入，不预先构建完整DOM
+- 支持的选择器子集: 标签、*、#id、.class、[attr]、[attr=v]、[attr*=v]、[attr^=v]、
+  [attr$=v]、[attr~=v]，以及后代（空格）与子代（>）组合符
+- 选择器按最右侧复合选择器的 id / class / 标签 分桶，每个元素只检查可能命中的选择器
+- 已结束且不再需要文本的子树随即释放，内存与文档深度而非文档大小相关
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from lxml import etree
+
+# 字段取值模式
+MODE_FIRST = "first"  # 按来源优先级取第一个可接受的值
+MODE_ALL = "all"  # 取优先级最高且有值的来源的全部值
+MODE_UNION = "union"  # 合并所有来源的值（去重）
+
+# 文本不计入任何字段的元素
+_SKIP_TEXT_TAGS = frozenset(("script", "style", "noscript", "template"))
+
+_COMPOUND_RE = re.compile(
+    r"""
+      (?P<tag>\*|[a-zA-Z][\w-]*)
+    | \#(?P<id>[\w-]+)
+    | \.(?P<cls>[\w-]+)
+    | \[\s*(?P<attr>[\w:-]+)\s*
+        (?:(?P<op>[*^$~|]?=)\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\]\s]+))\s*)?
+      \]
+    """,
+    re.VERBOSE,
+)
+
+
+def split_selector_list(selectors: str) -> List[str]:
+    """拆分逗号分隔的选择器列表（忽略引号与方括号内的逗号）"""
+    parts, buf, depth, quote = [], [], 0, None
+    for ch in selectors or "":
+        if quote:
+            quote = None if ch == quote else quote
+        elif ch in "'\"":
+            quote = ch
+        elif ch == "[":
+            depth += 1
+        elif ch == "]":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append("".join(buf).strip())
+            buf = []
+            continue
+        buf.append(ch)
+    parts.append("".join(buf).strip())
+    return [part for part in parts if part]
+
+
+class _Compound:
+    """复合选择器（单个元素上的全部条件）"""
+
+    __slots__ = ("tag", "id", "classes", "attrs")
+
+    def __init__(self, text: str):
+        self.tag: Optional[str] = None
+        self.id: Optional[str] = None
+        self.classes: Tuple[str, ...] = ()
+        self.attrs: List[Tuple[str, Optional[str], Optional[str]]] = []
+
+        pos = 0
+        classes = []
+        while pos < len(text):
+            match = _COMPOUND_RE.match(text, pos)
+            if match is None or (match.group("tag") and pos > 0):
+                raise ValueError(f"不支持的选择器: {text}")
+            if match.group("tag"):
+                tag = match.group("tag").lower()
+                self.tag = None if tag == "*" else tag
+            elif match.group("id"):
+                self.id = match.group("id")
+            elif match.group("cls"):
+                classes.append(match.group("cls"))
+            else:
+                value = next(
+                    (v for v in match.group("dq", "sq", "bare") if v is not None), None
+                )
+                self.attrs.append((match.group("attr").lower(), match.group("op"), value))
+            pos = match.end()
+        self.classes = tuple(classes)
+
+    def matches(self, elem) -> bool:
+        if self.tag is not None and elem.tag != self.tag:
+            return False
+        if self.id is not None and elem.get("id") != self.id:
+            return False
+        if self.classes:
+            class_attr = elem.get("class")
+            if not class_attr:
+                return False
+            names = class_attr.split()
+            if any(name not in names for name in self.classes):
+                return False
+        for name, op, value in self.attrs:
+            actual = elem.get(name)
+            if actual is None:
+                return False
+            if op is None:
+                continue
+            if op == "=":
+                ok = actual == value
+            elif op == "*=":
+                ok = bool(value) and value in actual
+            elif op == "^=":
+                ok = bool(value) and actual.startswith(value)
+            elif op == "$=":
+                ok = bool(value) and actual.endswith(value)
+            elif op == "~=":
+                ok = value in actual.split()
+            else:  # |=
+                ok = actual == value or actual.startswith(value + "-")
+            if not ok:
+                return False
+        return True
+
+
+class CompiledSelector:
+    """编译后的CSS选择器（自右向左匹配）
+
+    Args:
+        selector: 单个CSS选择器（不含逗号）
+    """
+
+    __slots__ = ("selector", "steps")
+
+    def __init__(self, selector: str):
+        self.selector = selector
+        # (与前一步的组合符, 复合选择器)
+        self.steps: List[Tuple[str, _Compound]] = []
+
+        buf, combinator, depth, quote = [], " ", 0, None
+        for ch in selector.strip() + " ":
+            if quote:
+                quote = None if ch == quote else quote
+            elif ch in "'\"":
+                quote = ch
+            elif ch == "[":
+                depth += 1
+            elif ch == "]":
+                depth -= 1
+            elif depth == 0 and (ch.isspace() or ch == ">"):
+                if buf:
+                    self.steps.append((combinator, _Compound("".join(buf))))
+                    buf, combinator = [], " "
+                if ch == ">":
+                    combinator = ">"
+                continue
+            buf.append(ch)
+
+        if not self.steps:
+            raise ValueError(f"空选择器: {selector!r}")
+
+    @property
+    def key(self) -> Tuple[str, Optional[str]]:
+        """分桶键（取最右侧复合选择器中区分度最高的条件）"""
+        last = self.steps[-1][1]
+        if last.id is not None:
+            return "id", last.id
+        if last.classes:
+            return "class", last.classes[0]
+        if last.tag is not None:
+            return "tag", last.tag
+        return "any", None
+
+    def match(self, elem) -> Optional[Any]:
+        """匹配元素
+
+        Returns:
+            命中时返回最左侧复合选择器对应的元素（单步选择器即元素本身），否则None
+        """
+        return self._match(elem, len(self.steps) - 1)
+
+    def _match(self, elem, index: int):
+        combinator, compound = self.steps[index]
+        if not compound.matches(elem):
+            return None
+        if index == 0:
+            return elem
+
+        parent = elem.getparent()
+        if combinator == ">":
+            return self._match(parent, index - 1) if parent is not None else None
+        while parent is not None:
+            scope = self._match(parent, index - 1)
+            if scope is not None:
+                return scope
+            parent = parent.getparent()
+        return None
+
+
+def element_text(elem) -> str:
+    """元素文本（合并空白）"""
+    return " ".join("".join(elem.itertext()).split())
+
+
+@dataclass
+class FieldRule:
+    """字段提取规则
+
+    Args:
+        name: 字段名
+        sources: 按优先级排列的 (选择器, 属性名) 列表，属性名为None时取元素文本；
+            属性名也可为元组，按顺序取第一个存在的属性（None表示元素文本）
+        accept: 把原始字符串转换为字段值，返回None表示不接受
+        mode: 取值模式（first / all / union）
+        blocking: 是否必须确定后才能提前结束遍历
+    """
+
+    name: str
+    sources: List[Tuple[str, Any]]
+    accept: Callable[[str], Any] = lambda value: value or None
+    mode: str = MODE_FIRST
+    blocking: bool = True
+
+
+@dataclass
+class ExtractionResult:
+    """提取结果"""
+
+    values: Dict[str, Any] = field(default_factory=dict)
+    early_stop: bool = False
+    elements: int = 0
+
+
+class _FieldState:
+    """单个字段在一次遍历中的状态"""
+
+    __slots__ = ("rule", "best", "value", "values", "seen", "final")
+
+    def __init__(self, rule: FieldRule):
+        self.rule = rule
+        self.best = len(rule.sources)
+        self.value = None
+        self.values: List[Any] = []
+        self.seen: Dict[Any, None] = {}
+        self.final = False
+
+    def wants(self, index: int) -> bool:
+        if self.final:
+            return False
+        mode = self.rule.mode
+        if mode == MODE_FIRST:
+            return index < self.best
+        if mode == MODE_ALL:
+            return index <= self.best
+        return True
+
+    def offer(self, index: int, raw: Optional[str]) -> bool:
+        """提交一个候选值，返回是否被接受"""
+        if not raw:
+            return False
+        value = self.rule.accept(raw.strip())
+        if value is None or not self.wants(index):
+            return False
+
+        mode = self.rule.mode
+        if mode == MODE_FIRST:
+            self.best, self.value = index, value
+            self.final = index == 0
+        elif mode == MODE_ALL:
+            if index < self.best:
+                self.best, self.values = index, []
+            self.values.append(value)
+        elif value not in self.seen:
+            self.seen[value] = None
+            self.values.append(value)
+        return True
+
+    def result(self) -> Any:
+        if self.rule.mode == MODE_FIRST:
+            return self.value
+        return self.values
+
+
+class ExtractionPlan:
+    """编译后的提取计划（可复用，线程安全）
+
+    MODE_ALL 字段在优先级最高的来源首次命中后，于其所在容器结束时确定：
+    后代选择器的容器为最左侧匹配的祖先元素，单步选择器为命中元素的父元素。
+    命中 stop 选择器即视为正文区域结束，之后的元素不再参与提取。
+
+    Args:
+        rules: 字段规则
+        stop: 区域结束选择器（逗号分隔，可为空）
+        chunk_size: 每次喂给解析器的字符数
+    """
+
+    def __init__(self, rules: Iterable[FieldRule], stop: str = "", chunk_size: int = 16384):
+        self.rules = list(rules)
+        self.chunk_size = chunk_size
+        # 分桶: 键 -> [(字段序号, 来源序号, 选择器, 属性名元组)]，字段序号为-1表示结束选择器
+        self._buckets: Dict[Tuple[str, Optional[str]], List[tuple]] = {}
+
+        for field_index, rule in enumerate(self.rules):
+            for source_index, (selector, attr) in enumerate(rule.sources):
+                self._add(field_index, source_index, CompiledSelector(selector), attr)
+        for selector in split_selector_list(stop):
+            self._add(-1, 0, CompiledSelector(selector), ())
+
+        self._any = self._buckets.get(("any", None), [])
+
+    def _add(self, field_index: int, source_index: int, selector: CompiledSelector, attr) -> None:
+        attrs = attr if isinstance(attr, tuple) else (attr,)
+        self._buckets.setdefault(selector.key, []).append((field_index, source_index, selector, attrs))
+
+    def _candidates(self, elem) -> List[tuple]:
+        buckets = self._buckets
+        candidates = list(self._any)
+        candidates.extend(buckets.get(("tag", elem.tag), ()))
+        elem_id = elem.get("id")
+        if elem_id:
+            candidates.extend(buckets.get(("id", elem_id), ()))
+        class_attr = elem.get("class")
+        if class_attr:
+            for name in set(class_attr.split()):
+                candidates.extend(buckets.get(("class", name), ()))
+        return candidates
+
+    def extract(self, markup: Any) -> ExtractionResult:
+        """流式提取
+
+        Args:
+            markup: HTML文本（str或bytes）
+
+        Returns:
+            提取结果
+        """
+        states = [_FieldState(rule) for rule in self.rules]
+        remaining = sum(1 for rule in self.rules if rule.blocking)
+        # 等待文本的未结束元素 -> [(字段状态, 来源序号, 容器)]
+        pending: Dict[Any, List[Tuple[_FieldState, int, Any]]] = {}
+        # MODE_ALL 字段的容器元素 -> 字段状态
+        closing: Dict[Any, List[_FieldState]] = {}
+        result = ExtractionResult()
+
+        def settle(state: _FieldState) -> None:
+            nonlocal remaining
+            if state.final and state.rule.blocking:
+                remaining -= 1
+
+        def submit(state: _FieldState, index: int, raw: Optional[str], scope) -> None:
+            was_final = state.final
+            if state.offer(index, raw):
+                if state.rule.mode == MODE_ALL and index == 0 and scope is not None:
+                    if scope not in closing or state not in closing[scope]:
+                        closing.setdefault(scope, []).append(state)
+                if state.final and not was_final:
+                    settle(state)
+
+        parser = etree.HTMLPullParser(events=("start", "end"))
+        stop_elem = None
+        stopped = False
+        size = len(markup)
+        offset = 0
+
+        while offset < size and not stopped:
+            parser.feed(markup[offset:offset + self.chunk_size])
+            offset += self.chunk_size
+            if offset >= size:
+                parser.close()
+
+            for event, elem in parser.read_events():
+                if not isinstance(elem.tag, str):
+                    continue
+
+                if event == "start":
+                    result.elements += 1
+                    for field_index, source_index, selector, attrs in self._candidates(elem):
+                        if field_index < 0:
+                            if selector.match(elem) is not None:
+                                stop_elem = elem
+                                break
+                            continue
+                        state = states[field_index]
+                        if not state.wants(source_index):
+                            continue
+                        scope = selector.match(elem)
+                        if scope is None:
+                            continue
+                        if scope is elem and state.rule.mode == MODE_ALL:
+                            scope = elem.getparent()
+                        for name in attrs:
+                            if name is None:
+                                pending.setdefault(elem, []).append((state, source_index, scope))
+                                break
+                            value = elem.get(name)
+                            if value is not None:
+                                submit(state, source_index, value, scope)
+                                break
+                    if stop_elem is not None or remaining == 0:
+                        stopped = True
+                        break
+                    continue
+
+                # end
+                if elem.tag in _SKIP_TEXT_TAGS:
+                    elem.text = None
+                captures = pending.pop(elem, None)
+                if captures:
+                    text = element_text(elem)
+                    for state, source_index, scope in captures:
+                        submit(state, source_index, text, scope)
+                watchers = closing.pop(elem, None)
+                if watchers:
+                    for state in watchers:
+                        if not state.final:
+                            state.final = True
+                            settle(state)
+                if remaining == 0:
+                    stopped = True
+                    break
+                if not pending:
+                    # 释放已结束的子树与之前的兄弟节点
+                    elem.clear()
+                    parent = elem.getparent()
+                    if parent is not None:
+                        while elem.getprevious() is not None:
+                            del parent[0]
+
+        if stop_elem is not None and pending and stop_elem.getparent() is not None:
+            # 截断结束元素及其之后已解析的内容，未结束元素按已解析部分取文本
+            node = stop_elem
+            while node is not None:
+                parent = node.getparent()
+                if parent is None:
+                    break
+                while node.getnext() is not None:
+                    parent.remove(node.getnext())
+                node = parent
+            stop_elem.getparent().remove(stop_elem)
+            pending.pop(stop_elem, None)
+            for elem, captures in pending.items():
+                text = element_text(elem)
+                for state, source_index, scope in captures:
+                    submit(state, source_index, text, scope)
+
+        result.early_stop = stopped
+        result.values = {state.rule.name: state.result() for state in states}
+        return result
@@ -8,9 +8,10 @@ import sys
 import os
 import re
 import json
+import time
 import asyncio
-from typing import Dict, Any, List, Optional, Set, Callable
-from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Set, Callable, Tuple
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass
 from enum import Enum
 
@@ -43,7 +44,50 @@ from telethon.errors import (
 from ..config import ConfigManager
 from ..utils import Logger
 from ..zmq_client import ZMQPublisher, NewsMessage
+from ..processors.pipeline import DataPipeline
 from .base_crawler import BaseCrawler, CrawlerStatus
+from .keyword_matcher import KeywordMatcher, PatternMatcher
+
+# 金融和加密货币相关关键词
+FINANCIAL_KEYWORDS = (
+    "bitcoin",
+    "btc",
+    "ethereum",
+    "eth",
+    "crypto",
+    "cryptocurrency",
+    "blockchain",
+    "defi",
+    "nft",
+    "trading",
+    "market",
+    "price",
+    "bull",
+    "bear",
+    "pump",
+    "dump",
+    "moon",
+    "lambo",
+    "hodl",
+    "altcoin",
+    "shitcoin",
+    "gem",
+    "signal",
+    "analysis",
+    "breakout",
+    "support",
+    "resistance",
+    "volume",
+    "listing",
+    "binance",
+    "coinbase",
+    "exchange",
+    "announcement",
+    "news",
+)
+
+_FINANCIAL_MATCHER = KeywordMatcher(FINANCIAL_KEYWORDS, whole_word=True)
+_HASHTAG_RE = re.compile(r"#\w+")
 
 
 class MessageType(Enum):
@@ -112,6 +156,47 @@ class ChannelConfig:
             self.exclude_keywords = []
 
 
+@dataclass
+class ChannelLagStats:
+    """单个频道的接收与延迟统计"""
+
+    username: Optional[str] = None
+    received: int = 0
+    processed: int = 0
+    filtered: int = 0
+    # 消息发布时间到开始处理的延迟（秒）
+    lag_last: float = 0.0
+    lag_avg: float = 0.0
+    lag_max: float = 0.0
+    # 入队到开始处理的排队时间（毫秒）
+    queue_delay_ms_last: float = 0.0
+    queue_delay_ms_max: float = 0.0
+
+    def record(self, lag: Optional[float], queue_delay_ms: float) -> None:
+        """记录一条消息的延迟（平均值为指数滑动平均）"""
+        self.received += 1
+        self.queue_delay_ms_last = queue_delay_ms
+        self.queue_delay_ms_max = max(self.queue_delay_ms_max, queue_delay_ms)
+        if lag is None:
+            return
+        self.lag_last = lag
+        self.lag_max = max(self.lag_max, lag)
+        self.lag_avg = lag if self.received == 1 else self.lag_avg * 0.9 + lag * 0.1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "username": self.username,
+            "received": self.received,
+            "processed": self.processed,
+            "filtered": self.filtered,
+            "lag_seconds_last": round(self.lag_last, 3),
+            "lag_seconds_avg": round(self.lag_avg, 3),
+            "lag_seconds_max": round(self.lag_max, 3),
+            "queue_delay_ms_last": round(self.queue_delay_ms_last, 3),
+            "queue_delay_ms_max": round(self.queue_delay_ms_max, 3),
+        }
+
+
 class MessageFilter:
     """消息过滤器"""
 
@@ -127,10 +212,10 @@ class MessageFilter:
         self.global_exclude_keywords = filter_config.get("global_exclude_keywords", [])
         self.spam_patterns = filter_config.get("spam_patterns", [])
 
-        # 编译正则表达式
-        self.spam_regex = [
-            re.compile(pattern, re.IGNORECASE) for pattern in self.spam_patterns
-        ]
+        # 编译正则表达式与关键词匹配器（垃圾信息正则合并为一次扫描）
+        self.spam_matcher = PatternMatcher(self.spam_patterns)
+        # 频道 -> (包含关键词匹配器, 排除关键词匹配器)，首次遇到频道时编译
+        self._channel_matchers: Dict[Tuple, Tuple[KeywordMatcher, KeywordMatcher]] = {}
 
         self.logger.info("消息过滤器初始化完成")
 
@@ -162,12 +247,15 @@ class MessageFilter:
             if self._is_spam(message.text):
                 return False
 
+            include, exclude = self._matchers(channel_config)
+            text_lower = message.text.lower()
+
             # 检查排除关键词
-            if self._contains_exclude_keywords(message.text, channel_config):
+            if exclude and exclude.search(text_lower):
                 return False
 
-            # 检查包含关键词
-            if not self._contains_keywords(message.text, channel_config):
+            # 检查包含关键词（未配置关键词时通过）
+            if include and not include.search(text_lower):
                 return False
 
             return True
@@ -176,46 +264,41 @@ class MessageFilter:
             self.logger.error(f"消息过滤异常: {e}")
             return False
 
+    def _matchers(
+        self, channel_config: ChannelConfig
+    ) -> Tuple[KeywordMatcher, KeywordMatcher]:
+        """获取频道的关键词匹配器（全局关键词与频道关键词合并编译）"""
+        key = (
+            channel_config.username,
+            tuple(channel_config.keywords),
+            tuple(channel_config.exclude_keywords),
+        )
+        matchers = self._channel_matchers.get(key)
+        if matchers is None:
+            matchers = self._channel_matchers[key] = (
+                KeywordMatcher(self.global_keywords + channel_config.keywords),
+                KeywordMatcher(self.global_exclude_keywords + channel_config.exclude_keywords),
+            )
+        return matchers
+
     def _is_spam(self, text: str) -> bool:
         """检查是否为垃圾信息"""
-        for regex in self.spam_regex:
-            if regex.search(text):
-                return True
-        return False
+        return self.spam_matcher.search(text)
 
     def _contains_exclude_keywords(
         self, text: str, channel_config: ChannelConfig
     ) -> bool:
         """检查是否包含排除关键词"""
-        text_lower = text.lower()
-
-        # 检查全局排除关键词
-        for keyword in self.global_exclude_keywords:
-            if keyword.lower() in text_lower:
-                return True
-
-        # 检查频道特定排除关键词
-        for keyword in channel_config.exclude_keywords:
-            if keyword.lower() in text_lower:
-                return True
-
-        return False
+        exclude = self._matchers(channel_config)[1]
+        return exclude.search(text.lower())
 
     def _contains_keywords(self, text: str, channel_config: ChannelConfig) -> bool:
         """检查是否包含关键词"""
         # 如果没有配置关键词，则通过
-        all_keywords = self.global_keywords + channel_config.keywords
-        if not all_keywords:
+        include = self._matchers(channel_config)[0]
+        if not include:
             return True
-
-        text_lower = text.lower()
-
-        # 检查是否包含任一关键词
-        for keyword in all_keywords:
-            if keyword.lower() in text_lower:
-                return True
-
-        return False
+        return include.search(text.lower())
 
 
 class TelegramCrawler(BaseCrawler):
@@ -229,6 +312,7 @@ class TelegramCrawler(BaseCrawler):
         config: ConfigManager,
         logger: Logger = None,
         publisher: ZMQPublisher = None,
+        pipeline: DataPipeline = None,
     ):
         """初始化Telegram爬虫
 
@@ -236,6 +320,7 @@ class TelegramCrawler(BaseCrawler):
             config: 配置管理器
             logger: 日志记录器
             publisher: ZMQ发布器
+            pipeline: 数据处理管道（为空且启用 telegram.ingest.use_pipeline 时按需创建）
         """
         super().__init__(config, logger, publisher)
 
@@ -274,11 +359,33 @@ class TelegramCrawler(BaseCrawler):
         # 消息处理器
         self.message_handlers: List[Callable] = []
 
+        # 接收管线：事件处理器只入队原始事件，后台工作协程按微批次解析、过滤、处理与发布
+        ingest_config = self.telegram_config.get("ingest", {}) or {}
+        self.ingest_queue_size = ingest_config.get("queue_size", 10000)
+        self.ingest_batch_size = max(1, ingest_config.get("batch_size", 100))
+        self.ingest_max_wait = ingest_config.get("max_batch_wait_ms", 50) / 1000.0
+        # 默认不经过数据处理管道：通用校验规则（如 min_content_length）会拒绝短消息
+        self.use_pipeline = ingest_config.get("use_pipeline", False)
+        self.pipeline = pipeline
+        self._ingest_queue: Optional[asyncio.Queue] = None
+        self._ingest_task: Optional[asyncio.Task] = None
+
+        # 聊天ID -> 频道配置（加入频道后建立）
+        self._channel_index: Dict[int, ChannelConfig] = {}
+        # 频道ID -> 接收与延迟统计（未设置频道ID时按用户名）
+        self.channel_stats: Dict[Any, ChannelLagStats] = {}
+
+        # 整词关键词匹配器缓存（按 telegram.keywords 编译）
+        self._keyword_matcher: Optional[KeywordMatcher] = None
+
         # 统计信息
         self.telegram_stats = {
             "messages_received": 0,
             "messages_processed": 0,
             "messages_filtered": 0,
+            "messages_rejected": 0,
+            "messages_dropped": 0,
+            "batches_processed": 0,
             "channels_monitored": 0,
             "last_message_time": None,
             "connection_errors": 0,
@@ -387,6 +494,9 @@ class TelegramCrawler(BaseCrawler):
         self.logger.info("开始监听Telegram消息")
 
         try:
+            # 启动批处理工作协程
+            self._start_ingest()
+
             # 注册消息处理器
             @self.client.on(events.NewMessage)
             async def message_handler(event):
@@ -404,6 +514,7 @@ class TelegramCrawler(BaseCrawler):
             self.telegram_stats["connection_errors"] += 1
             self.logger.error(f"Telegram监听异常: {e}")
         finally:
+            await self._stop_ingest()
             self.status = CrawlerStatus.IDLE
             self.stop_time = datetime.utcnow()
             self.logger.info("Telegram消息监听结束")
@@ -427,6 +538,7 @@ class TelegramCrawler(BaseCrawler):
 
                 # 更新频道ID
                 channel_config.channel_id = entity.id
+                self._index_channel(channel_config, entity)
                 joined_count += 1
 
             except ChannelPrivateError:
@@ -437,41 +549,231 @@ class TelegramCrawler(BaseCrawler):
         self.telegram_stats["channels_monitored"] = joined_count
         self.logger.info(f"成功监听 {joined_count} 个频道")
 
+    def _start_ingest(self) -> None:
+        """创建接收队列并启动批处理工作协程（需在事件循环中调用）"""
+        if self._ingest_task is not None and not self._ingest_task.done():
+            return
+        self._ingest_queue = asyncio.Queue(maxsize=self.ingest_queue_size)
+        self._ingest_task = asyncio.ensure_future(self._ingest_worker())
+
+    async def _stop_ingest(self, timeout: float = 10.0) -> None:
+        """处理完队列中剩余的消息后停止工作协程
+
+        队列已满时等待工作协程腾出位置再放入结束标记，整体超过 timeout 才取消
+        """
+        task, queue = self._ingest_task, self._ingest_queue
+        if task is None:
+            return
+
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + timeout
+        try:
+            await asyncio.wait_for(queue.put(None), timeout)
+            await asyncio.wait_for(asyncio.shield(task), max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            remaining = queue.qsize()
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            self.logger.warning(f"Telegram接收队列未能及时处理完，剩余 {remaining} 条")
+        except Exception as e:
+            self.logger.error(f"停止Telegram接收队列异常: {e}")
+        finally:
+            self._ingest_task = None
+            self._ingest_queue = None
+
     async def _handle_new_message(self, event) -> None:
-        """处理新消息
+        """处理新消息（只入队，不在Telethon的更新循环中解析或发布）
 
         Args:
             event: Telegram消息事件
         """
+        self.telegram_stats["messages_received"] += 1
+        self.telegram_stats["last_message_time"] = datetime.utcnow().isoformat()
+
+        item = (event, time.monotonic())
+        if self._ingest_queue is None:
+            # 未启动接收队列时（如直接调用）按单条批次处理
+            await self._process_batch([item])
+            return
+
         try:
-            self.telegram_stats["messages_received"] += 1
-            self.telegram_stats["last_message_time"] = datetime.utcnow().isoformat()
+            self._ingest_queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.telegram_stats["messages_dropped"] += 1
+            self.logger.warning(f"Telegram接收队列已满（{self.ingest_queue_size}），丢弃消息")
+
+    async def _ingest_worker(self) -> None:
+        """批处理工作协程：取到首条消息后，在批次上限或等待时限内尽量凑满一批"""
+        queue = self._ingest_queue
+        loop = asyncio.get_event_loop()
+        stopping = False
+
+        while not stopping:
+            item = await queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = loop.time() + self.ingest_max_wait
+            while len(batch) < self.ingest_batch_size:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                await self._process_batch(batch)
+            except Exception as e:
+                self.logger.error(f"处理Telegram消息批次异常: {e}")
 
-            # 解析消息
-            telegram_message = await self._parse_message(event)
+    async def _process_batch(self, batch: List[Tuple[Any, float]]) -> None:
+        """处理一批消息事件
+
+        并发解析 -> 编译关键词匹配器过滤 -> 数据处理管道批量处理（线程池中执行）-> 发布
+
+        Args:
+            batch: (消息事件, 入队时间) 列表
+        """
+        started = time.monotonic()
+        now = datetime.now(timezone.utc)
+
+        # 并发解析（获取发送者与聊天信息可能需要网络请求）
+        parsed = await asyncio.gather(
+            *(self._parse_message(event) for event, _ in batch)
+        )
+
+        accepted: List[Tuple[TelegramMessage, ChannelConfig]] = []
+        for (_, enqueued), telegram_message in zip(batch, parsed):
             if not telegram_message:
-                return
+                continue
 
             # 查找对应的频道配置
             channel_config = self._find_channel_config(telegram_message.chat_id)
             if not channel_config:
-                return
+                continue
+
+            channel_stats = self._channel_stats(channel_config)
+            channel_stats.record(
+                self._message_lag(telegram_message, now), (started - enqueued) * 1000
+            )
 
             # 过滤消息
             if not self.message_filter.should_process_message(
                 telegram_message, channel_config
             ):
                 self.telegram_stats["messages_filtered"] += 1
-                return
+                channel_stats.filtered += 1
+                continue
+
+            accepted.append((telegram_message, channel_config))
 
-            # 处理消息
-            await self._process_message(telegram_message, channel_config)
+        if accepted:
+            news_messages = [
+                self._build_news_message(telegram_message, channel_config)
+                for telegram_message, channel_config in accepted
+            ]
+            news_messages = await self._run_pipeline(news_messages)
+
+            for (telegram_message, channel_config), news_message in zip(
+                accepted, news_messages
+            ):
+                if news_message is None:
+                    self.telegram_stats["messages_rejected"] += 1
+                    continue
 
-            self.telegram_stats["messages_processed"] += 1
-            self.stats["items_scraped"] += 1
+                await self._process_message(telegram_message, channel_config, news_message)
 
+                self.telegram_stats["messages_processed"] += 1
+                self.stats["items_scraped"] += 1
+                self._channel_stats(channel_config).processed += 1
+
+        self.telegram_stats["batches_processed"] += 1
+        self.logger.debug(
+            f"Telegram批次处理完成: 消息={len(batch)} | 通过={len(accepted)} | "
+            f"耗时={(time.monotonic() - started) * 1000:.1f}ms"
+        )
+
+    async def _run_pipeline(
+        self, news_messages: List[NewsMessage]
+    ) -> List[Optional[NewsMessage]]:
+        """把一批消息交给数据处理管道（在线程池中执行，不阻塞事件循环）
+
+        Returns:
+            与输入一一对应的消息，未通过处理的为None；管道不可用时原样返回
+        """
+        pipeline = self._get_pipeline()
+        if pipeline is None:
+            return news_messages
+
+        loop = asyncio.get_event_loop()
+        try:
+            batch_result = await loop.run_in_executor(
+                None,
+                pipeline.process_batch,
+                [news_message.to_dict() for news_message in news_messages],
+            )
         except Exception as e:
-            self.logger.error(f"处理Telegram消息异常: {e}")
+            self.logger.error(f"Telegram消息批量处理失败: {e}")
+            return news_messages
+
+        if len(batch_result.results) != len(news_messages):
+            # 管道整体异常（结果缺失）时不丢弃消息
+            self.logger.warning(f"Telegram消息批量处理结果不完整: {batch_result.errors[:3]}")
+            return news_messages
+
+        processed = []
+        for news_message, result in zip(news_messages, batch_result.results):
+            if not result.success:
+                processed.append(None)
+                continue
+            data = result.data if isinstance(result.data, dict) else {}
+            # 采用清洗后的标题与正文
+            news_message.title = data.get("title") or news_message.title
+            news_message.content = data.get("content") or news_message.content
+            processed.append(news_message)
+        return processed
+
+    def _get_pipeline(self) -> Optional[DataPipeline]:
+        """获取数据处理管道（未注入时按配置首次使用时创建）"""
+        if self.pipeline is None and self.use_pipeline:
+            try:
+                self.pipeline = DataPipeline(self.config, self.logger)
+            except Exception as e:
+                self.logger.error(f"创建数据处理管道失败，消息将直接发布: {e}")
+                self.use_pipeline = False
+        return self.pipeline
+
+    def _channel_stats(self, channel_config: ChannelConfig) -> ChannelLagStats:
+        key = channel_config.channel_id
+        if key is None:
+            key = channel_config.username
+        stats = self.channel_stats.get(key)
+        if stats is None:
+            stats = self.channel_stats[key] = ChannelLagStats(username=channel_config.username)
+        return stats
+
+    @staticmethod
+    def _message_lag(telegram_message: TelegramMessage, now: datetime) -> Optional[float]:
+        """消息发布时间到当前的延迟（秒），无发布时间时返回None"""
+        date = telegram_message.date
+        if not isinstance(date, datetime):
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        return max(0.0, (now - date).total_seconds())
 
     async def _parse_message(self, event) -> Optional[TelegramMessage]:
         """解析Telegram消息
@@ -553,6 +855,22 @@ class TelegramCrawler(BaseCrawler):
             self.logger.error(f"解析Telegram消息失败: {e}")
             return None
 
+    def _index_channel(self, channel_config: ChannelConfig, entity=None) -> None:
+        """登记频道的聊天ID
+
+        消息的 chat_id 为带类型标记的ID（频道为 -100 前缀，普通群组取负），
+        实体ID为原始ID，两种形式都登记
+        """
+        channel_id = channel_config.channel_id
+        if channel_id is None:
+            return
+        self._channel_index[channel_id] = channel_config
+        if channel_id > 0:
+            if entity is None or isinstance(entity, Channel):
+                self._channel_index[-(10**12) - channel_id] = channel_config
+            if entity is None or isinstance(entity, Chat):
+                self._channel_index[-channel_id] = channel_config
+
     def _find_channel_config(self, chat_id: int) -> Optional[ChannelConfig]:
         """查找频道配置
 
@@ -562,47 +880,70 @@ class TelegramCrawler(BaseCrawler):
         Returns:
             频道配置或None
         """
+        config = self._channel_index.get(chat_id)
+        if config is not None:
+            return config
+
+        # 未登记（如频道ID由外部设置）时回退到线性查找并登记
         for config in self.channels:
-            if config.channel_id == chat_id:
-                return config
-        return None
+            if config.channel_id is not None:
+                self._index_channel(config)
+        return self._channel_index.get(chat_id)
 
-    async def _process_message(
+    def _build_news_message(
         self, telegram_message: TelegramMessage, channel_config: ChannelConfig
+    ) -> NewsMessage:
+        """创建新闻消息
+
+        Args:
+            telegram_message: Telegram消息
+            channel_config: 频道配置
+
+        Returns:
+            新闻消息
+        """
+        return NewsMessage(
+            id=f"tg_{telegram_message.chat_id}_{telegram_message.id}",
+            title=self._extract_title(telegram_message.text),
+            content=telegram_message.text,
+            source=f"telegram_{channel_config.username}",
+            url=self._generate_message_url(telegram_message),
+            timestamp=telegram_message.date.isoformat(),
+            category=channel_config.category,
+            sentiment=None,  # 将在后续处理中分析
+            keywords=self._extract_keywords(telegram_message.text),
+            metadata={
+                "telegram_message_id": telegram_message.id,
+                "telegram_chat_id": telegram_message.chat_id,
+                "telegram_chat_title": telegram_message.chat_title,
+                "telegram_sender_id": telegram_message.sender_id,
+                "telegram_sender_username": telegram_message.sender_username,
+                "telegram_message_type": telegram_message.message_type.value,
+                "telegram_views": telegram_message.views,
+                "telegram_forwards": telegram_message.forwards,
+                "telegram_reactions": telegram_message.reactions,
+                "telegram_forward_from": telegram_message.forward_from,
+                "channel_priority": channel_config.priority,
+                "extraction_time": datetime.utcnow().isoformat(),
+            },
+        )
+
+    async def _process_message(
+        self,
+        telegram_message: TelegramMessage,
+        channel_config: ChannelConfig,
+        news_message: NewsMessage = None,
     ) -> None:
         """处理消息
 
         Args:
             telegram_message: Telegram消息
             channel_config: 频道配置
+            news_message: 已创建（并经管道处理）的新闻消息，为空时现场创建
         """
         try:
-            # 创建新闻消息
-            news_message = NewsMessage(
-                id=f"tg_{telegram_message.chat_id}_{telegram_message.id}",
-                title=self._extract_title(telegram_message.text),
-                content=telegram_message.text,
-                source=f"telegram_{channel_config.username}",
-                url=self._generate_message_url(telegram_message),
-                timestamp=telegram_message.date.isoformat(),
-                category=channel_config.category,
-                sentiment=None,  # 将在后续处理中分析
-                keywords=self._extract_keywords(telegram_message.text),
-                metadata={
-                    "telegram_message_id": telegram_message.id,
-                    "telegram_chat_id": telegram_message.chat_id,
-                    "telegram_chat_title": telegram_message.chat_title,
-                    "telegram_sender_id": telegram_message.sender_id,
-                    "telegram_sender_username": telegram_message.sender_username,
-                    "telegram_message_type": telegram_message.message_type.value,
-                    "telegram_views": telegram_message.views,
-                    "telegram_forwards": telegram_message.forwards,
-                    "telegram_reactions": telegram_message.reactions,
-                    "telegram_forward_from": telegram_message.forward_from,
-                    "channel_priority": channel_config.priority,
-                    "extraction_time": datetime.utcnow().isoformat(),
-                },
-            )
+            if news_message is None:
+                news_message = self._build_news_message(telegram_message, channel_config)
 
             # 发布到ZMQ
             if self.publisher:
@@ -615,7 +956,7 @@ class TelegramCrawler(BaseCrawler):
                 except Exception as e:
                     self.logger.error(f"自定义消息处理器异常: {e}")
 
-            self.logger.info(
+            self.logger.debug(
                 f"处理Telegram消息: {telegram_message.chat_title} | "
                 f"ID: {telegram_message.id} | "
                 f"类型: {telegram_message.message_type.value}"
@@ -657,6 +998,10 @@ class TelegramCrawler(BaseCrawler):
         """
         if telegram_message.chat_username:
             return f"https://t.me/{telegram_message.chat_username.lstrip('@')}/{telegram_message.id}"
+        # 无用户名的频道使用 t.me/c/<频道ID>/<消息ID> 链接（频道的 chat_id 为 -(10^12 + 频道ID)）
+        chat_id = telegram_message.chat_id
+        if isinstance(chat_id, int) and chat_id < -(10**12):
+            return f"https://t.me/c/{-chat_id - 10**12}/{telegram_message.id}"
         return None
 
     def _extract_keywords(self, text: str) -> List[str]:
@@ -671,55 +1016,11 @@ class TelegramCrawler(BaseCrawler):
         if not text:
             return []
 
-        # 金融和加密货币相关关键词
-        financial_keywords = [
-            "bitcoin",
-            "btc",
-            "ethereum",
-            "eth",
-            "crypto",
-            "cryptocurrency",
-            "blockchain",
-            "defi",
-            "nft",
-            "trading",
-            "market",
-            "price",
-            "bull",
-            "bear",
-            "pump",
-            "dump",
-            "moon",
-            "lambo",
-            "hodl",
-            "altcoin",
-            "shitcoin",
-            "gem",
-            "signal",
-            "analysis",
-            "breakout",
-            "support",
-            "resistance",
-            "volume",
-            "listing",
-            "binance",
-            "coinbase",
-            "exchange",
-            "announcement",
-            "news",
-        ]
-
-        text_lower = text.lower()
-        found_keywords = []
-
-        for keyword in financial_keywords:
-            # 使用正则表达式进行边界匹配，确保只匹配完整的单词
-            pattern = r"\b" + re.escape(keyword) + r"\b"
-            if re.search(pattern, text_lower):
-                found_keywords.append(keyword)
+        # 单次分词后与关键词集合求交集（整词匹配）
+        found_keywords = _FINANCIAL_MATCHER.findall(text.lower())
 
         # 提取hashtags
-        hashtags = re.findall(r"#\w+", text)
+        hashtags = _HASHTAG_RE.findall(text)
         found_keywords.extend([tag.lower() for tag in hashtags])
 
         return list(set(found_keywords))  # 去重
@@ -744,14 +1045,11 @@ class TelegramCrawler(BaseCrawler):
             if not keywords:
                 return True
 
-            text_lower = text.lower()
-            for keyword in keywords:
-                # 使用正则表达式进行边界匹配，确保只匹配完整的单词
-                pattern = r"\b" + re.escape(keyword.lower()) + r"\b"
-                if re.search(pattern, text_lower):
-                    return True
-
-            return False
+            # 整词匹配，确保只匹配完整的单词（关键词配置变化时重新编译）
+            matcher = self._keyword_matcher
+            if matcher is None or matcher.keywords != KeywordMatcher.normalize(keywords):
+                matcher = self._keyword_matcher = KeywordMatcher(keywords, whole_word=True)
+            return matcher.search(text.lower())
 
         except Exception as e:
             self.logger.error(f"消息过滤异常: {e}")
@@ -851,6 +1149,11 @@ class TelegramCrawler(BaseCrawler):
 
         # 添加Telegram特定统计
         stats.update(self.telegram_stats)
+        stats["ingest_queue_size"] = self._ingest_queue.qsize() if self._ingest_queue else 0
+        stats["channel_lag"] = {
+            channel_key: channel_stats.to_dict()
+            for channel_key, channel_stats in self.channel_stats.items()
+        }
 
         # 计算消息处理率
         if self.telegram_stats["messages_received"] > 0:
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+NeuroTrade Nexus - 已访问URL索引
+规范化URL指纹 + 按域名计数，长时间爬取保持常数级单页开销
+
+- URL规范化后取64位blake2b指纹，集合中只保存整数而非完整URL字符串
+- 可选可扩展布隆过滤器：容量用尽时追加更大、误判率更低的分片，
+  内存约为每个URL 1~2字节（误判的代价是极少量页面被跳过）
+- 域名访问计数与指纹一起持久化，重启后页面上限仍然有效
+"""
+
+import hashlib
+import json
+import math
+import os
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+_MAGIC = b"NTN-URL-INDEX 1\n"
+
+
+def canonicalize_url(url: str) -> str:
+    """URL规范化：协议与域名小写、去默认端口、去片段、查询参数排序
+
+    Args:
+        url: 原始URL
+
+    Returns:
+        规范化后的URL
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    if ":" in netloc:
+        host, _, port = netloc.rpartition(":")
+        if _DEFAULT_PORTS.get(scheme) == port:
+            netloc = host
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse((scheme, netloc, parsed.path or "/", parsed.params, query, ""))
+
+
+def url_fingerprint(url: str) -> int:
+    """规范化URL的64位指纹"""
+    digest = hashlib.blake2b(canonicalize_url(url).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class _BloomSlice:
+    """定容布隆过滤器分片（由64位指纹双重哈希出k个位置）"""
+
+    def __init__(self, capacity: int, error_rate: float, bits: Optional[bytearray] = None, count: int = 0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hashes = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bits if bits is not None else bytearray((self.size + 7) // 8)
+        self.count = count
+
+    def _positions(self, fingerprint: int) -> Iterable[int]:
+        h1 = fingerprint & 0xFFFFFFFF
+        h2 = (fingerprint >> 32) | 1
+        size = self.size
+        return ((h1 + i * h2) % size for i in range(self.hashes))
+
+    def __contains__(self, fingerprint: int) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(fingerprint))
+
+    def add(self, fingerprint: int) -> None:
+        bits = self.bits
+        for p in self._positions(fingerprint):
+            bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+
+class ScalableBloomFilter:
+    """可扩展布隆过滤器
+
+    Args:
+        initial_capacity: 首个分片容量
+        error_rate: 总体误判率上限
+        growth: 新分片容量倍数
+        tightening: 新分片误判率衰减系数
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int = 100000,
+        error_rate: float = 0.001,
+        growth: int = 2,
+        tightening: float = 0.5,
+    ):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.slices: List[_BloomSlice] = []
+
+    def __contains__(self, fingerprint: int) -> bool:
+        return any(fingerprint in s for s in reversed(self.slices))
+
+    def __len__(self) -> int:
+        return sum(s.count for s in self.slices)
+
+    def add(self, fingerprint: int) -> None:
+        if not self.slices or self.slices[-1].count >= self.slices[-1].capacity:
+            index = len(self.slices)
+            self.slices.append(
+                _BloomSlice(
+                    self.initial_capacity * self.growth ** index,
+                    self.error_rate * (1 - self.tightening) * self.tightening ** index,
+                )
+            )
+        self.slices[-1].add(fingerprint)
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(len(s.bits) for s in self.slices)
+
+
+class VisitedURLIndex:
+    """已访问URL索引 - 指纹集合（或布隆过滤器）+ 域名计数
+
+    Args:
+        use_bloom: 是否使用可扩展布隆过滤器（否则为精确指纹集合）
+        persist_path: 持久化文件路径（为空则仅内存）
+        capacity: 布隆过滤器首个分片容量
+        error_rate: 布隆过滤器误判率
+    """
+
+    def __init__(
+        self,
+        use_bloom: bool = False,
+        persist_path: Optional[str] = None,
+        capacity: int = 100000,
+        error_rate: float = 0.001,
+    ):
+        self.use_bloom = use_bloom
+        self.persist_path = persist_path
+        self._fingerprints = ScalableBloomFilter(capacity, error_rate) if use_bloom else set()
+        self._domain_counts: Dict[str, int] = {}
+
+        if persist_path and os.path.exists(persist_path):
+            self.load(persist_path)
+
+    def __contains__(self, url: str) -> bool:
+        return url_fingerprint(url) in self._fingerprints
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def add(self, url: str, domain: Optional[str] = None) -> bool:
+        """记录已访问URL
+
+        Returns:
+            是否为新URL
+        """
+        fingerprint = url_fingerprint(url)
+        if fingerprint in self._fingerprints:
+            return False
+        self._fingerprints.add(fingerprint)
+        domain = domain or urlparse(url).netloc
+        self._domain_counts[domain] = self._domain_counts.get(domain, 0) + 1
+        return True
+
+    def domain_count(self, domain: str) -> int:
+        """域名已访问页面数（O(1)）"""
+        return self._domain_counts.get(domain, 0)
+
+    @property
+    def memory_bytes(self) -> int:
+        """指纹存储占用估算"""
+        if self.use_bloom:
+            return self._fingerprints.memory_bytes
+        # 集合槽位（哈希+引用）与int对象
+        return len(self._fingerprints) * (16 + 32)
+
+    # 持久化
+
+    def save(self, path: Optional[str] = None) -> Optional[str]:
+        """写入文件（先写临时文件再原子替换）"""
+        path = path or self.persist_path
+        if not path:
+            return None
+
+        header: Dict[str, Any] = {"domain_counts": self._domain_counts}
+        if self.use_bloom:
+            bloom = self._fingerprints
+            header["bloom"] = {
+                "initial_capacity": bloom.initial_capacity,
+                "error_rate": bloom.error_rate,
+                "growth": bloom.growth,
+                "tightening": bloom.tightening,
+                "slices": [
+                    {"capacity": s.capacity, "error_rate": s.error_rate, "count": s.count}
+                    for s in bloom.slices
+                ],
+            }
+            payloads = [bytes(s.bits) for s in bloom.slices]
+        else:
+            header["fingerprints"] = len(self._fingerprints)
+            payloads = [array("Q", self._fingerprints).tobytes()]
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(_MAGIC)
+            f.write(json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n")
+            for payload in payloads:
+                f.write(payload)
+        os.replace(temp_path, path)
+        return path
+
+    def load(self, path: str) -> None:
+        """从文件恢复（模式以文件为准）"""
+        with open(path, "rb") as f:
+            if f.readline() != _MAGIC:
+                raise ValueError(f"不是有效的URL索引文件: {path}")
+            header = json.loads(f.readline().decode("utf-8"))
+            self._domain_counts = {k: int(v) for k, v in header["domain_counts"].items()}
+
+            if "bloom" in header:
+                meta = header["bloom"]
+                bloom = ScalableBloomFilter(
+                    meta["initial_capacity"], meta["error_rate"], meta["growth"], meta["tightening"]
+                )
+                for item in meta["slices"]:
+                    s = _BloomSlice(item["capacity"], item["error_rate"], count=item["count"])
+                    s.bits = bytearray(f.read(len(s.bits)))
+                    bloom.slices.append(s)
+                self.use_bloom = True
+                self._fingerprints = bloom
+            else:
+                fingerprints = array("Q")
+                fingerprints.frombytes(f.read(header["fingerprints"] * fingerprints.itemsize))
+                self.use_bloom = False
+                self._fingerprints = set(fingerprints)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "mode": "bloom" if self.use_bloom else "exact",
+            "urls": len(self),
+            "domains": len(self._domain_counts),
+            "memory_bytes": self.memory_bytes,
+            "persist_path": self.persist_path,
+        }
@@ -69,6 +69,7 @@ class WebCrawler(BaseCrawler):
             CrawlResult: 爬取结果
         """
         start_time = time.time()
+        response = None
 
         try:
             # 创建爬取请求
@@ -90,8 +91,14 @@ class WebCrawler(BaseCrawler):
                     processing_time=time.time() - start_time,
                 )
 
-            # 解析内容
+            # 未变化页面跳过解析与发布
+            if self.is_unchanged(response):
+                return self._unchanged_result(url, response, start_time)
+
+            # 解析内容（增量模式只保留新出现的条目）
             data = self._parse_content(response, selectors or self.selectors)
+            if self.diff_mode:
+                data = self._new_items(url, data, response)
 
             # 创建结果
             result = CrawlResult(
@@ -102,14 +109,15 @@ class WebCrawler(BaseCrawler):
                 processing_time=time.time() - start_time,
             )
 
-            # 发布消息
-            if self.zmq_publisher and data:
-                self._publish_data(data, url)
+            # 发布消息（未全部受理时回滚抓取缓存，下次轮询重新处理）
+            if self.zmq_publisher and data and not self._publish_data(data, url):
+                self.rollback_freshness(response)
 
             self.logger.info(f"网页爬取完成: {url} | 数据条数: {len(data)}")
             return result
 
         except Exception as e:
+            self.rollback_freshness(response)
             self.logger.error(f"网页爬取失败: {url} | 错误: {e}")
             return CrawlResult(
                 success=False,
@@ -133,8 +141,9 @@ class WebCrawler(BaseCrawler):
             # 应用反爬虫策略
             self.anti_spider.apply_delay(request.url)
 
-            # 准备请求头
+            # 准备请求头（附加缓存校验器）
             headers = self.anti_spider.prepare_headers(request.headers)
+            headers.update(self._conditional_headers(request))
 
             # 获取代理
             proxies = self.anti_spider.get_random_proxy()
@@ -169,6 +178,7 @@ class WebCrawler(BaseCrawler):
                 response_time=response_time,
                 timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
             )
+            self._mark_freshness(request, crawl_response)
 
             return crawl_response
 
@@ -262,17 +272,22 @@ class WebCrawler(BaseCrawler):
             return data_list
 
         except Exception as e:
+            # 向上抛出：爬取结果记为失败并回滚抓取缓存，下次轮询重新解析
             self.logger.error(f"内容解析失败: {response.url} | 错误: {e}")
-            return []
+            raise
 
-    def _publish_data(self, data: List[Dict[str, Any]], source_url: str) -> None:
+    def _publish_data(self, data: List[Dict[str, Any]], source_url: str) -> bool:
         """
         发布爬取数据到ZMQ
 
         Args:
             data: 爬取的数据
             source_url: 数据源URL
+
+        Returns:
+            bool: 是否全部被发布者受理
         """
+        accepted = True
         try:
             for item in data:
                 message = NewsMessage(
@@ -284,10 +299,14 @@ class WebCrawler(BaseCrawler):
                     metadata=item,
                 )
 
-                self.zmq_publisher.publish_message(message)
+                if not self.zmq_publisher.publish_message(message):
+                    accepted = False
 
         except Exception as e:
             self.logger.error(f"数据发布失败: {e}")
+            return False
+
+        return accepted
 
     def get_status(self) -> Dict[str, Any]:
         """
@@ -481,18 +500,42 @@ class WebCrawler(BaseCrawler):
             timeout: 超时时间
 
         Returns:
-            响应对象或None
+            响应对象或None；页面自上次获取后未变化时返回状态码为304的响应。
+            启用抓取缓存时响应带有 crawl_response 属性，页面处理失败时传给
+            rollback_freshness 撤销本次写入的校验器
         """
+        conditional_headers = (
+            self.fetch_cache.conditional_headers(url) if self.fetch_cache else {}
+        )
         for attempt in range(max_retries):
             try:
-                # 发起请求
+                # 发起请求（带缓存校验器的条件请求）
                 response = requests.get(
-                    url, timeout=timeout, allow_redirects=self.follow_redirects
+                    url,
+                    headers=conditional_headers or None,
+                    timeout=timeout,
+                    allow_redirects=self.follow_redirects,
                 )
 
                 # 检查响应状态
                 response.raise_for_status()
 
+                if self.fetch_cache is not None:
+                    # 与 _make_request 相同的判定与回滚信息，调用方解析失败时
+                    # 调用 rollback_freshness(response.crawl_response)
+                    crawl_response = CrawlResponse(
+                        url=response.url,
+                        status_code=response.status_code,
+                        content=response.text,
+                        headers=dict(response.headers),
+                        cookies=dict(response.cookies),
+                        encoding=response.encoding or "utf-8",
+                        response_time=0.0,
+                        timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
+                    )
+                    self._mark_freshness(CrawlRequest(url=url), crawl_response)
+                    response.crawl_response = crawl_response
+
                 self.logger.info(f"页面获取成功: {url} (尝试 {attempt + 1}/{max_retries})")
                 return response
 
@@ -7,6 +7,13 @@
 from .data_cleaner import DataCleaner
 from .data_validator import DataValidator
 from .data_formatter import DataFormatter
+from .deduplicator import NearDuplicateDetector
 from .pipeline import DataPipeline
 
-__all__ = ["DataCleaner", "DataValidator", "DataFormatter", "DataPipeline"]
+__all__ = [
+    "DataCleaner",
+    "DataValidator",
+    "DataFormatter",
+    "NearDuplicateDetector",
+    "DataPipeline",
+]
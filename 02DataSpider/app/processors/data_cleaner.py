@@ -18,6 +18,32 @@ except ImportError:
 
 from ..config import ConfigManager
 from ..utils import Logger
+from .text_profile import TextProfile
+
+# 预编译正则（模块加载时编译一次，批量与多进程工作进程共用）
+_WHITESPACE_RE = re.compile(r"\s+")
+_CONTROL_CHARS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]")
+_REPEATED_PUNCT_RE = re.compile(r"[.,;:!?]{2,}")
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+# 危险内容合并为单个分支正则，每个字段只扫描一遍
+_DANGEROUS_RE = re.compile(
+    "|".join(
+        [
+            r"<script[^>]*>.*?</script>",
+            r"onerror\s*=[^\s>]*",
+            r"onclick\s*=[^\s>]*",
+            r"onload\s*=[^\s>]*",
+            r'javascript:[^\s"\'>]*',
+            r'vbscript:[^\s"\'>]*',
+        ]
+    ),
+    re.IGNORECASE,
+)
+
+# 含危险内容时清理后保留的重要字段（其余字段直接移除）
+IMPORTANT_FIELDS = frozenset({"title", "content", "url", "source", "author"})
+# 需要文本清洗的字段
+TEXT_FIELDS = ("title", "content")
 
 
 class CleaningLevel(Enum):
@@ -86,21 +112,41 @@ class TextCleaner:
         cleaned_text = self._aggressive_cleaning(cleaned_text)
         return cleaned_text
 
+    def clean_text_profile(self, text: str) -> TextProfile:
+        """按标准级别清洗文本并生成画像
+
+        画像记录清洗后文本的空白是否已标准化（移除控制字符可能留下连续空白），
+        后续阶段据此跳过重复的空白处理
+
+        Args:
+            text: 原始文本
+
+        Returns:
+            清洗后文本的画像
+        """
+        if not text:
+            return TextProfile("", normalized=True)
+
+        text = self._basic_cleaning(text)
+        normalized = self.normalize_whitespace and not _CONTROL_CHARS_RE.search(text)
+        text = self._standard_cleaning(text)
+        return TextProfile(text, normalized)
+
     def _basic_cleaning(self, text: str) -> str:
         """基础清洗"""
         if self.remove_html:
             text = self._remove_html_tags(text)
 
         if self.normalize_whitespace:
-            text = re.sub(r"\s+", " ", text)
+            text = _WHITESPACE_RE.sub(" ", text)
             text = text.strip()
 
         return text
 
     def _standard_cleaning(self, text: str) -> str:
         """标准清洗"""
-        text = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]", "", text)
-        text = re.sub(r"[.,;:!?]{2,}", lambda m: m.group()[0], text)
+        text = _CONTROL_CHARS_RE.sub("", text)
+        text = _REPEATED_PUNCT_RE.sub(lambda m: m.group()[0], text)
         return text
 
     def _aggressive_cleaning(self, text: str) -> str:
@@ -109,11 +155,14 @@ class TextCleaner:
 
     def _remove_html_tags(self, text: str) -> str:
         """移除HTML标签"""
+        # 不含标签与实体的纯文本无需解析
+        if "<" not in text and "&" not in text:
+            return text
         if BeautifulSoup:
             soup = BeautifulSoup(text, "html.parser")
             return soup.get_text()
         else:
-            return re.sub(r"<[^>]+>", "", text)
+            return _HTML_TAG_RE.sub("", text)
 
 
 class DataCleaner:
@@ -132,26 +181,15 @@ class DataCleaner:
             cleaned_data = data.copy()
             issues = []
 
-            # 清理包含危险内容的字段（清理而不是删除）
-            dangerous_patterns = [
-                r"<script[^>]*>.*?</script>",
-                r"onerror\s*=[^\s>]*",
-                r"onclick\s*=[^\s>]*",
-                r"onload\s*=[^\s>]*",
-                r'javascript:[^\s"\'>]*',
-                r'vbscript:[^\s"\'>]*',
-            ]
-
             # 对于重要字段（如title, content），清理危险内容而不是删除字段
-            important_fields = {"title", "content", "url", "source", "author"}
+            important_fields = IMPORTANT_FIELDS
             fields_to_remove = []
 
             for field, value in cleaned_data.items():
                 if isinstance(value, str):
                     original_value = value
-                    # 清理危险内容
-                    for pattern in dangerous_patterns:
-                        value = re.sub(pattern, "", value, flags=re.IGNORECASE)
+                    # 清理危险内容（清理而不是删除）
+                    value = _DANGEROUS_RE.sub("", value)
 
                     if value != original_value:
                         if field in important_fields:
@@ -204,6 +242,17 @@ class DataCleaner:
                 metadata={"error": str(e)},
             )
 
+    def clean_batch(self, data_list: List[Dict[str, Any]]) -> List[CleaningResult]:
+        """批量清洗数据
+
+        Args:
+            data_list: 待清洗的数据列表
+
+        Returns:
+            与输入顺序一致的清洗结果列表
+        """
+        return [self.clean_data(data) for data in data_list]
+
     def get_stats(self) -> Dict[str, Any]:
         """获取统计信息"""
         return {"processed": 0}
@@ -17,6 +17,16 @@ from urllib.parse import urlparse, urljoin
 from ..config import ConfigManager
 from ..utils import Logger
 from ..utils.serializers import SerializationManager
+from .text_profile import TextProfile, profile_for
+
+# 预编译正则（模块加载时编译一次）
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+_DOUBLE_QUOTES_RE = re.compile(r"[\u201c\u201d]")
+_SINGLE_QUOTES_RE = re.compile(r"[\u2018\u2019]")
+_ELLIPSIS_RE = re.compile(r"[.]{2,}")
+_EXCLAMATIONS_RE = re.compile(r"[!]{2,}")
+_QUESTIONS_RE = re.compile(r"[?]{2,}")
 
 
 class OutputFormat(Enum):
@@ -182,11 +192,12 @@ class FieldFormatter:
             self.logger.warning(f"URL格式化失败: {url} -> {e}")
             return url
 
-    def format_text(self, text: str) -> str:
+    def format_text(self, text: str, normalized: bool = False) -> str:
         """格式化文本
 
         Args:
             text: 原始文本
+            normalized: 文本是否已由清洗阶段完成空白标准化（是则跳过重复的空白处理）
 
         Returns:
             格式化后的文本
@@ -196,20 +207,28 @@ class FieldFormatter:
 
         try:
             # 清理HTML标签
-            text = re.sub(r"<[^>]+>", "", text)
+            if "<" in text:
+                text = _HTML_TAG_RE.sub("", text)
+                normalized = False
 
             # 标准化空白字符
-            text = re.sub(r"\s+", " ", text)
-            text = text.strip()
+            if not normalized:
+                text = _WHITESPACE_RE.sub(" ", text)
+                text = text.strip()
 
-            # 标准化引号
-            text = re.sub(r'[""]', '"', text)
-            text = re.sub(r"[" "]", "'", text)
+            # 标准化引号（中文弯引号 -> 直引号）；子串检查远快于正则扫描，无匹配时跳过
+            if "\u201c" in text or "\u201d" in text:
+                text = _DOUBLE_QUOTES_RE.sub('"', text)
+            if "\u2018" in text or "\u2019" in text:
+                text = _SINGLE_QUOTES_RE.sub("'", text)
 
             # 移除多余的标点符号
-            text = re.sub(r"[.]{2,}", "...", text)
-            text = re.sub(r"[!]{2,}", "!", text)
-            text = re.sub(r"[?]{2,}", "?", text)
+            if ".." in text:
+                text = _ELLIPSIS_RE.sub("...", text)
+            if "!!" in text:
+                text = _EXCLAMATIONS_RE.sub("!", text)
+            if "??" in text:
+                text = _QUESTIONS_RE.sub("?", text)
 
             return text
 
@@ -275,7 +294,7 @@ class FieldFormatter:
         """
         if source:
             # 清理HTML标签
-            source = re.sub(r"<[^>]+>", "", source)
+            source = _HTML_TAG_RE.sub("", source)
             return source.strip()
 
         # 如果没有来源，尝试从URL提取
@@ -387,19 +406,30 @@ class DataFormatter:
                     priority=rule_config.get("priority", 0),
                     enabled=rule_config.get("enabled", True),
                 )
+                # replace规则的正则在加载时编译一次
+                if rule.rule_type == "replace" and isinstance(
+                    rule.parameters.get("pattern"), str
+                ):
+                    rule.parameters = {
+                        **rule.parameters,
+                        "pattern": re.compile(rule.parameters["pattern"]),
+                    }
                 rules.append(rule)
-            except KeyError as e:
+            except (KeyError, re.error) as e:
                 self.logger.warning(f"格式化规则配置错误: {e}")
 
         # 按优先级排序
         rules.sort(key=lambda x: x.priority, reverse=True)
         return rules
 
-    def format_data(self, data: Dict[str, Any]) -> FormattingResult:
+    def format_data(
+        self, data: Dict[str, Any], profiles: Dict[str, TextProfile] = None
+    ) -> FormattingResult:
         """格式化数据
 
         Args:
             data: 原始数据
+            profiles: 清洗阶段生成的文本字段画像（可选）
 
         Returns:
             格式化结果
@@ -433,7 +463,9 @@ class DataFormatter:
                     self.logger.warning(error_msg)
 
             # 标准化核心字段
-            formatted_data = self._format_core_fields(formatted_data, warnings)
+            formatted_data = self._format_core_fields(
+                formatted_data, warnings, profiles
+            )
 
             # 应用输出模板
             formatted_data = self._apply_output_template(formatted_data)
@@ -492,6 +524,26 @@ class DataFormatter:
                 metadata={"error": str(e)},
             )
 
+    def format_batch(
+        self,
+        data_list: List[Dict[str, Any]],
+        profiles_list: List[Dict[str, TextProfile]] = None,
+    ) -> List[FormattingResult]:
+        """批量格式化数据
+
+        Args:
+            data_list: 原始数据列表
+            profiles_list: 与数据对齐的文本字段画像列表（可选）
+
+        Returns:
+            与输入顺序一致的格式化结果列表
+        """
+        profiles_list = profiles_list or [None] * len(data_list)
+        return [
+            self.format_data(data, profiles)
+            for data, profiles in zip(data_list, profiles_list)
+        ]
+
     def _apply_field_mapping(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """应用字段映射
 
@@ -564,13 +616,17 @@ class DataFormatter:
         return data
 
     def _format_core_fields(
-        self, data: Dict[str, Any], warnings: List[str]
+        self,
+        data: Dict[str, Any],
+        warnings: List[str],
+        profiles: Dict[str, TextProfile] = None,
     ) -> Dict[str, Any]:
         """格式化核心字段
 
         Args:
             data: 数据
             warnings: 警告列表
+            profiles: 文本字段画像（可选）
 
         Returns:
             格式化后的数据
@@ -591,11 +647,22 @@ class DataFormatter:
             except Exception as e:
                 warnings.append(f"URL格式化失败: {e}")
 
-        # 格式化文本字段
+        # 格式化文本字段（有画像时复用其空白标准化结果与分词）
+        content_word_count = None
         for field in ["title", "content", "summary", "author"]:
             if field in data and isinstance(data[field], str):
                 try:
-                    data[field] = self.field_formatter.format_text(data[field])
+                    profile = profile_for(profiles, field, data[field])
+                    data[field] = self.field_formatter.format_text(
+                        data[field], profile.normalized
+                    )
+                    # 文本格式化不改变空白切分的词数（移除HTML标签除外）
+                    if (
+                        field == "content"
+                        and profile.normalized
+                        and "<" not in profile.text
+                    ):
+                        content_word_count = len(profile.tokens)
                 except Exception as e:
                     warnings.append(f"{field}格式化失败: {e}")
 
@@ -656,7 +723,9 @@ class DataFormatter:
             except Exception:
                 metrics["share_count"] = 0
         # word_count: 根据content估算
-        if "word_count" not in metrics:
+        if "word_count" not in metrics and content_word_count is not None:
+            metrics["word_count"] = content_word_count
+        elif "word_count" not in metrics:
             try:
                 content = data.get("content") or ""
                 # 简单词数估算：按空白切分
@@ -828,6 +897,9 @@ class DataFormatter:
         else:
             stats["avg_formatting_time"] = 0.0
 
+        # 各序列化格式的编码吞吐量
+        stats["serialization"] = self.serialization_manager.get_stats()
+
         return stats
 
     def health_check(self) -> Dict[str, Any]:
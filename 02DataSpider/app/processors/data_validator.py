@@ -16,6 +16,14 @@ from urllib.parse import urlparse
 
 from ..config import ConfigManager
 from ..utils import Logger
+from .text_profile import TextProfile, profile_for
+
+# 预编译正则（模块加载时编译一次）
+_VALID_CHAR_RE = re.compile(r"[a-zA-Z\u4e00-\u9fff]")
+_REPEATED_CHAR_RE = re.compile(r"(.)\1{4,}")
+_SPECIAL_CHAR_RE = re.compile(r"[^a-zA-Z0-9\u4e00-\u9fff\s]")
+_SENTENCE_SPLIT_RE = re.compile(r"[.!?。！？]")
+_KEYWORD_RE = re.compile(r"^[a-zA-Z0-9\u4e00-\u9fff\s_-]+$")
 
 
 class ValidationLevel(Enum):
@@ -125,7 +133,7 @@ class FieldValidator:
         # 基础验证
         if level.value in ["basic", "standard", "strict"]:
             # 检查是否包含有效字符
-            if not re.search(r"[a-zA-Z\u4e00-\u9fff]", title):
+            if not _VALID_CHAR_RE.search(title):
                 issues.append(
                     ValidationIssue(
                         field="title",
@@ -139,7 +147,7 @@ class FieldValidator:
         # 标准验证
         if level.value in ["standard", "strict"]:
             # 检查重复字符
-            if re.search(r"(.)\1{4,}", title):
+            if _REPEATED_CHAR_RE.search(title):
                 issues.append(
                     ValidationIssue(
                         field="title",
@@ -165,7 +173,7 @@ class FieldValidator:
         # 严格验证
         if level == ValidationLevel.STRICT:
             # 检查特殊字符比例
-            special_chars = len(re.findall(r"[^a-zA-Z0-9\u4e00-\u9fff\s]", title))
+            special_chars = len(_SPECIAL_CHAR_RE.findall(title))
             if special_chars / len(title) > 0.3:
                 issues.append(
                     ValidationIssue(
@@ -180,13 +188,17 @@ class FieldValidator:
         return issues
 
     def validate_content(
-        self, content: str, level: ValidationLevel = ValidationLevel.STANDARD
+        self,
+        content: str,
+        level: ValidationLevel = ValidationLevel.STANDARD,
+        profile: TextProfile = None,
     ) -> List[ValidationIssue]:
         """验证内容
 
         Args:
             content: 内容文本
             level: 验证级别
+            profile: 清洗阶段生成的内容画像（可选，复用其分词与字符计数）
 
         Returns:
             验证问题列表
@@ -205,6 +217,9 @@ class FieldValidator:
             )
             return issues
 
+        if profile is None or profile.text is not content:
+            profile = TextProfile(content)
+
         # 长度检查
         if len(content) < self.min_content_length:
             issues.append(
@@ -233,9 +248,7 @@ class FieldValidator:
         # 基础验证
         if level.value in ["basic", "standard", "strict"]:
             # 检查字符质量
-            letter_count = sum(
-                1 for c in content if c.isalpha() or "\u4e00" <= c <= "\u9fff"
-            )
+            letter_count = profile.letter_count
             if letter_count / len(content) < 0.3:
                 issues.append(
                     ValidationIssue(
@@ -250,7 +263,7 @@ class FieldValidator:
         # 标准验证
         if level.value in ["standard", "strict"]:
             # 检查句子结构
-            sentences = re.split(r"[.!?。！？]", content)
+            sentences = _SENTENCE_SPLIT_RE.split(content)
             valid_sentences = [s for s in sentences if len(s.strip()) > 5]
             if len(valid_sentences) < 2:
                 issues.append(
@@ -266,7 +279,7 @@ class FieldValidator:
         # 严格验证
         if level == ValidationLevel.STRICT:
             # 检查重复内容
-            words = content.lower().split()
+            words = profile.tokens
             unique_words = set(words)
             if len(words) > 0 and len(unique_words) / len(words) < 0.5:
                 issues.append(
@@ -551,7 +564,7 @@ class FieldValidator:
 
             # 字符检查
             if level.value in ["standard", "strict"]:
-                if not re.match(r"^[a-zA-Z0-9\u4e00-\u9fff\s_-]+$", keyword):
+                if not _KEYWORD_RE.match(keyword):
                     issues.append(
                         ValidationIssue(
                             field=f"keywords[{i}]",
@@ -632,13 +645,17 @@ class DataValidator:
         self.logger.info("数据验证器初始化完成")
 
     def validate_data(
-        self, data: Dict[str, Any], level: ValidationLevel = None
+        self,
+        data: Dict[str, Any],
+        level: ValidationLevel = None,
+        profiles: Dict[str, TextProfile] = None,
     ) -> ValidationResult:
         """验证数据
 
         Args:
             data: 待验证的数据
             level: 验证级别
+            profiles: 清洗阶段生成的文本字段画像（可选）
 
         Returns:
             验证结果
@@ -673,7 +690,11 @@ class DataValidator:
 
             if "content" in data:
                 all_issues.extend(
-                    self.field_validator.validate_content(data["content"], level)
+                    self.field_validator.validate_content(
+                        data["content"],
+                        level,
+                        profile_for(profiles, "content", data["content"]),
+                    )
                 )
 
             if "url" in data:
@@ -690,7 +711,7 @@ class DataValidator:
                 )
 
             # 业务规则验证
-            all_issues.extend(self._validate_business_rules(data, level))
+            all_issues.extend(self._validate_business_rules(data, level, profiles))
 
             # 统计问题
             error_count = sum(
@@ -768,14 +789,40 @@ class DataValidator:
                 metadata={"error": str(e)},
             )
 
+    def validate_batch(
+        self,
+        data_list: List[Dict[str, Any]],
+        level: ValidationLevel = None,
+        profiles_list: List[Dict[str, TextProfile]] = None,
+    ) -> List[ValidationResult]:
+        """批量验证数据
+
+        Args:
+            data_list: 待验证的数据列表
+            level: 验证级别
+            profiles_list: 与数据对齐的文本字段画像列表（可选）
+
+        Returns:
+            与输入顺序一致的验证结果列表
+        """
+        profiles_list = profiles_list or [None] * len(data_list)
+        return [
+            self.validate_data(data, level, profiles)
+            for data, profiles in zip(data_list, profiles_list)
+        ]
+
     def _validate_business_rules(
-        self, data: Dict[str, Any], level: ValidationLevel
+        self,
+        data: Dict[str, Any],
+        level: ValidationLevel,
+        profiles: Dict[str, TextProfile] = None,
     ) -> List[ValidationIssue]:
         """验证业务规则
 
         Args:
             data: 数据
             level: 验证级别
+            profiles: 文本字段画像（可选）
 
         Returns:
             验证问题列表
@@ -784,12 +831,9 @@ class DataValidator:
 
         # 检查标题和内容的一致性
         if "title" in data and "content" in data:
-            title = data["title"].lower()
-            content = data["content"].lower()
-
             # 标题应该与内容相关
-            title_words = set(re.findall(r"\w+", title))
-            content_words = set(re.findall(r"\w+", content))
+            title_words = profile_for(profiles, "title", data["title"]).word_set
+            content_words = profile_for(profiles, "content", data["content"]).word_set
 
             if title_words and content_words:
                 common_words = title_words.intersection(content_words)
@@ -835,7 +879,7 @@ class DataValidator:
         # 检查关键词与内容的相关性
         if "keywords" in data and "content" in data and level == ValidationLevel.STRICT:
             keywords = data["keywords"]
-            content = data["content"].lower()
+            content = profile_for(profiles, "content", data["content"]).lower
 
             if isinstance(keywords, list) and keywords:
                 relevant_keywords = 0
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""
+近似重复检测模块
+
+同一新闻被多个站点转载、多个Telegram频道转发时，只保留（或聚类）首个副本
+
+- 签名：字符n-gram分片 + 单次置换MinHash（每个分片只哈希一次，
+  按哈希值分桶取最小值，空桶旋转致密化），单条耗时与文本长度线性相关
+- 索引：签名按band切分进入LSH桶，只与同桶候选比较签名
+- 滑动时间窗口：过期条目按入库顺序从桶中移除，内存随窗口内条目数而非历史总量增长
+- 检测与入库可分离：check(record=False) 只查询，条目通过后续阶段后再 record() 入库；
+  索引读写由锁保护，可在多线程管道中共享
+"""
+
+import re
+import threading
+import time
+import zlib
+from array import array
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from ..config import ConfigManager
+from ..utils import Logger
+
+_MASK64 = (1 << 64) - 1
+# 64位乘法混合常数（crc32 -> 64位均匀哈希）
+_MIX = 0x9E3779B97F4A7C15
+_EMPTY = (1 << 64) - 1
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+@dataclass
+class DuplicateCheck:
+    """重复检测结果"""
+
+    is_duplicate: bool
+    cluster_id: str
+    similarity: float
+    candidates: int
+    check_time: float
+    # 延迟入库所需的签名信息（record() 使用）
+    signature: Optional[array] = field(default=None, repr=False)
+    band_keys: Tuple[int, ...] = field(default=(), repr=False)
+    threshold: float = field(default=1.0, repr=False)
+    recorded: bool = False
+
+
+@dataclass(eq=False)
+class _Entry:
+    doc_id: str
+    cluster_id: str
+    signature: array
+    band_keys: Tuple[int, ...]
+    added_at: float
+
+
+class NearDuplicateDetector:
+    """近似重复检测器 - MinHash签名 + 分带LSH + 滑动时间窗口"""
+
+    def __init__(self, config: ConfigManager, logger: Logger = None):
+        self.config = config
+        self.logger = logger or Logger(config)
+
+        dedup_config = config.get_config("processors.dedup", {}) or {}
+        self.num_perm = dedup_config.get("num_perm", 64)
+        self.bands = dedup_config.get("bands", 16)
+        self.rows = self.num_perm // self.bands
+        self.threshold = dedup_config.get("threshold", 0.8)
+        self.shingle_size = dedup_config.get("shingle_size", 5)
+        # 只取文本前若干字符计算签名：转载副本的差异通常在尾部（来源声明、推广链接）
+        self.max_chars = dedup_config.get("max_chars", 4000)
+        # 短文本（快讯、模板化消息）分片太少、估计噪声大，且常只差一个数字，只按完全相同去重
+        self.min_chars = dedup_config.get("min_chars", 200)
+        self.window_seconds = dedup_config.get("window_seconds", 6 * 3600)
+        self.text_fields = dedup_config.get("text_fields", ["title", "content"])
+
+        if self.rows * self.bands != self.num_perm:
+            raise ValueError(f"num_perm({self.num_perm}) 必须是 bands({self.bands}) 的整数倍")
+
+        self._buckets: List[Dict[int, List[_Entry]]] = [{} for _ in range(self.bands)]
+        self._entries: Deque[_Entry] = deque()
+        self._sequence = 0
+        # 保护桶、入库队列与统计（PARALLEL/ASYNC 模式下多个线程共享同一检测器）
+        self._lock = threading.Lock()
+
+        # 统计信息
+        self.stats = {
+            "items_checked": 0,
+            "duplicates_found": 0,
+            "candidates_compared": 0,
+            "entries_expired": 0,
+            "total_check_time": 0.0,
+        }
+
+        self.logger.info(
+            f"近似重复检测器初始化完成 | 签名长度: {self.num_perm} | "
+            f"LSH: {self.bands}x{self.rows} | 阈值: {self.threshold}"
+        )
+
+    # 签名
+
+    def _text_of(self, data: Dict[str, Any]) -> str:
+        parts = [str(data.get(field) or "") for field in self.text_fields]
+        text = " ".join(parts)[: self.max_chars].lower()
+        return _NON_WORD.sub("", text)
+
+    def signature(self, text: str) -> array:
+        """计算单次置换MinHash签名
+
+        Args:
+            text: 已规范化的文本
+
+        Returns:
+            长度为num_perm的64位签名
+        """
+        k = self.shingle_size
+        if len(text) <= k:
+            shingles = {text}
+        else:
+            shingles = {text[i : i + k] for i in range(len(text) - k + 1)}
+
+        num_perm = self.num_perm
+        bins = [_EMPTY] * num_perm
+        for shingle in shingles:
+            h = (zlib.crc32(shingle.encode("utf-8")) * _MIX) & _MASK64
+            index = h % num_perm
+            value = h // num_perm
+            if value < bins[index]:
+                bins[index] = value
+
+        # 旋转致密化：空桶取右侧最近非空桶的值，并按距离偏移以区分来源
+        if _EMPTY in bins:
+            filled = [i for i, v in enumerate(bins) if v != _EMPTY]
+            if filled:
+                offset = _MASK64 // num_perm
+                dense = list(bins)
+                for i in range(num_perm):
+                    if bins[i] != _EMPTY:
+                        continue
+                    distance = 1
+                    while bins[(i + distance) % num_perm] == _EMPTY:
+                        distance += 1
+                    dense[i] = (bins[(i + distance) % num_perm] + distance * offset) & _MASK64
+                bins = dense
+        return array("Q", bins)
+
+    def _band_keys(self, signature: array) -> Tuple[int, ...]:
+        rows = self.rows
+        return tuple(
+            hash(tuple(signature[band * rows : (band + 1) * rows])) for band in range(self.bands)
+        )
+
+    @staticmethod
+    def similarity(left: array, right: array) -> float:
+        """签名相等槽位比例（Jaccard相似度估计）"""
+        return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+    # 索引
+
+    def _expire(self, now: float) -> None:
+        horizon = now - self.window_seconds
+        entries = self._entries
+        while entries and entries[0].added_at < horizon:
+            entry = entries.popleft()
+            for band, key in enumerate(entry.band_keys):
+                bucket = self._buckets[band].get(key)
+                if bucket is None:
+                    continue
+                try:
+                    bucket.remove(entry)
+                except ValueError:
+                    pass
+                if not bucket:
+                    del self._buckets[band][key]
+            self.stats["entries_expired"] += 1
+
+    def _best_match(
+        self, signature: array, band_keys: Tuple[int, ...]
+    ) -> Tuple[Optional[_Entry], float, int]:
+        """在同桶候选中查找最相似的条目（调用方持有锁）"""
+        best: Optional[_Entry] = None
+        best_similarity = 0.0
+        seen = set()
+        for band, key in enumerate(band_keys):
+            for entry in self._buckets[band].get(key, ()):
+                if id(entry) in seen:
+                    continue
+                seen.add(id(entry))
+                score = self.similarity(signature, entry.signature)
+                if score > best_similarity:
+                    best, best_similarity = entry, score
+        return best, best_similarity, len(seen)
+
+    def _insert(self, doc_id: str, signature: array, band_keys: Tuple[int, ...], now: float) -> None:
+        """条目加入索引（调用方持有锁）"""
+        entry = _Entry(doc_id, doc_id, signature, band_keys, now)
+        self._entries.append(entry)
+        for band, key in enumerate(band_keys):
+            self._buckets[band].setdefault(key, []).append(entry)
+
+    def check(
+        self, data: Dict[str, Any], now: Optional[float] = None, record: bool = True
+    ) -> DuplicateCheck:
+        """检测数据项是否与窗口内已有条目近似重复
+
+        Args:
+            data: 数据项（读取 text_fields 中的字段）
+            now: 当前时间戳（默认time.time()）
+            record: 非重复项是否立即加入索引；为False时由调用方在条目通过后续阶段后调用 record()
+
+        Returns:
+            重复检测结果，重复项的 cluster_id 为首个副本的ID
+        """
+        start_time = time.perf_counter()
+        now = time.time() if now is None else now
+
+        # 签名计算不访问共享状态，在锁外执行
+        text = self._text_of(data)
+        threshold = self.threshold if len(text) >= self.min_chars else 1.0
+        signature = self.signature(text)
+        band_keys = self._band_keys(signature)
+
+        with self._lock:
+            self._expire(now)
+            best, best_similarity, candidates = self._best_match(signature, band_keys)
+
+            self._sequence += 1
+            doc_id = str(data.get("id") or data.get("url") or f"doc-{self._sequence}")
+            is_duplicate = best is not None and best_similarity >= threshold
+
+            if is_duplicate:
+                cluster_id = best.cluster_id
+                self.stats["duplicates_found"] += 1
+            else:
+                cluster_id = doc_id
+                if record:
+                    self._insert(doc_id, signature, band_keys, now)
+
+            check_time = time.perf_counter() - start_time
+            self.stats["items_checked"] += 1
+            self.stats["candidates_compared"] += candidates
+            self.stats["total_check_time"] += check_time
+
+        return DuplicateCheck(
+            is_duplicate=is_duplicate,
+            cluster_id=cluster_id,
+            similarity=best_similarity,
+            candidates=candidates,
+            check_time=check_time,
+            signature=signature,
+            band_keys=band_keys,
+            threshold=threshold,
+            recorded=record and not is_duplicate,
+        )
+
+    def record(self, check: DuplicateCheck, now: Optional[float] = None) -> DuplicateCheck:
+        """将 check(record=False) 判定为非重复的条目加入索引
+
+        检测与入库之间其它线程可能已入库相似条目，入库前在锁内重新比较；
+        此时返回重复结果，条目不入库。
+
+        Args:
+            check: check() 返回的检测结果
+            now: 当前时间戳（默认time.time()）
+
+        Returns:
+            最终检测结果
+        """
+        if check.is_duplicate or check.recorded or check.signature is None:
+            return check
+
+        now = time.time() if now is None else now
+        with self._lock:
+            self._expire(now)
+            best, best_similarity, candidates = self._best_match(check.signature, check.band_keys)
+            if best is not None and best_similarity >= check.threshold:
+                self.stats["duplicates_found"] += 1
+                return replace(
+                    check,
+                    is_duplicate=True,
+                    cluster_id=best.cluster_id,
+                    similarity=best_similarity,
+                    candidates=candidates,
+                )
+            self._insert(check.cluster_id, check.signature, check.band_keys, now)
+
+        check.recorded = True
+        return check
+
+    def clear(self) -> None:
+        """清空索引"""
+        with self._lock:
+            self._buckets = [{} for _ in range(self.bands)]
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = self.stats.copy()
+            stats["window_entries"] = len(self._entries)
+        checked = stats["items_checked"]
+        stats["duplicate_rate"] = stats["duplicates_found"] / checked if checked else 0.0
+        stats["avg_check_time"] = stats["total_check_time"] / checked if checked else 0.0
+        return stats
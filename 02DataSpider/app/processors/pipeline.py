@@ -6,24 +6,31 @@
 """
 
 import time
+import math
 import asyncio
+import logging
+import multiprocessing
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Callable, Union
+from typing import Dict, List, Any, Optional, Callable, Tuple, Union
 from enum import Enum
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 
 from ..config import ConfigManager
 from ..utils import Logger
 from .data_cleaner import DataCleaner, CleaningLevel
 from .data_validator import DataValidator, ValidationLevel
 from .data_formatter import DataFormatter, OutputFormat
+from .deduplicator import NearDuplicateDetector
+from .fused_stage import FusedStagePlan
+from .text_profile import TextProfile
 
 
 class ProcessingStage(Enum):
     """处理阶段"""
 
     CLEANING = "cleaning"
+    DEDUPLICATION = "deduplication"
     VALIDATION = "validation"
     FORMATTING = "formatting"
     COMPLETE = "complete"
@@ -35,6 +42,7 @@ class ProcessingMode(Enum):
     SEQUENTIAL = "sequential"  # 顺序处理
     PARALLEL = "parallel"  # 并行处理
     ASYNC = "async"  # 异步处理
+    PROCESS = "process"  # 多进程处理（分块发送到常驻进程池）
 
 
 @dataclass
@@ -49,6 +57,9 @@ class ProcessingConfig:
     skip_formatting_on_validation_fail: bool = True
     max_workers: int = 4
     processing_mode: ProcessingMode = ProcessingMode.SEQUENTIAL
+    deduplicate: bool = True
+    chunk_size: int = 0  # PROCESS模式每块条目数，0表示按进程数自动划分
+    fused_stages: bool = True  # 按字段融合执行清洗/验证/格式化（共享文本画像）
 
 
 @dataclass
@@ -80,6 +91,46 @@ class BatchProcessingResult:
     metadata: Dict[str, Any]
 
 
+# 工作进程需要的配置键（只传递处理器配置快照，ConfigManager本身不跨进程）
+_WORKER_CONFIG_KEYS = (
+    "processors.text_cleaning",
+    "processors.validation",
+    "processors.formatting",
+    "processors.dedup",
+    "processors.pipeline",
+)
+
+
+class _ConfigSnapshot:
+    """可序列化的只读配置快照，供工作进程构建处理器"""
+
+    def __init__(self, values: Dict[str, Any]):
+        self._values = values
+
+    def get_config(self, key_path: str, default: Any = None) -> Any:
+        value = self._values.get(key_path)
+        return default if value is None else value
+
+    get = get_config
+
+
+# 工作进程内常驻的管道实例（由进程池initializer创建，之后每块复用）
+_worker_pipeline: Optional["DataPipeline"] = None
+
+
+def _init_worker(snapshot: _ConfigSnapshot) -> None:
+    global _worker_pipeline
+    _worker_pipeline = DataPipeline(snapshot, logging.getLogger(__name__))
+
+
+def _clean_chunk(chunk: List[Dict[str, Any]], config: "ProcessingConfig") -> List[Tuple]:
+    return _worker_pipeline._execute_cleaning_batch(chunk, config)
+
+
+def _validate_and_format_chunk(chunk: List[Tuple], config: "ProcessingConfig") -> List[Tuple]:
+    return _worker_pipeline._execute_validation_and_formatting_batch(chunk, config)
+
+
 class DataPipeline:
     """数据处理管道
 
@@ -100,6 +151,13 @@ class DataPipeline:
         self.cleaner = DataCleaner(config, self.logger)
         self.validator = DataValidator(config, self.logger)
         self.formatter = DataFormatter(config, self.logger)
+        self.deduplicator = NearDuplicateDetector(config, self.logger)
+        self.fused_plan = FusedStagePlan(self.cleaner)
+
+        # 近似重复处理方式：cluster 保留并在metadata中标注所属聚类（默认）；
+        # drop 直接丢弃后续副本，不再进入验证、格式化与下游发布
+        dedup_config = config.get_config("processors.dedup", {}) or {}
+        self.dedup_mode = dedup_config.get("mode", "cluster")
 
         # 管道配置
         pipeline_config = config.get_config("processors.pipeline", {})
@@ -122,13 +180,22 @@ class DataPipeline:
             processing_mode=ProcessingMode(
                 pipeline_config.get("processing_mode", "sequential")
             ),
+            deduplicate=dedup_config.get("enabled", True),
+            chunk_size=pipeline_config.get("chunk_size", 0),
+            fused_stages=pipeline_config.get("fused_stages", True),
         )
 
+        # PROCESS模式的常驻进程池（首次使用时创建，close()时关闭）
+        self.process_start_method = pipeline_config.get("process_start_method")
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_workers = 0
+
         # 处理钩子
         self.pre_processing_hooks: List[Callable] = []
         self.post_processing_hooks: List[Callable] = []
         self.stage_hooks: Dict[ProcessingStage, List[Callable]] = {
             ProcessingStage.CLEANING: [],
+            ProcessingStage.DEDUPLICATION: [],
             ProcessingStage.VALIDATION: [],
             ProcessingStage.FORMATTING: [],
         }
@@ -138,9 +205,11 @@ class DataPipeline:
             "items_processed": 0,
             "items_successful": 0,
             "items_failed": 0,
+            "items_duplicate": 0,
             "total_processing_time": 0.0,
             "stage_stats": {
                 "cleaning": {"success": 0, "failed": 0, "time": 0.0},
+                "deduplication": {"success": 0, "failed": 0, "time": 0.0},
                 "validation": {"success": 0, "failed": 0, "time": 0.0},
                 "formatting": {"success": 0, "failed": 0, "time": 0.0},
             },
@@ -200,7 +269,49 @@ class DataPipeline:
         self.stats["items_processed"] += 1
 
         # 初始化结果
-        result = ProcessingResult(
+        result = self._new_result(data)
+
+        try:
+            # 执行预处理钩子
+            processed_data = self._run_pre_processing_hooks(data, result)
+
+            # 数据清洗阶段
+            cleaning_result, profiles = self._execute_cleaning_stage(
+                processed_data, config
+            )
+            processed_data, proceed = self._apply_cleaning_result(
+                result, processed_data, cleaning_result, config
+            )
+            if not proceed:
+                return self._fail_item(result, start_time)
+
+            # 近似重复检测阶段（在验证与格式化之前，重复副本不再消耗后续阶段）；
+            # 此处只查询索引，条目通过验证后才入库，未通过验证的数据不会成为聚类首个副本
+            duplicate_check = None
+            if config.deduplicate:
+                duplicate_check = self._execute_deduplication_stage(processed_data, config)
+                if self._apply_duplicate_check(result, duplicate_check, processed_data):
+                    result.processing_time = time.time() - start_time
+                    return result
+                result.stages_completed.append(ProcessingStage.DEDUPLICATION)
+
+            # 数据验证与格式化阶段
+            validation_result, formatting_result = self._execute_validation_and_formatting(
+                processed_data, config, profiles
+            )
+            if not self._apply_validation_and_formatting(
+                result, processed_data, validation_result, formatting_result, config
+            ):
+                return self._fail_item(result, start_time)
+
+            return self._complete_item(result, duplicate_check, start_time)
+
+        except Exception as e:
+            return self._item_exception(result, start_time, e)
+
+    @staticmethod
+    def _new_result(data: Dict[str, Any]) -> ProcessingResult:
+        return ProcessingResult(
             success=False,
             data=None,
             original_data=data.copy(),
@@ -212,180 +323,371 @@ class DataPipeline:
             metadata={},
         )
 
-        try:
-            # 执行预处理钩子
-            processed_data = data.copy()
-            for hook in self.pre_processing_hooks:
-                try:
-                    processed_data = hook(processed_data)
-                except Exception as e:
-                    result.warnings.append(f"预处理钩子失败: {e}")
+    def _run_pre_processing_hooks(
+        self, data: Dict[str, Any], result: ProcessingResult
+    ) -> Dict[str, Any]:
+        """执行预处理钩子"""
+        processed_data = data.copy()
+        for hook in self.pre_processing_hooks:
+            try:
+                processed_data = hook(processed_data)
+            except Exception as e:
+                result.warnings.append(f"预处理钩子失败: {e}")
+        return processed_data
+
+    def _apply_cleaning_result(
+        self,
+        result: ProcessingResult,
+        data: Dict[str, Any],
+        cleaning_result,
+        config: ProcessingConfig,
+    ):
+        """将清洗结果写入处理结果
 
-            # 数据清洗阶段
-            cleaning_result = self._execute_cleaning_stage(processed_data, config)
-            result.stage_results["cleaning"] = cleaning_result
+        Returns:
+            (后续阶段使用的数据, 是否继续处理)
+        """
+        result.stage_results["cleaning"] = cleaning_result
+
+        if cleaning_result.success:
+            result.stages_completed.append(ProcessingStage.CLEANING)
+            self.stats["stage_stats"]["cleaning"]["success"] += 1
+            return cleaning_result.cleaned_data, True
+
+        self.stats["stage_stats"]["cleaning"]["failed"] += 1
+        result.errors.extend(cleaning_result.issues_found)
+        return data, not (config.fail_fast or config.skip_validation_on_clean_fail)
+
+    def _execute_validation_and_formatting(
+        self,
+        data: Dict[str, Any],
+        config: ProcessingConfig,
+        profiles: Dict[str, TextProfile] = None,
+    ):
+        """执行验证阶段与格式化阶段
 
-            if cleaning_result.success:
-                processed_data = cleaning_result.cleaned_data
-                result.stages_completed.append(ProcessingStage.CLEANING)
-                self.stats["stage_stats"]["cleaning"]["success"] += 1
-            else:
-                self.stats["stage_stats"]["cleaning"]["failed"] += 1
-                result.errors.extend(cleaning_result.errors)
-                result.warnings.extend(cleaning_result.warnings)
+        Returns:
+            (验证结果, 格式化结果)；验证失败且配置为跳过格式化时格式化结果为None
+        """
+        validation_result = self._execute_validation_stage(data, config, profiles)
+        if not validation_result.is_valid and (
+            config.fail_fast or config.skip_formatting_on_validation_fail
+        ):
+            return validation_result, None
+        return validation_result, self._execute_formatting_stage(data, config, profiles)
+
+    def _apply_validation_and_formatting(
+        self,
+        result: ProcessingResult,
+        data: Dict[str, Any],
+        validation_result,
+        formatting_result,
+        config: ProcessingConfig,
+    ) -> bool:
+        """将验证与格式化结果写入处理结果
 
-                if config.fail_fast or config.skip_validation_on_clean_fail:
-                    result.processing_time = time.time() - start_time
-                    self.stats["items_failed"] += 1
-                    return result
+        Returns:
+            是否继续处理（False表示按配置提前结束）
+        """
+        result.stage_results["validation"] = validation_result
 
-            # 数据验证阶段
-            if not config.skip_validation_on_clean_fail or cleaning_result.success:
-                validation_result = self._execute_validation_stage(
-                    processed_data, config
-                )
-                result.stage_results["validation"] = validation_result
+        if validation_result.is_valid:
+            result.stages_completed.append(ProcessingStage.VALIDATION)
+            self.stats["stage_stats"]["validation"]["success"] += 1
+        else:
+            self.stats["stage_stats"]["validation"]["failed"] += 1
+            result.errors.extend([issue.message for issue in validation_result.issues])
+            if formatting_result is None:
+                return False
 
-                if validation_result.is_valid:
-                    result.stages_completed.append(ProcessingStage.VALIDATION)
-                    self.stats["stage_stats"]["validation"]["success"] += 1
-                else:
-                    self.stats["stage_stats"]["validation"]["failed"] += 1
-                    result.errors.extend(
-                        [issue.message for issue in validation_result.issues]
-                    )
+        result.stage_results["formatting"] = formatting_result
 
-                    if config.fail_fast or config.skip_formatting_on_validation_fail:
-                        result.processing_time = time.time() - start_time
-                        self.stats["items_failed"] += 1
-                        return result
+        if formatting_result.success:
+            data = formatting_result.formatted_data
+            result.stages_completed.append(ProcessingStage.FORMATTING)
+            self.stats["stage_stats"]["formatting"]["success"] += 1
+        else:
+            self.stats["stage_stats"]["formatting"]["failed"] += 1
+            result.errors.extend(formatting_result.errors)
+            result.warnings.extend(formatting_result.warnings)
 
-            # 数据格式化阶段
-            validation_passed = True
-            if "validation" in result.stage_results:
-                validation_passed = result.stage_results["validation"].is_valid
+            if config.fail_fast:
+                return False
 
-            if not config.skip_formatting_on_validation_fail or validation_passed:
-                formatting_result = self._execute_formatting_stage(
-                    processed_data, config
-                )
-                result.stage_results["formatting"] = formatting_result
+        # 设置最终结果
+        result.data = data
+        result.success = len(result.errors) == 0
+        return True
 
-                if formatting_result.success:
-                    processed_data = formatting_result.formatted_data
-                    result.stages_completed.append(ProcessingStage.FORMATTING)
-                    self.stats["stage_stats"]["formatting"]["success"] += 1
-                else:
-                    self.stats["stage_stats"]["formatting"]["failed"] += 1
-                    result.errors.extend(formatting_result.errors)
-                    result.warnings.extend(formatting_result.warnings)
-
-                    if config.fail_fast:
-                        result.processing_time = time.time() - start_time
-                        self.stats["items_failed"] += 1
-                        return result
-
-            # 设置最终结果
-            result.data = processed_data
-            result.success = len(result.errors) == 0
-            result.stages_completed.append(ProcessingStage.COMPLETE)
-
-            # 添加处理元数据
-            if result.data and "metadata" not in result.data:
-                result.data["metadata"] = {}
-            if result.data:
-                result.data["metadata"]["processed_at"] = datetime.utcnow().isoformat()
-                result.data["metadata"]["pipeline_version"] = "1.0.0"
-                result.data["metadata"]["processing_stages"] = [
-                    stage.value for stage in result.stages_completed
-                ]
-
-            # 执行后处理钩子
-            for hook in self.post_processing_hooks:
-                try:
-                    result = hook(result)
-                except Exception as e:
-                    result.warnings.append(f"后处理钩子失败: {e}")
+    def _complete_item(
+        self, result: ProcessingResult, duplicate_check, start_time: float
+    ) -> ProcessingResult:
+        """去重入库、写入处理元数据、执行后处理钩子并更新统计"""
+        # 通过验证的非重复条目入库（入库前复查并发处理中先入库的副本）
+        if result.success and duplicate_check is not None and not duplicate_check.is_duplicate:
+            if self._record_duplicate_check(result, duplicate_check, result.data):
+                result.processing_time = time.time() - start_time
+                return result
+
+        result.stages_completed.append(ProcessingStage.COMPLETE)
+
+        # 添加处理元数据
+        if result.data and "metadata" not in result.data:
+            result.data["metadata"] = {}
+        if result.data:
+            result.data["metadata"]["processed_at"] = datetime.utcnow().isoformat()
+            result.data["metadata"]["pipeline_version"] = "1.0.0"
+            result.data["metadata"]["processing_stages"] = [
+                stage.value for stage in result.stages_completed
+            ]
+
+        # 执行后处理钩子
+        for hook in self.post_processing_hooks:
+            try:
+                result = hook(result)
+            except Exception as e:
+                result.warnings.append(f"后处理钩子失败: {e}")
 
-            # 更新统计
-            if result.success:
-                self.stats["items_successful"] += 1
-            else:
-                self.stats["items_failed"] += 1
+        # 更新统计
+        if result.success:
+            self.stats["items_successful"] += 1
+        else:
+            self.stats["items_failed"] += 1
 
-            result.processing_time = time.time() - start_time
-            self.stats["total_processing_time"] += result.processing_time
-            self.stats["last_processing_time"] = datetime.utcnow().isoformat()
+        result.processing_time = time.time() - start_time
+        self.stats["total_processing_time"] += result.processing_time
+        self.stats["last_processing_time"] = datetime.utcnow().isoformat()
 
-            self.logger.debug(
-                f"数据处理完成: 成功={result.success} | "
-                f"阶段={len(result.stages_completed)} | "
-                f"错误={len(result.errors)} | 警告={len(result.warnings)} | "
-                f"耗时={result.processing_time:.3f}s"
-            )
+        self.logger.debug(
+            f"数据处理完成: 成功={result.success} | "
+            f"阶段={len(result.stages_completed)} | "
+            f"错误={len(result.errors)} | 警告={len(result.warnings)} | "
+            f"耗时={result.processing_time:.3f}s"
+        )
 
-            return result
+        return result
 
-        except Exception as e:
-            result.processing_time = time.time() - start_time
-            result.errors.append(f"处理异常: {e}")
-            self.stats["items_failed"] += 1
+    def _fail_item(self, result: ProcessingResult, start_time: float) -> ProcessingResult:
+        """按配置提前结束处理（fail_fast 或跳过后续阶段）"""
+        result.processing_time = time.time() - start_time
+        self.stats["items_failed"] += 1
+        return result
+
+    def _item_exception(
+        self, result: ProcessingResult, start_time: float, error: Exception
+    ) -> ProcessingResult:
+        result.processing_time = time.time() - start_time
+        result.errors.append(f"处理异常: {error}")
+        self.stats["items_failed"] += 1
 
-            self.logger.error(f"数据处理异常: {e}")
-            return result
+        self.logger.error(f"数据处理异常: {error}")
+        return result
 
-    def _execute_cleaning_stage(self, data: Dict[str, Any], config: ProcessingConfig):
-        """执行清洗阶段"""
-        stage_start = time.time()
+    _STAGE_NAMES = {
+        ProcessingStage.CLEANING: "清洗",
+        ProcessingStage.DEDUPLICATION: "去重",
+        ProcessingStage.VALIDATION: "验证",
+        ProcessingStage.FORMATTING: "格式化",
+    }
 
-        # 执行阶段钩子
-        for hook in self.stage_hooks[ProcessingStage.CLEANING]:
+    def _run_stage_hooks(self, stage: ProcessingStage, data: Dict[str, Any]) -> Dict[str, Any]:
+        """依次执行阶段钩子，钩子失败时记录警告并沿用原数据"""
+        for hook in self.stage_hooks[stage]:
             try:
                 data = hook(data)
             except Exception as e:
-                self.logger.warning(f"清洗阶段钩子失败: {e}")
+                self.logger.warning(f"{self._STAGE_NAMES[stage]}阶段钩子失败: {e}")
+        return data
+
+    def _execute_cleaning_batch(
+        self, data_list: List[Dict[str, Any]], config: ProcessingConfig
+    ) -> List[Tuple]:
+        """按批执行清洗阶段（进程池工作进程的入口）
+
+        Returns:
+            与输入对齐的 (清洗结果, 文本字段画像) 列表
+        """
+        stage_start = time.time()
+        data_list = [self._run_stage_hooks(ProcessingStage.CLEANING, data) for data in data_list]
+
+        if config.fused_stages:
+            cleaned = self.fused_plan.clean_batch(data_list)
+        else:
+            cleaned = [(result, {}) for result in self.cleaner.clean_batch(data_list)]
+
+        self.stats["stage_stats"]["cleaning"]["time"] += time.time() - stage_start
+        return cleaned
+
+    def _execute_validation_and_formatting_batch(
+        self, items: List[Tuple], config: ProcessingConfig
+    ) -> List[Tuple]:
+        """按批执行验证阶段与格式化阶段（进程池工作进程的入口）
 
-        result = self.cleaner.clean_data(data)
+        Args:
+            items: (数据, 文本字段画像) 列表
+
+        Returns:
+            与输入对齐的 (验证结果, 格式化结果) 列表；规则同 _execute_validation_and_formatting
+        """
+        stage_start = time.time()
+        data_list = [data for data, _ in items]
+        profiles_list = [profiles for _, profiles in items]
+        validation_results = self.validator.validate_batch(
+            [self._run_stage_hooks(ProcessingStage.VALIDATION, data) for data in data_list],
+            config.validation_level,
+            profiles_list,
+        )
+        self.stats["stage_stats"]["validation"]["time"] += time.time() - stage_start
+
+        skip_invalid = config.fail_fast or config.skip_formatting_on_validation_fail
+        to_format = [
+            i for i, validation_result in enumerate(validation_results)
+            if validation_result.is_valid or not skip_invalid
+        ]
+        formatting_results: List[Optional[Any]] = [None] * len(items)
+        if to_format:
+            stage_start = time.time()
+            original_format = self.formatter.output_format
+            self.formatter.output_format = config.output_format
+            try:
+                formatted = self.formatter.format_batch(
+                    [
+                        self._run_stage_hooks(ProcessingStage.FORMATTING, data_list[i])
+                        for i in to_format
+                    ],
+                    [profiles_list[i] for i in to_format],
+                )
+            finally:
+                self.formatter.output_format = original_format
+            for i, formatting_result in zip(to_format, formatted):
+                formatting_results[i] = formatting_result
+            self.stats["stage_stats"]["formatting"]["time"] += time.time() - stage_start
+
+        return list(zip(validation_results, formatting_results))
+
+    def _execute_cleaning_stage(self, data: Dict[str, Any], config: ProcessingConfig):
+        """执行清洗阶段
+
+        Returns:
+            (清洗结果, 文本字段画像)；未启用融合执行时画像为空
+        """
+        stage_start = time.time()
+
+        # 执行阶段钩子
+        data = self._run_stage_hooks(ProcessingStage.CLEANING, data)
+
+        if config.fused_stages:
+            result, profiles = self.fused_plan.clean(data)
+        else:
+            result, profiles = self.cleaner.clean_data(data), {}
 
         stage_time = time.time() - stage_start
         self.stats["stage_stats"]["cleaning"]["time"] += stage_time
 
+        return result, profiles
+
+    def _execute_deduplication_stage(self, data: Dict[str, Any], config: ProcessingConfig):
+        """执行近似重复检测阶段"""
+        stage_start = time.time()
+
+        # 执行阶段钩子
+        data = self._run_stage_hooks(ProcessingStage.DEDUPLICATION, data)
+
+        result = self.deduplicator.check(data, record=False)
+
+        stage_time = time.time() - stage_start
+        self.stats["stage_stats"]["deduplication"]["time"] += stage_time
+
         return result
 
-    def _execute_validation_stage(self, data: Dict[str, Any], config: ProcessingConfig):
+    def _apply_duplicate_check(
+        self, result: ProcessingResult, duplicate_check, data: Optional[Dict[str, Any]]
+    ) -> bool:
+        """将近似重复检测结果写入处理结果
+
+        Returns:
+            是否按drop模式丢弃
+        """
+        result.stage_results["deduplication"] = duplicate_check
+        result.metadata["cluster_id"] = duplicate_check.cluster_id
+
+        if not duplicate_check.is_duplicate:
+            self.stats["stage_stats"]["deduplication"]["success"] += 1
+            return False
+
+        self.stats["stage_stats"]["deduplication"]["failed"] += 1
+        self.stats["items_duplicate"] += 1
+        result.metadata["duplicate_of"] = duplicate_check.cluster_id
+        result.metadata["similarity"] = duplicate_check.similarity
+
+        if self.dedup_mode == "drop":
+            # 丢弃的副本单独计数，不计入失败
+            result.success = False
+            result.data = None
+            result.metadata["dropped"] = True
+            result.warnings.append(
+                f"近似重复，已丢弃: 与 {duplicate_check.cluster_id} 相似度 "
+                f"{duplicate_check.similarity:.2f}"
+            )
+            return True
+
+        if isinstance(data, dict):
+            data.setdefault("metadata", {})
+            data["metadata"]["duplicate_of"] = duplicate_check.cluster_id
+        return False
+
+    def _record_duplicate_check(
+        self, result: ProcessingResult, duplicate_check, data: Dict[str, Any]
+    ) -> bool:
+        """通过验证的条目加入去重索引；入库时发现并发副本则按重复处理
+
+        Returns:
+            是否按drop模式丢弃
+        """
+        final_check = self.deduplicator.record(duplicate_check)
+        if not final_check.is_duplicate:
+            return False
+
+        # 检测阶段已按非重复计数，改记为重复
+        self.stats["stage_stats"]["deduplication"]["success"] -= 1
+        return self._apply_duplicate_check(result, final_check, data)
+
+    def _execute_validation_stage(
+        self,
+        data: Dict[str, Any],
+        config: ProcessingConfig,
+        profiles: Dict[str, TextProfile] = None,
+    ):
         """执行验证阶段"""
         stage_start = time.time()
 
         # 执行阶段钩子
-        for hook in self.stage_hooks[ProcessingStage.VALIDATION]:
-            try:
-                data = hook(data)
-            except Exception as e:
-                self.logger.warning(f"验证阶段钩子失败: {e}")
+        data = self._run_stage_hooks(ProcessingStage.VALIDATION, data)
 
-        result = self.validator.validate_data(data, config.validation_level)
+        result = self.validator.validate_data(data, config.validation_level, profiles)
 
         stage_time = time.time() - stage_start
         self.stats["stage_stats"]["validation"]["time"] += stage_time
 
         return result
 
-    def _execute_formatting_stage(self, data: Dict[str, Any], config: ProcessingConfig):
+    def _execute_formatting_stage(
+        self,
+        data: Dict[str, Any],
+        config: ProcessingConfig,
+        profiles: Dict[str, TextProfile] = None,
+    ):
         """执行格式化阶段"""
         stage_start = time.time()
 
         # 执行阶段钩子
-        for hook in self.stage_hooks[ProcessingStage.FORMATTING]:
-            try:
-                data = hook(data)
-            except Exception as e:
-                self.logger.warning(f"格式化阶段钩子失败: {e}")
+        data = self._run_stage_hooks(ProcessingStage.FORMATTING, data)
 
         # 临时设置输出格式
         original_format = self.formatter.output_format
         self.formatter.output_format = config.output_format
 
-        result = self.formatter.format_data(data)
+        result = self.formatter.format_data(data, profiles)
 
         # 恢复原始格式
         self.formatter.output_format = original_format
@@ -478,6 +780,17 @@ class DataPipeline:
                     indexed_results.sort(key=lambda x: x[0])
                     results = [result for _, result in indexed_results]
 
+            elif config.processing_mode == ProcessingMode.PROCESS:
+                # 多进程处理（按原始顺序返回）
+                results = self._process_batch_multiprocess(data_list, config)
+                for i, result in enumerate(results):
+                    if result.errors:
+                        errors.extend([f"Item {i}: {error}" for error in result.errors])
+                    if result.warnings:
+                        warnings.extend(
+                            [f"Item {i}: {warning}" for warning in result.warnings]
+                        )
+
             elif config.processing_mode == ProcessingMode.ASYNC:
                 # 异步处理（在同步上下文中运行）
                 loop = asyncio.new_event_loop()
@@ -489,15 +802,17 @@ class DataPipeline:
                 finally:
                     loop.close()
 
-            # 计算统计信息
+            # 计算统计信息（drop模式丢弃的副本单独计数，不计入失败）
+            duplicate_items = sum(1 for result in results if "duplicate_of" in result.metadata)
+            dropped_items = sum(1 for result in results if result.metadata.get("dropped"))
             successful_items = sum(1 for result in results if result.success)
-            failed_items = len(results) - successful_items
+            failed_items = len(results) - successful_items - dropped_items
             processing_time = time.time() - start_time
 
             self.logger.info(
                 f"批量处理完成: 总数={len(data_list)} | "
                 f"成功={successful_items} | 失败={failed_items} | "
-                f"耗时={processing_time:.3f}s"
+                f"丢弃副本={dropped_items} | 耗时={processing_time:.3f}s"
             )
 
             return BatchProcessingResult(
@@ -511,6 +826,8 @@ class DataPipeline:
                 metadata={
                     "processing_mode": config.processing_mode.value,
                     "max_workers": config.max_workers,
+                    "duplicate_items": duplicate_items,
+                    "dropped_items": dropped_items,
                     "avg_processing_time": processing_time / len(data_list)
                     if data_list
                     else 0,
@@ -548,6 +865,156 @@ class DataPipeline:
         tasks = [process_item_async(data) for data in data_list]
         return await asyncio.gather(*tasks)
 
+    def _get_process_pool(self, max_workers: int) -> ProcessPoolExecutor:
+        """获取常驻进程池（工作进程数变化时重建）"""
+        if self._process_pool is not None and self._process_pool_workers != max_workers:
+            self._shutdown_process_pool()
+
+        if self._process_pool is None:
+            snapshot = _ConfigSnapshot(
+                {key: self.config.get_config(key, {}) for key in _WORKER_CONFIG_KEYS}
+            )
+            mp_context = (
+                multiprocessing.get_context(self.process_start_method)
+                if self.process_start_method
+                else None
+            )
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=mp_context,
+                initializer=_init_worker,
+                initargs=(snapshot,),
+            )
+            self._process_pool_workers = max_workers
+            self.logger.info(f"处理进程池已启动: 工作进程={max_workers}")
+
+        return self._process_pool
+
+    def _shutdown_process_pool(self) -> None:
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True, cancel_futures=True)
+            self._process_pool = None
+            self._process_pool_workers = 0
+
+    def close(self) -> None:
+        """关闭管道（释放PROCESS模式的进程池）"""
+        self._shutdown_process_pool()
+
+    def _process_batch_multiprocess(
+        self, data_list: List[Dict[str, Any]], config: ProcessingConfig
+    ) -> List[ProcessingResult]:
+        """多进程批量处理
+
+        阶段语义与顺序处理一致：清洗在工作进程中按块执行；主进程按清洗结果决定是否继续，
+        并做近似重复检测（去重索引必须全局唯一）；未被丢弃的条目再按块发往工作进程验证与
+        格式化，通过的条目在主进程入库。预处理/后处理钩子留在主进程，阶段钩子无法跨进程时
+        退回顺序处理。
+        """
+        if any(self.stage_hooks.values()):
+            self.logger.warning("存在阶段钩子，无法在工作进程中执行，退回顺序处理")
+            return [self.process_item(data, config) for data in data_list]
+
+        max_workers = max(config.max_workers, 1)
+        chunk_size = config.chunk_size or max(
+            math.ceil(len(data_list) / (max_workers * 4)), 1
+        )
+
+        # 预处理钩子在主进程执行
+        start_times = []
+        results = []
+        prepared = []
+        for data in data_list:
+            start_times.append(time.time())
+            result = self._new_result(data)
+            prepared.append(self._run_pre_processing_hooks(data, result))
+            results.append(result)
+
+        try:
+            cleaned = self._map_process_pool(_clean_chunk, prepared, config, max_workers, chunk_size)
+        except Exception as e:
+            self.logger.error(f"进程池处理失败，退回顺序处理: {e}")
+            self._shutdown_process_pool()
+            return [self.process_item(data, config) for data in data_list]
+
+        # 主进程：清洗结果判定与近似重复检测
+        pending = []
+        for i, (data, (cleaning_result, profiles)) in enumerate(zip(prepared, cleaned)):
+            result = results[i]
+            self.stats["items_processed"] += 1
+            self.stats["stage_stats"]["cleaning"]["time"] += cleaning_result.cleaning_time
+            try:
+                data, proceed = self._apply_cleaning_result(result, data, cleaning_result, config)
+                if not proceed:
+                    self._fail_item(result, start_times[i])
+                    continue
+
+                duplicate_check = None
+                if config.deduplicate:
+                    duplicate_check = self._execute_deduplication_stage(data, config)
+                    if self._apply_duplicate_check(result, duplicate_check, data):
+                        result.processing_time = time.time() - start_times[i]
+                        continue
+                    result.stages_completed.append(ProcessingStage.DEDUPLICATION)
+
+                pending.append((i, data, profiles, duplicate_check))
+            except Exception as e:
+                self._item_exception(result, start_times[i], e)
+
+        # 工作进程：验证与格式化
+        stage_inputs = [(data, profiles) for _, data, profiles, _ in pending]
+        try:
+            staged = self._map_process_pool(
+                _validate_and_format_chunk, stage_inputs, config, max_workers, chunk_size
+            )
+        except Exception as e:
+            self.logger.error(f"进程池处理失败，在主进程完成验证与格式化: {e}")
+            self._shutdown_process_pool()
+            staged = self._execute_validation_and_formatting_batch(stage_inputs, config)
+        else:
+            stage_stats = self.stats["stage_stats"]
+            for validation_result, formatting_result in staged:
+                stage_stats["validation"]["time"] += validation_result.validation_time
+                if formatting_result is not None:
+                    stage_stats["formatting"]["time"] += formatting_result.formatting_time
+
+        # 主进程：写入结果、去重入库与后处理钩子
+        for (i, data, _, duplicate_check), (validation_result, formatting_result) in zip(
+            pending, staged
+        ):
+            result = results[i]
+            try:
+                if self._apply_validation_and_formatting(
+                    result, data, validation_result, formatting_result, config
+                ):
+                    results[i] = self._complete_item(result, duplicate_check, start_times[i])
+                else:
+                    self._fail_item(result, start_times[i])
+            except Exception as e:
+                self._item_exception(result, start_times[i], e)
+
+        return results
+
+    def _map_process_pool(
+        self,
+        func: Callable,
+        items: List[Any],
+        config: ProcessingConfig,
+        max_workers: int,
+        chunk_size: int,
+    ) -> List[Any]:
+        """按块提交到常驻进程池，结果按输入顺序展开"""
+        if not items:
+            return []
+        pool = self._get_process_pool(max_workers)
+        futures = [
+            pool.submit(func, items[i : i + chunk_size], config)
+            for i in range(0, len(items), chunk_size)
+        ]
+        outputs: List[Any] = []
+        for future in futures:
+            outputs.extend(future.result())
+        return outputs
+
     def get_stats(self) -> Dict[str, Any]:
         """获取统计信息"""
         stats = self.stats.copy()
@@ -579,6 +1046,7 @@ class DataPipeline:
             "cleaner": self.cleaner.get_stats(),
             "validator": self.validator.get_stats(),
             "formatter": self.formatter.get_stats(),
+            "deduplicator": self.deduplicator.get_stats(),
         }
 
         return stats
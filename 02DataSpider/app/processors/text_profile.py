@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+文本字段画像模块
+
+清洗阶段为文本字段生成一次画像（小写形式、空白分词、词集合、字母计数），
+验证与格式化阶段复用画像，避免同一字段被反复转换与分词
+"""
+
+import re
+from typing import Dict, Optional
+
+_WORD_RE = re.compile(r"\w+")
+
+# 有效字符判定为 isalpha() 或基本汉字区；当前Unicode版本下该区内非字母的码位
+# （通常为空）单独补计，结果与逐字符判定一致
+_CJK_NON_ALPHA = "".join(
+    c for c in map(chr, range(0x4E00, 0xA000)) if not c.isalpha()
+)
+_CJK_NON_ALPHA_RE = re.compile(f"[{_CJK_NON_ALPHA}]") if _CJK_NON_ALPHA else None
+
+
+class TextProfile:
+    """文本字段画像（各项按需计算并缓存）"""
+
+    __slots__ = ("text", "normalized", "_lower", "_tokens", "_word_set", "_letter_count")
+
+    def __init__(self, text: str, normalized: bool = False):
+        """初始化画像
+
+        Args:
+            text: 字段文本
+            normalized: 文本是否已完成空白标准化（连续空白已合并且首尾已去除）
+        """
+        self.text = text
+        self.normalized = normalized
+        self._lower = None
+        self._tokens = None
+        self._word_set = None
+        self._letter_count = None
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def tokens(self) -> list:
+        """按空白切分的小写词列表（词数与原文切分一致）"""
+        if self._tokens is None:
+            self._tokens = self.lower.split()
+        return self._tokens
+
+    @property
+    def word_set(self) -> set:
+        """\\w+ 词集合（小写）"""
+        if self._word_set is None:
+            self._word_set = set(_WORD_RE.findall(self.lower))
+        return self._word_set
+
+    @property
+    def letter_count(self) -> int:
+        """字母与汉字字符数"""
+        if self._letter_count is None:
+            count = sum(map(str.isalpha, self.text))
+            if _CJK_NON_ALPHA_RE is not None:
+                count += len(_CJK_NON_ALPHA_RE.findall(self.text))
+            self._letter_count = count
+        return self._letter_count
+
+
+def profile_for(
+    profiles: Optional[Dict[str, TextProfile]], field: str, value: str
+) -> TextProfile:
+    """取字段画像；画像缺失或字段值已被替换（如阶段钩子修改）时按当前值新建
+
+    Args:
+        profiles: 清洗阶段生成的画像
+        field: 字段名
+        value: 字段当前值
+
+    Returns:
+        与当前值对应的画像
+    """
+    if profiles:
+        profile = profiles.get(field)
+        if profile is not None and profile.text is value:
+            return profile
+    return TextProfile(value)
@@ -0,0 +1,589 @@
+# -*- coding: utf-8 -*-
+"""
+NeuroTrade Nexus - 编译型序列化编解码器
+按schema一次性编译出编码/解码函数，编码直接追加写入调用方提供的bytearray
+
+- Avro：按Avro二进制规范编码（zigzag变长整数、长度前缀字符串、分块数组/映射），
+  输出与avro库DatumWriter一致，不依赖avro库
+- Protobuf：按proto3线格式编码（字段编号与schemas/data.proto一致，默认值字段省略），
+  可被protoc生成的类直接解析，不依赖protobuf库
+- 编译结果按 (格式, schema指纹) 缓存，同一版本schema只编译一次
+- 批量帧：魔数 + 格式 + 条目数 + 每条长度前缀，整批写入一个缓冲区
+"""
+
+import hashlib
+import json
+import struct
+from typing import Any, Callable, Dict, List, Tuple
+
+_DOUBLE = struct.Struct("<d")
+_FLOAT = struct.Struct("<f")
+_MASK64 = (1 << 64) - 1
+
+_BATCH_MAGIC = b"NTNB\x01"
+_FORMAT_CODES = {"avro": 1, "protobuf": 2}
+
+Writer = Callable[[bytearray, Any], None]
+Reader = Callable[[bytes, int], Tuple[Any, int]]
+
+
+# 变长整数
+
+
+def write_varint(buf: bytearray, value: int) -> None:
+    """无符号变长整数（LEB128）"""
+    while value > 0x7F:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _write_long(buf: bytearray, value: int) -> None:
+    write_varint(buf, ((value << 1) ^ (value >> 63)) & _MASK64)
+
+
+def _read_long(data: bytes, pos: int) -> Tuple[int, int]:
+    value, pos = read_varint(data, pos)
+    return (value >> 1) ^ -(value & 1), pos
+
+
+def _as_str(value: Any) -> str:
+    return value if isinstance(value, str) else str(value)
+
+
+def _schema_type(schema: Any) -> str:
+    return schema if isinstance(schema, str) else schema["type"]
+
+
+def default_value(schema: Any) -> Any:
+    """schema类型的零值（字段缺失或为None时使用）"""
+    kind = _schema_type(schema)
+    if kind == "string":
+        return ""
+    if kind == "bytes":
+        return b""
+    if kind in ("int", "long", "int32", "int64"):
+        return 0
+    if kind in ("double", "float"):
+        return 0.0
+    if kind in ("boolean", "bool"):
+        return False
+    if kind == "array":
+        return []
+    if kind == "map":
+        return {}
+    if kind == "record":
+        return {field["name"]: default_value(field["type"]) for field in schema["fields"]}
+    return None
+
+
+# Avro
+
+
+def _avro_writer(schema: Any) -> Writer:
+    kind = _schema_type(schema)
+
+    if kind == "string":
+
+        def write(buf, value):
+            encoded = _as_str(value).encode("utf-8")
+            _write_long(buf, len(encoded))
+            buf += encoded
+
+    elif kind == "bytes":
+
+        def write(buf, value):
+            _write_long(buf, len(value))
+            buf += value
+
+    elif kind in ("int", "long"):
+
+        def write(buf, value):
+            _write_long(buf, int(value))
+
+    elif kind == "double":
+
+        def write(buf, value):
+            buf += _DOUBLE.pack(float(value))
+
+    elif kind == "float":
+
+        def write(buf, value):
+            buf += _FLOAT.pack(float(value))
+
+    elif kind == "boolean":
+
+        def write(buf, value):
+            buf.append(1 if value else 0)
+
+    elif kind == "null":
+
+        def write(buf, value):
+            pass
+
+    elif kind == "array":
+        item_writer = _avro_writer(schema["items"])
+
+        def write(buf, value):
+            items = value if isinstance(value, (list, tuple)) else list(value)
+            if items:
+                _write_long(buf, len(items))
+                for item in items:
+                    item_writer(buf, item)
+            buf.append(0)
+
+    elif kind == "map":
+        value_writer = _avro_writer(schema["values"])
+
+        def write(buf, value):
+            if value:
+                _write_long(buf, len(value))
+                for key, item in value.items():
+                    encoded = _as_str(key).encode("utf-8")
+                    _write_long(buf, len(encoded))
+                    buf += encoded
+                    value_writer(buf, item)
+            buf.append(0)
+
+    elif kind == "record":
+        fields = tuple(
+            (
+                field["name"],
+                _avro_writer(field["type"]),
+                field.get("default", default_value(field["type"])),
+            )
+            for field in schema["fields"]
+        )
+
+        def write(buf, value):
+            get = value.get if value else {}.get
+            for name, field_writer, default in fields:
+                item = get(name)
+                field_writer(buf, default if item is None else item)
+
+    else:
+        raise ValueError(f"不支持的Avro类型: {kind}")
+
+    return write
+
+
+def _avro_reader(schema: Any) -> Reader:
+    kind = _schema_type(schema)
+
+    if kind in ("string", "bytes"):
+        as_text = kind == "string"
+
+        def read(data, pos):
+            length, pos = _read_long(data, pos)
+            raw = data[pos : pos + length]
+            return (bytes(raw).decode("utf-8") if as_text else bytes(raw)), pos + length
+
+    elif kind in ("int", "long"):
+        read = _read_long
+
+    elif kind in ("double", "float"):
+        codec = _DOUBLE if kind == "double" else _FLOAT
+
+        def read(data, pos):
+            return codec.unpack_from(data, pos)[0], pos + codec.size
+
+    elif kind == "boolean":
+
+        def read(data, pos):
+            return data[pos] == 1, pos + 1
+
+    elif kind == "null":
+
+        def read(data, pos):
+            return None, pos
+
+    elif kind in ("array", "map"):
+        is_map = kind == "map"
+        item_reader = _avro_reader(schema["values"] if is_map else schema["items"])
+        key_reader = _avro_reader("string")
+
+        def read(data, pos):
+            result = {} if is_map else []
+            while True:
+                count, pos = _read_long(data, pos)
+                if count == 0:
+                    return result, pos
+                if count < 0:
+                    # 负数块长度后跟块字节数
+                    count = -count
+                    _, pos = _read_long(data, pos)
+                for _ in range(count):
+                    if is_map:
+                        key, pos = key_reader(data, pos)
+                        result[key], pos = item_reader(data, pos)
+                    else:
+                        item, pos = item_reader(data, pos)
+                        result.append(item)
+
+    elif kind == "record":
+        fields = tuple((field["name"], _avro_reader(field["type"])) for field in schema["fields"])
+
+        def read(data, pos):
+            result = {}
+            for name, field_reader in fields:
+                result[name], pos = field_reader(data, pos)
+            return result, pos
+
+    else:
+        raise ValueError(f"不支持的Avro类型: {kind}")
+
+    return read
+
+
+# Protobuf（proto3线格式）
+
+_VARINT, _FIXED64, _LENGTH, _FIXED32 = 0, 1, 2, 5
+_SCALAR_WIRE = {
+    "string": _LENGTH,
+    "bytes": _LENGTH,
+    "int32": _VARINT,
+    "int64": _VARINT,
+    "bool": _VARINT,
+    "double": _FIXED64,
+    "float": _FIXED32,
+}
+
+
+# 标量零值的合法类型：只有类型相符且等于零值时才按proto3省略
+_SCALAR_ZERO_TYPES = {
+    "string": str,
+    "bytes": (bytes, bytearray),
+    "int32": int,
+    "int64": int,
+    "bool": (bool, int),
+    "double": (int, float),
+    "float": (int, float),
+}
+
+
+def _tag(number: int, wire_type: int) -> bytes:
+    buf = bytearray()
+    write_varint(buf, (number << 3) | wire_type)
+    return bytes(buf)
+
+
+def _proto_scalar_payload(kind: str) -> Writer:
+    """标量值的载荷写入（不含tag）"""
+    if kind == "string":
+
+        def write(buf, value):
+            encoded = _as_str(value).encode("utf-8")
+            write_varint(buf, len(encoded))
+            buf += encoded
+
+    elif kind == "bytes":
+
+        def write(buf, value):
+            write_varint(buf, len(value))
+            buf += value
+
+    elif kind in ("int32", "int64"):
+
+        def write(buf, value):
+            write_varint(buf, int(value) & _MASK64)
+
+    elif kind == "bool":
+
+        def write(buf, value):
+            buf.append(1 if value else 0)
+
+    elif kind == "double":
+
+        def write(buf, value):
+            buf += _DOUBLE.pack(float(value))
+
+    elif kind == "float":
+
+        def write(buf, value):
+            buf += _FLOAT.pack(float(value))
+
+    else:
+        raise ValueError(f"不支持的Protobuf类型: {kind}")
+    return write
+
+
+def _proto_field_writer(number: int, schema: Any) -> Writer:
+    """单个字段的写入函数（proto3：标量默认值省略）"""
+    kind = _schema_type(schema)
+
+    if kind in _SCALAR_WIRE:
+        tag = _tag(number, _SCALAR_WIRE[kind])
+        payload = _proto_scalar_payload(kind)
+        zero, zero_types = default_value(kind), _SCALAR_ZERO_TYPES[kind]
+
+        def write(buf, value):
+            if value == zero and isinstance(value, zero_types):
+                return
+            buf += tag
+            payload(buf, value)
+
+    elif kind == "array":
+        item_kind = _schema_type(schema["items"])
+        if item_kind in ("string", "bytes"):
+            tag = _tag(number, _LENGTH)
+            payload = _proto_scalar_payload(item_kind)
+
+            def write(buf, value):
+                for item in value:
+                    buf += tag
+                    payload(buf, item)
+
+        else:
+            # 数值型repeated字段按proto3默认打包编码
+            tag = _tag(number, _LENGTH)
+            payload = _proto_scalar_payload(item_kind)
+
+            def write(buf, value):
+                if value:
+                    packed = bytearray()
+                    for item in value:
+                        payload(packed, item)
+                    buf += tag
+                    write_varint(buf, len(packed))
+                    buf += packed
+
+    elif kind == "map":
+        # map<K, V> 等价于 repeated Entry { K key = 1; V value = 2; }
+        tag = _tag(number, _LENGTH)
+        key_writer = _proto_field_writer(1, schema.get("keys", "string"))
+        value_writer = _proto_field_writer(2, schema["values"])
+
+        def write(buf, value):
+            for key, item in value.items():
+                entry = bytearray()
+                key_writer(entry, key)
+                value_writer(entry, item)
+                buf += tag
+                write_varint(buf, len(entry))
+                buf += entry
+
+    elif kind == "record":
+        tag = _tag(number, _LENGTH)
+        message_writer = _proto_message_writer(schema)
+
+        def write(buf, value):
+            nested = bytearray()
+            message_writer(nested, value)
+            buf += tag
+            write_varint(buf, len(nested))
+            buf += nested
+
+    else:
+        raise ValueError(f"不支持的Protobuf类型: {kind}")
+
+    return write
+
+
+def _proto_message_writer(schema: Dict[str, Any]) -> Writer:
+    fields = tuple(
+        (
+            field["name"],
+            _proto_field_writer(field["number"], field["type"]),
+            _schema_type(field["type"]) == "record",
+        )
+        for field in schema["fields"]
+    )
+
+    def write(buf, value):
+        get = value.get if value else {}.get
+        for name, field_writer, is_message in fields:
+            item = get(name)
+            if item is None:
+                if not is_message:
+                    continue
+                # 嵌套消息始终写出（保留字段存在性）
+                item = {}
+            field_writer(buf, item)
+
+    return write
+
+
+def _proto_scalar_decoder(kind: str) -> Callable[[Any], Any]:
+    if kind == "string":
+        return lambda raw: bytes(raw).decode("utf-8")
+    if kind == "bytes":
+        return bytes
+    if kind in ("int32", "int64"):
+        # 负数以64位补码变长整数编码
+        return lambda v: v - (1 << 64) if v >= 1 << 63 else v
+    if kind == "bool":
+        return bool
+    if kind == "double":
+        return lambda raw: _DOUBLE.unpack(raw)[0]
+    if kind == "float":
+        return lambda raw: _FLOAT.unpack(raw)[0]
+    raise ValueError(f"不支持的Protobuf类型: {kind}")
+
+
+def _read_proto_value(data: bytes, pos: int, wire_type: int) -> Tuple[Any, int]:
+    """按线类型读取原始值（varint为整数，其余为字节切片）"""
+    if wire_type == _VARINT:
+        return read_varint(data, pos)
+    if wire_type == _FIXED64:
+        return data[pos : pos + 8], pos + 8
+    if wire_type == _LENGTH:
+        length, pos = read_varint(data, pos)
+        return data[pos : pos + length], pos + length
+    if wire_type == _FIXED32:
+        return data[pos : pos + 4], pos + 4
+    raise ValueError(f"不支持的Protobuf线类型: {wire_type}")
+
+
+def _proto_message_reader(schema: Dict[str, Any]) -> Callable[[bytes], Dict[str, Any]]:
+    handlers: Dict[int, Tuple[str, str, Callable[[Any], Any]]] = {}
+    for field in schema["fields"]:
+        field_schema = field["type"]
+        kind = _schema_type(field_schema)
+        if kind in _SCALAR_WIRE:
+            handlers[field["number"]] = (field["name"], "value", _proto_scalar_decoder(kind))
+        elif kind == "array":
+            item_kind = _schema_type(field_schema["items"])
+            # 数值型repeated字段可能以打包形式出现，记录元素线类型以便展开
+            mode = "repeated" if item_kind in ("string", "bytes") else _SCALAR_WIRE[item_kind]
+            handlers[field["number"]] = (field["name"], mode, _proto_scalar_decoder(item_kind))
+        elif kind == "map":
+            entry_reader = _proto_message_reader(
+                {
+                    "fields": [
+                        {"name": "key", "number": 1, "type": field_schema.get("keys", "string")},
+                        {"name": "value", "number": 2, "type": field_schema["values"]},
+                    ]
+                }
+            )
+            handlers[field["number"]] = (field["name"], "map", entry_reader)
+        elif kind == "record":
+            handlers[field["number"]] = (field["name"], "value", _proto_message_reader(field_schema))
+        else:
+            raise ValueError(f"不支持的Protobuf类型: {kind}")
+
+    defaults = default_value({"type": "record", "fields": schema["fields"]})
+
+    def read(data) -> Dict[str, Any]:
+        # 零值中的容器逐字段复制（嵌套消息零值为一层字典，不含可变容器）
+        result = {
+            name: value.copy() if isinstance(value, (list, dict)) else value
+            for name, value in defaults.items()
+        }
+        pos = 0
+        end = len(data)
+        while pos < end:
+            key, pos = read_varint(data, pos)
+            raw, pos = _read_proto_value(data, pos, key & 0x07)
+            handler = handlers.get(key >> 3)
+            if handler is None:
+                continue  # 未知字段（新版本schema）跳过
+            name, mode, decode = handler
+            if mode == "value":
+                result[name] = decode(raw)
+            elif mode == "map":
+                entry = decode(raw)
+                result[name][entry["key"]] = entry["value"]
+            elif mode != "repeated" and key & 0x07 == _LENGTH:
+                # 打包的数值型repeated字段
+                inner = 0
+                while inner < len(raw):
+                    value, inner = _read_proto_value(raw, inner, mode)
+                    result[name].append(decode(value))
+            else:
+                result[name].append(decode(raw))
+        return result
+
+    return read
+
+
+# 编译与缓存
+
+
+class CompiledCodec:
+    """编译后的单一schema编解码器
+
+    Args:
+        format_type: 格式（avro / protobuf）
+        schema: schema定义
+    """
+
+    def __init__(self, format_type: str, schema: Dict[str, Any]):
+        if format_type not in _FORMAT_CODES:
+            raise ValueError(f"不支持的序列化格式: {format_type}")
+        self.format_type = format_type
+        self.schema = schema
+        self.fingerprint = schema_fingerprint(schema)
+
+        if format_type == "avro":
+            self.encode_into: Writer = _avro_writer(schema)
+            reader = _avro_reader(schema)
+            self._decode = lambda data: reader(data, 0)[0]
+        else:
+            self.encode_into = _proto_message_writer(schema)
+            self._decode = _proto_message_reader(schema)
+
+    def encode(self, datum: Dict[str, Any]) -> bytes:
+        buf = bytearray()
+        self.encode_into(buf, datum)
+        return bytes(buf)
+
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        return self._decode(memoryview(data) if isinstance(data, bytes) else data)
+
+    def encode_batch_into(self, buf: bytearray, items: List[Dict[str, Any]]) -> None:
+        """批量编码为单个帧：魔数 + 格式码 + 条目数 + (长度 + 条目)*"""
+        buf += _BATCH_MAGIC
+        buf.append(_FORMAT_CODES[self.format_type])
+        write_varint(buf, len(items))
+        scratch = bytearray()
+        encode_into = self.encode_into
+        for item in items:
+            del scratch[:]
+            encode_into(scratch, item)
+            write_varint(buf, len(scratch))
+            buf += scratch
+
+    def decode_batch(self, data: bytes) -> List[Dict[str, Any]]:
+        view = memoryview(data)
+        header = len(_BATCH_MAGIC)
+        if bytes(view[:header]) != _BATCH_MAGIC:
+            raise ValueError("无效的批量帧")
+        if view[header] != _FORMAT_CODES[self.format_type]:
+            raise ValueError(f"批量帧格式不匹配: 期望 {self.format_type}")
+        count, pos = read_varint(view, header + 1)
+        items = []
+        for _ in range(count):
+            length, pos = read_varint(view, pos)
+            items.append(self.decode(view[pos : pos + length]))
+            pos += length
+        return items
+
+
+def schema_fingerprint(schema: Dict[str, Any]) -> str:
+    """schema规范化JSON的指纹（schema版本标识）"""
+    canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+_codec_cache: Dict[Tuple[str, str], CompiledCodec] = {}
+
+
+def compile_codec(format_type: str, schema: Dict[str, Any]) -> CompiledCodec:
+    """获取schema的编译编解码器（按格式与schema指纹缓存）"""
+    key = (format_type, schema_fingerprint(schema))
+    codec = _codec_cache.get(key)
+    if codec is None:
+        codec = _codec_cache[key] = CompiledCodec(format_type, schema)
+    return codec
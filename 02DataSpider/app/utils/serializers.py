@@ -3,82 +3,94 @@
 序列化工具模块
 
 提供Protobuf和Avro序列化功能
+
+编码器由schema一次性编译生成（见codecs模块），不依赖protobuf/avro运行库：
+单条编码写入线程内复用的缓冲区，批量编码将整批条目写入一个带长度前缀的帧
 """
 
 import json
-import io
-from typing import Dict, Any, List, Union, Optional
-from datetime import datetime
-
-try:
-    import google.protobuf.message as protobuf_message
-    from google.protobuf.json_format import MessageToDict, ParseDict
-    from google.protobuf.descriptor import FieldDescriptor
-    from google.protobuf.message import Message
-
-    PROTOBUF_AVAILABLE = True
-except ImportError:
-    PROTOBUF_AVAILABLE = False
-
-try:
-    import avro.schema
-    import avro.io
-
-    AVRO_AVAILABLE = True
-except ImportError:
-    AVRO_AVAILABLE = False
+import threading
+import time
+from typing import Dict, Any, List
 
 from ..config import ConfigManager
 from . import Logger
-
-
-class ProtobufSerializer:
-    """Protobuf序列化器"""
-
-    def __init__(self, config: ConfigManager, logger: Logger):
+from .codecs import compile_codec
+
+# DataItem schema（字段编号与 schemas/data.proto 一致）
+PROTOBUF_SCHEMA = {
+    "type": "record",
+    "name": "DataItem",
+    "fields": [
+        {"name": "id", "number": 1, "type": "string"},
+        {"name": "title", "number": 2, "type": "string"},
+        {"name": "content", "number": 3, "type": "string"},
+        {"name": "url", "number": 4, "type": "string"},
+        {"name": "timestamp", "number": 5, "type": "string"},
+        {"name": "category", "number": 6, "type": "string"},
+        {"name": "keywords", "number": 7, "type": {"type": "array", "items": "string"}},
+        {"name": "source", "number": 8, "type": "string"},
+        {"name": "metadata", "number": 9, "type": {"type": "map", "values": "string"}},
+        {
+            "name": "metrics",
+            "number": 10,
+            "type": {
+                "type": "record",
+                "name": "DataMetrics",
+                "fields": [
+                    {"name": "relevance_score", "number": 1, "type": "double"},
+                    {"name": "sentiment_score", "number": 2, "type": "double"},
+                    {"name": "word_count", "number": 3, "type": "int32"},
+                    {"name": "view_count", "number": 4, "type": "int32"},
+                    {"name": "share_count", "number": 5, "type": "int32"},
+                ],
+            },
+        },
+    ],
+}
+
+# 旧版模拟Protobuf格式（JSON + 标识头），仅用于反序列化历史数据
+_LEGACY_PROTOBUF_PREFIX = b"PROTOBUF:"
+
+
+class _CompiledSerializer:
+    """编译型序列化器基类（编码统计按格式记录）"""
+
+    format_type = ""
+
+    def __init__(self, config: ConfigManager, logger: Logger, schema: Dict[str, Any]):
         self.config = config
         self.logger = logger
-
-        if not PROTOBUF_AVAILABLE:
-            self.logger.warning("Protobuf库未安装，序列化功能不可用")
-
-    def _create_data_item_message(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """创建DataItem消息结构"""
-        message = {
-            "id": str(data.get("id", "")),
-            "title": str(data.get("title", "")),
-            "content": str(data.get("content", "")),
-            "url": str(data.get("url", "")),
-            "timestamp": str(data.get("timestamp", "")),
-            "category": str(data.get("category", "")),
-            "keywords": list(data.get("keywords", [])),
-            "source": str(data.get("source", "")),
-            "metadata": dict(data.get("metadata", {})),
+        self.codec = compile_codec(self.format_type, schema)
+
+        # 线程内复用的编码缓冲区
+        self._local = threading.local()
+
+        self.stats = {
+            "items_encoded": 0,
+            "bytes_encoded": 0,
+            "batches_encoded": 0,
+            "encode_time": 0.0,
+            "items_decoded": 0,
+            "decode_time": 0.0,
+            "errors": 0,
         }
 
-        # 处理metrics字段
-        metrics = data.get("metrics", {})
-        if metrics:
-            message["metrics"] = {
-                "relevance_score": float(metrics.get("relevance_score", 0.0)),
-                "sentiment_score": float(metrics.get("sentiment_score", 0.0)),
-                "word_count": int(metrics.get("word_count", 0)),
-                "view_count": int(metrics.get("view_count", 0)),
-                "share_count": int(metrics.get("share_count", 0)),
-            }
+    def _buffer(self) -> bytearray:
+        buf = getattr(self._local, "buffer", None)
+        if buf is None:
+            buf = self._local.buffer = bytearray()
         else:
-            message["metrics"] = {
-                "relevance_score": 0.0,
-                "sentiment_score": 0.0,
-                "word_count": 0,
-                "view_count": 0,
-                "share_count": 0,
-            }
+            del buf[:]
+        return buf
 
-        return message
+    def _record_encode(self, start: float, items: int, size: int) -> None:
+        self.stats["encode_time"] += time.perf_counter() - start
+        self.stats["items_encoded"] += items
+        self.stats["bytes_encoded"] += size
 
     def serialize(self, data: Dict[str, Any]) -> bytes:
-        """序列化数据为Protobuf格式
+        """序列化单条数据
 
         Args:
             data: 要序列化的数据
@@ -86,29 +98,44 @@ class ProtobufSerializer:
         Returns:
             序列化后的字节数据
         """
-        if not PROTOBUF_AVAILABLE:
-            raise RuntimeError("Protobuf库未安装")
-
+        start = time.perf_counter()
         try:
-            # 创建消息结构
-            message_data = self._create_data_item_message(data)
+            buf = self._buffer()
+            self.codec.encode_into(buf, data)
+            payload = bytes(buf)
+        except Exception as e:
+            self.stats["errors"] += 1
+            self.logger.error(f"{self.format_type}序列化失败: {e}")
+            raise
 
-            # 由于没有生成的protobuf类，我们使用JSON格式模拟
-            # 在实际部署时，应该使用protoc生成的类
-            json_data = json.dumps(message_data, ensure_ascii=False)
+        self._record_encode(start, 1, len(payload))
+        return payload
 
-            # 添加protobuf标识头
-            protobuf_data = b"PROTOBUF:" + json_data.encode("utf-8")
+    def serialize_batch(self, items: List[Dict[str, Any]]) -> bytes:
+        """批量序列化为单个带长度前缀的帧
 
-            self.logger.debug(f"Protobuf序列化成功，数据大小: {len(protobuf_data)} bytes")
-            return protobuf_data
+        Args:
+            items: 数据列表
 
+        Returns:
+            批量帧字节数据
+        """
+        start = time.perf_counter()
+        try:
+            buf = self._buffer()
+            self.codec.encode_batch_into(buf, items)
+            payload = bytes(buf)
         except Exception as e:
-            self.logger.error(f"Protobuf序列化失败: {e}")
+            self.stats["errors"] += 1
+            self.logger.error(f"{self.format_type}批量序列化失败: {e}")
             raise
 
+        self._record_encode(start, len(items), len(payload))
+        self.stats["batches_encoded"] += 1
+        return payload
+
     def deserialize(self, data: bytes) -> Dict[str, Any]:
-        """反序列化Protobuf数据
+        """反序列化单条数据
 
         Args:
             data: 序列化的字节数据
@@ -116,36 +143,82 @@ class ProtobufSerializer:
         Returns:
             反序列化后的数据
         """
-        if not PROTOBUF_AVAILABLE:
-            raise RuntimeError("Protobuf库未安装")
-
+        start = time.perf_counter()
         try:
-            # 检查protobuf标识头
-            if not data.startswith(b"PROTOBUF:"):
-                raise ValueError("无效的Protobuf数据格式")
+            result = self.codec.decode(data)
+        except Exception as e:
+            self.stats["errors"] += 1
+            self.logger.error(f"{self.format_type}反序列化失败: {e}")
+            raise
+
+        self.stats["items_decoded"] += 1
+        self.stats["decode_time"] += time.perf_counter() - start
+        return result
 
-            # 移除标识头并解析JSON
-            json_data = data[9:].decode("utf-8")
-            message_data = json.loads(json_data)
+    def deserialize_batch(self, data: bytes) -> List[Dict[str, Any]]:
+        """反序列化批量帧
 
-            self.logger.debug("Protobuf反序列化成功")
-            return message_data
+        Args:
+            data: 批量帧字节数据
 
+        Returns:
+            数据列表
+        """
+        start = time.perf_counter()
+        try:
+            items = self.codec.decode_batch(data)
         except Exception as e:
-            self.logger.error(f"Protobuf反序列化失败: {e}")
+            self.stats["errors"] += 1
+            self.logger.error(f"{self.format_type}批量反序列化失败: {e}")
             raise
 
+        self.stats["items_decoded"] += len(items)
+        self.stats["decode_time"] += time.perf_counter() - start
+        return items
 
-class AvroSerializer:
-    """Avro序列化器"""
+    def get_stats(self) -> Dict[str, Any]:
+        """获取编码统计（含吞吐量）"""
+        stats = self.stats.copy()
+        encode_time = stats["encode_time"]
+        stats["schema_fingerprint"] = self.codec.fingerprint
+        stats["items_per_second"] = stats["items_encoded"] / encode_time if encode_time else 0.0
+        stats["mb_per_second"] = (
+            stats["bytes_encoded"] / encode_time / (1024 * 1024) if encode_time else 0.0
+        )
+        stats["avg_item_bytes"] = (
+            stats["bytes_encoded"] / stats["items_encoded"] if stats["items_encoded"] else 0.0
+        )
+        return stats
+
+
+class ProtobufSerializer(_CompiledSerializer):
+    """Protobuf序列化器（proto3线格式，兼容protoc生成的DataItem）"""
+
+    format_type = "protobuf"
 
     def __init__(self, config: ConfigManager, logger: Logger):
-        self.config = config
-        self.logger = logger
+        super().__init__(config, logger, PROTOBUF_SCHEMA)
+
+    def deserialize(self, data: bytes) -> Dict[str, Any]:
+        """反序列化Protobuf数据（兼容旧版JSON模拟格式）
+
+        Args:
+            data: 序列化的字节数据
+
+        Returns:
+            反序列化后的数据
+        """
+        if data.startswith(_LEGACY_PROTOBUF_PREFIX):
+            return json.loads(data[len(_LEGACY_PROTOBUF_PREFIX) :].decode("utf-8"))
+        return super().deserialize(data)
+
 
-        if not AVRO_AVAILABLE:
-            self.logger.warning("Avro库未安装，序列化功能不可用")
+class AvroSerializer(_CompiledSerializer):
+    """Avro序列化器（Avro二进制编码）"""
 
+    format_type = "avro"
+
+    def __init__(self, config: ConfigManager, logger: Logger):
         # 定义Avro schema
         self.schema_dict = {
             "type": "record",
@@ -178,99 +251,7 @@ class AvroSerializer:
             ],
         }
 
-        if AVRO_AVAILABLE:
-            self.schema = avro.schema.parse(json.dumps(self.schema_dict))
-
-    def _prepare_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """准备数据以符合Avro schema"""
-        prepared = {
-            "id": str(data.get("id", "")),
-            "title": str(data.get("title", "")),
-            "content": str(data.get("content", "")),
-            "url": str(data.get("url", "")),
-            "timestamp": str(data.get("timestamp", "")),
-            "category": str(data.get("category", "")),
-            "keywords": list(data.get("keywords", [])),
-            "source": str(data.get("source", "")),
-            "metadata": {k: str(v) for k, v in data.get("metadata", {}).items()},
-        }
-
-        # 处理metrics字段
-        metrics = data.get("metrics", {})
-        prepared["metrics"] = {
-            "relevance_score": float(metrics.get("relevance_score", 0.0)),
-            "sentiment_score": float(metrics.get("sentiment_score", 0.0)),
-            "word_count": int(metrics.get("word_count", 0)),
-            "view_count": int(metrics.get("view_count", 0)),
-            "share_count": int(metrics.get("share_count", 0)),
-        }
-
-        return prepared
-
-    def serialize(self, data: Dict[str, Any]) -> bytes:
-        """序列化数据为Avro格式
-
-        Args:
-            data: 要序列化的数据
-
-        Returns:
-            序列化后的字节数据
-        """
-        if not AVRO_AVAILABLE:
-            raise RuntimeError("Avro库未安装")
-
-        try:
-            # 准备数据
-            prepared_data = self._prepare_data(data)
-
-            # 创建字节流
-            bytes_writer = io.BytesIO()
-            encoder = avro.io.BinaryEncoder(bytes_writer)
-
-            # 创建DatumWriter并写入数据
-            writer = avro.io.DatumWriter(self.schema)
-            writer.write(prepared_data, encoder)
-
-            # 获取序列化后的字节数据
-            serialized_data = bytes_writer.getvalue()
-            bytes_writer.close()
-
-            self.logger.debug(f"Avro序列化成功，数据大小: {len(serialized_data)} bytes")
-            return serialized_data
-
-        except Exception as e:
-            self.logger.error(f"Avro序列化失败: {e}")
-            raise
-
-    def deserialize(self, data: bytes) -> Dict[str, Any]:
-        """反序列化Avro数据
-
-        Args:
-            data: 序列化的字节数据
-
-        Returns:
-            反序列化后的数据
-        """
-        if not AVRO_AVAILABLE:
-            raise RuntimeError("Avro库未安装")
-
-        try:
-            # 创建字节流
-            bytes_reader = io.BytesIO(data)
-            decoder = avro.io.BinaryDecoder(bytes_reader)
-
-            # 创建DatumReader并读取数据
-            reader = avro.io.DatumReader(self.schema)
-            deserialized_data = reader.read(decoder)
-
-            bytes_reader.close()
-
-            self.logger.debug("Avro反序列化成功")
-            return deserialized_data
-
-        except Exception as e:
-            self.logger.error(f"Avro反序列化失败: {e}")
-            raise
+        super().__init__(config, logger, self.schema_dict)
 
 
 class SerializationManager:
@@ -292,6 +273,12 @@ class SerializationManager:
 
         self.logger.info("序列化管理器初始化完成")
 
+    def _get_serializer(self, format_type: str) -> _CompiledSerializer:
+        serializer = self.serializers.get(format_type)
+        if serializer is None:
+            raise ValueError(f"不支持的序列化格式: {format_type}")
+        return serializer
+
     def serialize(self, data: Dict[str, Any], format_type: str) -> bytes:
         """序列化数据
 
@@ -302,11 +289,19 @@ class SerializationManager:
         Returns:
             序列化后的字节数据
         """
-        if format_type not in self.serializers:
-            raise ValueError(f"不支持的序列化格式: {format_type}")
+        return self._get_serializer(format_type).serialize(data)
 
-        serializer = self.serializers[format_type]
-        return serializer.serialize(data)
+    def serialize_batch(self, items: List[Dict[str, Any]], format_type: str) -> bytes:
+        """批量序列化为单个帧
+
+        Args:
+            items: 数据列表
+            format_type: 序列化格式 (protobuf, avro)
+
+        Returns:
+            批量帧字节数据
+        """
+        return self._get_serializer(format_type).serialize_batch(items)
 
     def deserialize(self, data: bytes, format_type: str) -> Dict[str, Any]:
         """反序列化数据
@@ -318,28 +313,31 @@ class SerializationManager:
         Returns:
             反序列化后的数据
         """
-        if format_type not in self.serializers:
-            raise ValueError(f"不支持的序列化格式: {format_type}")
+        return self._get_serializer(format_type).deserialize(data)
 
-        serializer = self.serializers[format_type]
-        return serializer.deserialize(data)
+    def deserialize_batch(self, data: bytes, format_type: str) -> List[Dict[str, Any]]:
+        """反序列化批量帧
 
-    def get_supported_formats(self) -> List[str]:
-        """获取支持的序列化格式"""
-        supported = []
+        Args:
+            data: 批量帧字节数据
+            format_type: 序列化格式 (protobuf, avro)
 
-        if PROTOBUF_AVAILABLE:
-            supported.append("protobuf")
-        if AVRO_AVAILABLE:
-            supported.append("avro")
+        Returns:
+            数据列表
+        """
+        return self._get_serializer(format_type).deserialize_batch(data)
 
-        return supported
+    def get_supported_formats(self) -> List[str]:
+        """获取支持的序列化格式"""
+        return list(self.serializers)
 
     def is_format_available(self, format_type: str) -> bool:
         """检查序列化格式是否可用"""
-        if format_type == "protobuf":
-            return PROTOBUF_AVAILABLE
-        elif format_type == "avro":
-            return AVRO_AVAILABLE
-        else:
-            return False
+        return format_type in self.serializers
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取各格式的编码统计"""
+        return {
+            format_type: serializer.get_stats()
+            for format_type, serializer in self.serializers.items()
+        }
@@ -7,5 +7,6 @@ ZeroMQ通信客户端模块
 from .publisher import ZMQPublisher, NewsMessage
 from .subscriber import ZMQSubscriber
 from .message_handler import MessageHandler
+from .spool import MessageSpool
 
-__all__ = ["ZMQPublisher", "ZMQSubscriber", "MessageHandler", "NewsMessage"]
+__all__ = ["ZMQPublisher", "ZMQSubscriber", "MessageHandler", "NewsMessage", "MessageSpool"]
@@ -9,7 +9,8 @@ import os
 import json
 import time
 import threading
-from typing import Dict, Any, Optional, List
+from collections import deque
+from typing import Deque, Dict, Any, Optional, List, Tuple
 from datetime import datetime
 from dataclasses import dataclass, asdict
 
@@ -25,6 +26,7 @@ from zmq import Context, Socket
 
 from ..config import ConfigManager
 from ..utils import Logger
+from .spool import MessageSpool
 
 
 @dataclass
@@ -61,9 +63,16 @@ class ZMQPublisher:
 
     核心功能：
     1. 发布crawler.news主题消息
-    2. 高性能异步通信
-    3. 消息持久化和重试
+    2. 高性能异步通信：生产者只做编码和入队（无锁deque），后台发送线程批量发送
+    3. 消息持久化和重试：队列超过水位或连接不可用时溢出到磁盘暂存，重连后回放
     4. 连接管理和监控
+
+    背压与顺序：
+    - 套接字为XPUB + XPUB_NODROP，订阅端达到高水位时非阻塞发送返回EAGAIN而不是静默丢弃，
+      未发出的消息留在队列，队列满后由生产者溢出到磁盘暂存
+    - 发送线程读取订阅/退订消息跟踪订阅者，没有订阅者时不发送（XPUB无订阅者时会丢弃消息）
+    - 暂存有积压时新消息同样写入暂存，发送线程先发完队列再按序回放暂存，运行期间保持发布顺序；
+      断开连接时队列剩余消息追加在暂存末尾，重启回放时排在断开前已溢出的消息之后
     """
 
     def __init__(self, config: ConfigManager, logger: Logger = None):
@@ -101,12 +110,34 @@ class ZMQPublisher:
             "last_message_time": None,
         }
 
-        # 线程锁
+        # 线程锁（仅保护连接与断开）
         self._lock = threading.Lock()
 
-        # 消息队列（用于重试）
-        self._message_queue: List[Dict[str, Any]] = []
-        self._max_queue_size = 10000
+        # 发送队列配置（配置缺失或格式异常时使用默认值）
+        publisher_config = self.zmq_config.get("publisher", {})
+        if not isinstance(publisher_config, dict):
+            publisher_config = {}
+        self.batch_size = publisher_config.get("batch_size", 500)
+        self.queue_size = publisher_config.get("queue_size", 10000)
+        self.retry_interval = publisher_config.get("retry_interval", 0.1)
+        self.flush_interval = publisher_config.get("flush_interval", 0.05)
+
+        # 生产者队列：deque的append/popleft在多线程下原子，生产者无需加锁
+        self._message_queue: Deque[Tuple[bytes, bytes]] = deque()
+        self._wakeup = threading.Event()
+        self._sender_idle = False
+        self._sender_thread: Optional[threading.Thread] = None
+        # 当前订阅前缀（仅发送线程读写）
+        self._subscriptions: set = set()
+
+        # 磁盘暂存（未配置 spool_path 时关闭，溢出消息计为失败）
+        spool_path = publisher_config.get("spool_path")
+        self.spool: Optional[MessageSpool] = (
+            MessageSpool(spool_path, publisher_config.get("spool_fsync", False))
+            if spool_path
+            else None
+        )
+        self.stats.update({"messages_queued": 0, "messages_spooled": 0, "batches_sent": 0})
 
         self.logger.info(f"ZeroMQ发布者初始化: {self.host}:{self.port}")
 
@@ -122,13 +153,23 @@ class ZMQPublisher:
                     self.logger.warning("ZeroMQ发布者已连接")
                     return True
 
+                # 发送失败断开后重连：先释放旧套接字
+                if self.socket:
+                    self.socket.close(linger=0)
+                    self.socket = None
+                if self.context:
+                    self.context.term()
+                    self.context = None
+
                 # 创建ZeroMQ上下文
                 self.context = zmq.Context()
 
-                # 创建发布者套接字
-                self.socket = self.context.socket(zmq.PUB)
+                # 创建发布者套接字（XPUB：可读取订阅消息；NODROP：高水位时返回EAGAIN而不丢弃）
+                self.socket = self.context.socket(zmq.XPUB)
+                self._subscriptions = set()
 
                 # 设置套接字选项
+                self.socket.setsockopt(zmq.XPUB_NODROP, 1)
                 self.socket.setsockopt(zmq.SNDHWM, self.high_water_mark)
                 self.socket.setsockopt(zmq.SNDTIMEO, self.timeout)
                 self.socket.setsockopt(zmq.LINGER, 1000)
@@ -140,6 +181,12 @@ class ZMQPublisher:
                 self._connected = True
                 self._running = True
 
+                # 启动发送线程（同时回放上次遗留的磁盘暂存）
+                self._sender_thread = threading.Thread(
+                    target=self._sender_loop, name="zmq-publisher-sender", daemon=True
+                )
+                self._sender_thread.start()
+
                 self.logger.info(f"✓ ZeroMQ发布者连接成功: {bind_address}")
                 return True
 
@@ -154,6 +201,14 @@ class ZMQPublisher:
             with self._lock:
                 self._running = False
 
+                # 等待发送线程发完队列，未能发出的消息转入磁盘暂存
+                sender = self._sender_thread
+                if sender is not None and sender.is_alive():
+                    self._wakeup.set()
+                    sender.join(timeout=self.timeout / 1000)
+                self._sender_thread = None
+                self._spill_queue()
+
                 if self.socket:
                     self.socket.close()
                     self.socket = None
@@ -164,28 +219,25 @@ class ZMQPublisher:
 
                 self._connected = False
 
+                if self.spool is not None:
+                    self.spool.close()
+
                 self.logger.info("✓ ZeroMQ发布者连接已断开")
 
         except Exception as e:
             self.logger.error(f"ZeroMQ发布者断开连接失败: {e}")
 
     def publish_message(self, message: NewsMessage, retry: bool = True) -> bool:
-        """发布新闻消息
+        """发布新闻消息（编码后入队，由发送线程批量发送）
 
         Args:
             message: 新闻消息
-            retry: 是否重试
+            retry: 队列满或未连接时是否转入磁盘暂存
 
         Returns:
-            发布是否成功
+            消息是否已受理（进入发送队列或磁盘暂存）
         """
-        if not self._connected:
-            if not self.connect():
-                return False
-
         try:
-            # 构建消息
-            topic_bytes = self.topic.encode("utf-8")
             message_data = message.to_dict()
 
             # 添加发布时间戳
@@ -194,44 +246,184 @@ class ZMQPublisher:
 
             message_bytes = json.dumps(message_data, ensure_ascii=False).encode("utf-8")
 
-            # 发送消息
-            with self._lock:
-                if not self.socket:
-                    raise RuntimeError("ZeroMQ套接字未初始化")
+        except Exception as e:
+            self.stats["messages_failed"] += 1
+            self.logger.error(f"消息编码失败: {message.id} | 错误: {e}")
+            return False
 
-                self.socket.send_multipart([topic_bytes, message_bytes], zmq.NOBLOCK)
+        return self._enqueue(self.topic.encode("utf-8"), message_bytes, retry)
 
-            # 更新统计
-            self.stats["messages_sent"] += 1
-            self.stats["bytes_sent"] += len(message_bytes)
-            self.stats["last_message_time"] = datetime.utcnow().isoformat()
+    def _enqueue(self, topic_bytes: bytes, payload_bytes: bytes, retry: bool = True) -> bool:
+        """消息帧入队；超过水位或连接不可用时溢出到磁盘暂存
 
-            self.logger.debug(
-                f"消息发布成功: {message.id} | 主题: {self.topic} | "
-                f"大小: {len(message_bytes)} bytes"
-            )
+        Returns:
+            消息是否已受理
+        """
+        if not self._connected and not self.connect():
+            return self._spill([(topic_bytes, payload_bytes)], retry)
+
+        # 队列已满，或暂存仍有积压（保证新消息排在已溢出消息之后）时写入暂存
+        if len(self._message_queue) >= self.queue_size or (
+            retry and self.spool is not None and len(self.spool)
+        ):
+            return self._spill([(topic_bytes, payload_bytes)], retry)
+
+        self._message_queue.append((topic_bytes, payload_bytes))
+        self.stats["messages_queued"] += 1
+        if self._sender_idle:
+            self._wakeup.set()
+        return True
+
+    def _spill(self, frames: List[Tuple[bytes, bytes]], retry: bool = True) -> bool:
+        """消息帧写入磁盘暂存
+
+        Returns:
+            是否写入成功
+        """
+        if retry and self.spool is not None:
+            try:
+                self.spool.append(frames)
+                self.stats["messages_spooled"] += len(frames)
+                return True
+            except OSError as e:
+                self.logger.error(f"消息写入磁盘暂存失败: {e}")
+
+        self.stats["messages_failed"] += len(frames)
+        self.logger.error(f"消息发布失败（发送队列已满）: {len(frames)} 条")
+        return False
+
+    def _spill_queue(self) -> None:
+        """将发送队列中的剩余消息转入磁盘暂存"""
+        frames = []
+        while self._message_queue:
+            frames.append(self._message_queue.popleft())
+        if frames:
+            self._spill(frames)
 
-            return True
+    def _poll_subscriptions(self, timeout: int = 0) -> bool:
+        """读取XPUB收到的订阅/退订消息（仅在发送线程调用）
 
+        Args:
+            timeout: 等待订阅消息的毫秒数
+
+        Returns:
+            当前是否有订阅者
+        """
+        socket = self.socket
+        try:
+            while socket.poll(timeout, zmq.POLLIN):
+                frame = socket.recv(zmq.NOBLOCK)
+                if frame[:1] == b"\x01":
+                    self._subscriptions.add(frame[1:])
+                elif frame[:1] == b"\x00":
+                    self._subscriptions.discard(frame[1:])
+                timeout = 0
         except zmq.Again:
-            # 发送缓冲区满，加入重试队列
-            if retry and len(self._message_queue) < self._max_queue_size:
-                self._message_queue.append(message.to_dict())
-                self.logger.warning(f"消息加入重试队列: {message.id}")
-            else:
-                self.stats["messages_failed"] += 1
-                self.logger.error(f"消息发布失败（缓冲区满）: {message.id}")
-            return False
+            pass
+        except Exception as e:
+            self.stats["connection_errors"] += 1
+            self.logger.error(f"读取订阅消息失败: {e}")
+            self._connected = False
+        return bool(self._subscriptions)
 
+    def _send_frames(self, frames: List[Tuple[bytes, bytes]]) -> int:
+        """在发送线程中逐帧非阻塞发送
+
+        Returns:
+            成功发送的帧数（遇到高水位背压或套接字错误时提前返回）
+        """
+        socket = self.socket
+        sent = 0
+        sent_bytes = 0
+        try:
+            for topic_bytes, payload_bytes in frames:
+                socket.send_multipart([topic_bytes, payload_bytes], zmq.NOBLOCK)
+                sent += 1
+                sent_bytes += len(payload_bytes)
+        except zmq.Again:
+            pass
         except Exception as e:
-            self.stats["messages_failed"] += 1
-            self.logger.error(f"消息发布失败: {message.id} | 错误: {e}")
+            self.stats["connection_errors"] += 1
+            self.logger.error(f"消息发送失败: {e}")
+            self._connected = False
 
-            # 连接可能断开，尝试重连
-            if "Connection refused" in str(e) or "Socket operation" in str(e):
-                self._connected = False
+        if sent:
+            self.stats["messages_sent"] += sent
+            self.stats["bytes_sent"] += sent_bytes
+            self.stats["batches_sent"] += 1
+            self.stats["last_message_time"] = datetime.utcnow().isoformat()
+        return sent
 
-            return False
+    def _replay_spool(self) -> int:
+        """回放一批磁盘暂存消息并提交偏移量
+
+        Returns:
+            成功回放的消息数量
+        """
+        records = self.spool.read(self.batch_size) if self.spool is not None else []
+        if not records:
+            return 0
+        sent = self._send_frames([(topic, payload) for _, topic, payload in records])
+        if sent:
+            self.spool.commit(records[sent - 1][0], sent)
+        return sent
+
+    def _sender_loop(self) -> None:
+        """发送线程：批量取出队列消息发送，队列空闲时回放磁盘暂存"""
+        queue = self._message_queue
+        while True:
+            if not self._poll_subscriptions():
+                # 没有订阅者：消息留在队列与暂存中，等待订阅建立
+                if not self._running or not self._connected:
+                    break
+                self._poll_subscriptions(int(self.retry_interval * 1000))
+                continue
+
+            batch = []
+            while queue and len(batch) < self.batch_size:
+                batch.append(queue.popleft())
+
+            if batch:
+                sent = self._send_frames(batch)
+                if sent < len(batch):
+                    # 高水位背压：未发出的消息放回队首，暂停后重试（期间溢出由生产者写入暂存）
+                    queue.extendleft(reversed(batch[sent:]))
+                    if not self._running or not self._connected:
+                        break
+                    time.sleep(self.retry_interval)
+                continue
+
+            if not self._running or not self._connected:
+                break
+
+            if self.spool is not None and len(self.spool):
+                if self._replay_spool() == 0:
+                    time.sleep(self.retry_interval)
+                continue
+
+            self._sender_idle = True
+            if not queue:
+                self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._sender_idle = False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """等待发送队列与磁盘暂存发完（发送线程回到空闲）
+
+        Args:
+            timeout: 最长等待秒数
+
+        Returns:
+            是否已全部发出
+        """
+        deadline = time.monotonic() + timeout
+        while self._message_queue or not self._sender_idle:
+            if self._sender_thread is None or not self._sender_thread.is_alive():
+                return False
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
 
     def publish_raw_data(self, data: Dict[str, Any]) -> bool:
         """发布原始数据
@@ -277,11 +469,8 @@ class ZMQPublisher:
             data: 可为dict/list/str/bytes或拥有to_dict/to_json方法的对象
 
         Returns:
-            发布是否成功
+            消息是否已受理（进入发送队列或磁盘暂存）
         """
-        if not self._connected:
-            if not self.connect():
-                return False
         try:
             effective_topic = self.topic
             if topic and topic != self.topic:
@@ -306,57 +495,30 @@ class ZMQPublisher:
                         ensure_ascii=False,
                     ).encode("utf-8")
 
-            topic_bytes = effective_topic.encode("utf-8")
-            with self._lock:
-                if not self.socket:
-                    raise RuntimeError("ZeroMQ套接字未初始化")
-                self.socket.send_multipart([topic_bytes, payload_bytes], zmq.NOBLOCK)
-
-            self.stats["messages_sent"] += 1
-            self.stats["bytes_sent"] += len(payload_bytes)
-            self.stats["last_message_time"] = datetime.utcnow().isoformat()
-            return True
-
-        except zmq.Again:
-            self.stats["messages_failed"] += 1
-            self.logger.warning("消息发布失败：发送缓冲区满")
-            return False
         except Exception as e:
             self.stats["messages_failed"] += 1
             self.logger.error(f"消息发布失败: {e}")
-            if "Connection" in str(e) or "Socket operation" in str(e):
-                self._connected = False
             return False
 
+        return self._enqueue(effective_topic.encode("utf-8"), payload_bytes)
+
     def process_retry_queue(self) -> int:
-        """处理重试队列
+        """处理磁盘暂存中的积压消息
+
+        发送线程运行时由其负责回放，此处只唤醒；否则在当前线程同步回放一批。
 
         Returns:
-            成功重试的消息数量
+            本次同步回放的消息数量
         """
-        if not self._message_queue:
+        if self._sender_thread is not None and self._sender_thread.is_alive():
+            self._wakeup.set()
+            return 0
+        if not self._connected or not self.socket:
             return 0
 
-        success_count = 0
-        failed_messages = []
-
-        for message_data in self._message_queue:
-            try:
-                message = NewsMessage.from_dict(message_data)
-                if self.publish_message(message, retry=False):
-                    success_count += 1
-                else:
-                    failed_messages.append(message_data)
-            except Exception as e:
-                self.logger.error(f"重试消息失败: {e}")
-                failed_messages.append(message_data)
-
-        # 更新重试队列
-        self._message_queue = failed_messages
-
+        success_count = self._replay_spool()
         if success_count > 0:
-            self.logger.info(f"重试队列处理完成: 成功 {success_count}, 失败 {len(failed_messages)}")
-
+            self.logger.info(f"磁盘暂存回放: 成功 {success_count}, 剩余 {len(self.spool)}")
         return success_count
 
     def get_stats(self) -> Dict[str, Any]:
@@ -371,6 +533,8 @@ class ZMQPublisher:
                 "connected": self._connected,
                 "running": self._running,
                 "queue_size": len(self._message_queue),
+                "subscriptions": len(self._subscriptions),
+                "spool": self.spool.get_stats() if self.spool is not None else None,
                 "host": self.host,
                 "port": self.port,
                 "topic": self.topic,
@@ -394,6 +558,7 @@ class ZMQPublisher:
             "messages_failed": self.stats["messages_failed"],
             "connection_errors": self.stats["connection_errors"],
             "queue_size": len(self._message_queue),
+            "spool_backlog": len(self.spool) if self.spool is not None else 0,
             "last_message_time": self.stats["last_message_time"],
         }
 
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+NeuroTrade Nexus - ZeroMQ消息磁盘暂存
+发送队列溢出或连接断开时，[topic, payload] 帧追加写入磁盘，重连后按偏移量顺序回放
+
+- 记录格式：8字节头（topic长度、payload长度，大端）+ topic + payload，只追加不改写
+- 已回放偏移量单独记录在 .offset 文件（临时文件原子替换），进程崩溃后从该偏移继续
+- 全部回放完成后截断文件，暂存文件大小只与积压量相关
+"""
+
+import os
+import struct
+import threading
+from typing import Any, Dict, List, Tuple
+
+_HEADER = struct.Struct(">II")
+
+
+class MessageSpool:
+    """追加写消息暂存
+
+    Args:
+        path: 暂存文件路径（偏移量记录在 path + ".offset"）
+        fsync: 每次写入后是否fsync（默认只flush到操作系统缓冲）
+    """
+
+    def __init__(self, path: str, fsync: bool = False):
+        self.path = path
+        self.offset_path = f"{path}.offset"
+        self.fsync = fsync
+
+        # 生产者线程（溢出写入）与发送线程（回放）并发访问
+        self._lock = threading.Lock()
+        self._writer = None
+        self._read_offset = 0
+        self._end_offset = 0
+        self._pending = 0
+
+        self.stats = {"appended": 0, "replayed": 0, "compactions": 0}
+
+        if os.path.exists(path):
+            self._recover()
+
+    def __len__(self) -> int:
+        return self._pending
+
+    @property
+    def backlog_bytes(self) -> int:
+        return self._end_offset - self._read_offset
+
+    def _recover(self) -> None:
+        """启动时恢复偏移量并统计积压记录；截断崩溃时写了一半的尾部记录"""
+        try:
+            with open(self.offset_path, "r", encoding="utf-8") as f:
+                self._read_offset = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            self._read_offset = 0
+
+        size = os.path.getsize(self.path)
+        offset = self._read_offset if self._read_offset <= size else 0
+        self._read_offset = offset
+        pending = 0
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            while True:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    break
+                topic_len, payload_len = _HEADER.unpack(header)
+                if offset + _HEADER.size + topic_len + payload_len > size:
+                    break
+                f.seek(topic_len + payload_len, os.SEEK_CUR)
+                offset += _HEADER.size + topic_len + payload_len
+                pending += 1
+
+        if offset < size:
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+        self._end_offset = offset
+        self._pending = pending
+
+    def append(self, frames: List[Tuple[bytes, bytes]]) -> int:
+        """追加写入消息帧
+
+        Args:
+            frames: [(topic, payload), ...]
+
+        Returns:
+            写入后的文件末尾偏移量
+        """
+        if not frames:
+            return self._end_offset
+        buffer = bytearray()
+        for topic, payload in frames:
+            buffer += _HEADER.pack(len(topic), len(payload))
+            buffer += topic
+            buffer += payload
+
+        with self._lock:
+            if self._writer is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._writer = open(self.path, "ab")
+            self._writer.write(buffer)
+            self._writer.flush()
+            if self.fsync:
+                os.fsync(self._writer.fileno())
+            self._end_offset += len(buffer)
+            self._pending += len(frames)
+            self.stats["appended"] += len(frames)
+            return self._end_offset
+
+    def read(self, max_records: int) -> List[Tuple[int, bytes, bytes]]:
+        """从已回放偏移量起读取记录（不移动偏移量）
+
+        Returns:
+            [(记录结束偏移量, topic, payload), ...]
+        """
+        with self._lock:
+            if not self._pending:
+                return []
+            records = []
+            offset = self._read_offset
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                while len(records) < max_records and offset < self._end_offset:
+                    topic_len, payload_len = _HEADER.unpack(f.read(_HEADER.size))
+                    topic = f.read(topic_len)
+                    payload = f.read(payload_len)
+                    offset += _HEADER.size + topic_len + payload_len
+                    records.append((offset, topic, payload))
+            return records
+
+    def commit(self, offset: int, count: int) -> None:
+        """确认回放到offset（共count条）；积压清空时截断文件"""
+        with self._lock:
+            self._read_offset = offset
+            self._pending = max(self._pending - count, 0)
+            self.stats["replayed"] += count
+
+            if self._read_offset >= self._end_offset:
+                if self._writer is not None:
+                    self._writer.close()
+                    self._writer = None
+                with open(self.path, "wb"):
+                    pass
+                if os.path.exists(self.offset_path):
+                    os.remove(self.offset_path)
+                self._read_offset = self._end_offset = self._pending = 0
+                self.stats["compactions"] += 1
+                return
+
+            temp_path = f"{self.offset_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(str(offset))
+            os.replace(temp_path, self.offset_path)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "pending": self._pending,
+            "backlog_bytes": self.backlog_bytes,
+            "path": self.path,
+        }
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+爬取前沿单元测试
+
+测试用例:
+- UNIT-FRONTIER-01: 不同域名并发出队，同一域名按礼貌间隔出队
+- UNIT-FRONTIER-02: 前沿耗尽与关闭
+- UNIT-FRONTIER-03: 事件循环内启动爬取，页面解析与数据发布不占用事件循环线程
+"""
+
+import unittest
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+
+from app.crawlers.frontier import CrawlFrontier
+from app.crawlers.scrapy_crawler import ScrapyCrawler
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    """首页链接到一篇文章页"""
+
+    pages = {
+        "/": b'<html><body><a href="/news/first">First</a></body></html>',
+        "/news/first": (
+            b"<html><body><article><h1>Bitcoin hits new high</h1>"
+            b"<p>Bitcoin rallied strongly today as institutional demand kept growing.</p>"
+            b"</article></body></html>"
+        ),
+    }
+
+    def do_GET(self):
+        body = self.pages.get(self.path, b"")
+        self.send_response(200 if body else 404)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestCrawlFrontier(unittest.TestCase):
+    """爬取前沿测试类"""
+
+    def test_unit_frontier_01_politeness_per_domain(self):
+        """UNIT-FRONTIER-01: 不同域名立即出队；同一域名在release后按间隔再次出队"""
+
+        async def scenario():
+            frontier = CrawlFrontier()
+            for url in (
+                "https://a.com/1",
+                "https://a.com/2",
+                "https://b.com/1",
+                "https://c.com/1",
+            ):
+                frontier.push(url)
+            self.assertFalse(frontier.push("https://a.com/1"), "已在队列中的URL不重复入队")
+
+            first = [await frontier.get() for _ in range(3)]
+            self.assertEqual({domain for domain, _ in first}, {"a.com", "b.com", "c.com"})
+
+            # a.com 在途期间其第二个URL不会出队
+            pending = asyncio.ensure_future(frontier.get())
+            await asyncio.sleep(0.05)
+            self.assertFalse(pending.done())
+
+            released_at = time.monotonic()
+            frontier.release("a.com", 0.1)
+            frontier.release("b.com", 0.1)
+            frontier.release("c.com", 0.1)
+            domain, url = await pending
+            self.assertEqual((domain, url), ("a.com", "https://a.com/2"))
+            self.assertGreaterEqual(time.monotonic() - released_at, 0.09)
+            return frontier
+
+        frontier = asyncio.run(scenario())
+        stats = frontier.get_stats()
+        self.assertEqual(stats["dispatched"], 4)
+        self.assertEqual(stats["queued_urls"], 0)
+        self.assertEqual(stats["in_flight_domains"], 1)
+
+    def test_unit_frontier_02_drain_and_close(self):
+        """UNIT-FRONTIER-02: 队列为空且无在途请求时get返回None；关闭后等待者被唤醒"""
+
+        async def scenario():
+            frontier = CrawlFrontier()
+            frontier.push("https://a.com/1")
+            domain, _ = await frontier.get()
+
+            # 在途请求发现新链接后release，等待者取到新URL
+            waiter = asyncio.ensure_future(frontier.get())
+            await asyncio.sleep(0)
+            frontier.push("https://a.com/2")
+            frontier.release(domain, 0)
+            self.assertEqual(await waiter, ("a.com", "https://a.com/2"))
+
+            frontier.release("a.com", 0)
+            self.assertIsNone(await frontier.get())
+
+            frontier.push("https://b.com/1")
+            await frontier.get()
+            waiter = asyncio.ensure_future(frontier.get())
+            await asyncio.sleep(0)
+            frontier.close()
+            self.assertIsNone(await waiter)
+
+        asyncio.run(scenario())
+
+    def test_unit_frontier_03_parse_and_publish_off_loop(self):
+        """UNIT-FRONTIER-03: 在运行中的事件循环内start_crawling返回任务；解析与发布在工作线程执行"""
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _SiteHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        config_data = {
+            "scrapy": {
+                "target_sites": [base_url + "/"],
+                "anti_spider": {"min_delay": 0, "max_delay": 0, "user_agents": ["Test/1.0"]},
+            }
+        }
+
+        def mock_get_config(key, default=None):
+            value = config_data
+            try:
+                for k in key.split("."):
+                    value = value[k]
+                return value
+            except (KeyError, TypeError):
+                return default
+
+        config = Mock()
+        config.get_config = mock_get_config
+        crawler = ScrapyCrawler(config, Mock(), Mock())
+
+        threads = {"parse": set(), "publish": set()}
+        parse_page = crawler._parse_page
+        publish_data = crawler._publish_data
+
+        def record_parse(response):
+            threads["parse"].add(threading.get_ident())
+            return parse_page(response)
+
+        def record_publish(data, url):
+            threads["publish"].add(threading.get_ident())
+            return publish_data(data, url)
+
+        crawler._parse_page = record_parse
+        crawler._publish_data = record_publish
+
+        async def scenario():
+            task = crawler.start_crawling()
+            self.assertIsInstance(task, asyncio.Task)
+            await asyncio.wait_for(task, timeout=10)
+            return threading.get_ident()
+
+        try:
+            loop_thread = asyncio.run(scenario())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(len(crawler.visited_urls), 2, "首页发现的文章链接应被跟踪")
+        self.assertTrue(threads["parse"])
+        self.assertNotIn(loop_thread, threads["parse"])
+        self.assertTrue(threads["publish"])
+        self.assertNotIn(loop_thread, threads["publish"])
+
+
+if __name__ == "__main__":
+    unittest.main()
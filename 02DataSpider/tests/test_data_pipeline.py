@@ -10,12 +10,13 @@
 import unittest
 from unittest.mock import Mock, patch
 import json
+from dataclasses import replace
 from datetime import datetime
 
 from app.processors.pipeline import DataPipeline, ProcessingConfig, ProcessingMode
 from app.processors.data_cleaner import DataCleaner
 from app.processors.data_formatter import DataFormatter
-from app.processors.data_validator import DataValidator
+from app.processors.data_validator import DataValidator, ValidationLevel
 
 
 class TestDataPipeline(unittest.TestCase):
@@ -287,6 +288,206 @@ class TestDataPipeline(unittest.TestCase):
         # 验证处理时间（并行应该更快）
         self.assertGreater(batch_result.processing_time, 0)
 
+    def test_batch_processing_process_pool(self):
+        """测试多进程批量处理：结果按原始顺序返回，跨块近似重复在主进程检测"""
+        test_batch = [
+            {
+                "title": f"News {i}",
+                "content": f"This is a valid content for news article number {i}.",
+                "url": f"https://example.com/{i}",
+                "timestamp": "2024-01-15T10:30:00Z",
+                "source": "example.com",
+            }
+            for i in range(6)
+        ]
+        # 与第0条内容相同的转载副本，落在不同的块中
+        test_batch.append(dict(test_batch[0], url="https://example.com/repost"))
+
+        config = ProcessingConfig(
+            processing_mode=ProcessingMode.PROCESS, max_workers=2, chunk_size=2
+        )
+        try:
+            batch_result = self.pipeline.process_batch(test_batch, config)
+            # 进程池常驻，第二批复用
+            second = self.pipeline.process_batch(test_batch[:2], config)
+            pool = self.pipeline._process_pool
+            self.assertIsNotNone(pool)
+        finally:
+            self.pipeline.close()
+
+        self.assertEqual(batch_result.total_items, 7)
+        self.assertEqual(batch_result.successful_items, 7)
+        self.assertEqual(
+            [r.data["title"] for r in batch_result.results],
+            [item["title"] for item in test_batch],
+        )
+        self.assertEqual(batch_result.metadata["duplicate_items"], 1)
+        self.assertEqual(
+            batch_result.results[6].metadata["duplicate_of"], "https://example.com/0"
+        )
+        self.assertEqual(second.successful_items, 2)
+        self.assertIsNone(self.pipeline._process_pool)
+
+        stats = self.pipeline.get_stats()
+        self.assertEqual(stats["items_processed"], 9)
+        self.assertEqual(stats["stage_stats"]["cleaning"]["success"], 9)
+
+    def test_process_pool_matches_sequential(self):
+        """测试多进程批量处理与顺序处理阶段语义一致：清洗失败不去重，验证失败不入去重索引"""
+        base = {
+            "title": "Markets rally",
+            "content": "Markets rallied today as investors weighed new data. " * 5,
+            "timestamp": "2024-01-15T10:30:00Z",
+            "source": "example.com",
+        }
+        test_batch = [
+            dict(base, title=123, url="https://example.com/bad-clean"),
+            dict(base, title="", url="https://example.com/invalid"),
+            dict(base, url="https://example.com/first"),
+            dict(base, url="https://example.com/copy"),
+        ]
+        config = ProcessingConfig(skip_validation_on_clean_fail=True, max_workers=2, chunk_size=1)
+
+        sequential = self.pipeline.process_batch(
+            test_batch, replace(config, processing_mode=ProcessingMode.SEQUENTIAL)
+        )
+        pipeline = DataPipeline(self.mock_config, self.mock_logger)
+        try:
+            process = pipeline.process_batch(
+                test_batch, replace(config, processing_mode=ProcessingMode.PROCESS)
+            )
+        finally:
+            pipeline.close()
+
+        for expected, actual in zip(sequential.results, process.results):
+            self.assertEqual(actual.success, expected.success)
+            self.assertEqual(actual.stages_completed, expected.stages_completed)
+            self.assertEqual(set(actual.stage_results), set(expected.stage_results))
+            self.assertEqual(actual.metadata.get("duplicate_of"), expected.metadata.get("duplicate_of"))
+
+        self.assertNotIn("deduplication", process.results[0].stage_results)
+        self.assertNotIn("duplicate_of", process.results[2].metadata)
+        self.assertEqual(process.results[3].metadata["duplicate_of"], "https://example.com/first")
+
+        def counts(stats):
+            return {
+                stage: (values["success"], values["failed"])
+                for stage, values in stats["stage_stats"].items()
+            }
+
+        self.assertEqual(counts(pipeline.get_stats()), counts(self.pipeline.get_stats()))
+        for key in ("items_processed", "items_successful", "items_failed", "items_duplicate"):
+            self.assertEqual(pipeline.get_stats()[key], self.pipeline.get_stats()[key])
+
+    def test_stage_batch_entry_points(self):
+        """测试各阶段的批量入口与逐条处理结果一致，进程池工作函数经批量入口执行"""
+        base = {
+            "title": "Markets rally",
+            "content": "Markets rallied today as investors weighed new data. " * 5,
+            "timestamp": "2024-01-15T10:30:00Z",
+            "source": "example.com",
+        }
+        test_batch = [
+            dict(base, url="https://example.com/a"),
+            dict(base, title="", url="https://example.com/invalid"),
+            dict(base, title="<b>Bold</b>  title", url="https://example.com/b"),
+        ]
+        pipeline = self.pipeline
+
+        cleaned = pipeline.cleaner.clean_batch(test_batch)
+        self.assertEqual(
+            [result.cleaned_data for result in cleaned],
+            [pipeline.cleaner.clean_data(data).cleaned_data for data in test_batch],
+        )
+
+        cleaned_data = [result.cleaned_data for result in cleaned]
+        validated = pipeline.validator.validate_batch(cleaned_data, ValidationLevel.STANDARD)
+        self.assertEqual([result.is_valid for result in validated], [True, False, True])
+
+        formatted = pipeline.formatter.format_batch(cleaned_data)
+        self.assertEqual(
+            [sorted(result.formatted_data) for result in formatted],
+            [sorted(pipeline.formatter.format_data(data).formatted_data) for data in cleaned_data],
+        )
+
+        config = ProcessingConfig(skip_formatting_on_validation_fail=True)
+        staged = pipeline._execute_validation_and_formatting_batch(
+            [(data, {}) for data in cleaned_data], config
+        )
+        expected = [
+            pipeline._execute_validation_and_formatting(data, config, {}) for data in cleaned_data
+        ]
+        self.assertEqual(
+            [(v.is_valid, f is None) for v, f in staged],
+            [(v.is_valid, f is None) for v, f in expected],
+        )
+        self.assertIsNone(staged[1][1])
+
+        with patch.object(pipeline.cleaner, "clean_batch", wraps=pipeline.cleaner.clean_batch) as batch:
+            pipeline._execute_cleaning_batch(test_batch, ProcessingConfig(fused_stages=False))
+        batch.assert_called_once()
+        fused = pipeline._execute_cleaning_batch(test_batch, ProcessingConfig(fused_stages=True))
+        self.assertEqual(
+            [result.cleaned_data for result, _ in fused],
+            [pipeline.fused_plan.clean(data)[0].cleaned_data for data in test_batch],
+        )
+
+    def test_fused_stages_match_staged_execution(self):
+        """测试融合执行：输出数据与各阶段问题报告与分阶段执行一致"""
+        test_batch = [
+            {
+                "title": "  <b>Bitcoin</b>   “Rally”  ",
+                "content": "Bitcoin  rallied\x01 today... Analysts  were surprised!!\n"
+                "The market   reacted quickly.  <i>Volume</i> rose.",
+                "url": "https://example.com/rally",
+                "timestamp": "2024-01-15T10:30:00Z",
+                "source": "example.com",
+                "keywords": ["bitcoin", "ethereum", "solana"],
+                "tracking": "javascript:alert(1)",
+            },
+            {
+                "title": "AAAAAAAAAAAA BBBBBB",
+                "content": "spam spam spam spam spam",
+                "url": "https://other.org/spam",
+                "timestamp": "2024-01-15T10:30:00Z",
+                "source": "example.com",
+            },
+        ]
+
+        def snapshot(result):
+            data = dict(result.data or {})
+            metadata = dict(data.pop("metadata", {}))
+            metadata.pop("formatted_at", None)
+            metadata.pop("processed_at", None)
+            validation = result.stage_results.get("validation")
+            return (
+                result.success,
+                data,
+                metadata,
+                result.errors,
+                result.stage_results["cleaning"].issues_found,
+                [(issue.field, issue.rule, issue.value) for issue in validation.issues],
+            )
+
+        for level in ValidationLevel:
+            staged = ProcessingConfig(
+                validation_level=level,
+                deduplicate=False,
+                skip_formatting_on_validation_fail=False,
+                fused_stages=False,
+            )
+            fused = replace(staged, fused_stages=True)
+            for item in test_batch:
+                self.assertEqual(
+                    snapshot(self.pipeline.process_item(item, fused)),
+                    snapshot(self.pipeline.process_item(item, staged)),
+                )
+
+        result = self.pipeline.process_item(test_batch[0], fused)
+        self.assertEqual(result.data["title"], 'Bitcoin "Rally"')
+        self.assertNotIn("tracking", result.data)
+        self.assertEqual(result.data["word_count"], 12)
+
     def test_processing_hooks(self):
         """测试处理钩子功能"""
 
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+近似重复检测单元测试
+
+测试用例:
+- UNIT-DEDUP-01: 转载副本识别与聚类
+- UNIT-DEDUP-02: 短文本与滑动窗口
+- UNIT-DEDUP-03: 管道drop模式丢弃副本
+- UNIT-DEDUP-04: 多线程共享检测器，验证失败的条目不入库
+"""
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+from app.processors.deduplicator import NearDuplicateDetector
+from app.processors.pipeline import DataPipeline, ProcessingConfig, ProcessingMode
+
+ARTICLE = (
+    "Bitcoin rallied above $68,000 on Tuesday as spot ETF inflows accelerated for a third "
+    "consecutive session, while analysts pointed to shrinking exchange reserves and a "
+    "rebound in futures open interest. Ether followed with a 4% gain, and traders said "
+    "options markets were pricing higher volatility into the end of the month."
+)
+
+OTHER_ARTICLE = (
+    "The central bank left interest rates unchanged and signalled that inflation remains "
+    "above target, prompting bond yields to edge higher. Equity markets were mixed, with "
+    "technology shares outperforming and energy stocks lagging as crude prices slipped "
+    "after an unexpected build in inventories was reported by the agency."
+)
+
+
+def _config(dedup=None):
+    config = Mock()
+    data = {"processors.dedup": dedup or {}}
+    config.get_config = lambda key, default=None: data.get(key, default)
+    return config
+
+
+class TestNearDuplicateDetector(unittest.TestCase):
+    """近似重复检测器测试类"""
+
+    def test_unit_dedup_01_syndicated_copy_is_clustered(self):
+        """UNIT-DEDUP-01: 转载副本（标题不同、尾部附来源声明）归入首个副本的聚类"""
+        detector = NearDuplicateDetector(_config(), Mock())
+
+        first = detector.check({"url": "https://a.com/1", "title": "BTC tops $68k", "content": ARTICLE})
+        copy = detector.check(
+            {
+                "url": "https://b.com/x",
+                "title": "Bitcoin tops $68k",
+                "content": ARTICLE + " Originally published by a.com.",
+            }
+        )
+        other = detector.check({"url": "https://c.com/2", "title": "Rates on hold", "content": OTHER_ARTICLE})
+
+        self.assertFalse(first.is_duplicate)
+        self.assertTrue(copy.is_duplicate)
+        self.assertEqual(copy.cluster_id, "https://a.com/1")
+        self.assertGreaterEqual(copy.similarity, 0.8)
+        self.assertFalse(other.is_duplicate)
+        self.assertEqual(other.cluster_id, "https://c.com/2")
+
+        stats = detector.get_stats()
+        self.assertEqual(stats["duplicates_found"], 1)
+        self.assertEqual(stats["window_entries"], 2)
+        self.assertLess(stats["avg_check_time"], 0.01)
+
+    def test_unit_dedup_02_short_text_and_window(self):
+        """UNIT-DEDUP-02: 短文本只差数字不算重复，完全相同才算；窗口外条目过期"""
+        detector = NearDuplicateDetector(_config({"window_seconds": 60}), Mock())
+
+        self.assertFalse(detector.check({"content": "BTC up 3% in an hour"}, now=0).is_duplicate)
+        self.assertFalse(detector.check({"content": "BTC up 5% in an hour"}, now=1).is_duplicate)
+        self.assertTrue(detector.check({"content": "BTC up 3% in an hour!"}, now=2).is_duplicate)
+
+        self.assertFalse(detector.check({"content": ARTICLE}, now=10).is_duplicate)
+        self.assertFalse(detector.check({"content": ARTICLE}, now=100).is_duplicate)
+        self.assertEqual(detector.get_stats()["entries_expired"], 3)
+
+    def test_unit_dedup_03_pipeline_drop_mode(self):
+        """UNIT-DEDUP-03: drop模式下副本不进入验证与格式化"""
+        pipeline = DataPipeline(_config({"mode": "drop"}), Mock())
+        item = {
+            "title": "Bitcoin tops $68k",
+            "content": ARTICLE,
+            "url": "https://a.com/1",
+            "timestamp": "2024-01-15T10:30:00Z",
+            "source": "a.com",
+        }
+
+        first = pipeline.process_item(item)
+        copy = pipeline.process_item({**item, "url": "https://b.com/1", "source": "b.com"})
+
+        self.assertIn("deduplication", first.stage_results)
+        self.assertNotIn("duplicate_of", first.metadata)
+        self.assertFalse(copy.success)
+        self.assertIsNone(copy.data)
+        self.assertEqual(copy.metadata["duplicate_of"], "https://a.com/1")
+        self.assertNotIn("validation", copy.stage_results)
+        self.assertEqual(pipeline.get_stats()["items_duplicate"], 1)
+        self.assertEqual(pipeline.get_stats()["items_failed"], 0)
+
+        batch = pipeline.process_batch([{**item, "url": "https://c.com/1", "source": "c.com"}])
+        self.assertEqual(batch.failed_items, 0)
+        self.assertEqual(batch.metadata["dropped_items"], 1)
+
+    def test_unit_dedup_04_threads_and_deferred_record(self):
+        """UNIT-DEDUP-04: 并发检测同一文本只有一条非重复；验证失败的首个副本不占用聚类"""
+        detector = NearDuplicateDetector(_config(), Mock())
+        items = [{"url": f"https://site{i}.com/1", "content": ARTICLE} for i in range(64)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            checks = list(executor.map(detector.check, items))
+        self.assertEqual(sum(1 for check in checks if not check.is_duplicate), 1)
+        self.assertEqual(detector.get_stats()["window_entries"], 1)
+
+        # 延迟入库：两次查询都未命中时，后入库的一方在record()时被判为重复
+        detector = NearDuplicateDetector(_config(), Mock())
+        first = detector.check(items[0], record=False)
+        second = detector.check(items[1], record=False)
+        self.assertFalse(first.is_duplicate or second.is_duplicate)
+        self.assertFalse(detector.record(first).is_duplicate)
+        late = detector.record(second)
+        self.assertTrue(late.is_duplicate)
+        self.assertEqual(late.cluster_id, "https://site0.com/1")
+
+        pipeline = DataPipeline(_config(), Mock())
+        item = {
+            "title": "Bitcoin tops $68k",
+            "content": ARTICLE,
+            "url": "https://a.com/1",
+            "timestamp": "2024-01-15T10:30:00Z",
+            "source": "a.com",
+        }
+        invalid = pipeline.process_item({**item, "title": ""})
+        valid = pipeline.process_item({**item, "url": "https://b.com/1", "source": "b.com"})
+        copy = pipeline.process_item({**item, "url": "https://c.com/1", "source": "c.com"})
+
+        self.assertFalse(invalid.success)
+        self.assertTrue(valid.success)
+        self.assertNotIn("duplicate_of", valid.metadata)
+        self.assertTrue(copy.success)
+        self.assertEqual(copy.metadata["duplicate_of"], "https://b.com/1")
+        self.assertEqual(pipeline.get_stats()["items_duplicate"], 1)
+
+        # 并行模式下同批次的转载副本只保留一个聚类首个副本
+        pipeline = DataPipeline(_config(), Mock())
+        batch = pipeline.process_batch(
+            [{**item, "url": f"https://d{i}.com/1", "source": f"d{i}.com"} for i in range(8)],
+            ProcessingConfig(processing_mode=ProcessingMode.PARALLEL),
+        )
+        self.assertEqual(batch.metadata["duplicate_items"], 7)
+        self.assertEqual(pipeline.get_stats()["component_stats"]["deduplicator"]["window_entries"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+条件抓取缓存单元测试
+
+测试用例:
+- UNIT-FETCH-01: 条件请求命中304、无校验器时按正文指纹判定未变化，均跳过解析
+- UNIT-FETCH-02: 增量模式只输出新出现的条目，缓存持久化后重启仍然有效
+- UNIT-FETCH-03: 解析或发布失败时回滚抓取缓存，下次轮询重新处理
+- UNIT-FETCH-04: 默认关闭；记录数按LRU限制；WebCrawler.fetch_page_with_retry 同样可回滚
+"""
+
+import os
+import re
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from unittest.mock import Mock
+
+from app.crawlers.base_crawler import BaseCrawler, CrawlResponse
+from app.crawlers.fetch_cache import FetchCache
+from app.crawlers.web_crawler import WebCrawler
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """/etag 支持ETag校验；/plain 无校验器；/list 返回当前文章列表"""
+
+    pages: Dict[str, bytes] = {}
+    requests_seen: List[Dict[str, str]] = []
+
+    def do_GET(self):
+        self.requests_seen.append({"path": self.path, **dict(self.headers)})
+        body = self.pages[self.path]
+        etag = f'"{hash(body) & 0xFFFFFFFF:x}"'
+
+        if self.path == "/etag" and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if self.path == "/etag":
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _ListCrawler(BaseCrawler):
+    """测试爬虫：页面中每个<a>为一个条目"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.parsed = 0
+        self.start_urls: List[str] = []
+        self.fail_parse = False
+
+    def get_start_urls(self) -> List[str]:
+        return self.start_urls
+
+    def parse_response(self, response: CrawlResponse) -> List[Dict[str, Any]]:
+        self.parsed += 1
+        if self.fail_parse:
+            raise ValueError("parse error")
+        return [
+            {"title": title, "url": response.url.rsplit("/", 1)[0] + href}
+            for href, title in re.findall(r'<a href="([^"]+)">([^<]+)</a>', response.content)
+        ]
+
+    def extract_links(self, response: CrawlResponse) -> List[str]:
+        return []
+
+
+class TestFetchCache(unittest.TestCase):
+    """条件抓取缓存测试类"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_data = {
+            "scrapy": {
+                "anti_spider": {"min_delay": 0, "max_delay": 0, "user_agents": ["Test/1.0"]},
+                "fetch_cache": {
+                    "enabled": True,
+                    "persist_path": os.path.join(self.temp_dir.name, "fetch_cache.json"),
+                },
+            }
+        }
+
+        def mock_get_config(key, default=None):
+            value = self.config_data
+            try:
+                for k in key.split("."):
+                    value = value[k]
+                return value
+            except (KeyError, TypeError):
+                return default
+
+        self.mock_config = Mock()
+        self.mock_config.get_config = mock_get_config
+        self.mock_logger = Mock()
+
+        _Handler.pages = {
+            "/etag": b'<a href="/a1">A1</a>',
+            "/plain": b'<a href="/b1">B1</a>',
+            "/list": b'<a href="/c1">C1</a><a href="/c2">C2</a>',
+        }
+        _Handler.requests_seen = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.temp_dir.cleanup()
+
+    def _crawler(self, publisher=None) -> _ListCrawler:
+        return _ListCrawler(self.mock_config, self.mock_logger, publisher)
+
+    def test_unit_fetch_01_conditional_requests_skip_parsing(self):
+        """UNIT-FETCH-01: 第二轮轮询带If-None-Match得到304；无校验器页面按指纹判定未变化"""
+        crawler = self._crawler()
+        for _ in range(3):
+            etag_result = crawler.crawl_url(f"{self.base_url}/etag")
+            plain_result = crawler.crawl_url(f"{self.base_url}/plain")
+
+        self.assertTrue(etag_result.success)
+        self.assertEqual(etag_result.response.status_code, 304)
+        self.assertEqual(etag_result.data, [])
+        self.assertTrue(etag_result.metadata["unchanged"])
+        self.assertEqual(plain_result.response.status_code, 200)
+        self.assertTrue(plain_result.metadata["unchanged"])
+        # 只有首轮解析
+        self.assertEqual(crawler.parsed, 2)
+
+        etag_requests = [r for r in _Handler.requests_seen if r["path"] == "/etag"]
+        self.assertNotIn("If-None-Match", etag_requests[0])
+        self.assertIn("If-None-Match", etag_requests[1])
+
+        # 页面变化后重新解析
+        _Handler.pages["/etag"] = b'<a href="/a1">A1</a><a href="/a2">A2</a>'
+        result = crawler.crawl_url(f"{self.base_url}/etag")
+        self.assertEqual(result.response.status_code, 200)
+        self.assertEqual(len(result.data), 2)
+
+        stats = crawler.get_stats()
+        self.assertEqual(stats["pages_unchanged"], 4)
+        self.assertEqual(stats["fetch_cache"]["not_modified"], 2)
+        self.assertEqual(stats["fetch_cache"]["unchanged"], 2)
+
+    def test_unit_fetch_02_diff_mode_and_persistence(self):
+        """UNIT-FETCH-02: 增量模式只输出新条目；重启后缓存校验器与已出现条目仍然有效"""
+        self.config_data["scrapy"]["fetch_cache"]["diff_mode"] = True
+        crawler = self._crawler()
+        url = f"{self.base_url}/list"
+
+        first = crawler.crawl_url(url)
+        self.assertEqual([item["title"] for item in first.data], ["C1", "C2"])
+
+        _Handler.pages["/list"] = b'<a href="/c3">C3</a><a href="/c1">C1</a><a href="/c2">C2</a>'
+        second = crawler.crawl_url(url)
+        self.assertEqual([item["title"] for item in second.data], ["C3"])
+        crawler.save_fetch_cache()
+
+        # 模拟重启：新实例从持久化文件恢复
+        restarted = self._crawler()
+        self.assertIn(url, restarted.fetch_cache)
+        self.assertTrue(restarted.crawl_url(url).metadata["unchanged"])
+        self.assertEqual(restarted.parsed, 0)
+
+        _Handler.pages["/list"] = b'<a href="/c4">C4</a><a href="/c3">C3</a>'
+        third = restarted.crawl_url(url)
+        self.assertEqual([item["title"] for item in third.data], ["C4"])
+
+        cache = FetchCache(max_links_per_page=2)
+        page = "http://x/"
+        self.assertEqual(cache.new_links(page, ["http://x/1", "http://x/2"]), ["http://x/1", "http://x/2"])
+        self.assertEqual(cache.new_links(page, ["http://x/3", "http://x/2"]), ["http://x/3"])
+        # 超出上限淘汰最早出现的链接
+        self.assertEqual(cache.new_links(page, ["http://x/1"]), ["http://x/1"])
+
+    def test_unit_fetch_03_rollback_on_failure(self):
+        """UNIT-FETCH-03: 解析失败或发布未被受理时回滚校验器、正文指纹与增量条目"""
+        self.config_data["scrapy"]["fetch_cache"]["diff_mode"] = True
+        publisher = Mock()
+        crawler = self._crawler(publisher)
+        url = f"{self.base_url}/etag"
+
+        # 解析失败：下次请求不带校验器，重新解析
+        crawler.fail_parse = True
+        self.assertFalse(crawler.crawl_url(url).success)
+        crawler.fail_parse = False
+        retry = crawler.crawl_url(url)
+        self.assertEqual(retry.response.status_code, 200)
+        self.assertNotIn("If-None-Match", _Handler.requests_seen[-1])
+        self.assertEqual([item["title"] for item in retry.data], ["A1"])
+
+        # 发布未被受理：回滚后下次轮询重新输出同一条目
+        _Handler.pages["/etag"] = b'<a href="/a2">A2</a>'
+        crawler.start_urls = [url]
+        publisher.publish_message.return_value = False
+        crawler.start_crawling()
+        publisher.publish_message.return_value = True
+        crawler.start_crawling()
+
+        titles = [call.args[0].title for call in publisher.publish_message.call_args_list]
+        self.assertEqual(titles, ["A2", "A2"])
+        self.assertEqual(crawler.get_stats()["fetch_rollbacks"], 2)
+
+        # 成功发布后不再回滚，下一轮命中304
+        crawler.start_crawling()
+        self.assertEqual(publisher.publish_message.call_count, 2)
+        self.assertEqual(crawler.crawl_url(url).response.status_code, 304)
+
+    def test_unit_fetch_04_default_off_lru_and_web_rollback(self):
+        """UNIT-FETCH-04: 默认关闭；记录数按LRU限制；fetch_page_with_retry 的写入可回滚"""
+        del self.config_data["scrapy"]["fetch_cache"]["enabled"]
+        crawler = self._crawler()
+        self.assertIsNone(crawler.fetch_cache)
+        for _ in range(2):
+            self.assertEqual(len(crawler.crawl_url(f"{self.base_url}/etag").data), 1)
+        self.assertEqual(crawler.parsed, 2)
+
+        cache = FetchCache(max_entries=2)
+        for page in ("http://x/1", "http://x/2"):
+            cache.record_response(page, {"ETag": '"v1"'}, page)
+        cache.conditional_headers("http://x/1")
+        cache.record_response("http://x/3", {}, "x3")
+        self.assertEqual(len(cache), 2)
+        self.assertIn("http://x/1", cache)
+        self.assertNotIn("http://x/2", cache)
+        self.assertEqual(cache.get_stats()["evicted"], 1)
+
+        self.config_data["scrapy"]["fetch_cache"]["enabled"] = True
+        web_crawler = WebCrawler(self.mock_config, self.mock_logger)
+        url = f"{self.base_url}/etag"
+        response = web_crawler.fetch_page_with_retry(url, max_retries=1)
+        self.assertEqual(response.status_code, 200)
+        # 调用方解析失败：回滚后下次请求不带校验器
+        web_crawler.rollback_freshness(response.crawl_response)
+        response = web_crawler.fetch_page_with_retry(url, max_retries=1)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("If-None-Match", _Handler.requests_seen[-1])
+        self.assertEqual(web_crawler.get_stats()["fetch_rollbacks"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+新闻提取器单元测试
+
+测试用例:
+- UNIT-NEWS-01: 站点选择器配置驱动的单次流式提取，备用来源按优先级生效
+- UNIT-NEWS-02: 字段全部确定或遇到正文结束标记后提前结束，页脚内容不参与提取
+"""
+
+import unittest
+from unittest.mock import Mock
+
+from app.crawlers.base_crawler import CrawlResponse
+from app.crawlers.scrapy_crawler import NewsExtractor
+from app.crawlers.selector_engine import CompiledSelector, ExtractionPlan, FieldRule, MODE_ALL
+
+PARAGRAPH = (
+    "<p>Bitcoin rallied above the key resistance level as institutional "
+    "<b>inflows</b> continued to build this week.</p>"
+)
+
+
+def _response(url: str, content: str) -> CrawlResponse:
+    return CrawlResponse(
+        url=url,
+        status_code=200,
+        content=content,
+        headers={},
+        cookies={},
+        encoding="utf-8",
+        response_time=0.0,
+        timestamp="2024-01-01T00:00:00Z",
+    )
+
+
+class TestNewsExtractor(unittest.TestCase):
+    """新闻提取器测试类"""
+
+    def setUp(self):
+        self.extractor = NewsExtractor(Mock())
+
+    def test_unit_news_01_site_config_extraction(self):
+        """UNIT-NEWS-01: coindesk配置命中站点选择器；无站点作者时回退到meta"""
+        page = f"""<html><head><title>Page</title>
+            <meta property="og:title" content="OG title">
+            <meta name="keywords" content="btc, crypto">
+            <meta property="og:image" content="/img/a.png">
+            <meta name="author" content="Meta Author"></head>
+            <body><nav class="breadcrumb"><a>Home</a><a>Markets</a></nav>
+            <h1 class="at-headline">Big <i>News</i></h1>
+            <time datetime="2024-05-06T07:08:09Z">May 6</time>
+            <div class="at-content-wrapper"><div class="at-text">{PARAGRAPH}</div>
+            <div class="at-text"><script>var noise = 1;</script>{PARAGRAPH}</div></div>
+            </body></html>"""
+
+        item = self.extractor.extract_news_item(
+            _response("https://www.coindesk.com/markets/2024/05/06/a/", page)
+        )
+
+        self.assertEqual(item.title, "Big News")
+        self.assertEqual(item.author, "Meta Author")
+        self.assertEqual(item.timestamp, "2024-05-06T07:08:09Z")
+        self.assertEqual(item.category, "Markets")
+        self.assertEqual(item.tags, ["btc", "crypto"])
+        self.assertEqual(item.image_url, "https://www.coindesk.com/img/a.png")
+        self.assertIn("institutional inflows continued", item.content)
+        self.assertNotIn("noise", item.content)
+        self.assertEqual(item.content.count("Bitcoin rallied"), 2)
+
+        # 站点选择器全部缺失时回退到 og:title 与全部段落
+        item = self.extractor.extract_news_item(
+            _response(
+                "https://www.bloomberg.com/news/a",
+                f'<head><meta property="og:title" content="OG title"></head><body>{PARAGRAPH}</body>',
+            )
+        )
+        self.assertEqual(item.title, "OG title")
+        self.assertEqual(item.timestamp, "2024-01-01T00:00:00Z")
+
+    def test_unit_news_02_early_stop(self):
+        """UNIT-NEWS-02: 站点字段确定后停止解析，正文结束标记之后的元素被忽略"""
+        related = "".join(
+            f"<div class='card'><h3>Related {i}</h3><p>teaser text about markets number {i}</p></div>"
+            for i in range(2000)
+        )
+        page = f"""<html><body>
+            <div class="post-meta__author">Jane Doe</div>
+            <div class="post-meta__publish-date">2024-05-06</div>
+            <div class="breadcrumbs"><a>News</a><a>Bitcoin</a></div>
+            <article><h1>Headline</h1><div class="post-content">{PARAGRAPH * 3}</div></article>
+            <section>{related}</section></body></html>"""
+
+        item = self.extractor.extract_news_item(
+            _response("https://cointelegraph.com/news/headline", page)
+        )
+        self.assertEqual(item.author, "Jane Doe")
+        self.assertEqual(item.timestamp, "2024-05-06T00:00:00Z")
+        self.assertEqual(item.category, "Bitcoin")
+        self.assertNotIn("Related", item.content)
+        self.assertEqual(self.extractor.stats["early_stops"], 1)
+        self.assertLess(self.extractor.stats["elements_scanned"], 100)
+
+        # 默认配置：正文结束标记截断页脚，后代与子代组合符
+        plan = ExtractionPlan(
+            [
+                FieldRule("content", [("main > p", None), ("p", None)], mode=MODE_ALL),
+                FieldRule("author", [(".byline [rel~='author']", None)]),
+            ],
+            stop="body > footer",
+        )
+        result = plan.extract(
+            "<body><main><p>one</p><div><p>nested</p></div><p>two</p>"
+            "<footer><p>article footer</p></footer></main>"
+            "<footer><p>site</p><span class='byline'><a rel='author me'>X</a></span></footer>"
+            "<p>after</p></body>"
+        )
+        self.assertEqual(result.values["content"], ["one", "two"])
+        self.assertIsNone(result.values["author"])
+        self.assertTrue(result.early_stop)
+
+        self.assertEqual(CompiledSelector("h1[data-testid='Heading']").key, ("tag", "h1"))
+        with self.assertRaises(ValueError):
+            CompiledSelector("p:first-child")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+序列化器单元测试
+
+测试用例:
+- UNIT-SER-01: Protobuf/Avro单条编解码往返与线格式
+- UNIT-SER-02: 批量帧编解码与编码吞吐量统计
+"""
+
+import unittest
+from unittest.mock import Mock
+
+from app.utils.codecs import compile_codec
+from app.utils.serializers import PROTOBUF_SCHEMA, SerializationManager
+
+
+class TestSerializers(unittest.TestCase):
+    """序列化器测试类"""
+
+    def setUp(self):
+        self.manager = SerializationManager(Mock(), Mock())
+        self.item = {
+            "id": "test_001",
+            "title": "Bitcoin价格分析报告",
+            "content": "比特币价格在过去24小时内出现了显著波动...",
+            "url": "https://example.com/bitcoin-analysis",
+            "timestamp": "2024-01-15T10:30:00Z",
+            "category": "加密货币",
+            "keywords": ["比特币", "价格分析"],
+            "source": "财经新闻网",
+            "metadata": {"author": "张三", "priority": 3},
+            "metrics": {
+                "relevance_score": 0.95,
+                "sentiment_score": -0.5,
+                "word_count": 1500,
+                "view_count": 2500,
+                "share_count": 150,
+            },
+        }
+
+    def _expected(self):
+        expected = dict(self.item)
+        expected["metadata"] = {"author": "张三", "priority": "3"}
+        return expected
+
+    def test_unit_ser_01_roundtrip_and_wire_format(self):
+        """UNIT-SER-01: 两种格式往返一致；缺失字段取零值；Protobuf输出为proto3线格式"""
+        for format_type in ("protobuf", "avro"):
+            payload = self.manager.serialize(self.item, format_type)
+            self.assertIsInstance(payload, bytes)
+            self.assertEqual(self.manager.deserialize(payload, format_type), self._expected())
+
+            sparse = self.manager.deserialize(
+                self.manager.serialize({"id": "x", "url": None}, format_type), format_type
+            )
+            self.assertEqual(sparse["url"], "")
+            self.assertEqual(sparse["keywords"], [])
+            self.assertEqual(sparse["metrics"]["word_count"], 0)
+
+        # 字段1(id)为长度前缀字符串: tag 0x0a, 长度 8
+        payload = self.manager.serialize({"id": "test_001"}, "protobuf")
+        self.assertTrue(payload.startswith(b"\x0a\x08test_001"))
+        # 旧版JSON模拟格式仍可读取
+        self.assertEqual(
+            self.manager.deserialize(b'PROTOBUF:{"id": "legacy"}', "protobuf"), {"id": "legacy"}
+        )
+        # 只省略与字段类型零值相同的值；类型不符的假值照常编码或报错
+        codec = compile_codec("protobuf", {
+            "name": "Scalars",
+            "fields": [
+                {"name": "text", "number": 1, "type": "string"},
+                {"name": "count", "number": 2, "type": "int64"},
+                {"name": "flag", "number": 3, "type": "bool"},
+                {"name": "blob", "number": 4, "type": "bytes"},
+            ],
+        })
+        self.assertEqual(codec.encode({"text": "", "count": 0, "flag": False, "blob": b""}), b"")
+        self.assertEqual(codec.decode(codec.encode({"text": 0}))["text"], "0")
+        with self.assertRaises(TypeError):
+            codec.encode({"blob": 0})
+
+        # 同一schema只编译一次
+        self.assertIs(
+            compile_codec("protobuf", PROTOBUF_SCHEMA), self.manager.protobuf_serializer.codec
+        )
+
+    def test_unit_ser_02_batch_frame_and_stats(self):
+        """UNIT-SER-02: 批量帧往返一致且与格式绑定；get_stats报告各格式吞吐量"""
+        items = [dict(self.item, id=f"item-{i}") for i in range(50)]
+        for format_type in ("protobuf", "avro"):
+            frame = self.manager.serialize_batch(items, format_type)
+            decoded = self.manager.deserialize_batch(frame, format_type)
+            self.assertEqual([item["id"] for item in decoded], [f"item-{i}" for i in range(50)])
+            self.assertEqual(decoded[7]["metrics"], self.item["metrics"])
+
+        frame = self.manager.serialize_batch(items, "avro")
+        with self.assertRaises(ValueError):
+            self.manager.deserialize_batch(frame, "protobuf")
+
+        stats = self.manager.get_stats()
+        for format_type in ("protobuf", "avro"):
+            self.assertEqual(stats[format_type]["batches_encoded"], 1 + (format_type == "avro"))
+            self.assertGreater(stats[format_type]["items_per_second"], 0)
+            self.assertGreater(stats[format_type]["mb_per_second"], 0)
+        self.assertEqual(stats["protobuf"]["items_encoded"], 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
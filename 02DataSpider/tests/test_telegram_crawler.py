@@ -5,12 +5,13 @@ Telegram监听器单元测试
 
 测试用例:
 - UNIT-CRAWL-02: 关键词过滤
+- UNIT-CRAWL-03: 微批次接收管线与频道延迟统计
 """
 
 import unittest
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from app.crawlers.telegram_crawler import TelegramCrawler
 
@@ -317,6 +318,146 @@ class TestTelegramCrawler(unittest.TestCase):
         self.assertIn("coinbase", extracted_data["keywords"])
         self.assertIn("listing", extracted_data["keywords"])
 
+    def test_keyword_matcher_reused_with_duplicate_keywords(self):
+        """配置中含重复或大小写不同的关键词时不重复编译匹配器"""
+        self.crawler.telegram_config["keywords"] = ["Listing", "listing", "pump", ""]
+        message = Mock(text="New listing today")
+        self.assertTrue(self.crawler.should_process_message(message))
+        matcher = self.crawler._keyword_matcher
+        self.assertTrue(self.crawler.should_process_message(message))
+        self.assertIs(self.crawler._keyword_matcher, matcher)
+        self.assertFalse(self.crawler.should_process_message(Mock(text="Nothing here")))
+        self.assertIs(self.crawler._keyword_matcher, matcher)
+
+    def test_unit_crawl_03_batched_ingestion(self):
+        """UNIT-CRAWL-03: 微批次接收管线
+
+        事件处理器只入队；工作协程按批次解析、过滤并交给数据处理管道，
+        管道拒绝的消息不发布，按频道记录接收数与延迟。
+        """
+        publisher = Mock()
+        pipeline = Mock()
+
+        def process_batch(items):
+            results = [
+                Mock(
+                    success="spam" not in item["content"],
+                    data={"title": item["title"].upper(), "content": item["content"]},
+                )
+                for item in items
+            ]
+            return Mock(results=results, errors=[])
+
+        pipeline.process_batch.side_effect = process_batch
+
+        crawler = TelegramCrawler(
+            self.mock_config, self.mock_logger, publisher, pipeline=pipeline
+        )
+        crawler.ingest_batch_size = 8
+        crawler.channels[0].channel_id = 111
+        crawler.channels[1].channel_id = 222
+        crawler.channels[1].keywords = ["listing"]
+
+        def make_event(message_id, channel_id, text):
+            message = Mock(
+                id=message_id,
+                text=text,
+                chat_id=-(10**12) - channel_id,
+                date=datetime.now(timezone.utc) - timedelta(seconds=5),
+                media=None,
+                forward=None,
+                reactions=None,
+                reply_to_msg_id=None,
+                views=100,
+                forwards=0,
+            )
+            message.get_sender = AsyncMock(return_value=Mock(id=1, username="sender"))
+            message.get_chat = AsyncMock(return_value=Mock(title="Chat", username=None))
+            return Mock(message=message)
+
+        async def run():
+            crawler._start_ingest()
+            for i in range(20):
+                await crawler._handle_new_message(make_event(i, 111, f"Market update number {i}"))
+            for i in range(20, 30):
+                text = "New listing announced today" if i % 2 else "Nothing interesting here"
+                await crawler._handle_new_message(make_event(i, 222, text))
+            await crawler._handle_new_message(make_event(99, 111, "spam spam spam spam"))
+
+            # 事件处理器只入队，不解析也不发布
+            self.assertEqual(publisher.publish_message.call_count, 0)
+            self.assertEqual(crawler.get_stats()["ingest_queue_size"], 31)
+
+            await crawler._stop_ingest()
+
+        asyncio.run(run())
+
+        stats = crawler.get_stats()
+        self.assertEqual(stats["messages_received"], 31)
+        self.assertEqual(stats["batches_processed"], 4)
+        self.assertEqual(stats["messages_filtered"], 5)
+        self.assertEqual(stats["messages_rejected"], 1)
+        self.assertEqual(stats["messages_processed"], 25)
+        self.assertEqual(publisher.publish_message.call_count, 25)
+
+        published = publisher.publish_message.call_args_list[0].args[0]
+        self.assertEqual(published.title, "MARKET UPDATE NUMBER 0")
+        self.assertEqual(published.url, "https://t.me/c/111/0")
+
+        lag = stats["channel_lag"]
+        self.assertEqual(lag[111]["username"], "@crypto_news")
+        self.assertEqual(lag[111]["received"], 21)
+        self.assertEqual(lag[111]["processed"], 20)
+        self.assertEqual(lag[222]["filtered"], 5)
+        self.assertGreaterEqual(lag[111]["lag_seconds_max"], 5)
+
+    def test_unit_crawl_03_ingest_drain_and_defaults(self):
+        """UNIT-CRAWL-03: 停止时先处理完满队列，统计按频道ID区分，默认不经过数据处理管道"""
+        self.assertFalse(self.crawler.use_pipeline)
+        self.assertIsNone(self.crawler._get_pipeline())
+
+        crawler = TelegramCrawler(self.mock_config, self.mock_logger, Mock())
+        crawler.ingest_queue_size = 5
+        crawler.ingest_batch_size = 2
+        # 两个频道都没有用户名
+        crawler.channels[0].username = None
+        crawler.channels[0].channel_id = 111
+        crawler.channels[1].username = None
+        crawler.channels[1].channel_id = 222
+        crawler.channels[1].keywords = []
+
+        def make_event(message_id, channel_id):
+            message = Mock(
+                id=message_id,
+                text="Short listing",
+                chat_id=-(10**12) - channel_id,
+                date=datetime.now(timezone.utc),
+                media=None,
+                forward=None,
+                reactions=None,
+                reply_to_msg_id=None,
+                views=100,
+                forwards=0,
+            )
+            message.get_sender = AsyncMock(return_value=Mock(id=1, username="sender"))
+            message.get_chat = AsyncMock(return_value=Mock(title="Chat", username=None))
+            return Mock(message=message)
+
+        async def run():
+            crawler._start_ingest()
+            for i in range(5):
+                await crawler._handle_new_message(make_event(i, 111 if i < 3 else 222))
+            self.assertEqual(crawler._ingest_queue.qsize(), 5)
+            await crawler._stop_ingest()
+
+        asyncio.run(run())
+
+        stats = crawler.get_stats()
+        self.assertEqual(stats["messages_dropped"], 0)
+        self.assertEqual(stats["messages_processed"], 5)
+        self.assertEqual(stats["channel_lag"][111]["processed"], 3)
+        self.assertEqual(stats["channel_lag"][222]["processed"], 2)
+
     @patch("telethon.TelegramClient")
     async def test_client_connection_handling(self, mock_client_class):
         """测试Telegram客户端连接处理"""
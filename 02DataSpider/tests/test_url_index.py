@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+已访问URL索引单元测试
+
+测试用例:
+- UNIT-URLINDEX-01: URL规范化去重与域名计数
+- UNIT-URLINDEX-02: 布隆过滤器扩容与持久化
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from app.crawlers.url_index import VisitedURLIndex, canonicalize_url
+
+
+class TestVisitedURLIndex(unittest.TestCase):
+    """已访问URL索引测试类"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_unit_urlindex_01_canonical_dedup_and_domain_counts(self):
+        """UNIT-URLINDEX-01: 等价URL只记录一次，域名计数O(1)读取"""
+        self.assertEqual(
+            canonicalize_url("HTTPS://News.Example.com:443/a?b=2&a=1#top"),
+            "https://news.example.com/a?a=1&b=2",
+        )
+
+        index = VisitedURLIndex()
+        self.assertTrue(index.add("https://news.example.com/a?a=1&b=2"))
+        self.assertFalse(index.add("https://NEWS.example.com/a?b=2&a=1#comments"))
+        self.assertTrue(index.add("https://news.example.com/b"))
+        self.assertTrue(index.add("https://other.com/"))
+
+        self.assertIn("https://news.example.com:443/b", index)
+        self.assertNotIn("https://news.example.com/c", index)
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.domain_count("news.example.com"), 2)
+        self.assertEqual(index.domain_count("missing.com"), 0)
+
+    def test_unit_urlindex_02_bloom_growth_and_persistence(self):
+        """UNIT-URLINDEX-02: 布隆过滤器超出容量后扩容；重启后指纹与计数恢复"""
+        path = os.path.join(self.temp_dir, "visited.idx")
+        index = VisitedURLIndex(use_bloom=True, persist_path=path, capacity=1000, error_rate=0.01)
+        urls = [f"https://site{i % 7}.com/news/{i}" for i in range(5000)]
+        for url in urls:
+            index.add(url)
+
+        stats = index.get_stats()
+        self.assertEqual(stats["mode"], "bloom")
+        self.assertGreater(len(index._fingerprints.slices), 1)
+        self.assertLess(stats["memory_bytes"], 5000 * 4)
+        index.save()
+
+        restored = VisitedURLIndex(persist_path=path)
+        self.assertTrue(restored.use_bloom)
+        self.assertTrue(all(url in restored for url in urls))
+        false_positives = sum(f"https://unseen.com/{i}" in restored for i in range(5000))
+        self.assertLess(false_positives, 5000 * 0.02)
+        self.assertEqual(
+            sum(restored.domain_count(f"site{i}.com") for i in range(7)), len(index)
+        )
+
+        exact_path = os.path.join(self.temp_dir, "exact.idx")
+        exact = VisitedURLIndex(persist_path=exact_path)
+        exact.add("https://a.com/1")
+        exact.save()
+        self.assertIn("https://a.com/1", VisitedURLIndex(persist_path=exact_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
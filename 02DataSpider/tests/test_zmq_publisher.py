@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ZeroMQ发布者单元测试
+
+测试用例:
+- UNIT-ZMQPUB-01: 多线程突发发布经发送线程批量发出，订阅端完整接收
+- UNIT-ZMQPUB-02: 队列溢出写入磁盘暂存，重连后按顺序回放
+- UNIT-ZMQPUB-03: 暂存偏移量持久化与半条记录截断
+- UNIT-ZMQPUB-04: 无订阅者时保留消息，慢订阅端背压触发溢出并按发布顺序送达
+"""
+
+import os
+import json
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+import zmq
+
+from app.zmq_client.publisher import ZMQPublisher, NewsMessage
+from app.zmq_client.spool import MessageSpool
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _message(i: int, content: str = "content") -> NewsMessage:
+    return NewsMessage(
+        id=f"msg-{i}",
+        title=f"News {i}",
+        content=content,
+        source="test",
+        url=None,
+        timestamp="2024-01-15T10:30:00Z",
+        category="test",
+        sentiment=None,
+        keywords=[],
+        metadata={},
+    )
+
+
+class TestZMQPublisher(unittest.TestCase):
+    """ZeroMQ发布者测试类"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.port = _free_port()
+        self.publisher_config = {
+            "host": "127.0.0.1",
+            "port": self.port,
+            "topic": "crawler.news",
+            "spool_path": os.path.join(self.temp_dir.name, "publisher.spool"),
+        }
+        self.mock_config = Mock()
+        self.mock_config.get_zmq_config.return_value = {
+            "publisher": self.publisher_config,
+            "timeout": 2000,
+            "high_water_mark": 100000,
+        }
+        self.mock_logger = Mock()
+
+        self.context = zmq.Context()
+        self.subscriber = self.context.socket(zmq.SUB)
+        self.subscriber.setsockopt(zmq.SUBSCRIBE, b"crawler.news")
+        self.subscriber.setsockopt(zmq.RCVHWM, 100000)
+        self.subscriber.setsockopt(zmq.RCVTIMEO, 2000)
+        self.subscriber.connect(f"tcp://127.0.0.1:{self.port}")
+
+    def tearDown(self):
+        self.subscriber.close(linger=0)
+        self.context.term()
+        self.temp_dir.cleanup()
+
+    def _receive(self, count):
+        ids = []
+        try:
+            while len(ids) < count:
+                _, payload = self.subscriber.recv_multipart()
+                ids.append(json.loads(payload)["id"])
+        except zmq.Again:
+            pass
+        return ids
+
+    def _connect(self, publisher):
+        self.assertTrue(publisher.connect())
+        # 等待订阅关系建立（PUB/SUB慢连接）
+        time.sleep(0.3)
+
+    def test_unit_zmqpub_01_burst_from_threads(self):
+        """UNIT-ZMQPUB-01: 4个线程各发布500条，发布调用不阻塞，订阅端收到全部2000条"""
+        publisher = ZMQPublisher(self.mock_config, self.mock_logger)
+        self._connect(publisher)
+
+        def produce(offset):
+            for i in range(500):
+                self.assertTrue(publisher.publish_message(_message(offset + i)))
+
+        try:
+            threads = [threading.Thread(target=produce, args=(n * 500,)) for n in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertTrue(publisher.flush(timeout=5))
+            received = self._receive(2000)
+        finally:
+            publisher.disconnect()
+
+        self.assertEqual(sorted(received), sorted(f"msg-{i}" for i in range(2000)))
+        stats = publisher.get_stats()
+        self.assertEqual(stats["messages_sent"], 2000)
+        self.assertLess(stats["batches_sent"], 2000)
+
+    def test_unit_zmqpub_02_overflow_spool_replayed_on_reconnect(self):
+        """UNIT-ZMQPUB-02: 超过队列水位的消息写入暂存；断开时队列剩余也写入暂存；重连后按序回放"""
+        self.publisher_config["queue_size"] = 2
+        publisher = ZMQPublisher(self.mock_config, self.mock_logger)
+        # 模拟已连接但发送线程未运行（消息堆积在队列中）
+        publisher._connected = True
+        for i in range(5):
+            self.assertTrue(publisher.publish_message(_message(i)))
+
+        self.assertEqual(len(publisher._message_queue), 2)
+        self.assertEqual(publisher.get_stats()["messages_spooled"], 3)
+        publisher._connected = False
+        publisher.disconnect()
+        self.assertEqual(len(publisher.spool), 5)
+
+        # 新实例（模拟进程重启）连接后回放暂存
+        self.publisher_config["queue_size"] = 10000
+        restarted = ZMQPublisher(self.mock_config, self.mock_logger)
+        self.assertEqual(len(restarted.spool), 5)
+        restarted.connect()
+        try:
+            self.assertTrue(restarted.flush(timeout=5))
+        finally:
+            restarted.disconnect()
+
+        self.assertEqual(restarted.spool.get_stats()["replayed"], 5)
+        self.assertEqual(len(restarted.spool), 0)
+        self.assertEqual(os.path.getsize(self.publisher_config["spool_path"]), 0)
+
+    def test_unit_zmqpub_03_spool_offsets_and_torn_tail(self):
+        """UNIT-ZMQPUB-03: 部分回放后重启从偏移量继续；崩溃遗留的半条记录被截断"""
+        path = self.publisher_config["spool_path"]
+        spool = MessageSpool(path)
+        spool.append([(b"t", f"payload-{i}".encode()) for i in range(4)])
+
+        records = spool.read(10)
+        self.assertEqual([payload for _, _, payload in records][:2], [b"payload-0", b"payload-1"])
+        spool.commit(records[1][0], 2)
+        spool.close()
+
+        # 模拟写入一半时崩溃
+        with open(path, "ab") as f:
+            f.write(b"\x00\x00\x00\x01\x00\x00")
+
+        recovered = MessageSpool(path)
+        self.assertEqual(len(recovered), 2)
+        self.assertEqual(
+            [payload for _, _, payload in recovered.read(10)], [b"payload-2", b"payload-3"]
+        )
+        recovered.append([(b"t", b"payload-4")])
+        records = recovered.read(10)
+        self.assertEqual(records[-1][2], b"payload-4")
+        recovered.commit(records[-1][0], len(records))
+        self.assertEqual(len(recovered), 0)
+        self.assertFalse(os.path.exists(recovered.offset_path))
+        recovered.close()
+
+    def test_unit_zmqpub_04_backpressure_spills_in_order(self):
+        """UNIT-ZMQPUB-04: 无订阅者时不发送；订阅端不读取时高水位返回EAGAIN，溢出写入暂存，最终按序全部送达"""
+        self.subscriber.close(linger=0)
+        self.mock_config.get_zmq_config.return_value["high_water_mark"] = 1
+        self.publisher_config.update({"queue_size": 4, "batch_size": 2})
+        publisher = ZMQPublisher(self.mock_config, self.mock_logger)
+        self.assertTrue(publisher.connect())
+        content = "x" * 256 * 1024
+        total = 60
+
+        try:
+            # 没有订阅者：消息留在队列中，不会被XPUB丢弃
+            for i in range(3):
+                self.assertTrue(publisher.publish_message(_message(i, content)))
+            time.sleep(0.3)
+            self.assertEqual(publisher.get_stats()["messages_sent"], 0)
+
+            self.subscriber = self.context.socket(zmq.SUB)
+            self.subscriber.setsockopt(zmq.RCVHWM, 1)
+            self.subscriber.setsockopt(zmq.RCVBUF, 4096)
+            self.subscriber.setsockopt(zmq.RCVTIMEO, 5000)
+            self.subscriber.setsockopt(zmq.SUBSCRIBE, b"crawler.news")
+            self.subscriber.connect(f"tcp://127.0.0.1:{self.port}")
+
+            # 订阅端暂不读取：发送线程遇到高水位，队列积满后消息溢出到暂存
+            for i in range(3, total):
+                self.assertTrue(publisher.publish_message(_message(i, content)))
+            self.assertGreater(publisher.get_stats()["messages_spooled"], 0)
+
+            received = self._receive(total)
+        finally:
+            publisher.disconnect()
+
+        self.assertEqual(received, [f"msg-{i}" for i in range(total)])
+        self.assertEqual(publisher.get_stats()["messages_failed"], 0)
+        self.assertEqual(len(publisher.spool), 0)
+
+if __name__ == "__main__":
+    unittest.main()
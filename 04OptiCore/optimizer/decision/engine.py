@@ -69,6 +69,35 @@ class StrategyDecision:
     timestamp: datetime
 
 
+@dataclass
+class StrategyTraits:
+    """由策略ID推断的策略类型特征"""
+
+    liquidity_score: float
+    trend_following: bool  # momentum / trend
+    momentum: bool
+    mean_reversion: bool
+    grid: bool
+    breakout: bool
+
+
+@dataclass
+class CandidateBatch:
+    """批量决策的候选集（策略 × 交易对），指标按候选对齐为数组"""
+
+    symbols: List[str]
+    strategy_ids: List[str]
+    strategy_results: List[Dict[str, Any]]
+    total_return: np.ndarray
+    max_drawdown: np.ndarray
+    sharpe_ratio: np.ndarray
+    win_rate: np.ndarray
+    profit_factor: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+
 class DecisionEngine:
     """
     策略决策引擎
@@ -118,9 +147,15 @@ class DecisionEngine:
             ],
         )
 
+        # 组合最多包含的策略数
+        self.max_portfolio_strategies = config.get("max_portfolio_strategies", 5)
+
         # 当前市场状态
         self.current_market_state = MarketState()
 
+        # 策略类型特征缓存（策略ID -> StrategyTraits）
+        self._strategy_traits: Dict[str, StrategyTraits] = {}
+
         self.logger.info("决策引擎初始化完成")
 
     async def initialize(self):
@@ -182,44 +217,358 @@ class DecisionEngine:
             self.logger.error("决策分析失败: %s", e)
             return []
 
+    async def make_batch_decisions(
+        self,
+        optimization_results: Dict[str, Any],
+        market_snapshot: Dict[str, Dict[str, Any]],
+    ) -> List[StrategyDecision]:
+        """
+        基于整个观察列表的市场快照批量做出策略决策
+
+        所有策略 × 交易对候选的评分、风险过滤与置信度按数组一次计算，
+        组合优化在合并后的候选集上只运行一次
+
+        Args:
+            optimization_results: 策略优化结果（交易对 -> optimized_strategies）
+            market_snapshot: 交易对 -> 该交易对的市场数据（price_history、volume_data、
+                trend_indicators、current_price）
+
+        Returns:
+            List[StrategyDecision]: 策略决策列表
+        """
+        self.logger.info("开始批量策略决策分析")
+
+        try:
+            # 每个交易对独立的市场状态
+            market_states = {}
+            for symbol, market_data in market_snapshot.items():
+                market_state = MarketState()
+                try:
+                    self._apply_market_data(market_state, market_data)
+                except Exception as e:
+                    self.logger.warning("市场状态更新失败 %s: %s", symbol, e)
+                market_states[symbol] = market_state
+
+            candidates = self._collect_candidates(optimization_results)
+            if not len(candidates):
+                return []
+
+            # 向量化评分与风险过滤
+            scores = self._score_candidates(candidates, market_states)
+            selected = self._select_portfolio(candidates, scores)
+
+            decisions = []
+            for index in selected:
+                symbol = candidates.symbols[index]
+                strategy_result = candidates.strategy_results[index]
+                strategy_eval = self._candidate_evaluation(candidates, scores, index)
+                market_data = market_snapshot.get(symbol, {})
+                action = self._determine_action(
+                    strategy_result,
+                    market_data,
+                    market_states.get(symbol, MarketState()),
+                )
+
+                current_price = market_data.get("current_price", 0)
+                if isinstance(current_price, dict):
+                    current_price = current_price.get(symbol, 0)
+                stop_loss, take_profit = self._calculate_stop_levels(
+                    action, current_price, strategy_result
+                )
+
+                decisions.append(
+                    StrategyDecision(
+                        strategy_id=candidates.strategy_ids[index],
+                        symbol=symbol,
+                        action=action,
+                        confidence=float(scores["confidence"][index]),
+                        risk_score=1 - float(scores["risk"][index]) / 100,
+                        expected_return=strategy_result.get("total_return", 0),
+                        max_drawdown=float(candidates.max_drawdown[index]),
+                        position_size=float(scores["position_size"][index]),
+                        stop_loss=stop_loss,
+                        take_profit=take_profit,
+                        reasoning=self._generate_reasoning(strategy_eval, action),
+                        timestamp=datetime.now(),
+                    )
+                )
+
+            validated_decisions = self._stress_test_batch(decisions)
+
+            self.logger.info(
+                "批量决策分析完成，%d 个候选生成 %d 个决策", len(candidates), len(validated_decisions)
+            )
+            return validated_decisions
+
+        except Exception as e:
+            self.logger.error("批量决策分析失败: %s", e)
+            return []
+
+    def _collect_candidates(self, optimization_results: Dict[str, Any]) -> CandidateBatch:
+        """
+        把优化结果展开为策略 × 交易对候选数组
+        """
+        symbols, strategy_ids, strategy_results, metrics = [], [], [], []
+
+        for symbol, symbol_results in optimization_results.items():
+            if "optimized_strategies" not in symbol_results:
+                continue
+
+            for strategy_id, strategy_result in symbol_results[
+                "optimized_strategies"
+            ].items():
+                symbols.append(symbol)
+                strategy_ids.append(strategy_id)
+                strategy_results.append(strategy_result)
+                metrics.append(
+                    (
+                        strategy_result.get("total_return", 0),
+                        strategy_result.get("max_drawdown", 0),
+                        strategy_result.get("sharpe_ratio", 0),
+                        strategy_result.get("win_rate", 0),
+                        strategy_result.get("profit_factor", 1),
+                    )
+                )
+
+        values = np.array(metrics, dtype=float).reshape(-1, 5)
+        return CandidateBatch(
+            symbols=symbols,
+            strategy_ids=strategy_ids,
+            strategy_results=strategy_results,
+            total_return=values[:, 0],
+            max_drawdown=np.abs(values[:, 1]),
+            sharpe_ratio=values[:, 2],
+            win_rate=values[:, 3],
+            profit_factor=values[:, 4],
+        )
+
+    def _score_candidates(
+        self, candidates: CandidateBatch, market_states: Dict[str, MarketState]
+    ) -> Dict[str, np.ndarray]:
+        """
+        向量化计算全部候选的各维度评分、综合评分、风险过滤、置信度与建议仓位
+
+        与 _evaluate_single_strategy / _calculate_market_fit_score /
+        _calculate_liquidity_score / _calculate_confidence / _risk_control_filter /
+        _calculate_position_size 的逐个计算口径一致
+        """
+        weights = self.strategy_weights
+        total_return = candidates.total_return
+        max_drawdown = candidates.max_drawdown
+        sharpe_ratio = candidates.sharpe_ratio
+        win_rate = candidates.win_rate
+
+        return_score = np.minimum(total_return * 100, 100)
+        risk_score = np.maximum(0, 100 - max_drawdown * 1000)
+        stability_score = np.minimum(sharpe_ratio * 20, 100)
+
+        # 策略特征与市场状态按候选展开
+        traits = [self._get_strategy_traits(s) for s in candidates.strategy_ids]
+        liquidity_score = np.array([t.liquidity_score for t in traits], dtype=float)
+        trend_following = np.array([t.trend_following for t in traits])
+        momentum = np.array([t.momentum for t in traits])
+        mean_reversion = np.array([t.mean_reversion for t in traits])
+        grid = np.array([t.grid for t in traits])
+        breakout = np.array([t.breakout for t in traits])
+
+        default_state = MarketState()
+        states = [market_states.get(s, default_state) for s in candidates.symbols]
+        bullish = np.array([state.trend == "bullish" for state in states])
+        bearish = np.array([state.trend == "bearish" for state in states])
+        volatility = np.array([state.volatility for state in states], dtype=float)
+        low_liquidity = np.array([state.liquidity == "low" for state in states])
+
+        # 市场适应性评分
+        market_fit = np.ones(len(candidates))
+        market_fit[bullish & trend_following] *= 1.2
+        market_fit[bullish & ~trend_following & mean_reversion] *= 0.8
+        market_fit[bearish & mean_reversion] *= 1.1
+        market_fit[bearish & ~mean_reversion & momentum] *= 0.9
+        market_fit[(volatility > 0.3) & grid] *= 1.1
+        market_fit[(volatility < 0.1) & breakout] *= 0.8
+        market_fit[low_liquidity] *= 0.9
+        market_fit = np.minimum(market_fit, 1.5)
+
+        total_score = (
+            return_score * weights.return_weight
+            + risk_score * weights.risk_weight
+            + stability_score * weights.stability_weight
+            + liquidity_score * weights.liquidity_weight
+        ) * market_fit
+
+        # 风险控制过滤
+        eligible = (
+            (max_drawdown <= self.risk_config.max_drawdown_threshold)
+            & (sharpe_ratio >= 0.5)
+            & (win_rate >= 0.4)
+            & (candidates.profit_factor >= 1.2)
+        )
+
+        # 决策置信度
+        sharpe_factor = np.clip(1 + (sharpe_ratio - 1) * 0.2, 0.8, 1.2)
+        win_rate_factor = np.clip(win_rate * 1.5, 0.8, 1.2)
+        confidence = np.clip(
+            total_score / 100 * sharpe_factor * win_rate_factor * market_fit, 0.1, 1.0
+        )
+
+        # 建议仓位
+        max_position = self.risk_config.max_position_size
+        position_size = np.clip(
+            max_position
+            * (total_score / 100)
+            * np.maximum(0.1, 1 - max_drawdown * 10)
+            * np.clip(sharpe_ratio, 0.5, 2.0),
+            0.01,
+            max_position,
+        )
+
+        return {
+            "return": return_score,
+            "risk": risk_score,
+            "stability": stability_score,
+            "liquidity": liquidity_score,
+            "market_fit": market_fit,
+            "total": total_score,
+            "eligible": eligible,
+            "confidence": confidence,
+            "position_size": position_size,
+        }
+
+    def _select_portfolio(
+        self, candidates: CandidateBatch, scores: Dict[str, np.ndarray]
+    ) -> List[int]:
+        """
+        在合并候选集上做一次组合优化：每个交易对取评分最高的合格策略，
+        再按评分取前 max_portfolio_strategies 个
+
+        Returns:
+            List[int]: 入选候选的下标（按评分降序）
+        """
+        eligible = np.flatnonzero(scores["eligible"])
+        if not len(eligible):
+            return []
+
+        symbol_codes = {}
+        codes = np.array(
+            [
+                symbol_codes.setdefault(candidates.symbols[i], len(symbol_codes))
+                for i in eligible
+            ]
+        )
+        total = scores["total"][eligible]
+
+        # 稳定排序：按交易对分组、组内评分降序，同分保留原顺序
+        order = np.lexsort((-total, codes))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = codes[order][1:] != codes[order][:-1]
+        best = order[first]
+
+        best = best[np.argsort(-total[best], kind="stable")]
+        return eligible[best[: self.max_portfolio_strategies]].tolist()
+
+    def _candidate_evaluation(
+        self, candidates: CandidateBatch, scores: Dict[str, np.ndarray], index: int
+    ) -> Dict[str, Any]:
+        """
+        把单个候选还原为与 _evaluate_single_strategy 一致的评估字典
+        """
+        return {
+            "symbol": candidates.symbols[index],
+            "strategy_id": candidates.strategy_ids[index],
+            "strategy_result": candidates.strategy_results[index],
+            "scores": {
+                name: float(scores[name][index])
+                for name in ("return", "risk", "stability", "liquidity", "market_fit")
+            },
+            "total_score": float(scores["total"][index]),
+            "key_metrics": {
+                "total_return": float(candidates.total_return[index]),
+                "max_drawdown": float(candidates.max_drawdown[index]),
+                "sharpe_ratio": float(candidates.sharpe_ratio[index]),
+                "win_rate": float(candidates.win_rate[index]),
+                "profit_factor": float(candidates.profit_factor[index]),
+            },
+            "recommended_position_size": float(scores["position_size"][index]),
+        }
+
+    def _stress_test_batch(
+        self, decisions: List[StrategyDecision]
+    ) -> List[StrategyDecision]:
+        """
+        向量化压力测试验证（决策 × 场景一次判定，口径同 _run_stress_test）
+        """
+        if not decisions or not self.stress_test_scenarios:
+            return decisions
+
+        expected_return = np.array([d.expected_return for d in decisions], dtype=float)
+        max_drawdown = np.array([d.max_drawdown for d in decisions], dtype=float)
+        market_drop = np.array(
+            [s["market_drop"] for s in self.stress_test_scenarios], dtype=float
+        )
+        volatility_spike = np.array(
+            [s["volatility_spike"] for s in self.stress_test_scenarios], dtype=float
+        )
+
+        failed = (
+            np.outer(max_drawdown, volatility_spike)
+            > self.risk_config.max_drawdown_threshold * 2
+        ) | (
+            np.outer(expected_return, 1 + market_drop)
+            < -self.risk_config.max_daily_loss * 5
+        )
+        passed = ~failed.any(axis=1)
+
+        for decision, ok in zip(decisions, passed):
+            if not ok:
+                self.logger.warning("策略 %s 未通过压力测试", decision.strategy_id)
+
+        validated_decisions = [d for d, ok in zip(decisions, passed) if ok]
+        self.logger.info("压力测试完成，%d/%d 个决策通过", len(validated_decisions), len(decisions))
+        return validated_decisions
+
     async def _update_market_state(self, market_data: Dict[str, Any]):
         """
         更新当前市场状态
         """
         try:
-            # 计算市场波动率
-            if "price_history" in market_data:
-                prices = np.array(market_data["price_history"])
-                returns = np.diff(np.log(prices))
-                self.current_market_state.volatility = np.std(returns) * np.sqrt(252)
-
-            # 判断市场趋势
-            if "trend_indicators" in market_data:
-                trend_score = market_data["trend_indicators"].get("trend_score", 0)
-                if trend_score > 0.1:
-                    self.current_market_state.trend = "bullish"
-                elif trend_score < -0.1:
-                    self.current_market_state.trend = "bearish"
-                else:
-                    self.current_market_state.trend = "neutral"
-
-            # 评估市场流动性
-            if "volume_data" in market_data:
-                avg_volume = np.mean(market_data["volume_data"])
-                recent_volume = market_data["volume_data"][-1]
-
-                if recent_volume > avg_volume * 1.5:
-                    self.current_market_state.liquidity = "high"
-                elif recent_volume < avg_volume * 0.5:
-                    self.current_market_state.liquidity = "low"
-                else:
-                    self.current_market_state.liquidity = "normal"
-
+            self._apply_market_data(self.current_market_state, market_data)
             self.logger.debug("市场状态更新: %s", self.current_market_state)
 
         except Exception as e:
             self.logger.warning("市场状态更新失败: %s", e)
 
+    def _apply_market_data(self, market_state: MarketState, market_data: Dict[str, Any]):
+        """
+        用市场数据更新给定的市场状态（缺失的字段保持原值）
+        """
+        # 计算市场波动率
+        if "price_history" in market_data:
+            prices = np.array(market_data["price_history"])
+            returns = np.diff(np.log(prices))
+            market_state.volatility = np.std(returns) * np.sqrt(252)
+
+        # 判断市场趋势
+        if "trend_indicators" in market_data:
+            trend_score = market_data["trend_indicators"].get("trend_score", 0)
+            if trend_score > 0.1:
+                market_state.trend = "bullish"
+            elif trend_score < -0.1:
+                market_state.trend = "bearish"
+            else:
+                market_state.trend = "neutral"
+
+        # 评估市场流动性
+        if "volume_data" in market_data:
+            avg_volume = np.mean(market_data["volume_data"])
+            recent_volume = market_data["volume_data"][-1]
+
+            if recent_volume > avg_volume * 1.5:
+                market_state.liquidity = "high"
+            elif recent_volume < avg_volume * 0.5:
+                market_state.liquidity = "low"
+            else:
+                market_state.liquidity = "normal"
+
     async def _evaluate_strategies(
         self, optimization_results: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
@@ -310,6 +659,24 @@ class DecisionEngine:
             self.logger.warning("策略评估失败 %s: %s", strategy_id, e)
             return None
 
+    def _get_strategy_traits(self, strategy_id: str) -> StrategyTraits:
+        """
+        获取策略类型特征（按策略ID缓存，避免重复的字符串匹配）
+        """
+        traits = self._strategy_traits.get(strategy_id)
+        if traits is None:
+            lowered = strategy_id.lower()
+            traits = StrategyTraits(
+                liquidity_score=self._calculate_liquidity_score(strategy_id),
+                trend_following="momentum" in lowered or "trend" in lowered,
+                momentum="momentum" in lowered,
+                mean_reversion="mean_reversion" in lowered,
+                grid="grid" in lowered,
+                breakout="breakout" in lowered,
+            )
+            self._strategy_traits[strategy_id] = traits
+        return traits
+
     def _calculate_liquidity_score(self, strategy_id: str) -> float:
         """
         计算策略流动性评分
@@ -337,27 +704,28 @@ class DecisionEngine:
         计算策略与当前市场的适应性评分
         """
         base_score = 1.0
+        traits = self._get_strategy_traits(strategy_id)
 
         # 根据市场趋势调整
         if self.current_market_state.trend == "bullish":
-            if "momentum" in strategy_id.lower() or "trend" in strategy_id.lower():
+            if traits.trend_following:
                 base_score *= 1.2  # 牛市中趋势策略表现更好
-            elif "mean_reversion" in strategy_id.lower():
+            elif traits.mean_reversion:
                 base_score *= 0.8  # 牛市中均值回归策略表现较差
 
         elif self.current_market_state.trend == "bearish":
-            if "mean_reversion" in strategy_id.lower():
+            if traits.mean_reversion:
                 base_score *= 1.1  # 熊市中均值回归策略可能表现更好
-            elif "momentum" in strategy_id.lower():
+            elif traits.momentum:
                 base_score *= 0.9  # 熊市中动量策略风险较高
 
         # 根据市场波动率调整
         volatility = self.current_market_state.volatility
         if volatility > 0.3:  # 高波动市场
-            if "grid" in strategy_id.lower():
+            if traits.grid:
                 base_score *= 1.1  # 网格策略在高波动中表现更好
         elif volatility < 0.1:  # 低波动市场
-            if "breakout" in strategy_id.lower():
+            if traits.breakout:
                 base_score *= 0.8  # 突破策略在低波动中表现较差
 
         # 根据流动性调整
@@ -445,8 +813,8 @@ class DecisionEngine:
         # 按总评分排序
         optimized_portfolio.sort(key=lambda x: x["total_score"], reverse=True)
 
-        # 限制组合大小（最多5个策略）
-        optimized_portfolio = optimized_portfolio[:5]
+        # 限制组合大小（默认最多5个策略）
+        optimized_portfolio = optimized_portfolio[: self.max_portfolio_strategies]
 
         self.logger.info("组合优化完成，选择 %d 个策略", len(optimized_portfolio))
         return optimized_portfolio
@@ -548,21 +916,27 @@ class DecisionEngine:
             return None
 
     def _determine_action(
-        self, strategy_result: Dict[str, Any], market_data: Dict[str, Any]
+        self,
+        strategy_result: Dict[str, Any],
+        market_data: Dict[str, Any],
+        market_state: Optional[MarketState] = None,
     ) -> str:
         """
         确定交易动作
         """
+        if market_state is None:
+            market_state = self.current_market_state
+
         # 基于策略信号确定动作
         signal = strategy_result.get("current_signal", "HOLD")
 
         # 考虑市场状态调整
-        if signal == "BUY" and self.current_market_state.trend == "bearish":
+        if signal == "BUY" and market_state.trend == "bearish":
             # 在熊市中谨慎买入
             if strategy_result.get("confidence", 0) < 0.8:
                 signal = "HOLD"
 
-        elif signal == "SELL" and self.current_market_state.trend == "bullish":
+        elif signal == "SELL" and market_state.trend == "bullish":
             # 在牛市中谨慎卖出
             if strategy_result.get("confidence", 0) < 0.8:
                 signal = "HOLD"
@@ -21,14 +21,23 @@ NeuroTrade Nexus (NTN) - Risk Manager
 
 import asyncio
 import logging
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
+from .metrics import compute_risk_metrics
+from .stress import (
+    PositionArrays,
+    ScenarioGrid,
+    portfolio_losses,
+    position_losses,
+)
+
 
 @dataclass
 class RiskControlConfig:
@@ -62,6 +71,97 @@ class RiskManagerState:
     emergency_mode: bool = False
 
 
+@lru_cache(maxsize=4096)
+def _base_asset(symbol: str) -> str:
+    """交易对的基础货币（BTC/USDT -> BTC），无分隔符时返回原符号"""
+    return symbol.split("/")[0]
+
+
+@dataclass
+class PortfolioAggregates:
+    """
+    组合风险增量聚合
+
+    仓位增删改时按差量更新，组合风险、相关性与敞口检查无需遍历全部仓位
+    """
+
+    total_value: float = 0.0
+    total_risk: float = 0.0
+    total_exposure: float = 0.0
+    position_count: int = 0
+    symbol_counts: Dict[str, int] = field(default_factory=dict)
+    base_asset_counts: Dict[str, int] = field(default_factory=dict)
+    strategy_counts: Dict[str, int] = field(default_factory=dict)
+    symbol_exposure: Dict[str, float] = field(default_factory=dict)
+    base_asset_exposure: Dict[str, float] = field(default_factory=dict)
+    strategy_exposure: Dict[str, float] = field(default_factory=dict)
+
+    def add(self, position: "PositionRisk"):
+        """计入一个仓位"""
+        self._apply(position, 1)
+
+    def remove(self, position: "PositionRisk"):
+        """移除一个仓位的贡献"""
+        self._apply(position, -1)
+
+    def reset(self):
+        """清空全部聚合"""
+        self.total_value = 0.0
+        self.total_risk = 0.0
+        self.total_exposure = 0.0
+        self.position_count = 0
+        for index in (
+            self.symbol_counts,
+            self.base_asset_counts,
+            self.strategy_counts,
+            self.symbol_exposure,
+            self.base_asset_exposure,
+            self.strategy_exposure,
+        ):
+            index.clear()
+
+    def _apply(self, position: "PositionRisk", sign: int):
+        self.position_count += sign
+        if self.position_count <= 0:
+            # 最后一个仓位移除时直接归零，避免浮点累加误差残留
+            self.reset()
+            return
+
+        value = abs(position.current_value)
+        exposure = abs(position.current_position)
+        self.total_value += sign * value
+        self.total_risk += sign * position.risk_score * value
+        self.total_exposure += sign * exposure
+
+        self._bump(self.symbol_counts, self.symbol_exposure, position.symbol, sign, exposure)
+        self._bump(
+            self.base_asset_counts,
+            self.base_asset_exposure,
+            _base_asset(position.symbol),
+            sign,
+            exposure,
+        )
+        self._bump(
+            self.strategy_counts, self.strategy_exposure, position.strategy_id, sign, exposure
+        )
+
+    @staticmethod
+    def _bump(
+        counts: Dict[str, int],
+        exposures: Dict[str, float],
+        key: str,
+        sign: int,
+        exposure: float,
+    ):
+        count = counts.get(key, 0) + sign
+        if count <= 0:
+            counts.pop(key, None)
+            exposures.pop(key, None)
+            return
+        counts[key] = count
+        exposures[key] = exposures.get(key, 0.0) + sign * exposure
+
+
 @dataclass
 class RiskManagerData:
     """风险管理器数据"""
@@ -70,10 +170,13 @@ class RiskManagerData:
     risk_metrics_history: List[Any] = None
     daily_pnl_history: List[float] = None
     stress_test_scenarios: List[Dict[str, Any]] = None
+    portfolio_aggregates: PortfolioAggregates = None
 
     def __post_init__(self):
         if self.current_positions is None:
             self.current_positions = {}
+        if self.portfolio_aggregates is None:
+            self.portfolio_aggregates = PortfolioAggregates()
         if self.risk_metrics_history is None:
             self.risk_metrics_history = []
         if self.daily_pnl_history is None:
@@ -141,6 +244,8 @@ class PositionRisk:
     take_profit_price: Optional[float]
     risk_level: RiskLevel
     last_updated: datetime
+    asset_class: str = "crypto"
+    beta: float = 1.0
 
 
 @dataclass
@@ -220,6 +325,9 @@ class RiskManager:
             )
         )
 
+        # 压力测试用的仓位数组，仓位变化时失效
+        self._position_arrays: Optional[PositionArrays] = None
+
         self.logger.info("风险管理器初始化完成")
 
     async def initialize(self):
@@ -234,6 +342,8 @@ class RiskManager:
             # 重置风险状态
             self.state.current_portfolio_risk = 0.0
             self.data.current_positions.clear()
+            self.data.portfolio_aggregates.reset()
+            self._position_arrays = None
             self.data.risk_metrics_history.clear()
             self.data.daily_pnl_history.clear()
 
@@ -308,7 +418,7 @@ class RiskManager:
                 stop_loss=stop_loss,
                 take_profit=take_profit,
                 timestamp=datetime.now(),
-                emergency_exit=self.emergency_mode,
+                emergency_exit=self.state.emergency_mode,
             )
 
             self.logger.debug(f"仓位风险评估完成: {symbol} - {action.value}")
@@ -378,22 +488,24 @@ class RiskManager:
     async def _calculate_correlation_risk(self, symbol: str, strategy_id: str) -> float:
         """
         计算与现有仓位的相关性风险
+
+        基于交易对、基础货币与策略的持仓计数索引，与仓位数量无关
         """
-        if not self.current_positions:
+        aggregates = self.data.portfolio_aggregates
+        if not aggregates.position_count:
             return 0.0
 
-        max_correlation = 0.0
-
-        for _pos_key, position in self.current_positions.items():
-            if position.symbol == symbol:
-                # 同一交易对的相关性风险
-                max_correlation = max(max_correlation, 0.8)
-            elif position.symbol.split("/")[0] == symbol.split("/")[0]:
-                # 同一基础货币的相关性风险
-                max_correlation = max(max_correlation, 0.6)
-            elif position.strategy_id == strategy_id:
-                # 同一策略的相关性风险
-                max_correlation = max(max_correlation, 0.5)
+        if symbol in aggregates.symbol_counts:
+            # 同一交易对的相关性风险
+            max_correlation = 0.8
+        elif _base_asset(symbol) in aggregates.base_asset_counts:
+            # 同一基础货币的相关性风险
+            max_correlation = 0.6
+        elif strategy_id in aggregates.strategy_counts:
+            # 同一策略的相关性风险
+            max_correlation = 0.5
+        else:
+            max_correlation = 0.0
 
         return min(1.0, max_correlation / self.risk_control_config.max_correlation)
 
@@ -438,7 +550,7 @@ class RiskManager:
             0.5,
             1
             - (
-                self.current_portfolio_risk
+                self.state.current_portfolio_risk
                 / self.risk_control_config.max_portfolio_risk
             ),
         )
@@ -454,7 +566,7 @@ class RiskManager:
         """
         确定风险控制动作
         """
-        if self.emergency_mode or risk_level == RiskLevel.CRITICAL:
+        if self.state.emergency_mode or risk_level == RiskLevel.CRITICAL:
             return ActionType.EMERGENCY_EXIT
         elif risk_level == RiskLevel.HIGH:
             return ActionType.BLOCK
@@ -520,10 +632,10 @@ class RiskManager:
 
         # 组合风险说明
         if (
-            self.current_portfolio_risk
+            self.state.current_portfolio_risk
             > self.risk_control_config.max_portfolio_risk * 0.8
         ):
-            reasons.append(f"组合风险接近上限: {self.current_portfolio_risk:.3f}")
+            reasons.append(f"组合风险接近上限: {self.state.current_portfolio_risk:.3f}")
 
         return "; ".join(reasons)
 
@@ -564,9 +676,18 @@ class RiskManager:
                 take_profit_price=position_data.get("take_profit_price"),
                 risk_level=self._determine_risk_level(risk_score),
                 last_updated=datetime.now(),
+                asset_class=position_data.get("asset_class", "crypto"),
+                beta=position_data.get("beta", 1.0),
             )
 
+            # 按差量更新组合聚合：先移除旧仓位贡献，再计入新仓位
+            aggregates = self.data.portfolio_aggregates
+            previous = self.data.current_positions.get(position_key)
+            if previous is not None:
+                aggregates.remove(previous)
             self.data.current_positions[position_key] = position_risk
+            aggregates.add(position_risk)
+            self._position_arrays = None
 
             # 更新组合风险
             await self._update_portfolio_risk()
@@ -576,24 +697,41 @@ class RiskManager:
         except Exception as e:
             self.logger.error(f"更新仓位失败: {e}")
 
+    async def remove_position(self, symbol: str, strategy_id: str) -> bool:
+        """
+        移除仓位（平仓）
+
+        Args:
+            symbol: 交易对符号
+            strategy_id: 策略ID
+
+        Returns:
+            bool: 仓位是否存在并已移除
+        """
+        position_key = f"{symbol}_{strategy_id}"
+        position = self.data.current_positions.pop(position_key, None)
+        if position is None:
+            return False
+
+        self.data.portfolio_aggregates.remove(position)
+        self._position_arrays = None
+        await self._update_portfolio_risk()
+
+        self.logger.debug(f"仓位移除完成: {position_key}")
+        return True
+
     async def _update_portfolio_risk(self):
         """
         更新组合风险
         """
-        if not self.data.current_positions:
+        aggregates = self.data.portfolio_aggregates
+        if not aggregates.position_count:
             self.state.current_portfolio_risk = 0.0
             return
 
-        # 计算组合总风险
-        total_risk = 0.0
-        total_value = 0.0
-
-        for position in self.data.current_positions.values():
-            position_value = abs(position.current_value)
-            position_risk = position.risk_score * position_value
-
-            total_risk += position_risk
-            total_value += position_value
+        # 组合总风险与总市值由增量聚合维护
+        total_risk = aggregates.total_risk
+        total_value = aggregates.total_value
 
         # 计算风险比例
         if total_value > 0:
@@ -615,13 +753,16 @@ class RiskManager:
             self.state.emergency_mode = False
 
     async def perform_stress_test(
-        self, scenarios: Optional[List[Dict[str, Any]]] = None
+        self,
+        scenarios: Optional[List[Dict[str, Any]]] = None,
+        include_position_impacts: bool = True,
     ) -> Dict[str, Any]:
         """
         执行压力测试
 
         Args:
             scenarios: 压力测试场景，如果为None则使用默认场景
+            include_position_impacts: 是否输出逐仓位影响明细
 
         Returns:
             Dict[str, Any]: 压力测试结果
@@ -635,10 +776,43 @@ class RiskManager:
             "scenarios": {},
         }
 
-        for scenario in scenarios:
-            scenario_name = scenario["name"]
-            scenario_result = await self._run_stress_scenario(scenario)
-            stress_test_results["scenarios"][scenario_name] = scenario_result
+        positions = self._get_position_arrays()
+        grid = ScenarioGrid.from_scenarios(scenarios)
+        # 场景 × 仓位损失矩阵一次算出
+        losses = position_losses(positions, grid)
+        total_losses = losses.sum(axis=1)
+        total_portfolio_value = float(positions.values.sum())
+
+        for i, scenario in enumerate(scenarios):
+            scenario_result = {
+                "scenario_name": scenario["name"],
+                "parameters": scenario,
+                "position_impacts": {},
+                "total_loss": 0.0,
+                "max_drawdown": 0.0,
+                "survival_probability": 0.0,
+            }
+
+            if include_position_impacts:
+                for pos_key, value, loss in zip(
+                    positions.keys, positions.values.tolist(), losses[i].tolist()
+                ):
+                    scenario_result["position_impacts"][pos_key] = {
+                        "current_value": value,
+                        "stress_loss": loss,
+                        "loss_percentage": loss / value if value > 0 else 0,
+                    }
+
+            # 计算组合层面的影响
+            if total_portfolio_value > 0:
+                total_loss = float(total_losses[i])
+                scenario_result["total_loss"] = total_loss
+                scenario_result["max_drawdown"] = total_loss / total_portfolio_value
+                scenario_result["survival_probability"] = max(
+                    0, 1 - scenario_result["max_drawdown"] / 0.5
+                )
+
+            stress_test_results["scenarios"][scenario["name"]] = scenario_result
 
         # 计算整体压力测试评分
         stress_test_results["overall_score"] = self._calculate_stress_test_score(
@@ -648,69 +822,80 @@ class RiskManager:
         self.logger.info(f"压力测试完成，整体评分: {stress_test_results['overall_score']:.3f}")
         return stress_test_results
 
-    async def _run_stress_scenario(self, scenario: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        运行单个压力测试场景
+    async def run_stress_grid(
+        self, grid: ScenarioGrid, worst_count: int = 10
+    ) -> Dict[str, Any]:
         """
-        scenario_result = {
-            "scenario_name": scenario["name"],
-            "parameters": scenario,
-            "position_impacts": {},
-            "total_loss": 0.0,
-            "max_drawdown": 0.0,
-            "survival_probability": 0.0,
-        }
+        在大规模场景网格上执行压力测试
 
-        total_portfolio_value = sum(
-            pos.current_value for pos in self.data.current_positions.values()
-        )
-        total_loss = 0.0
+        只计算组合层面损失，适合在每次再平衡前运行上万个场景
 
-        for pos_key, position in self.data.current_positions.items():
-            # 计算该仓位在压力场景下的损失
-            position_loss = self._calculate_position_stress_loss(position, scenario)
-
-            scenario_result["position_impacts"][pos_key] = {
-                "current_value": position.current_value,
-                "stress_loss": position_loss,
-                "loss_percentage": position_loss / position.current_value
-                if position.current_value > 0
-                else 0,
-            }
+        Args:
+            grid: 场景网格（历史回放、蒙特卡洛或配置场景）
+            worst_count: 输出的最差场景数量
 
-            total_loss += position_loss
+        Returns:
+            Dict[str, Any]: 压力测试汇总，losses/max_drawdowns 为逐场景数组
+        """
+        positions = self._get_position_arrays()
+        losses = portfolio_losses(positions, grid)
+        total_portfolio_value = float(positions.values.sum())
 
-        # 计算组合层面的影响
-        if total_portfolio_value > 0:
-            scenario_result["total_loss"] = total_loss
-            scenario_result["max_drawdown"] = total_loss / total_portfolio_value
-            scenario_result["survival_probability"] = max(
-                0, 1 - scenario_result["max_drawdown"] / 0.5
-            )
+        if total_portfolio_value > 0 and len(grid):
+            max_drawdowns = losses / total_portfolio_value
+            survival = np.maximum(0.0, 1 - max_drawdowns / 0.5)
+        else:
+            max_drawdowns = np.zeros(len(grid))
+            survival = np.zeros(len(grid))
 
-        return scenario_result
+        result = {
+            "timestamp": datetime.now().isoformat(),
+            "scenario_count": len(grid),
+            "position_count": len(positions),
+            "total_portfolio_value": total_portfolio_value,
+            "losses": losses,
+            "max_drawdowns": max_drawdowns,
+            "worst_scenarios": [],
+            "loss_95": 0.0,
+            "loss_99": 0.0,
+            "expected_shortfall_95": 0.0,
+            "overall_score": 0.0,
+        }
+        if not len(grid):
+            return result
 
-    def _calculate_position_stress_loss(
-        self, position: PositionRisk, scenario: Dict[str, Any]
-    ) -> float:
-        """
-        计算仓位在压力场景下的损失
-        """
-        # 基础市场冲击
-        market_drop = scenario.get("market_drop", 0)
-        base_loss = position.current_value * abs(market_drop)
-
-        # 波动率冲击
-        volatility_spike = scenario.get("volatility_spike", 1.0)
-        volatility_loss = (
-            position.current_value * position.risk_score * (volatility_spike - 1) * 0.1
+        # 一次分区同时得到两个分位点
+        count = len(losses)
+        k95 = min(count - 1, int(np.ceil(0.95 * count)) - 1)
+        k99 = min(count - 1, int(np.ceil(0.99 * count)) - 1)
+        partitioned = np.partition(losses, [k95, k99])
+        worst = np.argsort(losses)[::-1][:worst_count]
+
+        result.update(
+            {
+                "worst_scenarios": [
+                    {"scenario_name": grid.names[i], "total_loss": float(losses[i])}
+                    for i in worst
+                ],
+                "loss_95": float(partitioned[k95]),
+                "loss_99": float(partitioned[k99]),
+                "expected_shortfall_95": float(partitioned[k95:].mean()),
+                "overall_score": float(survival.mean() * 100),
+            }
         )
 
-        # 流动性冲击
-        liquidity_drop = scenario.get("liquidity_drop", 0)
-        liquidity_loss = position.current_value * liquidity_drop * 0.05
+        self.logger.info(
+            f"场景网格压力测试完成: {len(grid)} 个场景, 99%损失 {result['loss_99']:.2f}"
+        )
+        return result
 
-        return base_loss + volatility_loss + liquidity_loss
+    def _get_position_arrays(self) -> PositionArrays:
+        """获取打包后的仓位数组（仓位未变化时复用）"""
+        if self._position_arrays is None:
+            self._position_arrays = PositionArrays.from_positions(
+                self.data.current_positions
+            )
+        return self._position_arrays
 
     def _calculate_stress_test_score(self, scenario_results: Dict[str, Any]) -> float:
         """
@@ -746,6 +931,14 @@ class RiskManager:
                 "emergency_mode": self.state.emergency_mode,
                 "risk_utilization": self.state.current_portfolio_risk
                 / self.risk_control_config.max_portfolio_risk,
+                "total_value": self.data.portfolio_aggregates.total_value,
+                "total_exposure": self.data.portfolio_aggregates.total_exposure,
+                "base_asset_exposure": dict(
+                    self.data.portfolio_aggregates.base_asset_exposure
+                ),
+                "strategy_exposure": dict(
+                    self.data.portfolio_aggregates.strategy_exposure
+                ),
             },
             "position_details": {},
             "risk_metrics": {},
@@ -792,7 +985,7 @@ class RiskManager:
         # 高风险仓位建议
         high_risk_positions = [
             pos
-            for pos in self.current_positions.values()
+            for pos in self.data.current_positions.values()
             if pos.risk_level in [RiskLevel.HIGH, RiskLevel.CRITICAL]
         ]
 
@@ -800,7 +993,7 @@ class RiskManager:
             recommendations.append(f"发现 {len(high_risk_positions)} 个高风险仓位，建议重点监控")
 
         # 紧急模式建议
-        if self.emergency_mode:
+        if self.state.emergency_mode:
             recommendations.append("当前处于紧急模式，建议立即减少风险敞口")
 
         return recommendations
@@ -880,7 +1073,10 @@ class RiskManager:
             raise
 
     async def check_position_limits(
-        self, symbol: str, proposed_size: float, current_portfolio: Dict[str, float]
+        self,
+        symbol: str,
+        proposed_size: float,
+        current_portfolio: Optional[Dict[str, float]] = None,
     ) -> Dict[str, Any]:
         """
         检查仓位限制
@@ -888,7 +1084,7 @@ class RiskManager:
         Args:
             symbol: 交易对符号
             proposed_size: 建议仓位大小
-            current_portfolio: 当前组合仓位
+            current_portfolio: 当前组合仓位，为None时使用风险管理器维护的持仓聚合（O(1)）
 
         Returns:
             Dict[str, Any]: 检查结果
@@ -899,18 +1095,22 @@ class RiskManager:
                 proposed_size <= self.risk_control_config.max_position_size
             )
 
+            if current_portfolio is None:
+                aggregates = self.data.portfolio_aggregates
+                current_exposure = aggregates.total_exposure
+                symbol_exposure = aggregates.symbol_exposure.get(symbol)
+            else:
+                current_exposure = sum(abs(size) for size in current_portfolio.values())
+                symbol_exposure = current_portfolio.get(symbol)
+
             # 检查组合风险限制
-            total_exposure = sum(
-                abs(size) for size in current_portfolio.values()
-            ) + abs(proposed_size)
+            total_exposure = current_exposure + abs(proposed_size)
             portfolio_approved = total_exposure <= 1.0  # 总敞口不超过100%
 
             # 检查相关性风险
             correlation_approved = True
-            if symbol in current_portfolio:
-                total_symbol_exposure = abs(current_portfolio[symbol]) + abs(
-                    proposed_size
-                )
+            if symbol_exposure is not None:
+                total_symbol_exposure = abs(symbol_exposure) + abs(proposed_size)
                 correlation_approved = (
                     total_symbol_exposure <= self.risk_control_config.max_position_size
                 )
@@ -980,32 +1180,17 @@ class RiskManager:
                 self.logger.warning("回测结果数据不足，使用默认风险指标")
                 return self._get_default_risk_metrics()
 
-            # 转换为numpy数组进行计算
-            returns_array = np.array(returns)
-            equity_array = np.array(equity_curve)
-
-            # 计算基础风险指标
-            risk_metrics = {
-                "max_drawdown": self._calculate_max_drawdown(equity_array),
-                "volatility": np.std(returns_array) * np.sqrt(252),  # 年化波动率
-                "sharpe_ratio": self._calculate_sharpe_ratio(returns_array),
-                "sortino_ratio": self._calculate_sortino_ratio(returns_array),
-                "var_95": np.percentile(returns_array, 5),  # 95% VaR
-                "var_99": np.percentile(returns_array, 1),  # 99% VaR
-                "skewness": self._calculate_skewness(returns_array),
-                "kurtosis": self._calculate_kurtosis(returns_array),
-                "calmar_ratio": self._calculate_calmar_ratio(
-                    returns_array, equity_array
-                ),
-                "win_rate": self._calculate_win_rate(returns_array),
-                "profit_factor": self._calculate_profit_factor(returns_array),
-                "timestamp": datetime.now().isoformat(),
-            }
+            # 融合内核一次计算全部指标（矩、回撤、盈亏汇总、两个VaR分位）
+            risk_metrics = compute_risk_metrics(
+                np.asarray(returns, dtype=float), np.asarray(equity_curve, dtype=float)
+            )
+            current_drawdown = risk_metrics.pop("current_drawdown")
+            risk_metrics["timestamp"] = datetime.now().isoformat()
 
             # 保存到历史记录
             risk_metrics_obj = RiskMetrics(
                 max_drawdown=risk_metrics["max_drawdown"],
-                current_drawdown=self._calculate_current_drawdown(equity_array),
+                current_drawdown=current_drawdown,
                 sharpe_ratio=risk_metrics["sharpe_ratio"],
                 sortino_ratio=risk_metrics["sortino_ratio"],
                 var_95=risk_metrics["var_95"],
@@ -1018,11 +1203,11 @@ class RiskManager:
                 timestamp=datetime.now(),
             )
 
-            self.risk_metrics_history.append(risk_metrics_obj)
+            self.data.risk_metrics_history.append(risk_metrics_obj)
 
             # 保持历史记录在合理范围内
-            if len(self.risk_metrics_history) > 100:
-                self.risk_metrics_history = self.risk_metrics_history[-100:]
+            if len(self.data.risk_metrics_history) > 100:
+                self.data.risk_metrics_history = self.data.risk_metrics_history[-100:]
 
             self.logger.debug("风险指标计算完成")
             return risk_metrics
@@ -1050,137 +1235,6 @@ class RiskManager:
             "timestamp": datetime.now().isoformat(),
         }
 
-    def _calculate_max_drawdown(self, equity_curve: np.ndarray) -> float:
-        """
-        计算最大回撤
-        """
-        if len(equity_curve) == 0:
-            return 0.0
-
-        peak = np.maximum.accumulate(equity_curve)
-        drawdown = (equity_curve - peak) / peak
-        return abs(np.min(drawdown))
-
-    def _calculate_current_drawdown(self, equity_curve: np.ndarray) -> float:
-        """
-        计算当前回撤
-        """
-        if len(equity_curve) == 0:
-            return 0.0
-
-        peak = np.max(equity_curve)
-        current_value = equity_curve[-1]
-        return abs((current_value - peak) / peak) if peak > 0 else 0.0
-
-    def _calculate_sharpe_ratio(
-        self, returns: np.ndarray, risk_free_rate: float = 0.02
-    ) -> float:
-        """
-        计算夏普比率
-        """
-        if len(returns) == 0 or np.std(returns) == 0:
-            return 0.0
-
-        excess_returns = np.mean(returns) * 252 - risk_free_rate  # 年化超额收益
-        volatility = np.std(returns) * np.sqrt(252)  # 年化波动率
-
-        return excess_returns / volatility if volatility > 0 else 0.0
-
-    def _calculate_sortino_ratio(
-        self, returns: np.ndarray, risk_free_rate: float = 0.02
-    ) -> float:
-        """
-        计算索提诺比率
-        """
-        if len(returns) == 0:
-            return 0.0
-
-        excess_returns = np.mean(returns) * 252 - risk_free_rate
-        downside_returns = returns[returns < 0]
-
-        if len(downside_returns) == 0:
-            return float("inf") if excess_returns > 0 else 0.0
-
-        downside_deviation = np.std(downside_returns) * np.sqrt(252)
-
-        return excess_returns / downside_deviation if downside_deviation > 0 else 0.0
-
-    def _calculate_skewness(self, returns: np.ndarray) -> float:
-        """
-        计算偏度
-        """
-        if len(returns) < 3:
-            return 0.0
-
-        mean_return = np.mean(returns)
-        std_return = np.std(returns)
-
-        if std_return == 0:
-            return 0.0
-
-        skewness = np.mean(((returns - mean_return) / std_return) ** 3)
-        return skewness
-
-    def _calculate_kurtosis(self, returns: np.ndarray) -> float:
-        """
-        计算峰度
-        """
-        if len(returns) < 4:
-            return 0.0
-
-        mean_return = np.mean(returns)
-        std_return = np.std(returns)
-
-        if std_return == 0:
-            return 0.0
-
-        kurtosis = np.mean(((returns - mean_return) / std_return) ** 4) - 3
-        return kurtosis
-
-    def _calculate_calmar_ratio(
-        self, returns: np.ndarray, equity_curve: np.ndarray
-    ) -> float:
-        """
-        计算卡玛比率
-        """
-        if len(returns) == 0 or len(equity_curve) == 0:
-            return 0.0
-
-        annual_return = np.mean(returns) * 252
-        max_drawdown = self._calculate_max_drawdown(equity_curve)
-
-        return annual_return / max_drawdown if max_drawdown > 0 else 0.0
-
-    def _calculate_win_rate(self, returns: np.ndarray) -> float:
-        """
-        计算胜率
-        """
-        if len(returns) == 0:
-            return 0.0
-
-        winning_trades = np.sum(returns > 0)
-        total_trades = len(returns)
-
-        return winning_trades / total_trades if total_trades > 0 else 0.0
-
-    def _calculate_profit_factor(self, returns: np.ndarray) -> float:
-        """
-        计算盈利因子
-        """
-        if len(returns) == 0:
-            return 1.0
-
-        gross_profit = np.sum(returns[returns > 0])
-        gross_loss = abs(np.sum(returns[returns < 0]))
-
-        return (
-            gross_profit / gross_loss
-            if gross_loss > 0
-            else float("inf")
-            if gross_profit > 0
-            else 1.0
-        )
-
     async def cleanup(self):
         """
         清理资源
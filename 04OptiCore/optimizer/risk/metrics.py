@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+风险指标计算内核
+NeuroTrade Nexus (NTN) - Risk Metrics Kernel
+
+核心功能：
+1. 融合计算：一次中心化得到各阶矩，收益/亏损汇总与回撤共用中间结果
+2. 单次分区同时得到 95%/99% VaR（与 np.percentile 线性插值一致）
+3. 增量累加器：新收益到达时按批合并矩与回撤状态，无需重算历史
+
+指标口径与逐项计算一致：总体标准差、252 个交易日年化、无风险利率 2%
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+TRADING_DAYS = 252
+RISK_FREE_RATE = 0.02
+VAR_LEVELS = (5.0, 1.0)
+
+
+@dataclass
+class ReturnMoments:
+    """收益率样本的数量、均值与二至四阶中心矩之和"""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    m3: float = 0.0
+    m4: float = 0.0
+
+    @classmethod
+    def from_array(cls, values: np.ndarray) -> "ReturnMoments":
+        """由一批数据计算（中心化后复用平方项）"""
+        count = len(values)
+        if count == 0:
+            return cls()
+        mean = float(values.mean())
+        deviations = values - mean
+        squared = deviations * deviations
+        return cls(
+            count=count,
+            mean=mean,
+            m2=float(squared.sum()),
+            m3=float(np.dot(squared, deviations)),
+            m4=float(np.dot(squared, squared)),
+        )
+
+    def merge(self, other: "ReturnMoments") -> "ReturnMoments":
+        """合并两批数据的矩（Pébay 并行公式）"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            return other
+
+        na, nb = self.count, other.count
+        n = na + nb
+        delta = other.mean - self.mean
+        delta_n = delta / n
+        cross = na * nb * delta * delta_n
+
+        return ReturnMoments(
+            count=n,
+            mean=self.mean + nb * delta_n,
+            m2=self.m2 + other.m2 + cross,
+            m3=self.m3
+            + other.m3
+            + cross * delta_n * (na - nb)
+            + 3 * delta_n * (na * other.m2 - nb * self.m2),
+            m4=self.m4
+            + other.m4
+            + cross * delta_n * delta_n * (na * na - na * nb + nb * nb)
+            + 6 * delta_n * delta_n * (na * na * other.m2 + nb * nb * self.m2)
+            + 4 * delta_n * (na * other.m3 - nb * self.m3),
+        )
+
+    @property
+    def std(self) -> float:
+        """总体标准差"""
+        return float(np.sqrt(self.m2 / self.count)) if self.count else 0.0
+
+
+@dataclass
+class DrawdownState:
+    """权益曲线的历史峰值、最深回撤与最新权益"""
+
+    peak: float = -np.inf
+    min_drawdown: float = 0.0
+    last: float = 0.0
+    count: int = 0
+
+    def update(self, equity: np.ndarray) -> "DrawdownState":
+        """按时间顺序追加一段权益曲线"""
+        if len(equity) == 0:
+            return self
+        peaks = np.maximum.accumulate(equity)
+        if self.count:
+            np.maximum(peaks, self.peak, out=peaks)
+        drawdown = (equity - peaks) / peaks
+        return DrawdownState(
+            peak=float(peaks[-1]),
+            min_drawdown=min(self.min_drawdown, float(drawdown.min()))
+            if self.count
+            else float(drawdown.min()),
+            last=float(equity[-1]),
+            count=self.count + len(equity),
+        )
+
+    @property
+    def max_drawdown(self) -> float:
+        return abs(self.min_drawdown) if self.count else 0.0
+
+    @property
+    def current_drawdown(self) -> float:
+        if not self.count or self.peak <= 0:
+            return 0.0
+        return abs((self.last - self.peak) / self.peak)
+
+
+@dataclass
+class ReturnTotals:
+    """收益/亏损汇总与下行样本的矩"""
+
+    wins: int = 0
+    gross_profit: float = 0.0
+    gross_loss: float = 0.0
+    downside: ReturnMoments = None
+
+    def __post_init__(self):
+        if self.downside is None:
+            self.downside = ReturnMoments()
+
+    @classmethod
+    def from_array(cls, returns: np.ndarray, total: float) -> "ReturnTotals":
+        losses = returns[returns < 0]
+        gross_loss = -float(losses.sum())
+        return cls(
+            wins=int(np.count_nonzero(returns > 0)),
+            # 零收益不计入任何一侧，总和加回亏损即为盈利总额
+            gross_profit=total + gross_loss,
+            gross_loss=gross_loss,
+            downside=ReturnMoments.from_array(losses),
+        )
+
+    def merge(self, other: "ReturnTotals") -> "ReturnTotals":
+        return ReturnTotals(
+            wins=self.wins + other.wins,
+            gross_profit=self.gross_profit + other.gross_profit,
+            gross_loss=self.gross_loss + other.gross_loss,
+            downside=self.downside.merge(other.downside),
+        )
+
+
+def percentiles(values: np.ndarray, levels: Sequence[float]) -> Tuple[float, ...]:
+    """
+    单次分区计算多个分位点（线性插值，与 np.percentile 默认口径一致）
+
+    Args:
+        values: 样本
+        levels: 百分位（0-100）
+
+    Returns:
+        Tuple[float, ...]: 各分位点
+    """
+    count = len(values)
+    positions = [level / 100.0 * (count - 1) for level in levels]
+    bounds = sorted(
+        {int(np.floor(p)) for p in positions} | {int(np.ceil(p)) for p in positions}
+    )
+    partitioned = np.partition(values, bounds)
+
+    results = []
+    for position in positions:
+        low = int(np.floor(position))
+        high = int(np.ceil(position))
+        weight = position - low
+        results.append(
+            float(partitioned[low] + (partitioned[high] - partitioned[low]) * weight)
+        )
+    return tuple(results)
+
+
+def _finalize(
+    moments: ReturnMoments,
+    totals: ReturnTotals,
+    drawdown: DrawdownState,
+    var_95: float,
+    var_99: float,
+    risk_free_rate: float,
+) -> Dict[str, Any]:
+    """由累积统计量得出全部指标"""
+    count = moments.count
+    std = moments.std
+    annual_return = moments.mean * TRADING_DAYS
+    excess_return = annual_return - risk_free_rate
+    volatility = std * np.sqrt(TRADING_DAYS)
+
+    sharpe_ratio = excess_return / volatility if std > 0 else 0.0
+
+    if totals.downside.count == 0:
+        sortino_ratio = float("inf") if excess_return > 0 else 0.0
+    else:
+        downside_deviation = totals.downside.std * np.sqrt(TRADING_DAYS)
+        sortino_ratio = (
+            excess_return / downside_deviation if downside_deviation > 0 else 0.0
+        )
+
+    skewness = moments.m3 / count / std**3 if count >= 3 and std > 0 else 0.0
+    kurtosis = moments.m4 / count / std**4 - 3 if count >= 4 and std > 0 else 0.0
+
+    max_drawdown = drawdown.max_drawdown
+    if totals.gross_loss > 0:
+        profit_factor = totals.gross_profit / totals.gross_loss
+    else:
+        profit_factor = float("inf") if totals.gross_profit > 0 else 1.0
+
+    return {
+        "max_drawdown": max_drawdown,
+        "current_drawdown": drawdown.current_drawdown,
+        "volatility": volatility,
+        "sharpe_ratio": sharpe_ratio,
+        "sortino_ratio": sortino_ratio,
+        "var_95": var_95,
+        "var_99": var_99,
+        "skewness": skewness,
+        "kurtosis": kurtosis,
+        "calmar_ratio": annual_return / max_drawdown if max_drawdown > 0 else 0.0,
+        "win_rate": totals.wins / count if count else 0.0,
+        "profit_factor": profit_factor,
+    }
+
+
+def compute_risk_metrics(
+    returns: np.ndarray,
+    equity_curve: np.ndarray,
+    risk_free_rate: float = RISK_FREE_RATE,
+) -> Dict[str, Any]:
+    """
+    融合计算一组收益率与权益曲线的全部风险指标
+
+    Args:
+        returns: 收益率序列
+        equity_curve: 权益曲线
+        risk_free_rate: 年化无风险利率
+
+    Returns:
+        Dict[str, Any]: 风险指标（含 current_drawdown）
+    """
+    returns = np.asarray(returns, dtype=float)
+    moments = ReturnMoments.from_array(returns)
+    totals = ReturnTotals.from_array(returns, moments.mean * moments.count)
+    drawdown = DrawdownState().update(np.asarray(equity_curve, dtype=float))
+    var_95, var_99 = percentiles(returns, VAR_LEVELS)
+    return _finalize(moments, totals, drawdown, var_95, var_99, risk_free_rate)
+
+
+class RiskMetricsAccumulator:
+    """
+    风险指标增量累加器
+
+    新收益按批合并到矩与回撤状态中；VaR 需要完整样本，收益率保存在按倍数扩容的缓冲区中，
+    快照时做一次分区
+
+    Args:
+        risk_free_rate: 年化无风险利率
+        initial_capacity: 收益缓冲区初始容量
+    """
+
+    def __init__(
+        self, risk_free_rate: float = RISK_FREE_RATE, initial_capacity: int = 1024
+    ):
+        self.risk_free_rate = risk_free_rate
+        self.moments = ReturnMoments()
+        self.totals = ReturnTotals()
+        self.drawdown = DrawdownState()
+        self._buffer = np.empty(max(1, initial_capacity))
+
+    @property
+    def count(self) -> int:
+        return self.moments.count
+
+    def update(
+        self,
+        returns: Sequence[float],
+        equity_curve: Optional[Sequence[float]] = None,
+    ):
+        """
+        追加新到达的收益率（及对应权益点）
+
+        Args:
+            returns: 新收益率，可为单个值或序列
+            equity_curve: 新权益点，默认按最新权益与收益率复利推算
+        """
+        returns = np.atleast_1d(np.asarray(returns, dtype=float))
+        if len(returns) == 0:
+            return
+
+        if equity_curve is None:
+            if not self.drawdown.count:
+                raise ValueError("首次更新需要提供权益曲线")
+            equity = self.drawdown.last * np.cumprod(1 + returns)
+        else:
+            equity = np.atleast_1d(np.asarray(equity_curve, dtype=float))
+
+        batch = ReturnMoments.from_array(returns)
+        self.totals = self.totals.merge(
+            ReturnTotals.from_array(returns, batch.mean * batch.count)
+        )
+        self._append(returns)
+        self.moments = self.moments.merge(batch)
+        self.drawdown = self.drawdown.update(equity)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """当前全部风险指标"""
+        if not self.count:
+            raise ValueError("尚无收益数据")
+        var_95, var_99 = percentiles(self._buffer[: self.count], VAR_LEVELS)
+        return _finalize(
+            self.moments,
+            self.totals,
+            self.drawdown,
+            var_95,
+            var_99,
+            self.risk_free_rate,
+        )
+
+    def _append(self, returns: np.ndarray):
+        needed = self.count + len(returns)
+        if needed > len(self._buffer):
+            grown = np.empty(max(needed, 2 * len(self._buffer)))
+            grown[: self.count] = self._buffer[: self.count]
+            self._buffer = grown
+        self._buffer[self.count : needed] = returns
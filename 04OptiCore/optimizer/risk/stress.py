@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+压力测试场景网格
+NeuroTrade Nexus (NTN) - Vectorized Stress Scenarios
+
+核心功能：
+1. 仓位打包为数组（市值、风险评分、资产类别、Beta）
+2. 场景表示为冲击矩阵（场景 × 资产类别）
+3. 仓位 × 场景损失由单个矩阵表达式计算
+4. 场景网格生成：历史回放与相关因子蒙特卡洛
+
+损失模型（与逐仓位计算等价）：
+    loss = -shock[类别] * value * beta
+           + value * risk_score * (volatility_spike - 1) * 0.1
+           + value * liquidity_drop * 0.05
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# 场景未单独给出某资产类别冲击时使用的市场整体冲击列
+MARKET_FACTOR = "market"
+
+VOLATILITY_LOSS_FACTOR = 0.1
+LIQUIDITY_LOSS_FACTOR = 0.05
+
+
+@dataclass
+class PositionArrays:
+    """仓位数组（按仓位键顺序对齐）"""
+
+    keys: List[str]
+    values: np.ndarray
+    risk_scores: np.ndarray
+    betas: np.ndarray
+    class_codes: np.ndarray
+    asset_classes: List[str]
+
+    @classmethod
+    def from_positions(cls, positions: Dict[str, Any]) -> "PositionArrays":
+        """
+        从仓位字典打包
+
+        Args:
+            positions: 仓位键 -> PositionRisk
+
+        Returns:
+            PositionArrays: 仓位数组
+        """
+        count = len(positions)
+        values = np.empty(count)
+        risk_scores = np.empty(count)
+        betas = np.empty(count)
+        class_codes = np.empty(count, dtype=np.intp)
+        class_index: Dict[str, int] = {}
+
+        for i, position in enumerate(positions.values()):
+            values[i] = position.current_value
+            risk_scores[i] = position.risk_score
+            betas[i] = position.beta
+            class_codes[i] = class_index.setdefault(
+                position.asset_class, len(class_index)
+            )
+
+        return cls(
+            keys=list(positions),
+            values=values,
+            risk_scores=risk_scores,
+            betas=betas,
+            class_codes=class_codes,
+            asset_classes=list(class_index),
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def columns_in(self, grid: "ScenarioGrid") -> np.ndarray:
+        """每个仓位在场景冲击矩阵中的列号，未知资产类别落到市场列"""
+        grid_index = {name: i for i, name in enumerate(grid.asset_classes)}
+        market = grid_index[MARKET_FACTOR]
+        mapping = np.array(
+            [grid_index.get(name, market) for name in self.asset_classes],
+            dtype=np.intp,
+        )
+        return mapping[self.class_codes]
+
+
+@dataclass
+class ScenarioGrid:
+    """场景网格：冲击矩阵与场景级波动率、流动性冲击"""
+
+    names: List[str]
+    asset_classes: List[str]
+    shocks: np.ndarray  # (场景数, 资产类别数)，收益率冲击
+    volatility_spikes: np.ndarray  # (场景数,)
+    liquidity_drops: np.ndarray  # (场景数,)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_scenarios(cls, scenarios: Sequence[Dict[str, Any]]) -> "ScenarioGrid":
+        """
+        从配置场景构建网格
+
+        market_drop 按绝对值视为下跌幅度；asset_class_shocks 可按资产类别覆盖市场冲击
+
+        Args:
+            scenarios: 场景配置列表
+
+        Returns:
+            ScenarioGrid: 场景网格
+        """
+        asset_classes = [MARKET_FACTOR]
+        for scenario in scenarios:
+            for name in scenario.get("asset_class_shocks", {}):
+                if name not in asset_classes:
+                    asset_classes.append(name)
+        column = {name: i for i, name in enumerate(asset_classes)}
+
+        shocks = np.empty((len(scenarios), len(asset_classes)))
+        for i, scenario in enumerate(scenarios):
+            shocks[i, :] = -abs(scenario.get("market_drop", 0))
+            for name, shock in scenario.get("asset_class_shocks", {}).items():
+                shocks[i, column[name]] = -abs(shock)
+
+        return cls(
+            names=[scenario["name"] for scenario in scenarios],
+            asset_classes=asset_classes,
+            shocks=shocks,
+            volatility_spikes=np.array(
+                [scenario.get("volatility_spike", 1.0) for scenario in scenarios],
+                dtype=float,
+            ),
+            liquidity_drops=np.array(
+                [scenario.get("liquidity_drop", 0) for scenario in scenarios],
+                dtype=float,
+            ),
+        )
+
+    @classmethod
+    def concat(cls, grids: Sequence["ScenarioGrid"]) -> "ScenarioGrid":
+        """合并多个网格，资产类别取并集，缺失列使用市场冲击"""
+        asset_classes = [MARKET_FACTOR]
+        for grid in grids:
+            asset_classes.extend(
+                name for name in grid.asset_classes if name not in asset_classes
+            )
+
+        blocks = []
+        for grid in grids:
+            block = np.repeat(
+                grid.shocks[:, [grid.asset_classes.index(MARKET_FACTOR)]],
+                len(asset_classes),
+                axis=1,
+            )
+            for j, name in enumerate(grid.asset_classes):
+                block[:, asset_classes.index(name)] = grid.shocks[:, j]
+            blocks.append(block)
+
+        return cls(
+            names=[name for grid in grids for name in grid.names],
+            asset_classes=asset_classes,
+            shocks=np.vstack(blocks),
+            volatility_spikes=np.concatenate([g.volatility_spikes for g in grids]),
+            liquidity_drops=np.concatenate([g.liquidity_drops for g in grids]),
+        )
+
+
+def position_losses(positions: PositionArrays, grid: ScenarioGrid) -> np.ndarray:
+    """
+    计算每个场景下每个仓位的损失
+
+    Args:
+        positions: 仓位数组
+        grid: 场景网格
+
+    Returns:
+        np.ndarray: (场景数, 仓位数) 损失矩阵
+    """
+    columns = positions.columns_in(grid)
+    values = positions.values
+    return (
+        -grid.shocks[:, columns] * (values * positions.betas)
+        + np.outer(
+            (grid.volatility_spikes - 1) * VOLATILITY_LOSS_FACTOR,
+            values * positions.risk_scores,
+        )
+        + np.outer(grid.liquidity_drops * LIQUIDITY_LOSS_FACTOR, values)
+    )
+
+
+def portfolio_losses(positions: PositionArrays, grid: ScenarioGrid) -> np.ndarray:
+    """
+    计算每个场景下的组合总损失
+
+    损失对仓位线性，先按资产类别汇总 Beta 敞口，避免构造完整的仓位 × 场景矩阵
+
+    Args:
+        positions: 仓位数组
+        grid: 场景网格
+
+    Returns:
+        np.ndarray: (场景数,) 组合损失
+    """
+    values = positions.values
+    class_exposure = np.bincount(
+        positions.columns_in(grid),
+        weights=values * positions.betas,
+        minlength=len(grid.asset_classes),
+    )
+    return (
+        -(grid.shocks @ class_exposure)
+        + (grid.volatility_spikes - 1)
+        * (VOLATILITY_LOSS_FACTOR * float(values @ positions.risk_scores))
+        + grid.liquidity_drops * (LIQUIDITY_LOSS_FACTOR * float(values.sum()))
+    )
+
+
+def _derived_stress(
+    shocks: np.ndarray, scale: np.ndarray, liquidity_sensitivity: float
+):
+    """由冲击幅度推导波动率放大倍数（标准化冲击的均方根）与流动性下降（最大跌幅）"""
+    standardized = shocks / np.where(scale > 0, scale, 1.0)
+    volatility_spikes = np.maximum(1.0, np.sqrt(np.mean(standardized**2, axis=1)))
+    liquidity_drops = np.clip(-shocks.min(axis=1) * liquidity_sensitivity, 0.0, 1.0)
+    return volatility_spikes, liquidity_drops
+
+
+def historical_replay_scenarios(
+    returns: np.ndarray,
+    asset_classes: Sequence[str],
+    window: int = 1,
+    step: int = 1,
+    liquidity_sensitivity: float = 1.0,
+    prefix: str = "historical",
+) -> ScenarioGrid:
+    """
+    历史回放场景：每个滚动窗口的复合收益构成一个场景
+
+    Args:
+        returns: (时间, 资产类别) 历史收益率
+        asset_classes: 列对应的资产类别，缺少市场列时以各列均值补充
+        window: 回放窗口长度
+        step: 窗口步长
+        liquidity_sensitivity: 流动性下降对最大跌幅的敏感度
+        prefix: 场景名前缀
+
+    Returns:
+        ScenarioGrid: 场景网格
+    """
+    returns = np.asarray(returns, dtype=float)
+    if returns.ndim == 1:
+        returns = returns[:, None]
+    asset_classes = list(asset_classes)
+    if MARKET_FACTOR not in asset_classes:
+        returns = np.column_stack([returns.mean(axis=1), returns])
+        asset_classes = [MARKET_FACTOR] + asset_classes
+    if len(returns) < window:
+        raise ValueError("历史数据长度不足一个回放窗口")
+
+    log_growth = np.vstack(
+        [np.zeros(returns.shape[1]), np.cumsum(np.log1p(returns), axis=0)]
+    )
+    starts = np.arange(0, len(returns) - window + 1, step)
+    shocks = np.expm1(log_growth[starts + window] - log_growth[starts])
+
+    scale = returns.std(axis=0) * np.sqrt(window)
+    volatility_spikes, liquidity_drops = _derived_stress(
+        shocks, scale, liquidity_sensitivity
+    )
+    return ScenarioGrid(
+        names=[f"{prefix}_{start}" for start in starts],
+        asset_classes=asset_classes,
+        shocks=shocks,
+        volatility_spikes=volatility_spikes,
+        liquidity_drops=liquidity_drops,
+    )
+
+
+def monte_carlo_scenarios(
+    n_scenarios: int,
+    asset_classes: Sequence[str],
+    covariance: np.ndarray,
+    mean: Optional[np.ndarray] = None,
+    degrees_of_freedom: Optional[float] = None,
+    liquidity_sensitivity: float = 1.0,
+    seed: Optional[int] = None,
+    prefix: str = "monte_carlo",
+) -> ScenarioGrid:
+    """
+    蒙特卡洛场景：按协方差矩阵生成相关因子冲击
+
+    Args:
+        n_scenarios: 场景数
+        asset_classes: 因子对应的资产类别，需包含市场列
+        covariance: 因子协方差矩阵（按场景持有期）
+        mean: 因子均值，默认为0
+        degrees_of_freedom: 设置时使用多元t分布生成厚尾冲击
+        liquidity_sensitivity: 流动性下降对最大跌幅的敏感度
+        seed: 随机种子
+        prefix: 场景名前缀
+
+    Returns:
+        ScenarioGrid: 场景网格
+    """
+    asset_classes = list(asset_classes)
+    if MARKET_FACTOR not in asset_classes:
+        raise ValueError(f"蒙特卡洛因子必须包含 {MARKET_FACTOR} 列")
+    covariance = np.atleast_2d(np.asarray(covariance, dtype=float))
+    factor_count = len(asset_classes)
+    if covariance.shape != (factor_count, factor_count):
+        raise ValueError("协方差矩阵维度与资产类别数量不一致")
+
+    try:
+        loading = np.linalg.cholesky(covariance)
+    except np.linalg.LinAlgError:
+        # 半正定协方差（如估计样本不足）退化为特征分解
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        loading = eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+
+    rng = np.random.default_rng(seed)
+    draws = rng.standard_normal((n_scenarios, factor_count))
+    if degrees_of_freedom:
+        draws *= np.sqrt(
+            degrees_of_freedom / rng.chisquare(degrees_of_freedom, size=(n_scenarios, 1))
+        )
+
+    shocks = draws @ loading.T
+    if mean is not None:
+        shocks += np.asarray(mean, dtype=float)
+    # 收益率不低于-100%
+    np.maximum(shocks, -1.0, out=shocks)
+
+    volatility_spikes, liquidity_drops = _derived_stress(
+        shocks, np.sqrt(np.diag(covariance)), liquidity_sensitivity
+    )
+    return ScenarioGrid(
+        names=[f"{prefix}_{i}" for i in range(n_scenarios)],
+        asset_classes=asset_classes,
+        shocks=shocks,
+        volatility_spikes=volatility_spikes,
+        liquidity_drops=liquidity_drops,
+    )
@@ -7,7 +7,8 @@ NeuroTrade Nexus (NTN) - Decision Engine Unit Tests
 测试用例：
 1. UNIT-DECISION-ENGINE-01: 决策引擎批准路径测试
 2. UNIT-DECISION-ENGINE-02: 决策引擎拒绝路径测试（高回撤）
-3. 其他边界条件测试
+3. UNIT-DECISION-ENGINE-06: 观察列表批量决策与逐交易对决策一致
+4. 其他边界条件测试
 """
 
 import asyncio
@@ -16,6 +17,8 @@ from datetime import datetime
 from typing import Any, Dict, List
 from unittest.mock import MagicMock, Mock, patch
 
+import numpy as np
+
 # 导入被测试的模块
 from optimizer.decision.engine import DecisionEngine, StrategyDecision
 
@@ -423,6 +426,83 @@ class TestDecisionEngineUnit(unittest.TestCase):
 
         asyncio.run(run_test())
 
+    def test_unit_decision_engine_06_batch_decisions(self):
+        """
+        UNIT-DECISION-ENGINE-06: 批量决策
+
+        向量化评分后的批量决策与逐交易对调用 make_decision 的结果一致
+        """
+        rng = np.random.default_rng(21)
+        strategy_types = ["momentum", "mean_reversion", "grid", "breakout", "ma_crossover"]
+        trend_scores = [0.3, -0.3, 0.0, 0.3]
+
+        optimization_results = {}
+        market_snapshot = {}
+        for i, trend_score in enumerate(trend_scores):
+            symbol = f"SYM{i}USDT"
+            optimization_results[symbol] = {
+                "optimized_strategies": {
+                    f"{strategy_type}_{j}": {
+                        "total_return": float(rng.uniform(0.05, 0.4)),
+                        "sharpe_ratio": float(rng.uniform(0.4, 3.0)),
+                        "max_drawdown": -float(rng.uniform(0.01, 0.12)),
+                        "win_rate": float(rng.uniform(0.35, 0.75)),
+                        "profit_factor": float(rng.uniform(1.0, 2.5)),
+                        "current_signal": ["BUY", "SELL"][j % 2],
+                        "confidence": float(rng.uniform(0.5, 1.0)),
+                    }
+                    for j, strategy_type in enumerate(strategy_types)
+                }
+            }
+            prices = 100 * np.cumprod(1 + rng.normal(0, 0.01 + 0.02 * i, 30))
+            market_snapshot[symbol] = {
+                "price_history": prices.tolist(),
+                "volume_data": [1000] * 29 + [300 if i == 2 else 1000],
+                "trend_indicators": {"trend_score": trend_score},
+                "current_price": float(prices[-1]),
+            }
+
+        async def run_test():
+            expected = []
+            for symbol, symbol_results in optimization_results.items():
+                engine = DecisionEngine(self.test_config)
+                market_data = dict(market_snapshot[symbol])
+                market_data["current_price"] = {symbol: market_data["current_price"]}
+                expected.extend(
+                    await engine.make_decision({symbol: symbol_results}, market_data)
+                )
+
+            batch = await self.decision_engine.make_batch_decisions(
+                optimization_results, market_snapshot
+            )
+            return expected, batch
+
+        expected, batch = asyncio.run(run_test())
+
+        self.assertGreater(len(batch), 1)
+        self.assertEqual(
+            sorted((d.symbol, d.strategy_id) for d in batch),
+            sorted((d.symbol, d.strategy_id) for d in expected),
+        )
+        expected_by_symbol = {d.symbol: d for d in expected}
+        for decision in batch:
+            reference = expected_by_symbol[decision.symbol]
+            self.assertEqual(decision.action, reference.action)
+            self.assertAlmostEqual(decision.confidence, reference.confidence, places=9)
+            self.assertAlmostEqual(decision.position_size, reference.position_size, places=9)
+            self.assertAlmostEqual(decision.risk_score, reference.risk_score, places=9)
+            self.assertEqual(decision.stop_loss, reference.stop_loss)
+            self.assertEqual(decision.reasoning, reference.reasoning)
+
+        # 组合上限作用于合并后的候选集
+        self.decision_engine.max_portfolio_strategies = 1
+        batch = asyncio.run(
+            self.decision_engine.make_batch_decisions(
+                optimization_results, market_snapshot
+            )
+        )
+        self.assertLessEqual(len(batch), 1)
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
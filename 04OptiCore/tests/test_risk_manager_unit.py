@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+风险管理器单元测试
+NeuroTrade Nexus (NTN) - Risk Manager Unit Tests
+
+测试用例：
+1. UNIT-RISK-MANAGER-01: 组合风险增量聚合与逐仓位重算结果一致
+2. UNIT-RISK-MANAGER-02: 相关性风险与仓位限制检查使用持仓索引
+3. UNIT-RISK-MANAGER-03: 向量化压力测试与场景网格生成
+4. UNIT-RISK-MANAGER-04: 融合风险指标内核与增量累加器
+"""
+
+import asyncio
+import random
+import time
+import unittest
+
+import numpy as np
+
+from optimizer.risk.manager import RiskManager
+from optimizer.risk.metrics import RiskMetricsAccumulator, compute_risk_metrics
+from optimizer.risk.stress import (
+    ScenarioGrid,
+    historical_replay_scenarios,
+    monte_carlo_scenarios,
+)
+
+
+class TestRiskManagerUnit(unittest.TestCase):
+    """
+    风险管理器单元测试类
+    """
+
+    def setUp(self):
+        """测试用例初始化"""
+        self.risk_manager = RiskManager({"max_portfolio_risk": 0.05})
+        asyncio.run(self.risk_manager.initialize())
+
+    def _update(self, symbol: str, strategy_id: str, size: float, value: float):
+        asyncio.run(
+            self.risk_manager.update_position(
+                symbol,
+                strategy_id,
+                {
+                    "position_size": size,
+                    "current_value": value,
+                    "metrics": {"sharpe_ratio": 1.5, "volatility": 0.2},
+                },
+            )
+        )
+
+    def test_unit_risk_manager_01_incremental_aggregates(self):
+        """
+        UNIT-RISK-MANAGER-01: 增删改仓位后聚合与逐仓位重算一致
+        """
+        rng = random.Random(7)
+        symbols = ["BTC/USDT", "BTC/ETH", "ETH/USDT", "SOL/USDT", "DOGEUSDT"]
+        strategies = ["ma_cross", "rsi", "grid"]
+
+        for _ in range(200):
+            symbol, strategy_id = rng.choice(symbols), rng.choice(strategies)
+            if rng.random() < 0.2:
+                asyncio.run(self.risk_manager.remove_position(symbol, strategy_id))
+            else:
+                self._update(
+                    symbol,
+                    strategy_id,
+                    rng.uniform(-0.1, 0.1),
+                    rng.uniform(-5000, 5000),
+                )
+
+            positions = self.risk_manager.data.current_positions.values()
+            aggregates = self.risk_manager.data.portfolio_aggregates
+            total_value = sum(abs(p.current_value) for p in positions)
+            total_risk = sum(p.risk_score * abs(p.current_value) for p in positions)
+            self.assertEqual(aggregates.position_count, len(positions))
+            self.assertAlmostEqual(aggregates.total_value, total_value, places=6)
+            self.assertAlmostEqual(aggregates.total_risk, total_risk, places=6)
+            self.assertAlmostEqual(
+                aggregates.total_exposure,
+                sum(abs(p.current_position) for p in positions),
+                places=9,
+            )
+            self.assertEqual(
+                set(aggregates.base_asset_counts),
+                {p.symbol.split("/")[0] for p in positions},
+            )
+            for strategy_id, exposure in aggregates.strategy_exposure.items():
+                self.assertAlmostEqual(
+                    exposure,
+                    sum(
+                        abs(p.current_position)
+                        for p in positions
+                        if p.strategy_id == strategy_id
+                    ),
+                    places=9,
+                )
+            expected_risk = total_risk / total_value if total_value > 0 else 0.0
+            self.assertAlmostEqual(
+                self.risk_manager.state.current_portfolio_risk, expected_risk, places=9
+            )
+
+        # 全部平仓后聚合归零
+        for key in list(self.risk_manager.data.current_positions):
+            position = self.risk_manager.data.current_positions[key]
+            asyncio.run(
+                self.risk_manager.remove_position(position.symbol, position.strategy_id)
+            )
+        aggregates = self.risk_manager.data.portfolio_aggregates
+        self.assertEqual(aggregates.total_value, 0.0)
+        self.assertEqual(aggregates.base_asset_counts, {})
+        self.assertEqual(self.risk_manager.state.current_portfolio_risk, 0.0)
+
+    def test_unit_risk_manager_02_correlation_and_limits(self):
+        """
+        UNIT-RISK-MANAGER-02: 同交易对 > 同基础货币 > 同策略；仓位限制检查读取持仓聚合
+        """
+        correlation = self.risk_manager._calculate_correlation_risk
+        max_correlation = self.risk_manager.risk_control_config.max_correlation
+
+        self.assertEqual(asyncio.run(correlation("BTC/USDT", "rsi")), 0.0)
+
+        self._update("BTC/USDT", "ma_cross", 0.05, 1000.0)
+        self._update("ETH/USDT", "grid", 0.04, 800.0)
+
+        self.assertAlmostEqual(
+            asyncio.run(correlation("BTC/USDT", "rsi")), min(1.0, 0.8 / max_correlation)
+        )
+        self.assertAlmostEqual(
+            asyncio.run(correlation("BTC/EUR", "rsi")), 0.6 / max_correlation
+        )
+        self.assertAlmostEqual(
+            asyncio.run(correlation("SOL/USDT", "grid")), 0.5 / max_correlation
+        )
+        self.assertEqual(asyncio.run(correlation("SOL/USDT", "rsi")), 0.0)
+
+        # 评估路径不再因属性缺失退化为保守决策
+        decision = asyncio.run(
+            self.risk_manager.evaluate_position_risk(
+                "SOL/USDT", "rsi", 0.02, 100.0, {"sharpe_ratio": 2.0, "volatility": 0.1}
+            )
+        )
+        self.assertNotEqual(decision.reasoning, "风险评估失败，采用保守策略")
+
+        # 同交易对叠加超出单仓位上限
+        result = asyncio.run(self.risk_manager.check_position_limits("BTC/USDT", 0.06))
+        self.assertTrue(result["position_check"])
+        self.assertFalse(result["correlation_check"])
+        self.assertFalse(result["approved"])
+
+        result = asyncio.run(self.risk_manager.check_position_limits("SOL/USDT", 0.06))
+        self.assertTrue(result["approved"])
+
+        # 显式传入组合时保持原有行为
+        result = asyncio.run(
+            self.risk_manager.check_position_limits(
+                "SOL/USDT", 0.05, {"BTC/USDT": 0.5, "ETH/USDT": 0.5}
+            )
+        )
+        self.assertFalse(result["portfolio_check"])
+
+    def test_unit_risk_manager_03_vectorized_stress_grid(self):
+        """
+        UNIT-RISK-MANAGER-03: 配置场景结果与逐仓位公式一致；万级场景网格在一秒内完成
+        """
+        rng = np.random.default_rng(11)
+        asset_classes = ["crypto", "defi", "equity"]
+
+        async def populate():
+            for i in range(2000):
+                await self.risk_manager.update_position(
+                    f"C{i}/USDT",
+                    f"s{i % 7}",
+                    {
+                        "position_size": 0.0004,
+                        "current_value": float(rng.uniform(100, 1000)),
+                        "asset_class": asset_classes[i % 3],
+                        "beta": float(rng.uniform(0.5, 1.5)),
+                        "metrics": {"volatility": 0.2},
+                    },
+                )
+
+        asyncio.run(populate())
+
+        scenarios = self.risk_manager.data.stress_test_scenarios + [
+            {
+                "name": "defi_unwind",
+                "market_drop": -0.05,
+                "asset_class_shocks": {"defi": -0.4},
+                "volatility_spike": 3.0,
+            }
+        ]
+        result = asyncio.run(self.risk_manager.perform_stress_test(scenarios))
+        positions = self.risk_manager.data.current_positions.values()
+        for scenario in scenarios:
+            shocks = scenario.get("asset_class_shocks", {})
+            expected = sum(
+                p.current_value
+                * p.beta
+                * abs(shocks.get(p.asset_class, scenario["market_drop"]))
+                + p.current_value
+                * p.risk_score
+                * (scenario.get("volatility_spike", 1.0) - 1)
+                * 0.1
+                + p.current_value * scenario.get("liquidity_drop", 0) * 0.05
+                for p in positions
+            )
+            scenario_result = result["scenarios"][scenario["name"]]
+            self.assertAlmostEqual(scenario_result["total_loss"], expected, places=4)
+            self.assertEqual(len(scenario_result["position_impacts"]), 2000)
+
+        # 配置场景作为网格运行时与逐场景结果一致
+        grid_result = asyncio.run(
+            self.risk_manager.run_stress_grid(ScenarioGrid.from_scenarios(scenarios))
+        )
+        np.testing.assert_allclose(
+            grid_result["losses"],
+            [result["scenarios"][s["name"]]["total_loss"] for s in scenarios],
+        )
+
+        # 历史回放：窗口复合收益
+        history = rng.normal(0.0, 0.03, size=(500, 3))
+        replay = historical_replay_scenarios(history, asset_classes, window=5)
+        self.assertEqual(len(replay), 496)
+        self.assertEqual(replay.asset_classes[0], "market")
+        self.assertAlmostEqual(
+            replay.shocks[3, 1], np.prod(1 + history[3:8, 0]) - 1, places=12
+        )
+
+        # 蒙特卡洛：因子相关性与协方差一致
+        covariance = np.array(
+            [
+                [0.04, 0.03, 0.02, 0.01],
+                [0.03, 0.05, 0.02, 0.01],
+                [0.02, 0.02, 0.09, 0.0],
+                [0.01, 0.01, 0.0, 0.02],
+            ]
+        )
+        simulated = monte_carlo_scenarios(
+            10000 - len(replay), ["market"] + asset_classes, covariance, seed=3
+        )
+        np.testing.assert_allclose(
+            np.cov(simulated.shocks.T), covariance, atol=0.01
+        )
+
+        grid = ScenarioGrid.concat([replay, simulated])
+        self.assertEqual(len(grid), 10000)
+        started = time.perf_counter()
+        grid_result = asyncio.run(self.risk_manager.run_stress_grid(grid))
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(grid_result["scenario_count"], 10000)
+        self.assertGreaterEqual(grid_result["loss_99"], grid_result["loss_95"])
+        self.assertGreaterEqual(
+            grid_result["expected_shortfall_95"], grid_result["loss_95"]
+        )
+        self.assertEqual(
+            grid_result["worst_scenarios"][0]["total_loss"],
+            float(grid_result["losses"].max()),
+        )
+
+    def test_unit_risk_manager_04_fused_metrics_kernel(self):
+        """
+        UNIT-RISK-MANAGER-04: 融合内核与逐项计算一致；分批增量更新与整体计算一致
+        """
+        rng = np.random.default_rng(5)
+        returns = rng.standard_t(4, size=1000) * 0.01 + 0.0005
+        equity = 10000 * np.cumprod(1 + returns)
+
+        metrics = asyncio.run(
+            self.risk_manager.calculate_risk_metrics(
+                {"returns": returns.tolist(), "equity_curve": equity.tolist()}
+            )
+        )
+
+        std = np.std(returns)
+        excess = np.mean(returns) * 252 - 0.02
+        peak = np.maximum.accumulate(equity)
+        max_drawdown = abs(np.min((equity - peak) / peak))
+        downside = returns[returns < 0]
+        expected = {
+            "max_drawdown": max_drawdown,
+            "volatility": std * np.sqrt(252),
+            "sharpe_ratio": excess / (std * np.sqrt(252)),
+            "sortino_ratio": excess / (np.std(downside) * np.sqrt(252)),
+            "var_95": np.percentile(returns, 5),
+            "var_99": np.percentile(returns, 1),
+            "skewness": np.mean(((returns - returns.mean()) / std) ** 3),
+            "kurtosis": np.mean(((returns - returns.mean()) / std) ** 4) - 3,
+            "calmar_ratio": np.mean(returns) * 252 / max_drawdown,
+            "win_rate": np.sum(returns > 0) / len(returns),
+            "profit_factor": np.sum(returns[returns > 0]) / abs(np.sum(downside)),
+        }
+        for name, value in expected.items():
+            self.assertAlmostEqual(metrics[name], value, places=9, msg=name)
+        self.assertAlmostEqual(
+            self.risk_manager.data.risk_metrics_history[-1].current_drawdown,
+            abs((equity[-1] - equity.max()) / equity.max()),
+            places=12,
+        )
+
+        # 分批到达的收益增量合并
+        accumulator = RiskMetricsAccumulator(initial_capacity=8)
+        accumulator.update(returns[:1], equity[:1])
+        for start in range(1, 1000, 37):
+            accumulator.update(returns[start : start + 37])
+        snapshot = accumulator.snapshot()
+        batch = compute_risk_metrics(returns, equity)
+        self.assertEqual(accumulator.count, 1000)
+        for name, value in batch.items():
+            self.assertAlmostEqual(snapshot[name], value, places=9, msg=name)
+
+        # 边界：无下行、常数收益
+        flat = compute_risk_metrics(np.full(10, 2.0**-7), np.linspace(1, 2, 10))
+        self.assertEqual(flat["sharpe_ratio"], 0.0)
+        self.assertEqual(flat["sortino_ratio"], float("inf"))
+        self.assertEqual(flat["profit_factor"], float("inf"))
+        self.assertEqual(flat["max_drawdown"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
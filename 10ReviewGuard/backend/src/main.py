@@ -23,13 +23,13 @@ try:
     from .models.database import db_manager, StrategyReview, ReviewDecision, User
     from .services.review_service import ReviewService
     from .services.zmq_service import ZMQService
-    from .utils.auth import AuthManager
+    from .utils.auth import AuthManager, PermissionManager
     from .utils.config import get_settings
 except ImportError:  # Fallback when running without package context (e.g., `from main import app`)
     from models.database import db_manager, StrategyReview, ReviewDecision, User
     from services.review_service import ReviewService
     from services.zmq_service import ZMQService
-    from utils.auth import AuthManager
+    from utils.auth import AuthManager, PermissionManager
     from utils.config import get_settings
 
 # 设置
@@ -176,6 +176,14 @@ class LoginRequest(BaseModel):
     password: str
 
 
+class AuditRuleUpdateRequest(BaseModel):
+    rule_name: Optional[str] = None
+    rule_type: Optional[str] = Field(None, pattern="^(auto_approve|auto_reject|require_review)$")
+    conditions: Optional[Dict[str, Any]] = None
+    action: Optional[str] = None
+    is_active: Optional[bool] = None
+
+
 class PaginationResponse(BaseModel):
     total: int
     data: List[Dict[str, Any]]
@@ -623,17 +631,39 @@ async def get_review_history(
 async def get_audit_rules(
     current_user: User = Depends(get_current_user)
 ):
-    """获取审核规则配置"""
+    """获取审核规则配置及命中统计"""
     try:
         rules = await review_service.get_audit_rules()
         return {
             "success": True,
-            "data": rules
+            "data": rules,
+            "statistics": review_service.get_rule_statistics()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.put("/api/config/rules/{rule_id}")
+async def update_audit_rule(
+    rule_id: str,
+    request: AuditRuleUpdateRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """更新审核规则，审核服务随即重新编译规则"""
+    if not PermissionManager.can_manage_rules(current_user.role):
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    try:
+        updated = await review_service.update_audit_rule(rule_id, request.dict(exclude_none=True))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if not updated:
+        raise HTTPException(status_code=404, detail="Rule not found")
+    return {
+        "success": True,
+        "statistics": review_service.get_rule_statistics()
+    }
+
+
 @app.get("/api/monitor/status")
 async def get_system_status(
     current_user: User = Depends(get_current_user)
@@ -297,7 +297,69 @@ class DatabaseService:
         await self.connection.commit()
         logger.info(f"已创建审核决策记录: {decision_id}")
         return decision_id
-    
+
+    async def create_review_batch(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Optional[str]]]:
+        """
+        在单个事务中批量写入审核记录及其自动审核决策
+
+        Args:
+            entries: 每项包含 strategy_data、status 与可选的 decision（决策数据）
+
+        Returns:
+            List[Dict[str, Optional[str]]]: 与输入对齐的 review_id 与 decision_id
+        """
+        import uuid
+        import json
+
+        reviews = []
+        decisions = []
+        ids = []
+        for entry in entries:
+            strategy_data = entry['strategy_data']
+            review_id = f"review_{uuid.uuid4().hex[:8]}"
+            reviews.append((
+                review_id,
+                strategy_data.get('strategy_id'),
+                strategy_data.get('symbol'),
+                strategy_data.get('strategy_type'),
+                strategy_data.get('expected_return'),
+                strategy_data.get('max_drawdown'),
+                strategy_data.get('risk_level'),
+                entry.get('status', 'pending'),
+                json.dumps(strategy_data)
+            ))
+
+            decision_id = None
+            decision_data = entry.get('decision')
+            if decision_data:
+                decision_id = f"decision_{uuid.uuid4().hex[:8]}"
+                decisions.append((
+                    decision_id,
+                    review_id,
+                    decision_data.get('reviewer_id'),
+                    decision_data.get('decision'),
+                    decision_data.get('reason'),
+                    json.dumps(decision_data.get('risk_adjustment', {}))
+                ))
+            ids.append({'review_id': review_id, 'decision_id': decision_id})
+
+        async with self.transaction() as connection:
+            await connection.executemany("""
+                INSERT INTO strategy_reviews (
+                    id, strategy_id, symbol, strategy_type, expected_return,
+                    max_drawdown, risk_level, status, raw_data
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, reviews)
+            if decisions:
+                await connection.executemany("""
+                    INSERT INTO review_decisions (
+                        id, strategy_review_id, reviewer_id, decision, reason, risk_adjustment
+                    ) VALUES (?, ?, ?, ?, ?, ?)
+                """, decisions)
+
+        logger.info(f"已批量创建审核记录: {len(reviews)} 条，决策: {len(decisions)} 条")
+        return ids
+
     async def get_review_history(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
         """获取审核历史"""
         cursor = await self.connection.execute("""
@@ -324,4 +386,28 @@ class DatabaseService:
         rows = await cursor.fetchall()
         columns = [description[0] for description in cursor.description]
         
-        return [dict(zip(columns, row)) for row in rows]
\ No newline at end of file
+        return [dict(zip(columns, row)) for row in rows]
+    
+    async def update_audit_rule(self, rule_id: str, updates: Dict[str, Any]) -> bool:
+        """更新审核规则，返回规则是否存在"""
+        import json
+        
+        columns = ('rule_name', 'rule_type', 'conditions', 'action', 'is_active')
+        fields = {key: value for key, value in updates.items() if key in columns and value is not None}
+        if isinstance(fields.get('conditions'), dict):
+            fields['conditions'] = json.dumps(fields['conditions'])
+        if not fields:
+            cursor = await self.connection.execute("SELECT 1 FROM audit_rules WHERE id = ?", (rule_id,))
+            return await cursor.fetchone() is not None
+        
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        cursor = await self.connection.execute(
+            f"UPDATE audit_rules SET {assignments} WHERE id = ?",
+            (*fields.values(), rule_id)
+        )
+        await self.connection.commit()
+        
+        if cursor.rowcount == 0:
+            return False
+        logger.info(f"已更新审核规则: {rule_id}")
+        return True
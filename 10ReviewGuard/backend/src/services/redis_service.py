@@ -345,7 +345,46 @@ class RedisService:
         """获取缓存的审核结果"""
         key = f"review_result:{review_id}"
         return await self.get(key)
-    
+
+    async def write_review_batch(self, strategies: Dict[str, Dict[str, Any]],
+                                 review_results: Dict[str, Dict[str, Any]],
+                                 queue_items: List[Dict[str, Any]],
+                                 counters: Dict[str, int],
+                                 strategy_expire: int = 1800,
+                                 result_expire: int = 3600) -> bool:
+        """
+        通过单个管道批量写入审核批次的缓存、队列与计数器
+
+        Args:
+            strategies: 策略ID -> 策略数据
+            review_results: 审核ID -> 审核结果
+            queue_items: 待人工审核队列项（按入队顺序）
+            counters: 计数器名称 -> 增量
+            strategy_expire: 策略数据过期时间（秒）
+            result_expire: 审核结果过期时间（秒）
+        """
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+
+            for strategy_id, data in strategies.items():
+                pipe.setex(f"{self.CACHE_PREFIX}strategy:{strategy_id}", strategy_expire,
+                           json.dumps(data, ensure_ascii=False))
+            for review_id, result in review_results.items():
+                pipe.setex(f"{self.CACHE_PREFIX}review_result:{review_id}", result_expire,
+                           json.dumps(result, ensure_ascii=False))
+            if queue_items:
+                pipe.lpush(f"{self.QUEUE_PREFIX}pending_reviews",
+                           *[json.dumps(item, ensure_ascii=False) for item in queue_items])
+            for counter_name, amount in counters.items():
+                if amount:
+                    pipe.incrby(f"{self.CACHE_PREFIX}counter:{counter_name}", amount)
+
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"批量写入审核缓存失败: {e}")
+            return False
+
     async def get_system_stats(self) -> Dict[str, Any]:
         """获取系统统计信息"""
         try:
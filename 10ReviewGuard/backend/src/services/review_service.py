@@ -36,6 +36,7 @@ try:
 except ImportError:
     from utils.logger import setup_logger
 from .report_generator import ReportGenerator
+from .rule_table import RuleDecisionTable, CompiledRule
 
 logger = setup_logger(__name__)
 
@@ -75,8 +76,9 @@ class ReviewService:
         self.max_position_size = float(os.getenv("MAX_POSITION_SIZE", "0.1"))
         self.max_risk_level = os.getenv("MAX_RISK_LEVEL", "medium")
         
-        # 审核规则缓存
+        # 审核规则缓存（原始规则与编译后的决策表）
         self._audit_rules_cache = None
+        self._rule_table = RuleDecisionTable()
         self._cache_expire_time = None
     
     async def initialize(self):
@@ -88,33 +90,56 @@ class ReviewService:
         
         logger.info("审核服务初始化完成")
     
-    async def _load_audit_rules(self):
-        """加载审核规则到缓存"""
+    async def _load_audit_rules(self, force: bool = False):
+        """加载审核规则到缓存并编译为决策表"""
         try:
             # 检查缓存是否过期
-            if (self._cache_expire_time and 
+            if (not force and
+                self._cache_expire_time and 
                 datetime.now() < self._cache_expire_time and 
-                self._audit_rules_cache):
+                self._audit_rules_cache is not None):
                 return
             
             # 从数据库加载规则
             rules = await self.db.get_audit_rules()
             self._audit_rules_cache = rules
+            self._rule_table = RuleDecisionTable(rules)
             self._cache_expire_time = datetime.now() + timedelta(minutes=10)
             
-            logger.info(f"已加载 {len(rules)} 条审核规则")
+            logger.info(f"已加载 {len(rules)} 条审核规则，编译 {len(self._rule_table)} 条")
             
         except Exception as e:
             logger.error(f"加载审核规则失败: {e}")
             self._audit_rules_cache = []
+            self._rule_table = RuleDecisionTable()
     
-    async def submit_strategy_for_review(self, strategy_data: Dict[str, Any]) -> str:
-        """提交策略进行审核"""
+    async def reload_audit_rules(self):
+        """审核规则变更通知：立即重新加载并编译"""
+        await self._load_audit_rules(force=True)
+    
+    async def get_audit_rules(self) -> List[Dict[str, Any]]:
+        """获取当前生效的审核规则（与决策表共用缓存）"""
+        await self._load_audit_rules()
+        return list(self._audit_rules_cache or [])
+    
+    async def update_audit_rule(self, rule_id: str, updates: Dict[str, Any]) -> bool:
+        """更新审核规则，成功后立即重新加载并编译决策表"""
+        updated = await self.db.update_audit_rule(rule_id, updates)
+        if updated:
+            await self.reload_audit_rules()
+        return updated
+    
+    def get_rule_statistics(self) -> Dict[str, Any]:
+        """获取审核规则命中次数与评估耗时统计"""
+        return self._rule_table.get_stats()
+    
+    async def submit_strategy_for_review(self, strategy_data: Dict[str, Any], validate: bool = True) -> str:
+        """提交策略进行审核（validate为False时由调用方负责校验）"""
         try:
             logger.info(f"收到策略审核请求: {strategy_data.get('strategy_id')}")
             
             # 数据验证
-            if not self._validate_strategy_data(strategy_data):
+            if validate and not self._validate_strategy_data(strategy_data):
                 raise ValueError("策略数据验证失败")
             
             # 风险评估
@@ -155,6 +180,159 @@ class ReviewService:
             logger.error(f"提交策略审核失败: {e}")
             raise
     
+    async def submit_strategies_batch(self, strategies: List[Dict[str, Any]],
+                                      validate: bool = True) -> List[Optional[str]]:
+        """
+        批量提交策略审核
+
+        风险评估与规则评估按批执行，审核记录与自动审核决策在单个事务中写入，
+        缓存与计数器通过一个Redis管道更新，批准/拒绝结果批量发布
+
+        Args:
+            strategies: 策略数据列表
+            validate: 是否执行策略数据验证（ZeroMQ消息已按其接收规则校验时为False）
+
+        Returns:
+            List[Optional[str]]: 与输入对齐的审核ID，验证失败的策略为None
+        """
+        review_ids: List[Optional[str]] = [None] * len(strategies)
+        indices = []
+        for index, strategy_data in enumerate(strategies):
+            if not validate or self._validate_strategy_data(strategy_data):
+                indices.append(index)
+            else:
+                logger.warning(f"策略数据验证失败: {strategy_data.get('strategy_id')}")
+        if not indices:
+            return review_ids
+
+        valid = [strategies[index] for index in indices]
+        logger.info(f"收到批量策略审核请求: {len(valid)} 条")
+
+        # 风险评估与自动审核
+        for strategy_data in valid:
+            strategy_data['risk_assessment'] = await self._assess_strategy_risk(strategy_data)
+        auto_decisions = await self._auto_review_batch(valid)
+
+        entries = []
+        for strategy_data, auto_decision in zip(valid, auto_decisions):
+            if auto_decision is None:
+                entries.append({'strategy_data': strategy_data, 'status': ReviewStatus.PROCESSING.value})
+                continue
+            status = (ReviewStatus.APPROVED.value
+                      if auto_decision['decision'] == DecisionType.APPROVE.value
+                      else ReviewStatus.REJECTED.value)
+            entries.append({
+                'strategy_data': strategy_data,
+                'status': status,
+                'decision': {
+                    'reviewer_id': "system",
+                    'decision': auto_decision['decision'],
+                    'reason': auto_decision['reason'],
+                    'risk_adjustment': {}
+                }
+            })
+
+        # 单事务写入审核记录与决策，失败时整批回滚并逐条处理
+        try:
+            ids = await self.db.create_review_batch(entries)
+        except Exception as e:
+            logger.error(f"批量写入审核记录失败，改为逐条处理: {e}")
+            for index in indices:
+                try:
+                    review_ids[index] = await self.submit_strategy_for_review(strategies[index], validate)
+                except Exception:
+                    review_ids[index] = None
+            return review_ids
+
+        now = datetime.now().isoformat()
+        cached_strategies = {}
+        review_results = {}
+        queue_items = []
+        approved = []
+        rejected = []
+
+        for index, entry, entry_ids in zip(indices, entries, ids):
+            strategy_data = entry['strategy_data']
+            review_id = entry_ids['review_id']
+            review_ids[index] = review_id
+            cached_strategies[strategy_data.get('strategy_id')] = strategy_data
+
+            decision_data = entry.get('decision')
+            if decision_data is None:
+                queue_items.append({
+                    'review_id': review_id,
+                    'strategy_id': strategy_data.get('strategy_id'),
+                    'priority': self._calculate_review_priority(strategy_data),
+                    'queued_at': now
+                })
+                continue
+
+            decision_data = {**decision_data, 'strategy_review_id': review_id}
+            review_results[review_id] = {
+                'review_id': review_id,
+                'decision': decision_data['decision'],
+                'reason': decision_data['reason'],
+                'decision_id': entry_ids['decision_id'],
+                'processed_at': now
+            }
+
+            strategy_fields = self._strategy_fields(strategy_data)
+            if decision_data['decision'] == DecisionType.APPROVE.value:
+                approved.append((strategy_fields, decision_data, self._generate_report_data(strategy_data)))
+            else:
+                rejected.append((strategy_fields, decision_data))
+
+        await self.redis.write_review_batch(
+            cached_strategies,
+            review_results,
+            queue_items,
+            {
+                'total_reviews': len(valid),
+                'approved_reviews': len(approved),
+                'rejected_reviews': len(rejected)
+            }
+        )
+
+        if approved or rejected:
+            try:
+                await self.zmq.publish_review_batch(approved, rejected)
+            except Exception as pub_err:
+                logger.error(f"批量发布审核结果失败: {pub_err}")
+
+        logger.info(f"批量策略审核已处理: 通过 {len(approved)}, 拒绝 {len(rejected)}, 人工审核 {len(queue_items)}")
+        return review_ids
+
+    def _strategy_fields(self, strategy_data: Dict[str, Any]) -> Dict[str, Any]:
+        """发布审核结果所需的策略字段"""
+        risk_assessment = strategy_data.get('risk_assessment', {})
+        return {
+            'strategy_id': strategy_data.get('strategy_id'),
+            'strategy_name': strategy_data.get('strategy_name'),
+            'strategy_type': strategy_data.get('strategy_type', 'unknown'),
+            'parameters': strategy_data.get('parameters', {}),
+            'expected_return': strategy_data.get('expected_return'),
+            'risk_level': risk_assessment.get('risk_level', strategy_data.get('risk_level')),
+            'max_drawdown': strategy_data.get('max_drawdown')
+        }
+
+    def _generate_report_data(self, strategy_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """生成随批准结果发布的审核报告"""
+        try:
+            input_data = {
+                **self._strategy_fields(strategy_data),
+                'risk_assessment': {
+                    'risk_level': strategy_data.get('risk_assessment', {}).get('risk_level'),
+                    'max_drawdown': strategy_data.get('max_drawdown')
+                },
+                'performance': strategy_data.get('performance')
+            }
+            report_obj = self.report_generator.generate(input_data)
+            report_html = self.report_generator.generate_html(report_obj)
+            return {'report': report_obj, 'report_html': report_html}
+        except Exception as gen_err:
+            logger.error(f"生成报告失败: {gen_err}")
+            return None
+
     def _validate_strategy_data(self, strategy_data: Dict[str, Any]) -> bool:
         """验证策略数据"""
         required_fields = [
@@ -275,114 +453,68 @@ class ReviewService:
             await self._load_audit_rules()
             
             risk_assessment = strategy_data.get('risk_assessment', {})
-            risk_score = risk_assessment.get('risk_score', 0.5)
-            risk_level = risk_assessment.get('risk_level', 'medium')
-            position_size = strategy_data.get('position_size', 0.05)
-            
-            # 应用审核规则
-            for rule in self._audit_rules_cache:
-                if not rule.get('is_active', True):
-                    continue
-                
-                try:
-                    conditions = json.loads(rule.get('conditions', '{}'))
-                    
-                    if self._evaluate_rule_conditions(conditions, strategy_data, risk_assessment):
-                        rule_type = rule.get('rule_type')
-                        action = rule.get('action')
-                        
-                        if rule_type == 'auto_approve':
-                            return {
-                                'decision': DecisionType.APPROVE.value,
-                                'reason': f"自动通过: {rule.get('rule_name')}",
-                                'rule_id': rule.get('id')
-                            }
-                        elif rule_type == 'auto_reject':
-                            return {
-                                'decision': DecisionType.REJECT.value,
-                                'reason': f"自动拒绝: {rule.get('rule_name')}",
-                                'rule_id': rule.get('id')
-                            }
-                        elif rule_type == 'require_review':
-                            # 需要人工审核，返回None
-                            return None
-                            
-                except Exception as e:
-                    logger.error(f"规则评估失败 {rule.get('id')}: {e}")
-                    continue
-            
-            # 默认阈值检查
-            if risk_score <= self.auto_approve_threshold and risk_level == 'low':
-                return {
-                    'decision': DecisionType.APPROVE.value,
-                    'reason': f"低风险自动通过 (评分: {risk_score:.3f})"
-                }
-            elif risk_score >= self.auto_reject_threshold or position_size > self.max_position_size:
-                return {
-                    'decision': DecisionType.REJECT.value,
-                    'reason': f"高风险自动拒绝 (评分: {risk_score:.3f}, 仓位: {position_size:.3f})"
-                }
-            
-            # 需要人工审核
-            return None
+            rule = self._rule_table.classify(strategy_data, risk_assessment)
+            return self._auto_decision(rule, strategy_data, risk_assessment)
             
         except Exception as e:
             logger.error(f"自动审核失败: {e}")
             return None
     
-    def _evaluate_rule_conditions(self, conditions: Dict[str, Any], 
-                                 strategy_data: Dict[str, Any], 
-                                 risk_assessment: Dict[str, Any]) -> bool:
-        """评估规则条件"""
+    async def _auto_review_batch(self, strategies: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """批量自动审核，结果与输入顺序对齐"""
         try:
-            # 合并数据用于条件评估
-            eval_data = {**strategy_data, **risk_assessment}
-            
-            for field, condition in conditions.items():
-                if field not in eval_data:
-                    continue
-                
-                value = eval_data[field]
-                
-                if isinstance(condition, dict):
-                    # 复杂条件 (如 {">": 0.5, "<": 0.8})
-                    for op, threshold in condition.items():
-                        if not self._evaluate_condition(value, op, threshold):
-                            return False
-                else:
-                    # 简单相等条件
-                    if value != condition:
-                        return False
+            await self._load_audit_rules()
             
-            return True
+            items = [(strategy_data, strategy_data.get('risk_assessment', {}))
+                     for strategy_data in strategies]
+            rules = self._rule_table.classify_batch(items)
+            return [
+                self._auto_decision(rule, strategy_data, risk_assessment)
+                for rule, (strategy_data, risk_assessment) in zip(rules, items)
+            ]
             
         except Exception as e:
-            logger.error(f"条件评估失败: {e}")
-            return False
+            logger.error(f"批量自动审核失败: {e}")
+            return [None] * len(strategies)
     
-    def _evaluate_condition(self, value: Any, operator: str, threshold: Any) -> bool:
-        """评估单个条件"""
-        try:
-            if operator == ">":
-                return float(value) > float(threshold)
-            elif operator == ">=":
-                return float(value) >= float(threshold)
-            elif operator == "<":
-                return float(value) < float(threshold)
-            elif operator == "<=":
-                return float(value) <= float(threshold)
-            elif operator == "==":
-                return value == threshold
-            elif operator == "!=":
-                return value != threshold
-            elif operator == "in":
-                return value in threshold
-            elif operator == "not_in":
-                return value not in threshold
-            else:
-                return False
-        except (ValueError, TypeError):
-            return False
+    def _auto_decision(self, rule: Optional[CompiledRule], strategy_data: Dict[str, Any],
+                       risk_assessment: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """由命中的规则（或默认阈值）得出自动审核决策，需要人工审核时返回None"""
+        if rule is not None:
+            if rule.rule_type == 'auto_approve':
+                return {
+                    'decision': DecisionType.APPROVE.value,
+                    'reason': f"自动通过: {rule.rule_name}",
+                    'rule_id': rule.rule_id
+                }
+            elif rule.rule_type == 'auto_reject':
+                return {
+                    'decision': DecisionType.REJECT.value,
+                    'reason': f"自动拒绝: {rule.rule_name}",
+                    'rule_id': rule.rule_id
+                }
+            elif rule.rule_type == 'require_review':
+                # 需要人工审核，返回None
+                return None
+        
+        risk_score = risk_assessment.get('risk_score', 0.5)
+        risk_level = risk_assessment.get('risk_level', 'medium')
+        position_size = strategy_data.get('position_size', 0.05)
+        
+        # 默认阈值检查
+        if risk_score <= self.auto_approve_threshold and risk_level == 'low':
+            return {
+                'decision': DecisionType.APPROVE.value,
+                'reason': f"低风险自动通过 (评分: {risk_score:.3f})"
+            }
+        elif risk_score >= self.auto_reject_threshold or position_size > self.max_position_size:
+            return {
+                'decision': DecisionType.REJECT.value,
+                'reason': f"高风险自动拒绝 (评分: {risk_score:.3f}, 仓位: {position_size:.3f})"
+            }
+        
+        # 需要人工审核
+        return None
     
     async def _queue_for_manual_review(self, review_id: str, strategy_data: Dict[str, Any]):
         """加入人工审核队列"""
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ReviewGuard人工审核模组 - 审核规则决策表
+
+审核规则在加载（或收到变更通知）时编译一次，审核时只执行编译结果：
+1. 条件JSON预先解析为闭包谓词，运算符查表分派，阈值预先转换
+2. 按字段建立索引，每次审核每个字段只取值一次，相同条件在规则间共享
+3. 保持规则原有顺序，首个命中的规则生效
+4. 支持单条与批量分类，统计每条规则的命中次数与评估耗时
+
+评估语义与逐条解析一致：策略数据与风险评估合并（风险评估优先），
+缺失字段的条件跳过，数值比较转换失败或评估异常视为不满足
+"""
+
+import json
+import operator
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from ..utils.logger import setup_logger
+except ImportError:
+    from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+Predicate = Callable[[Any], bool]
+
+_MISSING = object()
+
+# 命中后产生决策的规则类型，其他类型命中后继续匹配下一条，编译时直接跳过
+RULE_TYPES = ('auto_approve', 'auto_reject', 'require_review')
+
+_NUMERIC_OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+
+def _never(value: Any) -> bool:
+    return False
+
+
+def _always(value: Any) -> bool:
+    return True
+
+
+def _compile_operator(op: str, threshold: Any) -> Predicate:
+    """编译单个运算符条件"""
+    compare = _NUMERIC_OPERATORS.get(op)
+    if compare is not None:
+        try:
+            bound = float(threshold)
+        except (ValueError, TypeError):
+            return _never
+
+        def check(value: Any) -> bool:
+            try:
+                return compare(float(value), bound)
+            except (ValueError, TypeError):
+                return False
+        return check
+
+    if op == "==":
+        return lambda value: value == threshold
+    if op == "!=":
+        return lambda value: value != threshold
+
+    if op in ("in", "not_in"):
+        negate = op == "not_in"
+        members = threshold
+        if isinstance(threshold, (list, tuple, set)):
+            try:
+                members = frozenset(threshold)
+            except TypeError:
+                pass
+
+        def check(value: Any) -> bool:
+            try:
+                found = value in members
+            except TypeError:
+                # 不可哈希的值退回原始容器按相等比较
+                try:
+                    found = value in threshold
+                except TypeError:
+                    return False
+            return found != negate
+        return check
+
+    # 未知运算符
+    return _never
+
+
+def compile_condition(condition: Any) -> Predicate:
+    """
+    编译单个字段的条件
+
+    Args:
+        condition: 运算符到阈值的字典（如 {">": 0.5, "<": 0.8}），其他值按相等比较
+
+    Returns:
+        Predicate: 字段值 -> 是否满足
+    """
+    if not isinstance(condition, dict):
+        return lambda value: value == condition
+
+    checks = [_compile_operator(op, threshold) for op, threshold in condition.items()]
+    if not checks:
+        return _always
+    if len(checks) == 1:
+        return checks[0]
+
+    def check_all(value: Any) -> bool:
+        for check in checks:
+            if not check(value):
+                return False
+        return True
+    return check_all
+
+
+@dataclass
+class CompiledRule:
+    """编译后的审核规则"""
+    rule_id: Any
+    rule_name: str
+    rule_type: str
+    predicate_ids: Tuple[int, ...]
+    hits: int = 0
+
+
+class RuleDecisionTable:
+    """
+    审核规则决策表
+
+    Args:
+        rules: 数据库中的审核规则（按生效顺序）
+    """
+
+    def __init__(self, rules: Optional[Sequence[Dict[str, Any]]] = None):
+        self.fields: List[str] = []
+        self.rules: List[CompiledRule] = []
+        self._predicates: List[Tuple[int, Predicate]] = []
+        self.compiled_at = datetime.now()
+        self.reset_stats()
+
+        field_slots: Dict[str, int] = {}
+        predicate_ids: Dict[Tuple[str, str], int] = {}
+
+        for rule in rules or []:
+            if not rule.get('is_active', True) or rule.get('rule_type') not in RULE_TYPES:
+                continue
+            try:
+                conditions = rule.get('conditions', '{}')
+                if isinstance(conditions, str):
+                    conditions = json.loads(conditions)
+
+                ids = []
+                for field, condition in conditions.items():
+                    key = (field, json.dumps(condition, sort_keys=True, default=str))
+                    if key not in predicate_ids:
+                        slot = field_slots.setdefault(field, len(field_slots))
+                        predicate_ids[key] = len(self._predicates)
+                        self._predicates.append((slot, compile_condition(condition)))
+                    ids.append(predicate_ids[key])
+            except Exception as e:
+                logger.error(f"规则编译失败 {rule.get('id')}: {e}")
+                continue
+
+            self.rules.append(CompiledRule(
+                rule_id=rule.get('id'),
+                rule_name=rule.get('rule_name'),
+                rule_type=rule.get('rule_type'),
+                predicate_ids=tuple(ids)
+            ))
+
+        self.fields = list(field_slots)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def reset_stats(self):
+        """清零命中与耗时统计"""
+        for rule in self.rules:
+            rule.hits = 0
+        self.evaluations = 0
+        self.unmatched = 0
+        self.total_time = 0.0
+        self.max_batch_time = 0.0
+
+    def _row(self, strategy_data: Dict[str, Any], risk_assessment: Dict[str, Any]) -> List[Any]:
+        """按字段索引取值（风险评估优先于策略数据）"""
+        row = []
+        for field in self.fields:
+            value = risk_assessment.get(field, _MISSING)
+            if value is _MISSING:
+                value = strategy_data.get(field, _MISSING)
+            row.append(value)
+        return row
+
+    def _test(self, predicate_id: int, row: List[Any]) -> bool:
+        slot, predicate = self._predicates[predicate_id]
+        value = row[slot]
+        if value is _MISSING:
+            return True
+        try:
+            return bool(predicate(value))
+        except Exception:
+            return False
+
+    def _record(self, started: float, count: int, unmatched: int):
+        elapsed = time.perf_counter() - started
+        self.evaluations += count
+        self.unmatched += unmatched
+        self.total_time += elapsed
+        self.max_batch_time = max(self.max_batch_time, elapsed)
+
+    def classify(self, strategy_data: Dict[str, Any],
+                 risk_assessment: Optional[Dict[str, Any]] = None) -> Optional[CompiledRule]:
+        """
+        找出首个命中的规则
+
+        Args:
+            strategy_data: 策略数据
+            risk_assessment: 风险评估结果
+
+        Returns:
+            Optional[CompiledRule]: 命中的规则，无命中返回None
+        """
+        started = time.perf_counter()
+        row = self._row(strategy_data, risk_assessment or {})
+        results: Dict[int, bool] = {}
+
+        matched = None
+        for rule in self.rules:
+            for predicate_id in rule.predicate_ids:
+                result = results.get(predicate_id)
+                if result is None:
+                    result = results[predicate_id] = self._test(predicate_id, row)
+                if not result:
+                    break
+            else:
+                matched = rule
+                break
+
+        if matched is not None:
+            matched.hits += 1
+        self._record(started, 1, matched is None)
+        return matched
+
+    def classify_batch(self, items: Sequence[Tuple[Dict[str, Any], Dict[str, Any]]]
+                       ) -> List[Optional[CompiledRule]]:
+        """
+        批量分类：按规则顺序逐列筛选尚未命中的策略
+
+        Args:
+            items: (策略数据, 风险评估) 列表
+
+        Returns:
+            List[Optional[CompiledRule]]: 与输入对齐的命中规则
+        """
+        started = time.perf_counter()
+        rows = [self._row(strategy_data, risk_assessment or {})
+                for strategy_data, risk_assessment in items]
+        matches: List[Optional[CompiledRule]] = [None] * len(rows)
+        columns: Dict[int, Dict[int, bool]] = {}
+
+        undecided = list(range(len(rows)))
+        for rule in self.rules:
+            if not undecided:
+                break
+            candidates = undecided
+            for predicate_id in rule.predicate_ids:
+                column = columns.setdefault(predicate_id, {})
+                passed = []
+                for index in candidates:
+                    result = column.get(index)
+                    if result is None:
+                        result = column[index] = self._test(predicate_id, rows[index])
+                    if result:
+                        passed.append(index)
+                candidates = passed
+                if not candidates:
+                    break
+
+            if candidates:
+                rule.hits += len(candidates)
+                for index in candidates:
+                    matches[index] = rule
+                hit = set(candidates)
+                undecided = [index for index in undecided if index not in hit]
+
+        self._record(started, len(rows), len(undecided))
+        return matches
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取规则命中与评估耗时统计"""
+        return {
+            'rule_count': len(self.rules),
+            'indexed_fields': list(self.fields),
+            'compiled_at': self.compiled_at.isoformat(),
+            'evaluations': self.evaluations,
+            'unmatched': self.unmatched,
+            'avg_latency_us': self.total_time / self.evaluations * 1e6 if self.evaluations else 0.0,
+            'max_batch_latency_ms': self.max_batch_time * 1e3,
+            'rules': [
+                {
+                    'rule_id': rule.rule_id,
+                    'rule_name': rule.rule_name,
+                    'rule_type': rule.rule_type,
+                    'hits': rule.hits
+                }
+                for rule in self.rules
+            ]
+        }
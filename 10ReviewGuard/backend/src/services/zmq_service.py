@@ -7,9 +7,8 @@ import asyncio
 import json
 import zmq
 import zmq.asyncio
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
-import uuid
 import logging
 
 try:
@@ -42,6 +41,10 @@ class ZMQService:
         self.sub_endpoint = settings.zmq_sub_endpoint  # 订阅optimizer.pool.trading
         self.pub_endpoint = settings.zmq_pub_endpoint  # 发布reviewguard.pool.approved
         
+        # 批量接收：首条消息到达后最多等待batch_wait秒或凑满batch_size条
+        self.batch_size = max(1, settings.review_batch_size)
+        self.batch_wait = settings.review_batch_wait_ms / 1000.0
+        
     async def start(self):
         """启动ZeroMQ服务"""
         try:
@@ -86,64 +89,140 @@ class ZMQService:
         
         while self.is_running:
             try:
-                # 接收消息（非阻塞）
-                message = await self.subscriber.recv_multipart(flags=zmq.NOBLOCK)
+                # 按批接收消息（非阻塞）
+                batch = await self._receive_batch()
                 
-                if len(message) >= 2:
-                    topic = message[0].decode('utf-8')
-                    data = json.loads(message[1].decode('utf-8'))
-                    
-                    logger.info(f"Received message on topic: {topic}")
-                    
-                    # 处理策略消息
-                    if topic == "optimizer.pool.trading":
-                        await self._process_strategy_message(data)
+                if batch:
+                    await self._process_strategy_batch(batch)
+                else:
+                    # 没有消息，继续等待
+                    await asyncio.sleep(0.1)
                         
-            except zmq.Again:
-                # 没有消息，继续等待
-                await asyncio.sleep(0.1)
             except Exception as e:
                 logger.error(f"Error processing message: {e}")
                 await asyncio.sleep(1)
     
+    async def _receive_batch(self) -> List[Dict[str, Any]]:
+        """接收一批策略消息：首条到达后继续收取，直到凑满batch_size或超过batch_wait"""
+        loop = asyncio.get_running_loop()
+        batch = []
+        deadline = None
+        
+        while len(batch) < self.batch_size:
+            try:
+                message = await self.subscriber.recv_multipart(flags=zmq.NOBLOCK)
+            except zmq.Again:
+                if deadline is None:
+                    break
+                remaining = deadline - loop.time()
+                if remaining <= 0 or not await self.subscriber.poll(timeout=remaining * 1000):
+                    break
+                continue
+            
+            if deadline is None:
+                deadline = loop.time() + self.batch_wait
+            
+            if len(message) < 2:
+                continue
+            try:
+                topic = message[0].decode('utf-8')
+                if topic == "optimizer.pool.trading":
+                    batch.append(json.loads(message[1].decode('utf-8')))
+            except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                logger.error(f"Error decoding message: {e}")
+        
+        if batch:
+            logger.info(f"Received {len(batch)} strategy messages on topic: optimizer.pool.trading")
+        return batch
+    
     async def _process_strategy_message(self, data: Dict[str, Any]):
         """处理策略消息"""
+        await self._process_strategy_batch([data])
+    
+    async def _process_strategy_batch(self, messages: List[Dict[str, Any]]):
+        """处理一批策略消息：按ZeroMQ消息的接收规则校验并补全默认值后整批提交审核服务"""
         try:
             # 验证消息格式
             required_fields = ['strategy_id', 'strategy_name', 'parameters', 'expected_return', 'risk_level']
-            if not all(field in data for field in required_fields):
-                logger.warning(f"Invalid strategy message format: {data}")
-                return
-            
-            # 创建策略审核记录
-            strategy_review = StrategyReview(
-                id=str(uuid.uuid4()),
-                strategy_id=data['strategy_id'],
-                strategy_name=data['strategy_name'],
-                strategy_type=data.get('strategy_type', 'unknown'),
-                parameters=json.dumps(data['parameters']),
-                expected_return=float(data['expected_return']),
-                risk_level=data['risk_level'],
-                max_drawdown=float(data.get('max_drawdown', 0.0)),
-                status='pending',
-                raw_data=json.dumps(data),
-                created_at=datetime.now(),
-                updated_at=datetime.now()
-            )
+            strategies = []
+            for data in messages:
+                if not all(field in data for field in required_fields):
+                    logger.warning(f"Invalid strategy message format: {data}")
+                    continue
+                try:
+                    strategies.append({
+                        **data,
+                        'symbol': data.get('symbol', 'unknown'),
+                        'strategy_type': data.get('strategy_type', 'unknown'),
+                        'expected_return': float(data['expected_return']),
+                        'max_drawdown': float(data.get('max_drawdown', 0.0))
+                    })
+                except (TypeError, ValueError) as e:
+                    logger.warning(f"Invalid strategy message values: {data.get('strategy_id')}: {e}")
             
-            # 保存到数据库
-            if self.review_service:
-                success = await self.review_service.create_strategy_review(strategy_review)
-                if success:
-                    logger.info(f"Strategy review created: {strategy_review.id}")
-                    
-                    # 执行自动审核规则
-                    await self.review_service.apply_auto_review_rules(strategy_review)
-                else:
-                    logger.error(f"Failed to create strategy review for: {data['strategy_id']}")
+            if strategies and self.review_service:
+                # 消息已按上述规则校验，审核服务不再套用API提交的校验
+                review_ids = await self.review_service.submit_strategies_batch(strategies, validate=False)
+                for strategy, review_id in zip(strategies, review_ids):
+                    if not review_id:
+                        logger.warning(f"Strategy review not created: {strategy['strategy_id']}")
+                created = sum(1 for review_id in review_ids if review_id)
+                logger.info(f"Strategy reviews created: {created}/{len(strategies)}")
             
         except Exception as e:
-            logger.error(f"Error processing strategy message: {e}")
+            logger.error(f"Error processing strategy batch: {e}")
+    
+    @staticmethod
+    def _review_fields(strategy_review: StrategyReview) -> Dict[str, Any]:
+        """审核记录中发布所需的策略字段"""
+        return {
+            'strategy_id': strategy_review.strategy_id,
+            'strategy_name': strategy_review.strategy_name,
+            'strategy_type': strategy_review.strategy_type,
+            'parameters': json.loads(strategy_review.parameters) if strategy_review.parameters else {},
+            'expected_return': strategy_review.expected_return,
+            'risk_level': strategy_review.risk_level,
+            'max_drawdown': strategy_review.max_drawdown
+        }
+    
+    def _approved_message(self, strategy: Dict[str, Any], decision_data: Dict[str, Any],
+                          report_data: Optional[Dict[str, Any]] = None) -> List[bytes]:
+        """构造批准消息"""
+        message_data = {
+            **strategy,
+            'review_decision': decision_data,
+            'approved_at': datetime.now().isoformat(),
+            'reviewer_id': decision_data.get('reviewer_id'),
+            'approval_reason': decision_data.get('reason')
+        }
+
+        # 可选附加三页式报告
+        if report_data:
+            message_data['review_report'] = report_data.get('report')
+            message_data['review_report_html'] = report_data.get('report_html')
+        
+        topic = "reviewguard.pool.approved"
+        return [
+            topic.encode('utf-8'),
+            json.dumps(message_data).encode('utf-8')
+        ]
+    
+    def _rejected_message(self, strategy: Dict[str, Any], decision_data: Dict[str, Any]) -> List[bytes]:
+        """构造拒绝通知消息"""
+        message_data = {
+            'strategy_id': strategy.get('strategy_id'),
+            'strategy_name': strategy.get('strategy_name'),
+            'rejection_reason': decision_data.get('reason', 'No reason provided'),
+            'risk_level': strategy.get('risk_level'),
+            'rejected_at': datetime.now().isoformat(),
+            'reviewer_id': decision_data.get('reviewer_id')
+        }
+        
+        topic = "review.pool.rejected"
+        return [
+            topic.encode('utf-8'),
+            json.dumps(message_data).encode('utf-8')
+        ]
     
     async def publish_approved_strategy(self, strategy_review: StrategyReview, decision_data: Dict[str, Any], report_data: Optional[Dict[str, Any]] = None):
         """发布已批准的策略到下游模组"""
@@ -152,33 +231,8 @@ class ZMQService:
                 logger.warning("Publisher not available")
                 return False
             
-            # 构造发布消息
-            message_data = {
-                'strategy_id': strategy_review.strategy_id,
-                'strategy_name': strategy_review.strategy_name,
-                'strategy_type': strategy_review.strategy_type,
-                'parameters': json.loads(strategy_review.parameters) if strategy_review.parameters else {},
-                'expected_return': strategy_review.expected_return,
-                'risk_level': strategy_review.risk_level,
-                'max_drawdown': strategy_review.max_drawdown,
-                'review_decision': decision_data,
-                'approved_at': datetime.now().isoformat(),
-                'reviewer_id': decision_data.get('reviewer_id'),
-                'approval_reason': decision_data.get('reason')
-            }
-
-            # 可选附加三页式报告
-            if report_data:
-                message_data['review_report'] = report_data.get('report')
-                message_data['review_report_html'] = report_data.get('report_html')
-            
             # 发布消息
-            topic = "reviewguard.pool.approved"
-            message = [
-                topic.encode('utf-8'),
-                json.dumps(message_data).encode('utf-8')
-            ]
-            
+            message = self._approved_message(self._review_fields(strategy_review), decision_data, report_data)
             await self.publisher.send_multipart(message)
             logger.info(f"Published approved strategy: {strategy_review.strategy_id}")
             
@@ -195,23 +249,8 @@ class ZMQService:
                 logger.warning("Publisher not available")
                 return False
             
-            # 构造拒绝通知消息
-            message_data = {
-                'strategy_id': strategy_review.strategy_id,
-                'strategy_name': strategy_review.strategy_name,
-                'rejection_reason': decision_data.get('reason', 'No reason provided'),
-                'risk_level': strategy_review.risk_level,
-                'rejected_at': datetime.now().isoformat(),
-                'reviewer_id': decision_data.get('reviewer_id')
-            }
-            
             # 发布到拒绝通知主题
-            topic = "review.pool.rejected"
-            message = [
-                topic.encode('utf-8'),
-                json.dumps(message_data).encode('utf-8')
-            ]
-            
+            message = self._rejected_message(self._review_fields(strategy_review), decision_data)
             await self.publisher.send_multipart(message)
             logger.info(f"Published rejected strategy notification: {strategy_review.strategy_id}")
             
@@ -221,6 +260,39 @@ class ZMQService:
             logger.error(f"Error publishing rejected strategy: {e}")
             return False
     
+    async def publish_review_batch(self,
+                                   approved: List[Tuple[Dict[str, Any], Dict[str, Any], Optional[Dict[str, Any]]]],
+                                   rejected: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> int:
+        """
+        批量发布审核结果
+
+        消息格式与逐条发布一致（每个策略一条消息），全部序列化后依次写入套接字（同一套接字不能并发发送）
+
+        Args:
+            approved: (策略字段, 决策数据, 报告数据) 列表
+            rejected: (策略字段, 决策数据) 列表
+
+        Returns:
+            int: 已发布的消息数
+        """
+        try:
+            if not self.publisher or not self.is_running:
+                logger.warning("Publisher not available")
+                return 0
+            
+            messages = [self._approved_message(*item) for item in approved]
+            messages.extend(self._rejected_message(*item) for item in rejected)
+            
+            for message in messages:
+                await self.publisher.send_multipart(message)
+            logger.info(f"Published review batch: {len(approved)} approved, {len(rejected)} rejected")
+            
+            return len(messages)
+            
+        except Exception as e:
+            logger.error(f"Error publishing review batch: {e}")
+            return 0
+    
     def get_connection_status(self) -> Dict[str, Any]:
         """获取连接状态"""
         return {
@@ -40,6 +40,8 @@ class Settings:
     auto_review_enabled: bool = True
     manual_review_timeout_hours: int = 24
     max_pending_reviews: int = 1000
+    review_batch_size: int = 100        # 批量接收的最大策略数
+    review_batch_wait_ms: float = 5.0   # 批量接收的最长等待时间
     
     # 日志配置
     log_level: str = "INFO"
@@ -74,6 +76,8 @@ class Settings:
         self.auto_review_enabled = os.getenv("AUTO_REVIEW_ENABLED", "true").lower() == "true"
         self.manual_review_timeout_hours = int(os.getenv("MANUAL_REVIEW_TIMEOUT_HOURS", self.manual_review_timeout_hours))
         self.max_pending_reviews = int(os.getenv("MAX_PENDING_REVIEWS", self.max_pending_reviews))
+        self.review_batch_size = int(os.getenv("REVIEW_BATCH_SIZE", self.review_batch_size))
+        self.review_batch_wait_ms = float(os.getenv("REVIEW_BATCH_WAIT_MS", self.review_batch_wait_ms))
         
         # 日志配置
         self.log_level = os.getenv("LOG_LEVEL", self.log_level)
@@ -117,6 +121,8 @@ DEBUG=false
 AUTO_REVIEW_ENABLED=true
 MANUAL_REVIEW_TIMEOUT_HOURS=24
 MAX_PENDING_REVIEWS=1000
+REVIEW_BATCH_SIZE=100
+REVIEW_BATCH_WAIT_MS=5
 
 # 日志配置
 LOG_LEVEL=INFO
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+ReviewGuard人工审核模组 - 批量审核接收单元测试
+
+测试用例：
+- UNIT-RG-BATCH-01: 批量提交 - 风险评估与规则评估按批执行，单次写库、单次缓存、单次发布
+- UNIT-RG-BATCH-02: 批量写库 - 审核记录与决策在同一事务中写入，失败整批回滚
+- UNIT-RG-BATCH-03: ZeroMQ批量收发 - 按批接收策略消息，批量发布审核结果
+- UNIT-RG-BATCH-04: ZeroMQ接收规则 - 沿用消息格式校验，缺省字段取默认值后进入审核
+"""
+
+import pytest
+import json
+from unittest.mock import AsyncMock, MagicMock
+import sys
+import os
+
+import zmq
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.services.review_service import ReviewService
+from src.services.database_service import DatabaseService
+from src.services.zmq_service import ZMQService
+
+
+DEFAULT_RULES = [
+    {
+        'id': 'rule_001', 'rule_name': '低风险自动通过', 'rule_type': 'auto_approve',
+        'conditions': json.dumps({"risk_level": "low", "max_drawdown": {"<": 0.05}}), 'is_active': True
+    },
+    {
+        'id': 'rule_002', 'rule_name': '高风险强制审核', 'rule_type': 'require_review',
+        'conditions': json.dumps({"risk_level": "high"}), 'is_active': True
+    },
+    {
+        'id': 'rule_003', 'rule_name': '超大仓位拒绝', 'rule_type': 'auto_reject',
+        'conditions': json.dumps({"position_size": {">=": 0.5}}), 'is_active': True
+    }
+]
+
+
+def make_strategy(strategy_id, symbol, strategy_type, max_drawdown, position_size=0.05):
+    return {
+        'strategy_id': strategy_id,
+        'strategy_name': f"{strategy_id}_name",
+        'symbol': symbol,
+        'strategy_type': strategy_type,
+        'parameters': {'period': 20},
+        'expected_return': 0.12,
+        'max_drawdown': max_drawdown,
+        'position_size': position_size
+    }
+
+
+class TestReviewBatch:
+    """批量审核接收测试类"""
+
+    @pytest.fixture
+    def review_service(self):
+        """创建ReviewService实例，依赖服务均为Mock"""
+        mock_db = AsyncMock()
+        mock_db.get_audit_rules.return_value = DEFAULT_RULES
+        mock_db.create_review_batch.side_effect = lambda entries: [
+            {'review_id': f"review_{i}", 'decision_id': f"decision_{i}" if entry.get('decision') else None}
+            for i, entry in enumerate(entries)
+        ]
+        return ReviewService(
+            database_service=mock_db,
+            redis_service=AsyncMock(),
+            zeromq_service=AsyncMock()
+        )
+
+    @pytest.mark.asyncio
+    async def test_unit_rg_batch_01_submit_batch(self, review_service):
+        """UNIT-RG-BATCH-01: 批量提交策略审核"""
+        strategies = [
+            make_strategy('s_approve', 'EURUSD', 'arbitrage', 0.03),
+            make_strategy('s_reject', 'BTCUSDT', 'momentum', 0.08, position_size=0.6),
+            {'strategy_id': 's_invalid'},
+            make_strategy('s_manual', 'XYZ', 'momentum', 0.25),
+        ]
+
+        review_ids = await review_service.submit_strategies_batch(strategies)
+        assert review_ids == ['review_0', 'review_1', None, 'review_2']
+
+        # 审核记录与决策一次写入
+        review_service.db.create_review_batch.assert_awaited_once()
+        entries = review_service.db.create_review_batch.call_args.args[0]
+        assert [entry['status'] for entry in entries] == ['approved', 'rejected', 'processing']
+        assert entries[0]['decision']['reason'] == "自动通过: 低风险自动通过"
+        assert entries[1]['decision']['reason'] == "自动拒绝: 超大仓位拒绝"
+        assert 'decision' not in entries[2]
+        review_service.db.create_strategy_review.assert_not_called()
+        review_service.db.create_review_decision.assert_not_called()
+
+        # 缓存、队列与计数器一次写入
+        review_service.redis.write_review_batch.assert_awaited_once()
+        strategies_cached, results, queue_items, counters = review_service.redis.write_review_batch.call_args.args
+        assert set(strategies_cached) == {'s_approve', 's_reject', 's_manual'}
+        assert set(results) == {'review_0', 'review_1'}
+        assert [item['review_id'] for item in queue_items] == ['review_2']
+        assert counters == {'total_reviews': 3, 'approved_reviews': 1, 'rejected_reviews': 1}
+
+        # 批准与拒绝结果一次发布
+        review_service.zmq.publish_review_batch.assert_awaited_once()
+        approved, rejected = review_service.zmq.publish_review_batch.call_args.args
+        assert [item[0]['strategy_id'] for item in approved] == ['s_approve']
+        assert approved[0][1]['strategy_review_id'] == 'review_0'
+        assert [item[0]['strategy_id'] for item in rejected] == ['s_reject']
+
+        # 规则只加载一次
+        assert review_service.db.get_audit_rules.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unit_rg_batch_02_single_transaction(self, tmp_path, monkeypatch):
+        """UNIT-RG-BATCH-02: 审核记录与决策在同一事务中写入"""
+        monkeypatch.setenv("DATABASE_PATH", str(tmp_path / "reviewguard.db"))
+        db = DatabaseService()
+        await db.initialize()
+
+        async def count(table):
+            cursor = await db.connection.execute(f"SELECT COUNT(*) FROM {table}")
+            return (await cursor.fetchone())[0]
+
+        try:
+            ids = await db.create_review_batch([
+                {
+                    'strategy_data': make_strategy('s1', 'EURUSD', 'arbitrage', 0.03),
+                    'status': 'approved',
+                    'decision': {'reviewer_id': 'reviewer_001', 'decision': 'approve', 'reason': 'ok'}
+                },
+                {'strategy_data': make_strategy('s2', 'XYZ', 'momentum', 0.25), 'status': 'processing'}
+            ])
+            assert ids[0]['decision_id'] is not None
+            assert ids[1]['decision_id'] is None
+            assert await count('strategy_reviews') == 2
+            assert await count('review_decisions') == 1
+
+            cursor = await db.connection.execute(
+                "SELECT status FROM strategy_reviews WHERE id = ?", (ids[0]['review_id'],)
+            )
+            assert (await cursor.fetchone())[0] == 'approved'
+
+            # 决策违反外键约束时整批回滚
+            with pytest.raises(Exception):
+                await db.create_review_batch([
+                    {'strategy_data': make_strategy('s3', 'EURUSD', 'arbitrage', 0.03), 'status': 'processing'},
+                    {
+                        'strategy_data': make_strategy('s4', 'EURUSD', 'arbitrage', 0.03),
+                        'status': 'rejected',
+                        'decision': {'reviewer_id': 'unknown_reviewer', 'decision': 'reject', 'reason': 'x'}
+                    }
+                ])
+            assert await count('strategy_reviews') == 2
+            assert await count('review_decisions') == 1
+        finally:
+            await db.close()
+
+    @pytest.mark.asyncio
+    async def test_unit_rg_batch_03_zmq_batch_io(self):
+        """UNIT-RG-BATCH-03: 按批接收策略消息并批量发布审核结果"""
+        review_service = AsyncMock()
+        review_service.submit_strategies_batch.return_value = ['review_0']
+        service = ZMQService(review_service)
+        service.batch_size = 10
+        service.is_running = True
+
+        valid = {
+            'strategy_id': 's1', 'strategy_name': 'n1', 'parameters': {},
+            'expected_return': 0.1, 'risk_level': 'low'
+        }
+        frames = [
+            [b"optimizer.pool.trading", json.dumps(valid).encode('utf-8')],
+            [b"optimizer.pool.trading", b"{broken"],
+            [b"optimizer.pool.trading", json.dumps({'strategy_id': 's2'}).encode('utf-8')],
+        ]
+
+        subscriber = MagicMock()
+
+        async def recv_multipart(flags=0):
+            if frames:
+                return frames.pop(0)
+            raise zmq.Again()
+        subscriber.recv_multipart.side_effect = recv_multipart
+        subscriber.poll = AsyncMock(return_value=0)
+        service.subscriber = subscriber
+
+        batch = await service._receive_batch()
+        assert [data['strategy_id'] for data in batch] == ['s1', 's2']
+
+        await service._process_strategy_batch(batch)
+        review_service.submit_strategies_batch.assert_awaited_once_with(
+            [{**valid, 'symbol': 'unknown', 'strategy_type': 'unknown', 'max_drawdown': 0.0}],
+            validate=False
+        )
+
+        service.publisher = AsyncMock()
+        published = await service.publish_review_batch(
+            [({'strategy_id': 's1', 'strategy_name': 'n1'}, {'reviewer_id': 'system', 'reason': 'ok'}, None)],
+            [({'strategy_id': 's2', 'strategy_name': 'n2'}, {'reviewer_id': 'system', 'reason': 'bad'})]
+        )
+        assert published == 2
+        topics = [call.args[0][0] for call in service.publisher.send_multipart.call_args_list]
+        assert topics == [b"reviewguard.pool.approved", b"review.pool.rejected"]
+
+    @pytest.mark.asyncio
+    async def test_unit_rg_batch_04_zmq_acceptance_rules(self, review_service):
+        """UNIT-RG-BATCH-04: ZeroMQ消息不套用API提交的校验，缺省字段取默认值"""
+        service = ZMQService(review_service)
+        await service._process_strategy_batch([
+            {
+                'strategy_id': 'z1', 'strategy_name': 'n1', 'parameters': {},
+                'expected_return': 1.5, 'risk_level': 'medium'
+            },
+            {
+                'strategy_id': 'z2', 'strategy_name': 'n2', 'parameters': {},
+                'expected_return': 'n/a', 'risk_level': 'low'
+            },
+            {'strategy_id': 'z3', 'strategy_name': 'n3'},
+        ])
+
+        review_service.db.create_review_batch.assert_awaited_once()
+        entries = review_service.db.create_review_batch.call_args.args[0]
+        assert [entry['strategy_data']['strategy_id'] for entry in entries] == ['z1']
+        strategy_data = entries[0]['strategy_data']
+        assert strategy_data['symbol'] == 'unknown'
+        assert strategy_data['strategy_type'] == 'unknown'
+        assert strategy_data['max_drawdown'] == 0.0
+        assert strategy_data['expected_return'] == 1.5
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+ReviewGuard人工审核模组 - 审核规则决策表单元测试
+
+测试用例：
+- UNIT-RG-TABLE-01: 规则编译 - 首个命中规则生效，缺失字段跳过
+- UNIT-RG-TABLE-02: 批量分类 - 与逐条分类结果一致，命中计数累加
+- UNIT-RG-TABLE-03: 自动审核 - 规则只编译一次，变更通知后重新编译
+- UNIT-RG-TABLE-04: 规则更新 - 写库后立即重新编译，规则与命中统计可查询
+"""
+
+import pytest
+import json
+from unittest.mock import AsyncMock
+import sys
+import os
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.services.review_service import ReviewService, DecisionType
+from src.services.database_service import DatabaseService
+from src.services.rule_table import RuleDecisionTable
+
+
+class TestRuleDecisionTable:
+    """审核规则决策表测试类"""
+
+    @pytest.fixture
+    def audit_rules(self):
+        """按生效顺序排列的审核规则（与数据库返回格式一致）"""
+        return [
+            {
+                'id': 'rule_position',
+                'rule_name': '超大仓位拒绝',
+                'rule_type': 'auto_reject',
+                'conditions': json.dumps({'position_size': {'>=': 0.5}}),
+                'is_active': True
+            },
+            {
+                'id': 'rule_high_risk',
+                'rule_name': '高风险人工审核',
+                'rule_type': 'require_review',
+                'conditions': json.dumps({'risk_level': {'in': ['high']}}),
+                'is_active': True
+            },
+            {
+                'id': 'rule_low_drawdown',
+                'rule_name': '低回撤通过',
+                'rule_type': 'auto_approve',
+                'conditions': json.dumps({'max_drawdown': {'<': 0.05}, 'strategy_type': {'not_in': ['scalping']}}),
+                'is_active': True
+            },
+            {
+                'id': 'rule_broken',
+                'rule_name': '格式错误',
+                'rule_type': 'auto_approve',
+                'conditions': '{not json',
+                'is_active': True
+            },
+            {
+                'id': 'rule_inactive',
+                'rule_name': '已停用',
+                'rule_type': 'auto_approve',
+                'conditions': '{}',
+                'is_active': False
+            }
+        ]
+
+    @pytest.fixture
+    def strategies(self):
+        """(策略数据, 风险评估) 样本"""
+        return [
+            ({'strategy_id': 's1', 'position_size': 0.6, 'max_drawdown': 0.01}, {'risk_level': 'low'}),
+            ({'strategy_id': 's2', 'position_size': 0.1, 'max_drawdown': 0.01}, {'risk_level': 'high'}),
+            ({'strategy_id': 's3', 'position_size': 0.1, 'max_drawdown': 0.03, 'strategy_type': 'momentum'}, {'risk_level': 'low'}),
+            ({'strategy_id': 's4', 'position_size': 0.1, 'max_drawdown': 0.03, 'strategy_type': 'scalping'}, {'risk_level': 'low'}),
+            ({'strategy_id': 's5', 'position_size': 'n/a', 'strategy_type': 'momentum'}, {'risk_level': 'medium'}),
+        ]
+
+    def test_unit_rg_table_01_first_match(self, audit_rules, strategies):
+        """UNIT-RG-TABLE-01: 首个命中规则生效，缺失字段跳过"""
+        table = RuleDecisionTable(audit_rules)
+
+        # 格式错误与停用规则不参与编译
+        assert [rule.rule_id for rule in table.rules] == [
+            'rule_position', 'rule_high_risk', 'rule_low_drawdown'
+        ]
+
+        results = [table.classify(strategy, risk) for strategy, risk in strategies]
+        assert [rule.rule_id if rule else None for rule in results] == [
+            'rule_position',      # 仓位规则优先于低回撤规则
+            'rule_high_risk',
+            'rule_low_drawdown',
+            None,                 # 剥头皮策略不满足not_in
+            'rule_low_drawdown'   # 缺失max_drawdown跳过，仓位无法转换为数值视为不满足
+        ]
+
+        # 风险评估中的字段优先于策略数据
+        rule = table.classify({'position_size': 0.1, 'risk_level': 'high'}, {'risk_level': 'low', 'max_drawdown': 0.2})
+        assert rule is None
+
+    def test_unit_rg_table_02_batch_matches_single(self, audit_rules, strategies):
+        """UNIT-RG-TABLE-02: 批量分类与逐条分类一致"""
+        table = RuleDecisionTable(audit_rules)
+
+        single = [table.classify(strategy, risk) for strategy, risk in strategies]
+        batch = table.classify_batch(strategies * 100)
+        assert batch == single * 100
+
+        stats = table.get_stats()
+        assert stats['evaluations'] == len(strategies) * 101
+        assert stats['unmatched'] == 101
+        assert {rule['rule_id']: rule['hits'] for rule in stats['rules']} == {
+            'rule_position': 101,
+            'rule_high_risk': 101,
+            'rule_low_drawdown': 202
+        }
+        assert stats['avg_latency_us'] > 0
+
+        table.reset_stats()
+        assert table.get_stats()['evaluations'] == 0
+        assert all(rule.hits == 0 for rule in table.rules)
+
+    @pytest.mark.asyncio
+    async def test_unit_rg_table_03_auto_review_compiles_once(self, audit_rules):
+        """UNIT-RG-TABLE-03: 自动审核复用编译结果，变更通知后重新编译"""
+        mock_db = AsyncMock()
+        mock_db.get_audit_rules.return_value = audit_rules
+        service = ReviewService(
+            database_service=mock_db,
+            redis_service=AsyncMock(),
+            zeromq_service=AsyncMock()
+        )
+
+        strategy = {
+            'strategy_id': 'test_strategy_001',
+            'position_size': 0.6,
+            'risk_assessment': {'risk_level': 'low', 'risk_score': 0.2}
+        }
+        for _ in range(10):
+            decision = await service._auto_review('review_001', strategy)
+            assert decision['decision'] == DecisionType.REJECT.value
+            assert decision['rule_id'] == 'rule_position'
+        assert mock_db.get_audit_rules.await_count == 1
+
+        # 批量审核结果与单条一致；require_review命中时不走默认阈值
+        decisions = await service._auto_review_batch([
+            strategy,
+            {'strategy_id': 's2', 'position_size': 0.01, 'risk_assessment': {'risk_level': 'high', 'risk_score': 0.9}}
+        ])
+        assert decisions[0]['rule_id'] == 'rule_position'
+        assert decisions[1] is None
+        assert service.get_rule_statistics()['rules'][0]['hits'] == 11
+
+        # 规则变更通知
+        mock_db.get_audit_rules.return_value = audit_rules[1:2]
+        await service.reload_audit_rules()
+        assert mock_db.get_audit_rules.await_count == 2
+
+        decision = await service._auto_review('review_002', strategy)
+        assert decision['decision'] == DecisionType.APPROVE.value
+        assert decision['reason'].startswith('低风险自动通过')
+
+    @pytest.mark.asyncio
+    async def test_unit_rg_table_04_update_rule_recompiles(self, tmp_path, monkeypatch):
+        """UNIT-RG-TABLE-04: 更新规则后立即重新编译"""
+        monkeypatch.setenv("DATABASE_PATH", str(tmp_path / "reviewguard.db"))
+        db = DatabaseService()
+        await db.initialize()
+        service = ReviewService(
+            database_service=db,
+            redis_service=AsyncMock(),
+            zeromq_service=AsyncMock()
+        )
+        strategy = {
+            'strategy_id': 'test_strategy_001',
+            'position_size': 0.08,
+            'risk_assessment': {'risk_level': 'medium', 'risk_score': 0.2}
+        }
+
+        try:
+            rules = await service.get_audit_rules()
+            assert [rule['id'] for rule in rules] == ['rule_001', 'rule_002', 'rule_003']
+            assert await service._auto_review('review_001', strategy) is None
+
+            updated = await service.update_audit_rule(
+                'rule_003', {'conditions': {'position_size': {'>=': 0.05}}}
+            )
+            assert updated is True
+            decision = await service._auto_review('review_002', strategy)
+            assert decision['decision'] == DecisionType.REJECT.value
+            assert decision['rule_id'] == 'rule_003'
+
+            stats = service.get_rule_statistics()
+            assert stats['rule_count'] == 3
+            assert [rule['hits'] for rule in stats['rules'] if rule['rule_id'] == 'rule_003'] == [1]
+
+            # 停用后不再生效；未知规则不触发重新加载
+            assert await service.update_audit_rule('rule_003', {'is_active': False}) is True
+            assert [rule['id'] for rule in await service.get_audit_rules()] == ['rule_001', 'rule_002']
+            assert await service.update_audit_rule('rule_missing', {'action': 'reject'}) is False
+        finally:
+            await db.close()